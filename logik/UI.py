@@ -6,18 +6,28 @@ Alle kendte fejl er rettet:
 - Ingen sorte bokse bag labels (bg_color matcher CTk's mørke tema).
 - Baggrunden skalerer med vinduet via <Configure>-eventet.
 - Månen vises som én enkelt emoji.
-- Slideren navigerer ±60 dage fra i dag.
+- Slideren viser ±60 dage og flytter centrum ved kanten (uendelig tidslinje).
 - Vejrdata hentes i baggrunden (threading) så UI ikke fryser.
+- Alt arbejde pr. slider-tik sker i en arbejdstråd; hovedtråden anvender
+  kun færdige visningstilstande én gang pr. frame (se logik/viewstate.py).
+- Opstarten tegner først vinduet fra et snapshot af sidste session og
+  henter derefter live data (se logik/startup.py).
 """
 
 import customtkinter as ctk
 import tkinter as tk
-from PIL import Image, ImageDraw, ImageTk
+import os
 import random
 import threading
+from datetime import timedelta
 
 from logik.moon_api import MoonAPIClient
-from logik.boilerplate import DateUtils, MoonEngine, MoonVisuals
+from logik.rate_limiter import PREFETCH
+from logik.startup import (StartupTimer, background_path, load_snapshot,
+                           prune_backgrounds, save_snapshot)
+from logik.timeline import LRUCache, Timeline
+from logik.viewstate import FRAME_MS, STRIMMEL_CELLER, ViewStateWorker
+from logik.boilerplate import DateUtils, Formatters, MoonEngine, MoonVisuals
 
 
 # CTk dark mode bruger denne baggrundsfarve på vinduet.
@@ -25,6 +35,14 @@ from logik.boilerplate import DateUtils, MoonEngine, MoonVisuals
 # ikke opstår sorte bokse bag teksten.
 CTK_DARK_BG = "#212121"
 
+# Loft over cachede vejrdage
+WEATHER_CACHE_DAGE = 512
+
+# Labels hvis tekst gemmes i snapshot og vises ved næste opstart
+SNAPSHOT_LABELS = ("moon_display", "phase_label", "illumination_label", "days_label",
+                   "weather_label", "sunrise_label", "sunset_label", "moonrise_label",
+                   "moonset_label", "uv_label", "precip_label")
+
 
 # ──────────────────────────────────────────────
 # BAGGRUND
@@ -48,6 +66,7 @@ def generate_space_background(width, height):
     Returns:
         PIL.Image: Færdigt baggrundsbillede.
     """
+    from PIL import Image, ImageDraw
     img = Image.new("RGB", (width, height))
     draw = ImageDraw.Draw(img)
 
@@ -97,51 +116,163 @@ class LunarOrbitApp(ctk.CTk):
         tk.Frame oven på canvas med gennemsigtig baggrund.
     """
 
-    def __init__(self):
+    def __init__(self, timer=None, startup_report=False, today=None):
         """
         Initialiserer applikationen og sætter alle komponenter op.
+
+        Opstarten sker i etaper (se logik/startup.py): vinduet tegnes
+        først ud fra sidste sessions snapshot, og månedata, timevejr og
+        vejr hentes først efter første optegning.
+
+        Args:
+            timer (StartupTimer, optional): Måler opstartens etaper.
+            startup_report (bool): Print tidsrapporten, når vejret er vist.
+            today (str, optional): Fast "i dag" (YYYY-MM-DD), så kørsler kan
+                                   gentages (se logik/headless.py).
         """
+        self._timer = timer or StartupTimer()
+        self._startup_report = startup_report
         super().__init__()
+        self._timer.mark("window")
+
+        # ── Snapshot af sidste session (None ved første start) ──
+        snapshot = load_snapshot() or {}
+        geometri = snapshot.get("geometry", "900x700")
 
         self.title("LunarOrbit")
-        self.geometry("900x700")
+        self.geometry(geometri)
         ctk.set_appearance_mode("dark")
 
         # ── Logik-objekter ──
-        self.api_client   = MoonAPIClient()
+        if "latitude" in snapshot:
+            self.api_client = MoonAPIClient(snapshot["latitude"], snapshot["longitude"],
+                                            snapshot.get("location_name", "København"))
+        else:
+            self.api_client = MoonAPIClient()
         self.moon_engine  = MoonEngine()
         self.moon_visuals = MoonVisuals()
         self.date_utils   = DateUtils()
 
-        # ── Dato og slider-interval (±60 dage) ──
-        self.today        = self.date_utils.get_current_date()
-        self.current_date = self.today
-        self.slider_start, self.slider_end = self.date_utils.create_slider_date_range(
-            self.today, range_days=60
-        )
+        # ── Dato og slider-interval (±60 dage omkring et flytbart centrum) ──
+        self.today        = today or self.date_utils.get_current_date()
+        self.current_date = snapshot.get("date", self.today)
+        self.timeline     = Timeline(self.api_client, self.today)
+
+        # ── Kalendertiles (oprettes når kalenderen åbnes første gang) ──
+        self.calendar_renderer = None
+        self.slider_start, self.slider_end = self.timeline.start, self.timeline.end
+
+        # ── Live-position af måne og sol (oprettes ved første tryk på Live) ──
+        self.tracker = None
+        self._live   = False
 
         # ── Cache til vejrdata ──
-        self._weather_cache = {}
+        self._weather_cache = LRUCache(WEATHER_CACHE_DAGE)
+
+        # ── Visningstilstande bygges i en arbejdstråd (se logik/viewstate.py) ──
+        # Timevejr for hele slider-vinduet hentes efter første optegning.
+        self.view_worker = ViewStateWorker(self.api_client, self.timeline,
+                                           self._weather_cache).start()
+        self._anvendt = {}
+        # Løbenumre for seneste anmodning og seneste anvendte tilstand
+        self.requested_seq = 0
+        self.applied_seq   = 0
 
         # ── Canvas som baggrund ──
-        # tk.Canvas (ikke ctk) understøtter PIL-billeder via create_image().
+        # tk.Canvas (ikke ctk) understøtter PhotoImage via create_image().
         self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=CTK_DARK_BG)
         self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
 
-        # Generer baggrundsbilledet én gang i høj opløsning og gem det.
-        # Ved resize skalerer vi dette billede i stedet for at generere nyt.
-        self._bg_original = generate_space_background(1920, 1080)
-
-        # Tegn baggrunden første gang i standardstørrelsen
-        self._tegn_baggrund_i_storrelse(900, 700)
+        # Baggrunden i høj opløsning genereres først, når den skal skaleres.
+        # Ved opstart bruges den gemte PNG for vinduesstørrelsen, hvis den findes.
+        self._bg_original = None
+        self._bg_scaled = None
+        self._bg_size = None
+        bredde, højde = (int(v) for v in geometri.split("+")[0].split("x"))
+        self._tegn_baggrund_i_storrelse(bredde, højde)
+        self._timer.mark("background")
 
         # Lyt på resize-events – men KUN fra selve vinduet (se _on_resize)
         self.bind("<Configure>", self._on_resize)
 
+        # Piletaster flytter én dag ad gangen – også forbi slider-vinduet
+        self.bind("<Left>",  lambda event: self._step(-1))
+        self.bind("<Right>", lambda event: self._step(1))
+
         # ── UI ──
         self._setup_ui()
+        self._timer.mark("widgets")
+
+        # Sidste sessions tekster vises, til de friske data er beregnet
+        if snapshot.get("date") == self.current_date:
+            self._apply_snapshot(snapshot)
+        self.date_slider.set(self.timeline.goto(self.current_date))
         self._update_clock()
+        self._timer.mark("snapshot")
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after_idle(self._after_first_paint)
+
+    # ──────────────────────────────────────────────
+    # OPSTART OG SNAPSHOT
+    # ──────────────────────────────────────────────
+
+    def _apply_snapshot(self, snapshot):
+        """
+        Viser de gemte tekster fra sidste session.
+
+        Args:
+            snapshot (dict): Indlæst med `load_snapshot()`.
+        """
+        for navn, tekst in snapshot.get("labels", {}).items():
+            if navn in SNAPSHOT_LABELS:
+                getattr(self, navn).configure(text=tekst)
+        self.status_label.configure(text="Fra sidste session", text_color="orange")
+
+    def _after_first_paint(self):
+        """
+        Kører når vinduet er tegnet første gang: henter live data.
+        """
+        self.update_idletasks()
+        self._timer.mark("first_paint")
+
         self._fetch_and_display_moon()
+        self._poll_view_states()
+        threading.Thread(target=self._fetch_hourly_in_background, daemon=True).start()
+
+    def _mark_startup(self, navn):
+        """Markerer en senere opstartsetape og printer rapporten ved vejret."""
+        if navn in self._timer.names:
+            return
+        self._timer.mark(navn)
+        if navn == "weather" and self._startup_report:
+            self._timer.print_report()
+
+    def _on_close(self):
+        """
+        Gemmer snapshot af sessionen (dato, sted, størrelse, tekster og
+        baggrund) og lukker vinduet.
+        """
+        bredde, højde = self.winfo_width(), self.winfo_height()
+        try:
+            sti = background_path(bredde, højde)
+            if (self._bg_scaled is not None and self._bg_size == (bredde, højde)
+                    and not os.path.exists(sti)):
+                os.makedirs(os.path.dirname(sti), exist_ok=True)
+                self._bg_scaled.save(sti, compress_level=1)
+                prune_backgrounds(sti)
+            save_snapshot({
+                "date":          self.current_date,
+                "latitude":      self.api_client.latitude,
+                "longitude":     self.api_client.longitude,
+                "location_name": self.api_client.location_name,
+                "geometry":      f"{bredde}x{højde}",
+                "labels": {navn: getattr(self, navn).cget("text") for navn in SNAPSHOT_LABELS},
+            })
+        except OSError:
+            pass                        # Et manglende snapshot må ikke forhindre lukning
+        self.view_worker.stop()
+        self.destroy()
 
     # ──────────────────────────────────────────────
     # BAGGRUND
@@ -151,12 +282,33 @@ class LunarOrbitApp(ctk.CTk):
         """
         Skalerer det originale baggrundsbillede til (w, h) og tegner det på canvas.
 
+        Findes en gemt baggrund i præcis denne størrelse (fra sidste
+        session), indlæses den direkte med tk.PhotoImage; så hverken
+        genereres originalen eller importeres PIL.
+
         Args:
             w (int): Ønsket bredde i pixels.
             h (int): Ønsket højde i pixels.
         """
-        skaleret = self._bg_original.resize((w, h), Image.LANCZOS)
-        self.bg_photo = ImageTk.PhotoImage(skaleret)
+        sti = background_path(w, h)
+        foto = None
+        if self._bg_original is None and os.path.exists(sti):
+            try:
+                foto = tk.PhotoImage(file=sti)
+            except tk.TclError:
+                foto = None
+        if foto is None:
+            # PIL skal kun bruges, når baggrunden genereres eller skaleres
+            self._timer.import_module("PIL.ImageTk")
+            from PIL import Image, ImageTk
+            if self._bg_original is None:
+                self._bg_original = generate_space_background(1920, 1080)
+            self._bg_scaled = self._bg_original.resize((w, h), Image.LANCZOS)
+            foto = ImageTk.PhotoImage(self._bg_scaled)
+        else:
+            self._bg_scaled = None      # Findes allerede på disken
+        self._bg_size = (w, h)
+        self.bg_photo = foto
         self.canvas.delete("baggrund")
         self.canvas.create_image(0, 0, image=self.bg_photo, anchor="nw", tags="baggrund")
         self.canvas.tag_lower("baggrund")
@@ -173,6 +325,7 @@ class LunarOrbitApp(ctk.CTk):
         Baggrunden genereres én gang i fuld opløsning og gemmes i
         self._bg_original. Ved resize skalerer vi bare det gemte billede
         i stedet for at generere et nyt – det er meget hurtigere.
+        Events uden ny størrelse (f.eks. flytning af vinduet) ignoreres.
 
         Args:
             event: Tkinter Configure-event med ny width og height.
@@ -182,16 +335,10 @@ class LunarOrbitApp(ctk.CTk):
             return
 
         w, h = event.width, event.height
-        if w < 10 or h < 10:
+        if w < 10 or h < 10 or (w, h) == self._bg_size:
             return
 
-        # Skaler det originale baggrundsbillede til den nye størrelse
-        skaleret = self._bg_original.resize((w, h), Image.LANCZOS)
-        self.bg_photo = ImageTk.PhotoImage(skaleret)
-
-        self.canvas.delete("baggrund")
-        self.canvas.create_image(0, 0, image=self.bg_photo, anchor="nw", tags="baggrund")
-        self.canvas.tag_lower("baggrund")
+        self._tegn_baggrund_i_storrelse(w, h)
 
     # ──────────────────────────────────────────────
     # UI OPBYGNING
@@ -221,6 +368,13 @@ class LunarOrbitApp(ctk.CTk):
         )
         self.clock_label.place(relx=0.98, rely=0.02, anchor="ne")
 
+        # ── Live-position under uret (kun i live-tilstand) ──
+        self.live_label = tk.Label(
+            self, text="", font=("Arial", 11),
+            fg="#c0a0e0", bg="#11052a", justify="right"
+        )
+        self.live_label.place(relx=0.98, rely=0.06, anchor="ne")
+
         # ── Status øverst til venstre ──
         self.status_label = ctk.CTkLabel(
             self, text="Klar", font=("Arial", 11),
@@ -239,6 +393,26 @@ class LunarOrbitApp(ctk.CTk):
         )
         self.reset_button.place(x=10, y=30)
 
+        # ── Live-knap under reset-knappen ──
+        self.live_button = ctk.CTkButton(
+            self, text="◉ Live",
+            font=("Arial", 11), height=28,
+            fg_color="#3c0a5a", hover_color="#8020c0",
+            bg_color="#11052a",
+            command=self._toggle_live
+        )
+        self.live_button.place(x=10, y=64)
+
+        # ── Kalender-knap ved siden af live-knappen ──
+        self.calendar_button = ctk.CTkButton(
+            self, text="📅 Kalender",
+            font=("Arial", 11), height=28, width=90,
+            fg_color="#3c0a5a", hover_color="#8020c0",
+            bg_color="#11052a",
+            command=self._open_calendar
+        )
+        self.calendar_button.place(x=160, y=64)
+
         # ── Dato centreret ──
         self.date_label = tk.Label(
             self, text=self.current_date,
@@ -247,6 +421,24 @@ class LunarOrbitApp(ctk.CTk):
         )
         self.date_label.place(relx=0.5, rely=0.07, anchor="center")
 
+        # ── Dagsstrimmel under datoen ──
+        # Et fast antal celler genbruges: ved skift af dato skrives kun
+        # teksten om, der oprettes eller slettes ingen widgets. Den midterste
+        # celle er altid den valgte dato.
+        self.strip_frame = tk.Frame(self, bg="#11052a")
+        self.strip_frame.place(relx=0.5, rely=0.12, anchor="center")
+        self._strip_cells = []
+        for i in range(STRIMMEL_CELLER):
+            celle = tk.Label(
+                self.strip_frame, text="", font=("Arial", 10),
+                fg="white" if i == STRIMMEL_CELLER // 2 else "#a080c0",
+                bg="#11052a", width=4
+            )
+            celle.grid(row=0, column=i)
+            celle.bind("<Button-1>",
+                       lambda event, i=i: self._step(i - STRIMMEL_CELLER // 2))
+            self._strip_cells.append(celle)
+
         # ── Stor måne-emoji ──
         self.moon_display = tk.Label(
             self, text="🌙",
@@ -269,6 +461,7 @@ class LunarOrbitApp(ctk.CTk):
             command=self._on_slider_change
         )
         self.date_slider.set(50)
+        self.date_slider.bind("<ButtonRelease-1>", self._on_slider_release)
         self.date_slider.place(relx=0.5, rely=0.62, anchor="center", relwidth=0.76)
 
         self.plus_label = tk.Label(
@@ -383,103 +576,96 @@ class LunarOrbitApp(ctk.CTk):
         Opdaterer ur-labelen med aktuel tid hvert sekund.
 
         Bruger after() til at kalde sig selv igen efter 1000ms.
+        I live-tilstand opdateres månens og solens position samtidig.
         """
         self.clock_label.config(text=self.date_utils.get_current_time())
+        if self._live:
+            self._update_live()
         self.after(1000, self._update_clock)
 
-    def _fetch_and_display_moon(self):
+    def _update_live(self):
         """
-        Henter og viser månefasedata for den valgte dato.
+        Viser månens og solens aktuelle højde og azimut samt belysningen.
 
-        Månefasen beregnes lokalt (ingen API, øjeblikkeligt).
-        Vejrdata hentes i en baggrundstråd så UI ikke fryser.
+        Positionen kommer fra `LiveTracker`, som genbruger et cachet
+        polynomium for den dyre månemodel (se logik/tracker.py).
         """
-        date = self.current_date
-
-        # Månefase: lokal beregning, vises med det samme
-        moon_raw = self.api_client.fetch_moon_data(date)
-        if moon_raw:
-            moon  = self.moon_engine.format_moon_data(moon_raw)
-            phase = moon.get("phase", 0)
-
-            self.moon_display.config(
-                text=self.moon_visuals.get_large_moon_display(phase, size=1)
-            )
-            self.phase_label.configure(text=f"Fase: {moon.get('phase_name')}")
-            self.illumination_label.configure(
-                text=f"Belysning: {moon.get('illumination_percent')}"
-            )
-            days = int(round(self.moon_engine.calculate_days_to_full_moon(phase)))
-            self.days_label.configure(text=f"Dage til fuldmåne: {days}")
-
-        # Vejrdata: hentes i baggrundstråd
-        self.status_label.configure(text="Henter vejr...", text_color="orange")
-
-        if date in self._weather_cache:
-            self._update_weather_ui(self._weather_cache[date])
+        nu = self.tracker.sample()
+        self.live_label.config(text=(
+            f"🌙 {nu.moon_altitude:5.1f}°  az {nu.moon_azimuth:5.1f}°  "
+            f"{Formatters.format_illumination(nu.illumination)}\n"
+            f"☀ {nu.sun_altitude:5.1f}°  az {nu.sun_azimuth:5.1f}°"
+        ))
+
+    def _toggle_live(self):
+        """
+        Slår live-tilstand til og fra.
+        """
+        if self.tracker is None:
+            from logik.tracker import LiveTracker
+            self.tracker = LiveTracker(self.api_client)
+        self._live = not self._live
+        self.live_button.configure(fg_color="#6010a0" if self._live else "#3c0a5a")
+        if self._live:
+            self._update_live()
         else:
-            thread = threading.Thread(
-                target=self._fetch_weather_in_background,
-                args=(date,),
-                daemon=True
-            )
-            thread.start()
+            self.live_label.config(text="")
 
-    def _fetch_weather_in_background(self, date):
+    def _fetch_and_display_moon(self):
         """
-        Henter vejrdata fra API i en baggrundstråd.
+        Beder arbejdstråden om visningen for den valgte dato.
 
-        Bruger after(0, ...) til at opdatere UI i hoved-tråden
-        (krav i Tkinter – UI må kun opdateres fra hoved-tråden).
+        Al beregning (fase, tekster, dagsstrimmel, cache-opslag og evt.
+        vejrhentning) sker i `ViewStateWorker`; hovedtråden returnerer
+        med det samme og anvender resultatet i `_poll_view_states`.
+        """
+        self.requested_seq = self.view_worker.request(self.current_date)
 
-        Args:
-            date (str): Dato i YYYY-MM-DD format.
+    def _poll_view_states(self):
+        """
+        Anvender den nyeste færdige visningstilstand (én gang pr. frame).
         """
-        weather = self.api_client.fetch_weather_data(date)
-        self._weather_cache[date] = weather
-        self.after(0, lambda: self._update_weather_ui(weather))
+        state = self.view_worker.poll()
+        if state is not None:
+            self._apply_view_state(state)
+        self.after(FRAME_MS, self._poll_view_states)
 
-    def _update_weather_ui(self, weather):
+    def _apply_view_state(self, state):
         """
-        Opdaterer vejr-labelen og det astronomiske panel med hentet data.
+        Skriver en færdig `ViewState` i widgets. Kun ændrede tekster sættes.
 
         Args:
-            weather (dict eller None): Vejrdata fra API, eller None ved fejl.
+            state (ViewState): Fra arbejdstråden.
         """
-        if weather:
-            tekst = (
-                f"🌡 {weather.get('temperature_min')}° – "
-                f"{weather.get('temperature_max')}°C\n"
-                f"☁ Skydækket: {weather.get('cloud_cover')}%"
-            )
-            self.weather_label.configure(text=f"Vejr: {tekst}")
-            self.status_label.configure(text="Klar", text_color="lightgreen")
-
-            # Opdater astronomi-panelet
-            self.sunrise_label.configure(
-                text=f"🌅 Solopgang:   {weather.get('sunrise', '-')}")
-            self.sunset_label.configure(
-                text=f"🌇 Solnedgang:  {weather.get('sunset', '-')}")
-            self.moonrise_label.configure(
-                text=f"🌕 Måneopgang:  {weather.get('moonrise', '-')}")
-            self.moonset_label.configure(
-                text=f"🌑 Månenedgang: {weather.get('moonset', '-')}")
-
-            uv = weather.get('uv_index', '-')
-            self.uv_label.configure(text=f"☀️ UV-indeks:   {uv}")
-
-            precip = weather.get('precip_prob', '-')
-            self.precip_label.configure(
-                text=f"🌧 Nedbør:      {precip}%")
-        else:
-            self.weather_label.configure(text="Vejr: ikke tilgængeligt")
-            self.status_label.configure(text="Klar", text_color="lightgreen")
-            self.sunrise_label.configure(text="🌅 Solopgang:   -")
-            self.sunset_label.configure(text="🌇 Solnedgang:  -")
-            self.moonrise_label.configure(text="🌕 Måneopgang:  -")
-            self.moonset_label.configure(text="🌑 Månenedgang: -")
-            self.uv_label.configure(text="☀️ UV-indeks:   -")
-            self.precip_label.configure(text="🌧 Nedbør:      -%")
+        ændringer = list(state.labels)
+        ændringer.extend((("strip", i), tekst) for i, tekst in enumerate(state.strip))
+        ændringer.append(("status_label", state.status))
+        for nøgle, værdi in ændringer:
+            if self._anvendt.get(nøgle) == værdi:
+                continue
+            self._anvendt[nøgle] = værdi
+            if nøgle == "status_label":
+                self.status_label.configure(text=værdi[0], text_color=værdi[1])
+            elif isinstance(nøgle, tuple):
+                self._strip_cells[nøgle[1]].config(text=værdi)
+            else:
+                getattr(self, nøgle).configure(text=værdi)
+
+        self.applied_seq = state.seq
+        self._mark_startup("moon")
+        if state.weather_ready:
+            self._mark_startup("weather")
+
+    def _fetch_hourly_in_background(self):
+        """
+        Henter timevejr for slider-vinduet med lav prioritet.
+
+        Arbejdstråden bygger bagefter visningen om, så skydække ved
+        måneopgang vises for den aktuelle dato uden et nyt kald.
+        """
+        tabel = self.api_client.fetch_hourly(self.slider_start, self.slider_end,
+                                             priority=PREFETCH)
+        self.view_worker.set_hourly(tabel)
 
     def _on_slider_change(self, value):
         """
@@ -490,19 +676,179 @@ class LunarOrbitApp(ctk.CTk):
         Args:
             value (float): Sliderens position (0.0 til 100.0).
         """
-        self.current_date = self.date_utils.slider_value_to_date(
-            value,
-            self.slider_start,
-            self.slider_end
-        )
-        self.date_label.config(text=self.current_date)
+        date = self.timeline.value_to_date(value)
+        if date == self.current_date:
+            return
+        self.current_date = date
         self._fetch_and_display_moon()
 
+    def _on_slider_release(self, event=None):
+        """
+        Flytter tidslinjens centrum, hvis slideren slippes ved en kant.
+
+        Slideren sættes tilbage til midten, så brugeren kan fortsætte
+        i samme retning (uendelig tidslinje).
+        """
+        if self.timeline.needs_recenter(self.date_slider.get()):
+            self.timeline.recenter(self.current_date)
+            self._after_recenter()
+            self.date_slider.set(50)
+
+    def _after_recenter(self):
+        """
+        Opdaterer slider-vinduet og henter timevejr for det nye vindue.
+        """
+        self.slider_start, self.slider_end = self.timeline.start, self.timeline.end
+        threading.Thread(target=self._fetch_hourly_in_background, daemon=True).start()
+
+    def _goto(self, date):
+        """
+        Går til en dato og flytter tidslinjen, hvis datoen ligger ved kanten.
+
+        Args:
+            date (str): Dato i YYYY-MM-DD format.
+        """
+        center = self.timeline.center
+        value = self.timeline.goto(date)
+        if self.timeline.center != center:
+            self._after_recenter()
+        self.date_slider.set(value)
+        self.current_date = date
+        self._fetch_and_display_moon()
+
+    def _step(self, days):
+        """
+        Flytter den valgte dato et antal dage.
+
+        Args:
+            days (int): Antal dage (negativ = tilbage).
+        """
+        date = self.date_utils.date_string_to_date_obj(self.current_date)
+        self._goto(self.date_utils.format_date(date + timedelta(days=days)))
+
+    def _open_calendar(self):
+        """
+        Åbner kalendervinduet (eller bringer det frem, hvis det er åbent).
+        """
+        if getattr(self, "calendar_window", None) is not None and self.calendar_window.winfo_exists():
+            self.calendar_window.focus()
+            return
+        if self.calendar_renderer is None:
+            # Kalenderen (og PIL's tegnemoduler) indlæses først her
+            from logik.calendar_view import CalendarRenderer
+            self.calendar_renderer = CalendarRenderer(self.api_client)
+        self.calendar_window = CalendarWindow(self)
+
     def _reset_to_today(self):
         """
-        Nulstiller datoen til i dag og sætter slideren til midten (50 = i dag).
+        Nulstiller datoen til i dag og centrerer tidslinjen (slider 50 = i dag).
         """
+        self.timeline.recenter(self.today)
+        self._after_recenter()
         self.current_date = self.today
-        self.date_label.config(text=self.current_date)
         self.date_slider.set(50)
-        self._fetch_and_display_moon()
\ No newline at end of file
+        self._fetch_and_display_moon()
+
+
+# ──────────────────────────────────────────────
+# KALENDER
+# ──────────────────────────────────────────────
+
+class CalendarWindow(ctk.CTkToplevel):
+    """
+    Måneds- og årskalender med månefaser.
+
+    Hver måned er ét cachet billede fra `CalendarRenderer` i stedet for
+    hundredvis af widgets. Billedet vises i én tk.Label, og klik omsættes
+    til en dato, som vælges i hovedvinduet.
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app (LunarOrbitApp): Hovedvinduet (giver klient og `_goto`).
+        """
+        super().__init__(app)
+        self.app = app
+        self.title("LunarOrbit – Kalender")
+        self.configure(fg_color="#1a082a")
+
+        dato = app.date_utils.date_string_to_date_obj(app.current_date)
+        self.year, self.month = dato.year, dato.month
+        self.mode = "month"
+        self.renderer = app.calendar_renderer
+
+        # ── Navigation ──
+        top = ctk.CTkFrame(self, fg_color="transparent")
+        top.pack(fill="x", padx=10, pady=8)
+        ctk.CTkButton(top, text="◀", width=36, fg_color="#3c0a5a",
+                      hover_color="#8020c0", command=lambda: self._move(-1)).pack(side="left")
+        self.title_label = ctk.CTkLabel(top, text="", font=("Arial", 14, "bold"),
+                                        text_color="#c060e0", width=160)
+        self.title_label.pack(side="left", padx=8)
+        ctk.CTkButton(top, text="▶", width=36, fg_color="#3c0a5a",
+                      hover_color="#8020c0", command=lambda: self._move(1)).pack(side="left")
+        self.mode_button = ctk.CTkSegmentedButton(
+            top, values=["Måned", "År"], command=self._set_mode,
+            selected_color="#6010a0", selected_hover_color="#8020c0"
+        )
+        self.mode_button.set("Måned")
+        self.mode_button.pack(side="right")
+
+        # ── Billedet ──
+        self.image_label = tk.Label(self, bg="#1a082a", bd=0)
+        self.image_label.pack(padx=10, pady=(0, 10))
+        self.image_label.bind("<Button-1>", self._on_click)
+        self._photo = None
+
+        self._render()
+
+    def _render(self):
+        """Viser den aktuelle måned eller det aktuelle år."""
+        from PIL import ImageTk
+        from logik import calendar_view
+        if self.mode == "month":
+            billede = self.renderer.month_tile(self.year, self.month)
+            self.title_label.configure(
+                text=f"{calendar_view.MÅNEDER[self.month - 1]} {self.year}")
+        else:
+            billede = self.renderer.year_image(self.year)
+            self.title_label.configure(text=str(self.year))
+            # Nabo-årene tegnes i baggrunden, så næste skift er øjeblikkeligt
+            for år in (self.year - 1, self.year + 1):
+                self.renderer.prefetch_year_async(år)
+        self._photo = ImageTk.PhotoImage(billede)
+        self.image_label.config(image=self._photo)
+
+    def _move(self, retning):
+        """
+        Går én måned eller ét år frem/tilbage.
+
+        Args:
+            retning (int): -1 eller 1.
+        """
+        if self.mode == "month":
+            self.month += retning
+            if self.month < 1:
+                self.year, self.month = self.year - 1, 12
+            elif self.month > 12:
+                self.year, self.month = self.year + 1, 1
+        else:
+            self.year += retning
+        self._render()
+
+    def _set_mode(self, værdi):
+        """Skifter mellem måneds- og årsvisning."""
+        self.mode = "month" if værdi == "Måned" else "year"
+        self._render()
+
+    def _on_click(self, event):
+        """Vælger den dag, der klikkes på, i hovedvinduet."""
+        from logik import calendar_view
+        if self.mode == "month":
+            dato = calendar_view.hit_test_month(self.year, self.month, event.x, event.y)
+        else:
+            dato = calendar_view.hit_test_year(self.year, event.x, event.y)
+        if dato:
+            self.app._goto(dato)
+
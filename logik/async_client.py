@@ -0,0 +1,236 @@
+"""
+Asynkron vejrklient for mange steder og datoer.
+
+`MoonAPIClient` henter én dag for ét sted pr. kald. `AsyncWeatherClient`
+henter et helt sæt (steder × datoer) på én gang:
+
+  - Datoerne deles op efter endpoint (forecast/arkiv) og i vinduer.
+  - Op til `koordinater_pr_kald` steder slås sammen i ét Open-Meteo-kald
+    (kommaseparerede `latitude`/`longitude`).
+  - Kaldene køres samtidigt med et loft (`max_samtidige`) over en
+    `requests.Session` med forbindelsespulje pr. vært.
+
+Resultatet har samme form som `MoonAPIClient.fetch_weather_data`.
+Astronomitiderne beregnes lokalt og returneres, selv hvis et kald fejler.
+
+Eksempel:
+    klient = AsyncWeatherClient()
+    svar = asyncio.run(klient.fetch_many([(55.68, 12.57, "København")],
+                                         ["2024-06-21"]))
+"""
+
+import asyncio
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from logik.moon_api import MoonAPIClient, anvend_dagligt
+from logik.rate_limiter import PREFETCH, get_json, get_limiter
+from logik.records import WeatherRecord
+
+
+# Et sted: (breddegrad, længdegrad, stednavn)
+Sted = Tuple[float, float, str]
+
+# Længste datovindue i ét kald (holder svarene små)
+MAX_VINDUE_DAGE = 92
+
+
+class AsyncWeatherClient:
+    """
+    asyncio-klient der henter vejr for mange steder og datoer samtidigt.
+    """
+
+    WEATHER_API_URL = MoonAPIClient.WEATHER_API_URL
+    ARCHIVE_API_URL = MoonAPIClient.ARCHIVE_API_URL
+
+    def __init__(self, max_samtidige: int = 8, koordinater_pr_kald: int = 50,
+                 timeout: float = 8.0, lunar_tier: str = "fast",
+                 prioritet: int = PREFETCH):
+        """
+        Args:
+            max_samtidige (int):       Maks. samtidige HTTP-kald (og puljestørrelse pr. vært).
+            koordinater_pr_kald (int): Maks. steder i ét multi-koordinat-kald.
+            timeout (float):           Timeout pr. kald i sekunder.
+            lunar_tier (str):          Præcisionstrin for månetider.
+            prioritet (int):           Prioritet i den fælles ratebegrænsning.
+        """
+        self.max_samtidige       = max_samtidige
+        self.koordinater_pr_kald = koordinater_pr_kald
+        self.timeout             = timeout
+        self.lunar_tier          = lunar_tier
+        self.prioritet           = prioritet
+        self.limiter             = get_limiter()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_samtidige)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._pulje = ThreadPoolExecutor(max_workers=max_samtidige,
+                                         thread_name_prefix="vejr")
+
+        # Én synkron klient pr. sted til astronomitider og endpointvalg
+        self._klienter: Dict[Tuple[float, float], MoonAPIClient] = {}
+        self.stats = {"http_calls": 0, "failed_calls": 0}
+
+    def close(self) -> None:
+        """Lukker forbindelsespuljen og trådpuljen."""
+        self.session.close()
+        self._pulje.shutdown(wait=False)
+
+    def _klient(self, sted: Sted) -> MoonAPIClient:
+        """Returnerer (og opretter ved behov) den synkrone klient for et sted."""
+        lat, lon, navn = sted
+        klient = self._klienter.get((lat, lon))
+        if klient is None:
+            klient = MoonAPIClient(lat, lon, navn, lunar_tier=self.lunar_tier)
+            klient.WEATHER_API_URL = self.WEATHER_API_URL
+            klient.ARCHIVE_API_URL = self.ARCHIVE_API_URL
+            self._klienter[(lat, lon)] = klient
+        return klient
+
+    def _hent(self, url: str, params: Dict) -> List[Dict]:
+        """
+        Synkront HTTP-kald gennem ratebegrænsningen (køres i trådpuljen).
+
+        Returns:
+            list: Ét svar pr. koordinat (Open-Meteo returnerer en liste
+                  ved flere koordinater og et enkelt objekt ved ét).
+        """
+        svar = get_json(url, params, self.prioritet, self.timeout,
+                        session=self.session, limiter=self.limiter)
+        return svar if isinstance(svar, list) else [svar]
+
+    async def fetch_many_records(self, steder: Sequence[Sted],
+                                 datoer: Sequence[str]) -> List[List[Optional[WeatherRecord]]]:
+        """
+        Henter vejr og astronomitider for alle kombinationer af steder og datoer.
+
+        Args:
+            steder (list): Steder som (breddegrad, længdegrad, stednavn).
+            datoer (list): Datoer i YYYY-MM-DD format.
+
+        Returns:
+            list: `resultat[i][j]` er posten for `steder[i]` på `datoer[j]`
+                  (None ved ugyldig dato).
+        """
+        i_dag = dt.datetime.now()
+        klienter = [self._klient(s) for s in steder]
+
+        tolkede: List[Optional[dt.datetime]] = []
+        for dato in datoer:
+            try:
+                tolkede.append(dt.datetime.strptime(dato, "%Y-%m-%d"))
+            except ValueError as e:
+                print(f"Uventet fejl: {e}")
+                tolkede.append(None)
+
+        # Grundposter med astronomitider
+        resultat = [[klient._astro_record(d) if d else None for d in tolkede]
+                    for klient in klienter]
+        if not klienter:
+            return resultat
+
+        # Gruppér gyldige datoer efter endpoint (samme valg for alle steder)
+        grupper: Dict[Tuple[str, str], List[Tuple[int, dt.date]]] = {}
+        for j, d in enumerate(tolkede):
+            endpoint = klienter[0]._vejr_endpoint(d, i_dag) if d else None
+            if endpoint is not None:
+                grupper.setdefault(endpoint, []).append((j, d.date()))
+
+        # Byg kald: (url, variable, datoer i vinduet, steder i batchen)
+        kald = []
+        for (url, daglig), indeks in grupper.items():
+            indeks.sort(key=lambda x: x[1])
+            vindue: List[Tuple[int, dt.date]] = []
+            for post in indeks:
+                if vindue and (post[1] - vindue[0][1]).days >= MAX_VINDUE_DAGE:
+                    kald.extend(self._batches(url, daglig, vindue, len(steder)))
+                    vindue = []
+                vindue.append(post)
+            if vindue:
+                kald.extend(self._batches(url, daglig, vindue, len(steder)))
+
+        semafor = asyncio.Semaphore(self.max_samtidige)
+        loop = asyncio.get_running_loop()
+
+        async def udfør(url, daglig, vindue, batch):
+            params = {
+                "latitude":   ",".join(str(steder[i][0]) for i in batch),
+                "longitude":  ",".join(str(steder[i][1]) for i in batch),
+                "start_date": vindue[0][1].isoformat(),
+                "end_date":   vindue[-1][1].isoformat(),
+                "daily":      daglig,
+                "timezone":   "auto",
+            }
+            async with semafor:
+                self.stats["http_calls"] += 1
+                try:
+                    svar = await loop.run_in_executor(self._pulje, self._hent, url, params)
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    self.stats["failed_calls"] += 1
+                    print(f"Advarsel: Kunne ikke hente vejrdata: {e}")
+                    return
+
+            for i, sted_svar in zip(batch, svar):
+                daglig_svar = sted_svar.get("daily", {})
+                tid = {t: k for k, t in enumerate(daglig_svar.get("time", []))}
+                for j, dato in vindue:
+                    k = tid.get(dato.isoformat())
+                    if k is not None:
+                        anvend_dagligt(resultat[i][j], daglig_svar, k,
+                                       kilde=klienter[i]._kilde(url))
+
+        await asyncio.gather(*(udfør(*k) for k in kald))
+
+        # Datoer uden prognose eller med fejlede kald: klimanormaler, hvis de findes
+        for klient, række in zip(klienter, resultat):
+            for post, d in zip(række, tolkede):
+                if post is not None and not post.has_weather:
+                    klient.apply_climatology(post, d.date())
+        return resultat
+
+    def _batches(self, url: str, daglig: str, vindue: List[Tuple[int, dt.date]],
+                 antal_steder: int) -> List[Tuple]:
+        """Deler stederne op i multi-koordinat-batches for ét datovindue."""
+        n = self.koordinater_pr_kald
+        return [(url, daglig, vindue, range(start, min(start + n, antal_steder)))
+                for start in range(0, antal_steder, n)]
+
+    async def fetch_many(self, steder: Sequence[Sted],
+                         datoer: Sequence[str]) -> List[List[Optional[Dict]]]:
+        """
+        Som `fetch_many_records`, men formateret som `fetch_weather_data`.
+
+        Args:
+            steder (list): Steder som (breddegrad, længdegrad, stednavn).
+            datoer (list): Datoer i YYYY-MM-DD format.
+
+        Returns:
+            list: `resultat[i][j]` er ordbogen for `steder[i]` på `datoer[j]`.
+        """
+        poster = await self.fetch_many_records(steder, datoer)
+        return [[p.to_dict() if p else None for p in række] for række in poster]
+
+
+def fetch_weather_many(steder: Sequence[Sted], datoer: Sequence[str],
+                       **kwargs) -> List[List[Optional[Dict]]]:
+    """
+    Synkron indgang til `AsyncWeatherClient.fetch_many`.
+
+    Args:
+        steder (list): Steder som (breddegrad, længdegrad, stednavn).
+        datoer (list): Datoer i YYYY-MM-DD format.
+        **kwargs:      Videregives til `AsyncWeatherClient`.
+
+    Returns:
+        list: `resultat[i][j]` for `steder[i]` på `datoer[j]`.
+    """
+    klient = AsyncWeatherClient(**kwargs)
+    try:
+        return asyncio.run(klient.fetch_many(steder, datoer))
+    finally:
+        klient.close()
@@ -0,0 +1,391 @@
+"""
+Genoptagelig hentning af arkivvejr til et lokalt søjlelager.
+
+`fetch_weather_data` henter én dag ad gangen og gemmer intet. Til
+analyser over flere år henter `backfill()` arkivet i store bidder
+(standard: ét år pr. kald) og skriver dem til et søjlelager pr. sted:
+
+    ~/.lunarorbit/archive/<lat>_<lon>/
+        manifest.json              sted, variable, startdato, antal rækker
+        temperature_2m_max.f32     rå float32 (little-endian), én værdi pr. dag
+        ...
+
+Række i svarer til dagen `start + i`. Manglende værdier er NaN.
+
+Manifestet opdateres atomisk efter hver bid og er kilden til sandhed.
+Afbrydes jobbet, afkortes søjlefilerne ved næste åbning til manifestets
+antal rækker, og hentningen fortsætter fra den første manglende dag.
+
+Kør fra kommandolinjen:
+    python -m logik.backfill --start 2015-01-01 --end 2024-12-31
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Iterator, Optional, Sequence
+
+import requests
+
+from logik.boilerplate import MoonConstants
+from logik.climatology import ClimatologyStore
+from logik.moon_api import MoonAPIClient
+from logik.rate_limiter import BACKFILL, RateLimiter, get_json, get_limiter
+from logik.records import MANGLER, til_tal
+from logik.tiles import sted_nøgle
+
+
+STANDARD_MAPPE = os.path.join(MoonConstants.DATA_DIR, "archive")
+
+# Daglige arkivvariable der gemmes som søjler
+ARKIV_KOLONNER = (
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "temperature_2m_mean",
+    "cloud_cover_mean",
+    "precipitation_sum",
+    "wind_speed_10m_max",
+)
+
+# Arkivet opdateres med nogle dages forsinkelse
+ARKIV_FORSINKELSE_DAGE = 5
+
+_FORMAT = 1
+
+
+class ArchiveStore:
+    """
+    Søjlelager med én float32-fil pr. variabel og ét manifest pr. sted.
+    """
+
+    def __init__(self, mappe: str, manifest: Dict):
+        """
+        Brug `open()` eller `create()` i stedet for at kalde direkte.
+
+        Args:
+            mappe (str):     Stedets mappe.
+            manifest (dict): Indlæst manifest.
+        """
+        self.mappe    = mappe
+        self.manifest = manifest
+
+    # ── Åbning ──
+
+    @classmethod
+    def create(cls, mappe: str, lat: float, lon: float, navn: str,
+               start: dt.date, kolonner: Sequence[str] = ARKIV_KOLONNER) -> "ArchiveStore":
+        """
+        Opretter et tomt lager.
+
+        Args:
+            mappe (str):     Stedets mappe.
+            lat, lon (float): Koordinater.
+            navn (str):      Stednavn.
+            start (date):    Dato for række 0.
+            kolonner (list): Variable der gemmes.
+
+        Returns:
+            ArchiveStore: Det nye lager.
+        """
+        os.makedirs(mappe, exist_ok=True)
+        lager = cls(mappe, {"format": _FORMAT, "latitude": lat, "longitude": lon,
+                            "location": navn, "start": start.isoformat(),
+                            "columns": list(kolonner), "rows": 0})
+        for kolonne in kolonner:
+            open(lager._søjle_sti(kolonne), "wb").close()
+        lager._gem_manifest()
+        return lager
+
+    @classmethod
+    def open(cls, mappe: str) -> "ArchiveStore":
+        """
+        Åbner et eksisterende lager og fjerner halvt skrevne rækker.
+
+        Args:
+            mappe (str): Stedets mappe.
+
+        Returns:
+            ArchiveStore: Lageret.
+
+        Raises:
+            FileNotFoundError: Hvis mappen ikke indeholder et manifest.
+            ValueError:        Ved ukendt format eller manglende søjler.
+        """
+        with open(os.path.join(mappe, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != _FORMAT:
+            raise ValueError(f"Ukendt lagerformat i {mappe}")
+
+        lager = cls(mappe, manifest)
+        længde = manifest["rows"] * 4
+        for kolonne in manifest["columns"]:
+            sti = lager._søjle_sti(kolonne)
+            if os.path.getsize(sti) < længde:
+                raise ValueError(f"Søjlen {kolonne} er kortere end manifestet")
+            # Rækker skrevet efter sidste manifest-opdatering kasseres
+            with open(sti, "r+b") as f:
+                f.truncate(længde)
+        return lager
+
+    # ── Egenskaber ──
+
+    @property
+    def rows(self) -> int:
+        """Antal fuldførte rækker (dage)."""
+        return self.manifest["rows"]
+
+    @property
+    def start(self) -> dt.date:
+        """Dato for række 0."""
+        return dt.date.fromisoformat(self.manifest["start"])
+
+    @property
+    def next_date(self) -> dt.date:
+        """Første dag der mangler i lageret."""
+        return self.start + dt.timedelta(days=self.rows)
+
+    def dates(self) -> Iterator[dt.date]:
+        """Gennemløber lagerets datoer i rækkefølge."""
+        start = self.start
+        for i in range(self.rows):
+            yield start + dt.timedelta(days=i)
+
+    # ── Skrivning ──
+
+    def append(self, daglig: Dict) -> int:
+        """
+        Tilføjer et Open-Meteo `daily`-svar som nye rækker.
+
+        Svarets første dag skal være `next_date`, og dagene skal være
+        fortløbende. Søjlerne skrives først; manifestet opdateres til sidst.
+
+        Args:
+            daglig (dict): Svarets `daily`-ordbog.
+
+        Returns:
+            int: Antal tilføjede rækker.
+
+        Raises:
+            ValueError: Hvis svaret ikke starter ved `next_date`.
+        """
+        tider = daglig.get("time", [])
+        if not tider:
+            return 0
+        if tider[0] != self.next_date.isoformat():
+            raise ValueError(f"Svaret starter {tider[0]}, forventede {self.next_date}")
+        forventet_slut = self.next_date + dt.timedelta(days=len(tider) - 1)
+        if tider[-1] != forventet_slut.isoformat():
+            raise ValueError("Svarets datoer er ikke fortløbende")
+
+        for kolonne in self.manifest["columns"]:
+            værdier = daglig.get(kolonne) or [None] * len(tider)
+            søjle = array("f", (til_tal(v) for v in værdier))
+            if sys.byteorder == "big":
+                søjle.byteswap()
+            with open(self._søjle_sti(kolonne), "ab") as f:
+                søjle.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.manifest["rows"] += len(tider)
+        self._gem_manifest()
+        return len(tider)
+
+    def _gem_manifest(self) -> None:
+        """Skriver manifestet atomisk (midlertidig fil + os.replace)."""
+        sti = os.path.join(self.mappe, "manifest.json")
+        midlertidig = sti + ".tmp"
+        with open(midlertidig, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(midlertidig, sti)
+
+    def _søjle_sti(self, kolonne: str) -> str:
+        return os.path.join(self.mappe, f"{kolonne}.f32")
+
+    # ── Læsning ──
+
+    def column(self, kolonne: str, start: Optional[dt.date] = None,
+               slut: Optional[dt.date] = None) -> array:
+        """
+        Læser en søjle, eventuelt afgrænset til et datointerval.
+
+        Args:
+            kolonne (str):         Variabelnavn.
+            start (date, optional): Første dag (standard: lagerets start).
+            slut (date, optional):  Sidste dag inkl. (standard: sidste række).
+
+        Returns:
+            array('f'): Værdierne, NaN for manglende.
+        """
+        fra = 0 if start is None else max(0, (start - self.start).days)
+        til = self.rows if slut is None else min(self.rows, (slut - self.start).days + 1)
+        søjle = array("f")
+        if til <= fra:
+            return søjle
+        with open(self._søjle_sti(kolonne), "rb") as f:
+            f.seek(fra * 4)
+            søjle.frombytes(f.read((til - fra) * 4))
+        if sys.byteorder == "big":
+            søjle.byteswap()
+        return søjle
+
+    def value(self, kolonne: str, dato: dt.date) -> float:
+        """Én værdi, eller `MANGLER` hvis datoen ikke er i lageret."""
+        søjle = self.column(kolonne, dato, dato)
+        return søjle[0] if søjle else MANGLER
+
+
+class RateBudget:
+    """
+    Simpelt budget: højst `kald_pr_minut` kald, jævnt fordelt.
+    """
+
+    def __init__(self, kald_pr_minut: float = 30.0):
+        self.interval = 60.0 / kald_pr_minut if kald_pr_minut > 0 else 0.0
+        self._næste   = 0.0
+
+    def wait(self) -> None:
+        """Venter til næste kald må sendes."""
+        nu = time.monotonic()
+        if nu < self._næste:
+            time.sleep(self._næste - nu)
+            nu = self._næste
+        self._næste = nu + self.interval
+
+
+def _hent_bid(session: requests.Session, url: str, params: Dict,
+              limiter: RateLimiter, forsøg: int = 4) -> Dict:
+    """
+    Henter én bid med genforsøg og eksponentiel backoff ved netværksfejl.
+
+    Kaldet går gennem den fælles ratebegrænsning med lavest prioritet.
+    429 og `Retry-After` håndteres kun dér (`get_json`), så de to lag
+    ikke ganger forsøgene og backoff sammen.
+
+    Returns:
+        dict: Svarets `daily`-ordbog.
+
+    Raises:
+        requests.exceptions.RequestException: Ved HTTP-fejl, eller når alle
+            forsøg ved netværksfejl er brugt.
+    """
+    for i in range(forsøg):
+        try:
+            svar = get_json(url, params, BACKFILL, timeout=30, forsøg=forsøg,
+                            session=session, limiter=limiter)
+            return svar.get("daily", {})
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if i == forsøg - 1:
+                raise
+            print(f"Advarsel: Bid fejlede ({e}), prøver igen")
+            time.sleep(2 ** i)
+
+
+def backfill(lat: float, lon: float, navn: str, start: dt.date, slut: dt.date,
+             bid_dage: int = 365, kald_pr_minut: float = 30.0,
+             mappe: str = STANDARD_MAPPE,
+             url: str = MoonAPIClient.ARCHIVE_API_URL,
+             session: Optional[requests.Session] = None,
+             limiter: Optional[RateLimiter] = None) -> ArchiveStore:
+    """
+    Henter arkivvejr for et sted og datointerval til søjlelageret.
+
+    Findes lageret allerede, fortsættes fra første manglende dag.
+    Slutdatoen afkortes til den seneste dag arkivet har data for.
+
+    Args:
+        lat, lon (float):     Koordinater.
+        navn (str):           Stednavn.
+        start, slut (date):   Interval (begge inkl.).
+        bid_dage (int):       Dage pr. kald.
+        kald_pr_minut (float): Ratebudget for dette job (oven i den fælles
+                              ratebegrænsning).
+        mappe (str):          Rodmappe for lagrene.
+        url (str):            Arkiv-endpoint.
+        session (requests.Session, optional): Genbrugt HTTP-session.
+        limiter (RateLimiter, optional): Standard: processens fælles.
+
+    Returns:
+        ArchiveStore: Lageret efter hentningen.
+
+    Raises:
+        ValueError: Hvis `start` ligger før et eksisterende lagers start,
+            eller hvis arkivet svarer uden dage for en bid (ellers ville
+            samme bid blive hentet igen og igen).
+        requests.exceptions.RequestException: Hvis en bid ikke kan hentes.
+            De allerede gemte bidder bevares.
+    """
+    sted_mappe = os.path.join(mappe, sted_nøgle(lat, lon))
+    if os.path.exists(os.path.join(sted_mappe, "manifest.json")):
+        lager = ArchiveStore.open(sted_mappe)
+        if lager.rows == 0:
+            lager.manifest["start"] = start.isoformat()
+        elif start < lager.start:
+            raise ValueError(f"Lageret starter {lager.start}; kan ikke udvide bagud til {start}")
+    else:
+        lager = ArchiveStore.create(sted_mappe, lat, lon, navn, start)
+
+    slut = min(slut, dt.date.today() - dt.timedelta(days=ARKIV_FORSINKELSE_DAGE))
+    budget = RateBudget(kald_pr_minut)
+    session = session or requests.Session()
+    limiter = limiter or get_limiter()
+
+    while lager.next_date <= slut:
+        fra = lager.next_date
+        til = min(slut, fra + dt.timedelta(days=bid_dage - 1))
+        budget.wait()
+        daglig = _hent_bid(session, url, {
+            "latitude":   lat,
+            "longitude":  lon,
+            "start_date": fra.isoformat(),
+            "end_date":   til.isoformat(),
+            "daily":      ",".join(lager.manifest["columns"]),
+            "timezone":   "auto",
+        }, limiter)
+        if lager.append(daglig) == 0:
+            raise ValueError(f"Arkivet returnerede ingen dage for {fra} – {til}")
+        print(f"{navn}: {fra} – {til} gemt ({lager.rows} dage i alt)")
+
+    return lager
+
+
+def main(argv=None):
+    """
+    Kører en arkivhentning fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Hent arkivvejr til lokalt søjlelager")
+    parser.add_argument("--lat", type=float, default=MoonConstants.LATITUDE)
+    parser.add_argument("--lon", type=float, default=MoonConstants.LONGITUDE)
+    parser.add_argument("--name", default="København")
+    parser.add_argument("--start", required=True, type=dt.date.fromisoformat)
+    parser.add_argument("--end", type=dt.date.fromisoformat, default=dt.date.today())
+    parser.add_argument("--chunk", type=int, default=365, help="Dage pr. kald")
+    parser.add_argument("--rate", type=float, default=30.0, help="Kald pr. minut")
+    parser.add_argument("--dir", default=STANDARD_MAPPE, help="Rodmappe for lagrene")
+    args = parser.parse_args(argv)
+
+    try:
+        lager = backfill(args.lat, args.lon, args.name, args.start, args.end,
+                         args.chunk, args.rate, args.dir)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Hentning afbrudt: {e}. Kør igen for at fortsætte.")
+        return
+    print(f"Færdig: {lager.rows} dage fra {lager.start} i {lager.mappe}")
+
+    # Klimanormalerne (reserve for datoer uden prognose) bygges om fra det nye arkiv
+    if lager.rows:
+        normaler = ClimatologyStore.build(lager)
+        print(f"Klimanormaler ({normaler.label}) gemt i {normaler.save()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1442 @@
+"""
+Benchmarks for LunarOrbit.
+
+Hvert benchmark er en funktion der kører en afgrænset arbejdsmængde og
+printer en kort rapport. Kør et benchmark fra projektroden:
+
+    python -m logik.benchmark records
+    python -m logik.benchmark records --antal 100000
+
+Kør uden argumenter for at se listen over tilgængelige benchmarks.
+"""
+
+import argparse
+import gc
+import inspect
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(navn: str):
+    """
+    Registrerer en funktion som benchmark under et navn.
+
+    Args:
+        navn (str): Navnet benchmarket køres med fra kommandolinjen.
+
+    Returns:
+        Decorator der registrerer funktionen uændret.
+    """
+    def registrer(funktion):
+        BENCHMARKS[navn] = funktion
+        return funktion
+    return registrer
+
+
+def _mål_hukommelse(byg: Callable):
+    """
+    Måler hukommelse og tid for at bygge en datastruktur.
+
+    Args:
+        byg (callable): Funktion uden argumenter der returnerer strukturen.
+
+    Returns:
+        tuple: (struktur, bytes brugt, sekunder)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    struktur = byg()
+    sekunder = time.perf_counter() - start
+    brugt, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return struktur, brugt, sekunder
+
+
+def _rapport(titel: str, rækker):
+    """
+    Printer en simpel tabel med benchmarkresultater.
+
+    Args:
+        titel (str): Overskrift.
+        rækker (list): Liste af (navn, værdi-streng) par.
+    """
+    print(f"\n{titel}")
+    print("─" * len(titel))
+    bredde = max(len(navn) for navn, _ in rækker)
+    for navn, værdi in rækker:
+        print(f"  {navn:<{bredde}}  {værdi}")
+
+
+# ──────────────────────────────────────────────
+# RESULTATPOSTER
+# ──────────────────────────────────────────────
+
+@benchmark("records")
+def bench_records(antal: int = 1_000_000):
+    """
+    Sammenligner hukommelsesforbrug for `antal` vejrresultater.
+
+    Tre repræsentationer bygges med samme indhold:
+      - ordbøger med "HH:MM" strenge og "-" (det gamle format)
+      - `WeatherRecord` med __slots__
+      - søjlebaseret `WeatherTable`
+
+    Args:
+        antal (int): Antal poster der bygges.
+    """
+    from logik.boilerplate import Formatters
+    from logik.records import MANGLER, WeatherRecord, WeatherTable
+
+    fmt = Formatters.format_minutes
+
+    def byg_dicts():
+        return [{
+            "temperature_max": 10.0 + (i % 20) * 0.5,
+            "temperature_min": "-",
+            "cloud_cover":     i % 101,
+            "precip_prob":     "-",
+            "location":        "København",
+            "sunrise":         fmt(300 + i % 200),
+            "sunset":          fmt(1100 + i % 200),
+            "moonrise":        fmt(i % 1440),
+            "moonset":         fmt((i * 7) % 1440),
+        } for i in range(antal)]
+
+    def byg_records():
+        return [WeatherRecord(
+            location="København",
+            sunrise=300 + i % 200, sunset=1100 + i % 200,
+            moonrise=i % 1440, moonset=(i * 7) % 1440,
+            temperature_max=10.0 + (i % 20) * 0.5, temperature_min=MANGLER,
+            cloud_cover=float(i % 101), precip_prob=MANGLER,
+        ) for i in range(antal)]
+
+    def byg_tabel():
+        tabel = WeatherTable("København")
+        k = tabel.columns
+        for i in range(antal):
+            k["sunrise"].append(300 + i % 200)
+            k["sunset"].append(1100 + i % 200)
+            k["moonrise"].append(i % 1440)
+            k["moonset"].append((i * 7) % 1440)
+            k["temperature_max"].append(10.0 + (i % 20) * 0.5)
+            k["temperature_min"].append(MANGLER)
+            k["cloud_cover"].append(float(i % 101))
+            k["precip_prob"].append(MANGLER)
+        return tabel
+
+    rækker = []
+    for navn, byg in (("dict + strenge", byg_dicts),
+                      ("WeatherRecord (__slots__)", byg_records),
+                      ("WeatherTable (array)", byg_tabel)):
+        struktur, brugt, sekunder = _mål_hukommelse(byg)
+        del struktur
+        rækker.append((navn, f"{brugt / 1e6:8.1f} MB  "
+                             f"{brugt / antal:6.1f} B/post  "
+                             f"{sekunder:6.2f} s"))
+
+    _rapport(f"Hukommelse for {antal:,} vejrposter", rækker)
+
+
+# ──────────────────────────────────────────────
+# OBSERVATIONSKONTEKST
+# ──────────────────────────────────────────────
+
+@benchmark("observer")
+def bench_observer(antal: int = 200_000):
+    """
+    Måler pris pr. kald for sol- og måneberegning med og uden genbrugt kontekst.
+
+    Engangsfunktionerne `_sol_minutter` / `_måne_minutter` bygger en ny
+    `ObserverContext` pr. kald; `MoonAPIClient` genbruger én.
+
+    Args:
+        antal (int): Antal datoer der beregnes.
+    """
+    import datetime as dt
+    from logik.moon_api import ObserverContext, _måne_minutter, _sol_minutter
+
+    lat, lon = 55.6761, 12.5683
+    start = dt.date(2000, 1, 1)
+    datoer = [start + dt.timedelta(days=i % 36500) for i in range(antal)]
+    datoer = [(d.year, d.month, d.day) for d in datoer]
+    ctx = ObserverContext(lat, lon)
+
+    def tid(funktion):
+        t0 = time.perf_counter()
+        for år, måned, dag in datoer:
+            funktion(år, måned, dag)
+        return (time.perf_counter() - t0) / antal * 1e6
+
+    rækker = [
+        ("sol, engangskald",     f"{tid(lambda å, m, d: _sol_minutter(å, m, d, lat, lon)):6.2f} µs/kald"),
+        ("sol, genbrugt kontekst", f"{tid(ctx.sun_events):6.2f} µs/kald"),
+        ("måne, engangskald",    f"{tid(lambda å, m, d: _måne_minutter(å, m, d, lat, lon)):6.2f} µs/kald"),
+        ("måne, genbrugt kontekst", f"{tid(ctx.moon_events):6.2f} µs/kald"),
+    ]
+    _rapport(f"Pris pr. kald over {antal:,} datoer", rækker)
+
+
+@benchmark("twilight")
+def bench_twilight(antal: int = 100_000):
+    """
+    Pris pr. solbegivenhed for alle fire horisontdefinitioner.
+
+    Sammenligner fire separate `sun_events`-lignende kald pr. dag (den
+    gentagne deklinations- og tidsligningsberegning) med én fælles
+    evaluering pr. dag og med batchvarianten over hele intervallet.
+
+    Args:
+        antal (int): Antal dage.
+    """
+    import datetime as dt
+    from logik.moon_api import ObserverContext
+
+    ctx = ObserverContext(55.6761, 12.5683)
+    start = dt.date(2000, 1, 1)
+    datoer = [start + dt.timedelta(days=i) for i in range(antal)]
+    datoer = [(d.year, d.month, d.day) for d in datoer]
+    begivenheder = antal * 9          # middag + 4 × (opgang, nedgang)
+
+    t0 = time.perf_counter()
+    for år, måned, dag in datoer:
+        for _ in ctx.SOL_DEFINITIONER:
+            ctx.sun_events(år, måned, dag)
+    separat = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for år, måned, dag in datoer:
+        ctx.solar_events(år, måned, dag)
+    fælles = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ctx.solar_events_range(start, antal)
+    batch = time.perf_counter() - t0
+
+    _rapport(f"Sol og tusmørke for {antal:,} dage ({begivenheder:,} begivenheder)", [
+        ("4 separate kald pr. dag", f"{separat / begivenheder * 1e6:6.3f} µs/begivenhed  ({separat:5.2f} s)"),
+        ("solar_events",            f"{fælles / begivenheder * 1e6:6.3f} µs/begivenhed  ({fælles:5.2f} s)"),
+        ("solar_events_range",      f"{batch / begivenheder * 1e6:6.3f} µs/begivenhed  ({batch:5.2f} s)"),
+    ])
+
+
+@benchmark("pipeline")
+def bench_pipeline(antal: int = 36_525):
+    """
+    Hukommelse og gennemløb for lange datointervaller.
+
+    Sammenligner listeformen (`get_date_range` + én post pr. dato, alle
+    holdt i en liste) med `stream_days`, der beregner i bidder og
+    udleverer dagene én ad gangen. Begge bygger de samme ordbøger.
+
+    Args:
+        antal (int): Antal dage (standard: 100 år).
+    """
+    import datetime as dt
+    from logik.boilerplate import DateUtils
+    from logik.moon_api import MoonAPIClient
+    from logik.pipeline import stream_days
+
+    klient = MoonAPIClient()
+    start = dt.date(1950, 1, 1)
+
+    def som_liste():
+        resultat = []
+        for dato in DateUtils.get_date_range(dt.datetime(1950, 1, 1), antal):
+            astro = klient._astro_record(dt.datetime.fromisoformat(dato))
+            resultat.append({"moon": klient.fetch_moon_record(dato).to_dict(),
+                             "weather": astro.to_dict(), "date": dato})
+        return resultat
+
+    def som_strøm():
+        sidste = None
+        for dag in stream_days(klient, start, start + dt.timedelta(days=antal - 1)):
+            sidste = dag.to_dict()
+        return sidste
+
+    målinger = []
+    for byg in (som_liste, som_strøm):
+        gc.collect()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        resultat = byg()
+        sekunder = time.perf_counter() - t0
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        målinger.append((top, sekunder))
+        del resultat
+
+    (top_liste, t_liste), (top_strøm, t_strøm) = målinger
+    _rapport(f"{antal:,} dage ({antal / 365.25:.0f} år)", [
+        ("liste: top-hukommelse", f"{top_liste / 1e6:8.2f} MB"),
+        ("strøm: top-hukommelse", f"{top_strøm / 1e6:8.2f} MB"),
+        ("liste: dage/s",         f"{antal / t_liste:8.0f}   ({t_liste:5.2f} s)"),
+        ("strøm: dage/s",         f"{antal / t_strøm:8.0f}   ({t_strøm:5.2f} s)"),
+    ])
+
+
+@benchmark("tracker")
+def bench_tracker(antal: int = 86_400):
+    """
+    Pris pr. tik for live-positionen af måne og sol.
+
+    Sammenligner fuld evaluering af serierne ved hvert tik med
+    `LiveTracker`, der for "meeus" evaluerer et cachet Chebyshev-vindue
+    og for "fast" serien direkte. Tikkene ligger ét sekund fra hinanden
+    (standard: et døgn).
+
+    Args:
+        antal (int): Antal tik.
+    """
+    from logik.moon_api import MoonAPIClient
+    from logik.tracker import LiveTracker, unix_til_jd
+
+    for tier in ("fast", "meeus"):
+        klient = MoonAPIClient(lunar_tier=tier)
+        ctx, model = klient.observer, klient.lunar_model
+        tracker = LiveTracker(klient)
+        start = 1718928000.0            # 2024-06-21 00:00 UTC
+        tider = [start + i for i in range(antal)]
+
+        t0 = time.perf_counter()
+        for tidspunkt in tider:
+            JD = unix_til_jd(tidspunkt)
+            ra, dekl, _ = model.position(JD)
+            ctx.horizontal(ra, dekl, JD)
+            ctx.horizontal(*LiveTracker._sol(JD), JD)
+        fuld = time.perf_counter() - t0
+
+        for tidspunkt in tider:
+            tracker.sample(tidspunkt)
+
+        _rapport(f"Live-position, {antal:,} tik ({tier})", [
+            ("fuld evaluering",  f"{fuld / antal * 1e6:7.2f} µs/tik"),
+            ("LiveTracker",      f"{tracker.mean_tick_ms() * 1000:7.2f} µs/tik"),
+            ("langsomste tik",   f"{tracker.stats['max_s'] * 1000:7.3f} ms"),
+            ("nye vinduer",      f"{tracker.stats['refits']:7d}"),
+        ])
+
+
+@benchmark("lunations")
+def bench_lunations(antal: int = 1000):
+    """
+    Formørkelser og supermåner over et antal år.
+
+    Sammenligner scanneren (filter på middelværdier, derefter forfining
+    af kandidaterne) med at forfine alle lunationer.
+
+    Args:
+        antal (int): Antal år fra år 1500.
+    """
+    from logik import lunations as L
+
+    start, slut = 1500, 1500 + antal - 1
+    k_fra, k_til = L.lunation_range(start, slut)
+    lunationer = 2 * (k_til - k_fra + 1)
+
+    t0 = time.perf_counter()
+    formørkelser = L.find_eclipses(start, slut)
+    supermåner = L.find_supermoons(start, slut, phases=("new", "full"))
+    scanner = time.perf_counter() - t0
+
+    # Uden filter: hver syzygi forfines og får beregnet afstanden
+    t0 = time.perf_counter()
+    for k in range(k_fra, k_til + 1):
+        for kk in (k, k + 0.5):
+            L._formørkelse(kk)
+            L._meeus_ekliptisk(L._sand_syzygi(kk)[0])
+    alle = time.perf_counter() - t0
+
+    kandidater = 0
+    for fuldmåne in (False, True):
+        middel = L.mean_phases(k_fra, k_til, fuldmåne)
+        kandidater += sum(1 for v in middel["sin_f"] if abs(v) < L.KNUDE_GRÆNSE)
+        kandidater += sum(1 for v in middel["cos_m"] if v > L.PERIGÆUM_GRÆNSE)
+
+    sol = sum(1 for f in formørkelser if f.kind == "solar")
+    _rapport(f"Formørkelser og supermåner {start}-{slut}", [
+        ("syzygier",           f"{lunationer:8,}"),
+        ("kandidater",         f"{kandidater:8,}"),
+        ("solformørkelser",    f"{sol:8,}"),
+        ("måneformørkelser",   f"{len(formørkelser) - sol:8,}"),
+        ("supermåner",         f"{len(supermåner):8,}"),
+        ("scanner",            f"{scanner:8.2f} s"),
+        ("forfin alle",        f"{alle:8.2f} s"),
+    ])
+
+
+@benchmark("timeline")
+def bench_timeline(antal: int = 365):
+    """
+    Svartid og hukommelse for den uendelige tidslinje.
+
+    Scroller `antal` dage dag for dag fra 1. januar i hhv. 1950, 2026 og
+    2150 og henter hver gang de 15 synlige dage (som UI'ets dagsstrimmel).
+
+    Args:
+        antal (int): Antal skridt pr. startår.
+    """
+    import datetime as dt
+    from logik.moon_api import MoonAPIClient
+    from logik.timeline import Timeline
+
+    tidslinje = Timeline(MoonAPIClient(), "2026-01-01")
+    rækker = []
+    tracemalloc.start()
+    for år in (1950, 2026, 2150):
+        dato = dt.date(år, 1, 1)
+        tidslinje.recenter(dato.isoformat())
+        tider = []
+        for _ in range(antal):
+            t0 = time.perf_counter()
+            tidslinje.goto(dato.isoformat())
+            tidslinje.days((dato - dt.timedelta(days=7)).isoformat(), 15)
+            tider.append(time.perf_counter() - t0)
+            dato += dt.timedelta(days=1)
+        tider.sort()
+        brugt, _ = tracemalloc.get_traced_memory()
+        rapport = tidslinje.report()
+        rækker.append((str(år), f"middel {sum(tider) / len(tider) * 1000:5.2f} ms   "
+                                f"p99 {tider[int(len(tider) * 0.99)] * 1000:5.2f} ms   "
+                                f"{rapport['blocks']} blokke   {brugt / 1024:6.0f} KB i alt"))
+    tracemalloc.stop()
+
+    rapport = tidslinje.report()
+    rækker.append(("cache", f"{rapport['hits']} hits, {rapport['misses']} beregnede blokke, "
+                            f"{rapport['recenters']} flytninger, {rapport['evicted']} smidt ud"))
+    _rapport(f"Tidslinje: {antal} skridt pr. startår", rækker)
+
+
+@benchmark("calendar")
+def bench_calendar(antal: int = 20):
+    """
+    Årskalender: batch + cachede tiles mod beregning pr. celle.
+
+    Den naive variant kalder `fetch_moon_data` og `get_phase_info` for
+    hver af årets dage (uden at tegne noget). `CalendarRenderer` beregner
+    hver måned i én batch og tegner den som én tile; et år der allerede
+    er vist, sættes blot sammen af cachede tiles.
+
+    Args:
+        antal (int): Antal år.
+    """
+    import datetime as dt
+    from logik.boilerplate import MoonVisuals
+    from logik.calendar_view import CalendarRenderer
+    from logik.moon_api import MoonAPIClient
+
+    klient = MoonAPIClient()
+    år_liste = list(range(2020, 2020 + antal))
+
+    t0 = time.perf_counter()
+    for år in år_liste:
+        dag = dt.date(år, 1, 1)
+        while dag.year == år:
+            data = klient.fetch_moon_data(dag.isoformat())
+            MoonVisuals.get_phase_info(data["phase"])
+            dag += dt.timedelta(days=1)
+    naiv = time.perf_counter() - t0
+
+    tegner = CalendarRenderer(klient)
+    t0 = time.perf_counter()
+    for år in år_liste:
+        tegner.year_image(år)
+    kold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for år in år_liste[-6:]:
+        tegner.year_image(år)
+    varm = time.perf_counter() - t0
+
+    _rapport(f"Årskalender, {antal} år", [
+        ("naiv: kun beregning pr. celle", f"{naiv / antal * 1000:7.1f} ms/år"),
+        ("tiles: beregn og tegn",         f"{kold / antal * 1000:7.1f} ms/år"),
+        ("tiles: skift til vist år",      f"{varm / 6 * 1000:7.1f} ms/år"),
+    ])
+
+
+@benchmark("kernels")
+def bench_kernels(antal: int = 20):
+    """
+    Batch-arbejdsmængderne med kernerne mod de skalare kald dag for dag.
+
+    Måler `solar_events_range`, det hurtige trins måneopgang/-nedgang,
+    `pipeline.compute_chunk` og `tiles.compute_tile` for hele år. "Dag for
+    dag" er de skalare `ObserverContext`-kald, som batchvejene brugte før
+    kernerne. Måler den aktive backend (numba hvis installeret, ellers ren
+    Python); kør med LUNARORBIT_KERNELS=python for at måle fallback.
+
+    Args:
+        antal (int): Antal år (fra 2000), fordelt på tre steder.
+    """
+    import datetime as dt
+    from array import array
+    from logik import kernels
+    from logik.lunar_models import LunarModel
+    from logik.moon_api import MoonAPIClient
+    from logik.pipeline import compute_chunk, phase_columns
+    from logik.tiles import compute_tile
+
+    steder = [(55.6761, 12.5683), (69.6492, 18.9553), (-33.9249, 18.4241)]
+    år = [(steder[i % len(steder)], 2000 + i) for i in range(antal)]
+    klienter = {sted: MoonAPIClient(*sted, tiles=False) for sted in steder}
+
+    def dage_i(å):
+        return (dt.date(å + 1, 1, 1) - dt.date(å, 1, 1)).days
+
+    def sol_dag_for_dag(klient, start, dage):
+        ctx = klient.observer
+        ordinal = start.toordinal()
+        op, ned = array("h"), array("h")
+        for o in range(ordinal, ordinal + dage):
+            dato = dt.date.fromordinal(o)
+            begivenheder = ctx.solar_events(dato.year, dato.month, dato.day)
+            op.append(begivenheder.sunrise)
+            ned.append(begivenheder.sunset)
+        return op, ned
+
+    def chunk_dag_for_dag(klient, start, dage):
+        # Søjlerne fra compute_chunk, bygget med de skalare kald
+        return (*phase_columns(klient, start, dage), *sol_dag_for_dag(klient, start, dage),
+                *LunarModel.rise_set_range(klient.lunar_model, klient.observer, start, dage))
+
+    def tile_dag_for_dag(klient, start, dage):
+        return [array("f", søjle) for søjle in chunk_dag_for_dag(klient, start, dage)]
+
+    arbejde = [
+        ("solar_events_range",
+         sol_dag_for_dag,
+         lambda k, s, n: k.observer.solar_events_range(s, n)),
+        ("måneopgang (fast)",
+         lambda k, s, n: LunarModel.rise_set_range(k.lunar_model, k.observer, s, n),
+         lambda k, s, n: k.lunar_model.rise_set_range(k.observer, s, n)),
+        ("compute_chunk",
+         chunk_dag_for_dag,
+         lambda k, s, n: compute_chunk(k, s, n)),
+        ("compute_tile",
+         tile_dag_for_dag,
+         lambda k, s, n: compute_tile(k.latitude, k.longitude, s.year)),
+    ]
+
+    # Første kald oversætter kernerne (numba); det tælles ikke med
+    t0 = time.perf_counter()
+    compute_chunk(klienter[steder[0]], dt.date(1999, 1, 1), 2)
+    opvarmning = time.perf_counter() - t0
+
+    dage_i_alt = sum(dage_i(å) for _, å in år)
+    rækker = [("backend", f"{kernels.BACKEND}  (opvarmning {opvarmning:.2f} s)")]
+    for navn, skalar, kerne in arbejde:
+        tider = []
+        for variant in (skalar, kerne):
+            t0 = time.perf_counter()
+            for sted, å in år:
+                variant(klienter[sted], dt.date(å, 1, 1), dage_i(å))
+            tider.append(time.perf_counter() - t0)
+        t_skalar, t_kerne = tider
+        rækker.append((navn, f"dag for dag {t_skalar / dage_i_alt * 1e6:6.2f} µs/dag   "
+                             f"kerner {t_kerne / dage_i_alt * 1e6:6.2f} µs/dag   "
+                             f"{t_skalar / t_kerne:5.1f}x"))
+    _rapport(f"Batch-arbejdsmængder, {antal} år × 1 sted ({dage_i_alt:,} dage)", rækker)
+
+
+@benchmark("startup")
+def bench_startup(antal: int = 5):
+    """
+    Opstartens etaper uden skærm: imports, baggrund og snapshot.
+
+    Importtider måles i en frisk fortolker pr. gentagelse (medianen vises).
+    De udskudte moduler er dem, UI'et først importerer ved brug. PIL
+    vises for sig selv; customtkinter importerer det også selv.
+    Den gemte baggrund indlæses som i appen med tk.PhotoImage, hvis der
+    er en skærm, ellers med PIL.
+
+    Args:
+        antal (int): Gentagelser pr. måling.
+    """
+    import json
+    import os
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+    import tkinter as tk
+    from PIL import Image
+    from logik import startup
+    from logik.UI import generate_space_background
+
+    def importtid(moduler):
+        kode = ("import time; t = time.perf_counter(); "
+                + "; ".join(f"import {m}" for m in moduler)
+                + "; print(time.perf_counter() - t)")
+        tider = [float(subprocess.run([sys.executable, "-c", kode], capture_output=True,
+                                      text=True, check=True).stdout) for _ in range(antal)]
+        return statistics.median(tider) * 1000
+
+    udskudt = ["requests", "logik.calendar_view", "logik.tracker"]
+    rækker = [
+        ("import PIL.ImageTk", f"{importtid(['PIL.ImageTk']):7.1f} ms"),
+        ("import customtkinter", f"{importtid(['customtkinter']):7.1f} ms   (inkl. PIL)"),
+        ("import logik.UI", f"{importtid(['logik.UI']):7.1f} ms"),
+        ("+ udskudte moduler", f"{importtid(['logik.UI'] + udskudt):7.1f} ms"
+                               f"   ({', '.join(udskudt)})"),
+    ]
+
+    with tempfile.TemporaryDirectory() as mappe:
+        sti = os.path.join(mappe, "background_900x700.png")
+        t0 = time.perf_counter()
+        for _ in range(antal):
+            skaleret = generate_space_background(1920, 1080).resize((900, 700), Image.LANCZOS)
+        t_generer = (time.perf_counter() - t0) / antal
+        t0 = time.perf_counter()
+        skaleret.save(sti, compress_level=1)
+        t_gem = time.perf_counter() - t0
+        try:
+            rod = tk.Tk()
+            rod.withdraw()
+            indlæs, måde = (lambda: tk.PhotoImage(file=sti)), "tk.PhotoImage"
+        except tk.TclError:
+            rod = None
+            indlæs, måde = (lambda: Image.open(sti).load()), "PIL, ingen skærm"
+        t0 = time.perf_counter()
+        for _ in range(antal):
+            indlæs()
+        t_indlæs = (time.perf_counter() - t0) / antal
+        if rod is not None:
+            rod.destroy()
+        rækker += [
+            ("baggrund genereret", f"{t_generer * 1000:7.1f} ms   (1920x1080 + LANCZOS til 900x700)"),
+            ("baggrund fra PNG", f"{t_indlæs * 1000:7.1f} ms   ({måde}; gemt ved lukning: "
+                                 f"{t_gem * 1000:.1f} ms)"),
+        ]
+
+        snap = os.path.join(mappe, "session.json")
+        data = {"date": "2026-01-01", "labels": {f"label_{i}": "x" * 40 for i in range(11)}}
+        t0 = time.perf_counter()
+        startup.save_snapshot(data, snap)
+        t_gem = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        startup.load_snapshot(snap)
+        t_indlæs = time.perf_counter() - t0
+        rækker.append(("snapshot", f"{t_indlæs * 1000:7.2f} ms indlæs   {t_gem * 1000:.2f} ms gem"
+                                   f"   ({len(json.dumps(data))} bytes)"))
+    _rapport("Opstart (uden skærm)", rækker)
+
+
+@benchmark("tiles")
+def bench_tiles(antal: int = 50, år: int = 10):
+    """
+    Forudberegnede årstiles: bygning på alle kerner og opslag mod beregning.
+
+    Args:
+        antal (int): Antal steder.
+        år (int):    År pr. sted.
+    """
+    import datetime as dt
+    import os
+    import tempfile
+    from logik.moon_api import MoonAPIClient
+    from logik.pipeline import compute_chunk
+    from logik.tiles import TileStore, build_tiles
+
+    steder = [(round(54.6 + (i % 10) * 0.3, 4), round(8.1 + (i // 10) * 0.9, 4), f"Sted {i}")
+              for i in range(antal)]
+    første = dt.date.today().year
+    kerner = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as mappe:
+        enkelt = build_tiles(steder[:max(1, antal // 10)], første, første + år - 1,
+                             mappe=os.path.join(mappe, "enkelt"), arbejdere=1)
+        alle = build_tiles(steder, første, første + år - 1, mappe=mappe)
+        pr_tile_1 = enkelt["seconds"] / enkelt["built"]
+        pr_tile_n = alle["seconds"] / alle["built"]
+
+        # Stedskift: et helt års søjler for hvert sted, beregnet mod fra tiles
+        start = dt.date(første, 1, 1)
+        dage = (dt.date(første + 1, 1, 1) - start).days
+        t0 = time.perf_counter()
+        for lat, lon, navn in steder:
+            compute_chunk(MoonAPIClient(lat, lon, navn, tiles=False), start, dage)
+        t_beregnet = (time.perf_counter() - t0) / antal
+        t0 = time.perf_counter()
+        for lat, lon, navn in steder:
+            klient = MoonAPIClient(lat, lon, navn, tiles=False)
+            klient.tiles = TileStore(lat, lon, mappe=mappe)
+            compute_chunk(klient, start, dage)
+        t_tiles = (time.perf_counter() - t0) / antal
+
+        # Enkeltopslag: én dags astronomitider
+        datoer = [dt.datetime(første, 1, 1) + dt.timedelta(days=i) for i in range(dage)]
+        beregnet, tile = MoonAPIClient(*steder[0], tiles=False), MoonAPIClient(*steder[0], tiles=False)
+        tile.tiles = TileStore(*steder[0][:2], mappe=mappe)
+        t0 = time.perf_counter()
+        for dato in datoer:
+            beregnet._astro_record(dato)
+        t_dag_beregnet = (time.perf_counter() - t0) / dage
+        t0 = time.perf_counter()
+        for dato in datoer:
+            tile._astro_record(dato)
+        t_dag_tile = (time.perf_counter() - t0) / dage
+
+    _rapport(f"Årstiles, {antal} steder × {år} år", [
+        ("bygning, 1 proces", f"{pr_tile_1 * 1000:7.1f} ms/tile"),
+        (f"bygning, {alle['workers']} processer", f"{pr_tile_n * 1000:7.1f} ms/tile   "
+                                                   f"{alle['seconds']:.1f} s i alt, {kerner} kerner"),
+        ("tile-størrelse", f"{alle['bytes'] / alle['built'] / 1024:7.1f} KB"),
+        ("stedskift, år beregnet", f"{t_beregnet * 1000:7.1f} ms"),
+        ("stedskift, år fra tiles", f"{t_tiles * 1000:7.1f} ms   {t_beregnet / t_tiles:.0f}x"),
+        ("én dag beregnet", f"{t_dag_beregnet * 1e6:7.1f} µs"),
+        ("én dag fra tile", f"{t_dag_tile * 1e6:7.1f} µs"),
+    ])
+
+
+@benchmark("viewstate")
+def bench_viewstate(antal: int = 600, hz: float = 120.0):
+    """
+    Slider-sweep: hovedtrådens tid pr. tik før og efter arbejdstråden.
+
+    "Før" er opbygningen af hele visningen i hovedtråden (samme arbejde
+    som `ViewStateWorker.build`). "Efter" er `request()` + `poll()`.
+    Vejret hentes ikke (offline klient uden klimanormaler).
+
+    Args:
+        antal (int): Antal slider-tik (én dag pr. tik).
+        hz (float):  Tik pr. sekund (musebevægelser).
+    """
+    import datetime as dt
+    import statistics
+    from logik.moon_api import MoonAPIClient
+    from logik.timeline import LRUCache, Timeline
+    from logik.viewstate import ViewStateWorker
+
+    klient = MoonAPIClient(offline=True, tiles=False)
+    klient._normaler_indlæst = True
+    datoer = [(dt.date(2026, 1, 1) + dt.timedelta(days=i)).isoformat() for i in range(antal)]
+
+    # Før: alt i hovedtråden
+    synkron = ViewStateWorker(klient, Timeline(klient, datoer[0]), LRUCache(512), fetch_weather=False)
+    før = []
+    for dato in datoer:
+        t0 = time.perf_counter()
+        synkron.build(dato)
+        før.append(time.perf_counter() - t0)
+
+    # Efter: hovedtråden beder kun om tilstande og henter færdige én gang pr. tik
+    arbejder = ViewStateWorker(klient, Timeline(klient, datoer[0]), LRUCache(512),
+                               fetch_weather=False).start()
+    efter, anvendt = [], 0
+    for dato in datoer:
+        t0 = time.perf_counter()
+        arbejder.request(dato)
+        if arbejder.poll() is not None:
+            anvendt += 1
+        efter.append(time.perf_counter() - t0)
+        time.sleep(1 / hz)
+    time.sleep(0.05)
+    anvendt += arbejder.poll() is not None
+    arbejder.stop()
+    r = arbejder.report()
+
+    def fmt(tider):
+        tider = sorted(tider)
+        return (f"median {statistics.median(tider) * 1e6:7.1f} µs   "
+                f"p99 {tider[int(len(tider) * 0.99)] * 1e6:7.1f} µs   maks {tider[-1] * 1e6:7.1f} µs")
+
+    _rapport(f"Slider-sweep, {antal} tik ved {hz:.0f} Hz", [
+        ("hovedtråd, før", fmt(før)),
+        ("hovedtråd, efter", fmt(efter)),
+        ("arbejdstråd", f"{r['built']} tilstande bygget, {r['skipped']} oversprunget, "
+                        f"middel {r['mean_ms']:.2f} ms"),
+        ("anvendt i UI", f"{anvendt} tilstande"),
+    ])
+
+
+@benchmark("phase-events")
+def bench_phase_events(antal: int = 100_000):
+    """
+    Nedtællinger til fuldmåne, nymåne og kvarter: pr. opslag og træfrate.
+
+    Datoerne er et slider-forløb: dag for dag med et spring på ±1-20 år
+    hver 500. dag. Sammenlignes med den nøjagtige beregning uden cache
+    (Meeus for de nærmeste lunationer) og med middelmodellen
+    `calculate_days_to_full_moon` (hurtig, men op til ca. en dag forkert).
+
+    Args:
+        antal (int): Antal opslag.
+    """
+    import datetime as dt
+    import math
+    import random
+    from logik import lunations as L
+    from logik.boilerplate import MoonEngine
+    from logik.moon_api import MoonAPIClient
+
+    rng = random.Random(7)
+    dato, datoer = dt.date(2026, 1, 1), []
+    for i in range(antal):
+        if i % 500 == 499:
+            dato += dt.timedelta(days=rng.choice((-1, 1)) * rng.randint(365, 20 * 365))
+        datoer.append(dato)
+        dato += dt.timedelta(days=1)
+
+    def uden_cache(d, brøk):
+        jd = d.toordinal() + 1721424.5
+        k = math.floor((jd - 2451550.09766) / 29.530588861) - 1
+        return min(j for j in (L._sand_fase(k + i + brøk) for i in range(3)) if j > jd) - jd
+
+    klient = MoonAPIClient(tiles=False)
+    engine = MoonEngine()
+    faser = [klient.fetch_moon_record(d.isoformat()).phase for d in datoer]
+    t0 = time.perf_counter()
+    middel = [engine.calculate_days_to_full_moon(fase) for fase in faser]
+    tid_middel = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    eksakt = [uden_cache(d, 0.5) for d in datoer]
+    tid_eksakt = time.perf_counter() - t0
+
+    cache = L.PhaseEventCache()
+    t0 = time.perf_counter()
+    cachet = [cache.days_until("full", d) for d in datoer]
+    tid_cache = time.perf_counter() - t0
+    for fase in ("new", "first_quarter", "last_quarter"):
+        for d in datoer[:1000]:
+            cache.days_until(fase, d)
+
+    assert max(abs(a - b) for a, b in zip(eksakt, cachet)) < 1e-9
+    fejl = sorted(abs(a - b) for a, b in zip(middel, eksakt))
+    r = cache.report()
+    _rapport(f"Dage til fuldmåne, {antal:,} opslag", [
+        ("middelmodel",     f"{tid_middel / antal * 1e6:7.2f} µs/opslag   "
+                            f"afvigelse median {fejl[len(fejl) // 2]:.2f} d, maks {fejl[-1]:.2f} d"),
+        ("Meeus uden cache", f"{tid_eksakt / antal * 1e6:7.2f} µs/opslag"),
+        ("PhaseEventCache", f"{tid_cache / antal * 1e6:7.2f} µs/opslag   (samme resultat)"),
+        ("træfrate",        f"{r['hit_rate'] * 100:7.2f} %   ({r['extensions']} udvidelser)"),
+        ("dækning",         f"{r['years']:7.1f} år, {r['events']:,} faser "
+                            f"({r['events'] * 9 / 1024:.0f} KB)"),
+    ])
+
+
+@benchmark("dataset")
+def bench_dataset(år: int = 100, opslag: int = 10_000):
+    """
+    Pakket binært datasæt mod CSV: skrivning, størrelse, læsning og opslag.
+
+    Dagene beregnes én gang med `stream_chunks` og får syntetisk vejr, så
+    CSV-filen har tal i alle felter. CSV er skrevet som `DayRecord.to_dict()`
+    ("HH:MM" og "-") og læses tilbage til søjler.
+
+    Args:
+        år (int):     Antal år fra 1950.
+        opslag (int): Antal tilfældige datoopslag.
+    """
+    import csv
+    import datetime as dt
+    import math
+    import os
+    import random
+    import tempfile
+    from array import array
+    from logik.boilerplate import Formatters
+    from logik.dataset import DatasetWriter, PackedDataset
+    from logik.moon_api import MoonAPIClient
+    from logik.pipeline import stream_chunks
+    from logik.records import WeatherRecord
+
+    start = dt.date(1950, 1, 1)
+    slut = dt.date(1950 + år, 1, 1) - dt.timedelta(days=1)
+    klient = MoonAPIClient(tiles=False)
+    bidder = list(stream_chunks(klient, start, slut))
+    for bid in bidder:
+        o = bid.start.toordinal()
+        for i, felt in enumerate(WeatherRecord.VEJR_FELTER):
+            bid.table.columns[felt] = array("f", (round(10 + 8 * math.sin((o + d) / 58.1 + i), 1)
+                                                  for d in range(len(bid))))
+    rækker = sum(len(bid) for bid in bidder)
+    mappe = tempfile.mkdtemp()
+    csv_sti, bin_sti = os.path.join(mappe, "data.csv"), os.path.join(mappe, "data.lods")
+
+    def til_minutter(tekst):
+        return -1 if tekst == "-" else int(tekst[:2]) * 60 + int(tekst[3:])
+
+    def til_tal(tekst):
+        return math.nan if tekst == "-" else float(tekst)
+
+    # ── Skrivning ──
+    t0 = time.perf_counter()
+    with open(csv_sti, "w", newline="", encoding="utf-8") as f:
+        skriver = csv.writer(f)
+        skriver.writerow(["date", "phase", "illumination", *WeatherRecord.TID_FELTER,
+                          *WeatherRecord.VEJR_FELTER])
+        for bid in bidder:
+            for dag in bid:
+                v = dag.weather.to_dict()
+                skriver.writerow([dag.date.isoformat(), f"{dag.moon.phase:.6f}",
+                                  f"{dag.moon.illumination:.4f}",
+                                  *(v[felt] for felt in WeatherRecord.TID_FELTER),
+                                  *(v[felt] for felt in WeatherRecord.VEJR_FELTER)])
+    csv_skriv = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with DatasetWriter(bin_sti, rækker, klient.latitude, klient.longitude,
+                       klient.location_name, "archive") as skriver:
+        for bid in bidder:
+            skriver.write_chunk(bid)
+    bin_skriv = time.perf_counter() - t0
+
+    # ── Læsning til søjler ──
+    t0 = time.perf_counter()
+    søjler = {navn: array("f") for navn in ("phase", "illumination", *WeatherRecord.VEJR_FELTER)}
+    søjler.update({navn: array("h") for navn in WeatherRecord.TID_FELTER})
+    datoer = array("i")
+    with open(csv_sti, newline="", encoding="utf-8") as f:
+        læser = csv.reader(f)
+        hoved = next(læser)
+        for række in læser:
+            datoer.append(dt.date.fromisoformat(række[0]).toordinal())
+            for navn, tekst in zip(hoved[1:], række[1:]):
+                søjle = søjler[navn]
+                søjle.append(til_minutter(tekst) if søjle.typecode == "h" else til_tal(tekst))
+    csv_læs = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ds = PackedDataset(bin_sti)
+    bin_søjler = {navn: ds.column(navn) for navn in søjler}
+    bin_åbn = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    kontrol = sum(bin_søjler["illumination"])
+    bin_scan = time.perf_counter() - t0
+    assert abs(kontrol - sum(søjler["illumination"])) < 1e-3 * rækker
+    assert bin_søjler["moonrise"].tolist() == søjler["moonrise"].tolist()
+
+    # ── Opslag: én dato og ét års udsnit ──
+    rng = random.Random(3)
+    valgte = [start + dt.timedelta(days=rng.randrange(rækker)) for _ in range(opslag)]
+    t0 = time.perf_counter()
+    for dato in valgte:
+        i = ds.index(dato)
+        ds.column("moonrise", i, i + 1)[0]
+    bin_opslag = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for dato in valgte[:1000]:
+        udsnit = ds.slice(dato, dato + dt.timedelta(days=364))
+    bin_udsnit = time.perf_counter() - t0
+
+    del bin_søjler, udsnit
+    ds.close()
+    csv_str, bin_str = os.path.getsize(csv_sti), os.path.getsize(bin_sti)
+    for sti in (csv_sti, bin_sti):
+        os.remove(sti)
+    os.rmdir(mappe)
+
+    _rapport(f"Datasæt, {år} år ({rækker:,} dage)", [
+        ("størrelse",        f"CSV {csv_str / 1024:8.0f} KB ({csv_str / rækker:.0f} B/dag)   "
+                             f"pakket {bin_str / 1024:6.0f} KB ({bin_str / rækker:.0f} B/dag)"),
+        ("skriv",            f"CSV {csv_skriv * 1000:8.1f} ms   pakket {bin_skriv * 1000:8.1f} ms"),
+        ("læs til søjler",   f"CSV {csv_læs * 1000:8.1f} ms   pakket {bin_åbn * 1000:8.3f} ms (mmap)"),
+        ("summér én søjle",  f"pakket {bin_scan * 1000:6.2f} ms"),
+        ("datoopslag",       f"pakket {bin_opslag / opslag * 1e6:6.2f} µs/opslag"),
+        ("års udsnit",       f"pakket {bin_udsnit / 1000 * 1e6:6.2f} µs (alle søjler, uden kopi)"),
+    ])
+
+
+# ──────────────────────────────────────────────
+# CHEBYSHEV-EFEMERIDE
+# ──────────────────────────────────────────────
+
+@benchmark("ephemeris")
+def bench_ephemeris(antal: int = 50_000):
+    """
+    Sammenligner Chebyshev-opslag med de direkte serier og tjekker fejlgrænsen.
+
+    Bygger en årsefemeride (måne fra Meeus-serien, solen med til
+    sammenligning), gemmer/indlæser den via en midlertidig fil og måler
+    pris pr. positionsopslag. Til sidst måles den rigtige bruger:
+    "meeus"-trinnets opgang/nedgang for et år med og uden efemeriden.
+
+    Args:
+        antal (int): Antal tilfældige tidspunkter der evalueres.
+    """
+    import datetime as dt
+    import os
+    import random
+    import tempfile
+    from logik.ephemeris import (SOL_LEGEME, STANDARD_LEGEMER, ChebyshevEphemeris,
+                                 _direkte_måne, _direkte_sol, year_ephemeris, år_til_jd)
+    from logik.lunar_models import MeeusLunarModel
+    from logik.moon_api import ObserverContext
+
+    jd0, jd1 = år_til_jd(2024), år_til_jd(2025)
+    t0 = time.perf_counter()
+    efemeride = ChebyshevEphemeris.build(jd0, jd1, legemer={**STANDARD_LEGEMER, **SOL_LEGEME})
+    bygget = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as mappe:
+        sti = os.path.join(mappe, "ephemeris.bin")
+        efemeride.save(sti)
+        størrelse = os.path.getsize(sti)
+        efemeride = ChebyshevEphemeris.load(sti)
+        genmålt = max(max(f) for f in efemeride.verify().values())
+
+    random.seed(1)
+    tider = [jd0 + random.random() * (jd1 - jd0 - 1) for _ in range(antal)]
+
+    def tid(funktion):
+        t = time.perf_counter()
+        for JD in tider:
+            funktion(JD)
+        return (time.perf_counter() - t) / antal * 1e6
+
+    ctx = ObserverContext(55.6761, 12.5683)
+    datoer = [dt.date(2024, 1, 1) + dt.timedelta(days=i) for i in range(366)]
+    med, uden = MeeusLunarModel(), MeeusLunarModel()
+    uden.brug_efemeride = False
+    year_ephemeris(2024)                   # Indlæst/bygget uden for målingen
+
+    def rise_set(model):
+        t = time.perf_counter()
+        tider = [model.rise_set(ctx, d.year, d.month, d.day) for d in datoer]
+        return (time.perf_counter() - t) / len(datoer) * 1e6, tider
+
+    us_med, tider_med = rise_set(med)
+    us_uden, tider_uden = rise_set(uden)
+    forskellige = sum(a != b for a, b in zip(tider_med, tider_uden))
+
+    _rapport(f"Chebyshev-efemeride, {antal:,} opslag", [
+        ("opbygning 1 år",      f"{bygget:6.2f} s (måne + sol)"),
+        ("filstørrelse",        f"{størrelse / 1024:6.0f} KiB"),
+        ("max fejl (gemt)",     f"{efemeride.max_error:.2e}°"),
+        ("max fejl (genmålt)",  f"{genmålt:.2e}°"),
+        ("måne, Meeus-serie",   f"{tid(_direkte_måne):6.2f} µs/opslag"),
+        ("måne, Chebyshev",     f"{tid(efemeride.moon_position):6.2f} µs/opslag"),
+        ("sol, direkte serie",  f"{tid(_direkte_sol):6.2f} µs/opslag"),
+        ("sol, Chebyshev",      f"{tid(efemeride.sun_position):6.2f} µs/opslag"),
+        ("meeus op/ned, serie", f"{us_uden:6.1f} µs/dag"),
+        ("meeus op/ned, efem.", f"{us_med:6.1f} µs/dag ({forskellige} dage afviger)"),
+    ])
+
+
+# ──────────────────────────────────────────────
+# MÅNEMODELLER
+# ──────────────────────────────────────────────
+
+@benchmark("lunar-tiers")
+def bench_lunar_tiers():
+    """
+    Rapporterer hastighed og fejl for hvert præcisionstrin af månemodellen.
+
+    Måles mod referencetabellen i logik/data/moon_reference.csv.
+    """
+    from logik.lunar_models import validate_tiers
+
+    for trin, tal in validate_tiers().items():
+        _rapport(f"Månemodel '{trin}'", [
+            ("position",           f"{tal['position_us']:8.1f} µs/kald"),
+            ("positionsfejl max",  f"{tal['position_max_arcmin']:8.2f} bueminutter"),
+            ("Meeus eks. 47.a",    f"{tal['meeus_47a_arcsec']:8.2f} buesekunder"),
+            ("opgang/nedgang",     f"{tal['rise_set_us']:8.1f} µs/dag"),
+            ("tidsfejl middel",    f"{tal['rise_set_mean_min']:8.2f} min"),
+            ("tidsfejl p95",       f"{tal['rise_set_p95_min']:8.2f} min"),
+            ("tidsfejl max",       f"{tal['rise_set_max_min']:8.2f} min"),
+            ("manglende/ekstra",   f"{tal['rise_set_missing']:8d} begivenheder"),
+        ])
+
+
+# ──────────────────────────────────────────────
+# JSON-TJENESTE
+# ──────────────────────────────────────────────
+
+async def _http_get(reader, writer, sti: str) -> int:
+    """
+    Sender én GET over en keep-alive-forbindelse og læser svaret.
+
+    Args:
+        reader, writer: asyncio-strømme.
+        sti (str): Sti inkl. querystreng.
+
+    Returns:
+        int: HTTP-statuskode.
+    """
+    writer.write(f"GET {sti} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    længde = 0
+    while True:
+        linje = await reader.readline()
+        if linje in (b"\r\n", b""):
+            break
+        navn, _, værdi = linje.decode("latin-1").partition(":")
+        if navn.lower() == "content-length":
+            længde = int(værdi)
+    await reader.readexactly(længde)
+    return status
+
+
+@benchmark("server")
+def bench_server(antal: int = 5_000, forbindelser: int = 50, latens: float = 0.05):
+    """
+    Belastningstest af JSON-tjenesten med en stubbet upstream.
+
+    Upstream-vejrkaldet erstattes af en pause på `latens` sekunder, så
+    testen måler tjenestens egen gennemstrømning, cache og sammenlægning.
+    Forespørgslerne fordeles over 120 datoer, så de fleste rammer cachen
+    og mange samtidige er identiske.
+
+    Args:
+        antal (int):        Samlet antal forespørgsler.
+        forbindelser (int): Samtidige keep-alive-forbindelser.
+        latens (float):     Simuleret upstream-latens i sekunder.
+    """
+    import asyncio
+    import datetime as dt
+    import random
+    from logik.moon_api import MoonAPIClient
+    from logik.server import LunarOrbitService, start_server
+
+    class StubKlient(MoonAPIClient):
+        """Klient hvor vejr-API'et er erstattet af en fast pause."""
+
+        def fetch_weather_record(self, date_string):
+            time.sleep(latens)
+            post = self._astro_record(dt.datetime.strptime(date_string, "%Y-%m-%d"))
+            post.temperature_max, post.temperature_min = 12.0, 4.0
+            post.cloud_cover, post.precip_prob = 40.0, 10.0
+            return post
+
+    start = dt.date(2024, 1, 1)
+    datoer = [(start + dt.timedelta(days=i)).isoformat() for i in range(120)]
+    random.seed(7)
+
+    async def kør():
+        service = LunarOrbitService(client_factory=StubKlient, max_upstream=8)
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        pr_forbindelse = antal // forbindelser
+        latenser = []
+
+        async def klient():
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for _ in range(pr_forbindelse):
+                t = time.perf_counter()
+                status = await _http_get(reader, writer, f"/day?date={random.choice(datoer)}")
+                latenser.append(time.perf_counter() - t)
+                assert status == 200
+            writer.close()
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(klient() for _ in range(forbindelser)))
+        varighed = time.perf_counter() - t0
+
+        server.close()
+        await server.wait_closed()
+        return service.stats, varighed, sorted(latenser)
+
+    stats, varighed, latenser = asyncio.run(kør())
+    udført = len(latenser)
+    _rapport(f"JSON-tjeneste: {udført:,} forespørgsler, {forbindelser} forbindelser", [
+        ("gennemstrømning",  f"{udført / varighed:8.0f} req/s"),
+        ("latens p50",       f"{latenser[udført // 2] * 1000:8.2f} ms"),
+        ("latens p99",       f"{latenser[int(udført * 0.99)] * 1000:8.2f} ms"),
+        ("cache hits",       f"{stats['cache_hits']:8d}"),
+        ("sammenlagte",      f"{stats['coalesced']:8d}"),
+        ("upstream-kald",    f"{stats['upstream_calls']:8d}"),
+    ])
+
+
+@benchmark("meteo-stub")
+def bench_meteo_stub(antal: int = 2_000, samtidighed: int = 32):
+    """
+    Klientens gennemstrømning og halelatens mod Open-Meteo-stand-in'en.
+
+    Kører `run_load` under tre scenarier: ren stub, realistisk latens med
+    jitter og fejl, samt throttling (429) over 200 forespørgsler/s.
+
+    Args:
+        antal (int):       Antal kald pr. scenarie.
+        samtidighed (int): Samtidige klienttråde.
+    """
+    from logik.meteo_stub import StubConfig, run_load
+
+    scenarier = [
+        ("ingen latens",           StubConfig()),
+        ("20±20 ms, 1 % fejl",     StubConfig(latens=0.02, jitter=0.02, fejlrate=0.01)),
+        ("throttling 200 req/s",   StubConfig(max_rps=200)),
+    ]
+    for titel, config in scenarier:
+        r = run_load(config, antal=antal, samtidighed=samtidighed)
+        _rapport(f"fetch_weather_record, {samtidighed} tråde: {titel}", [
+            ("gennemstrømning", f"{r['throughput']:8.0f} kald/s"),
+            ("latens p50",      f"{r['p50_ms']:8.2f} ms"),
+            ("latens p95",      f"{r['p95_ms']:8.2f} ms"),
+            ("latens p99",      f"{r['p99_ms']:8.2f} ms"),
+            ("med vejrdata",    f"{r['weather_ok'] * 100:8.1f} %"),
+            ("429 / 500",       f"{r['throttled']:5d} / {r['errors']}"),
+        ])
+
+
+@benchmark("rate-limiter")
+def bench_rate_limiter(varighed: float = 3.0, rate: float = 50.0):
+    """
+    Ventetid pr. prioritet når spanden er mættet.
+
+    Fire tråde henter arkiv (BACKFILL) og to forudhenter (PREFETCH) uden
+    pause, mens én interaktiv tråd beder om et token hver 100. ms.
+    Derefter sendes kald mod en stub der throttler, for at vise den
+    fælles 429-pause.
+
+    Args:
+        varighed (float): Sekunder pr. scenarie.
+        rate (float):     Tokens pr. sekund.
+    """
+    import threading
+    from logik.meteo_stub import OpenMeteoStub, StubConfig
+    from logik.rate_limiter import (BACKFILL, INTERACTIVE, PREFETCH,
+                                    RateLimiter, get_json)
+
+    limiter = RateLimiter(rate=rate, burst=5)
+    slut = time.monotonic() + varighed
+
+    def arbejder(prioritet, pause):
+        while time.monotonic() < slut:
+            try:
+                limiter.acquire(prioritet, timeout=max(0.01, slut - time.monotonic()))
+            except TimeoutError:
+                break
+            if pause:
+                time.sleep(pause)
+
+    tråde = ([threading.Thread(target=arbejder, args=(BACKFILL, 0)) for _ in range(4)]
+             + [threading.Thread(target=arbejder, args=(PREFETCH, 0)) for _ in range(2)]
+             + [threading.Thread(target=arbejder, args=(INTERACTIVE, 0.1))])
+    for t in tråde:
+        t.start()
+    for t in tråde:
+        t.join()
+
+    stats = limiter.stats()
+    _rapport(f"Tokenspand {rate:.0f}/s i {varighed:.0f} s (4 backfill, 2 prefetch, 1 interaktiv)", [
+        (navn, f"{stats[navn]['calls']:5d} kald, middel {stats[navn]['mean_wait_ms']:7.1f} ms, "
+               f"p95 {stats[navn]['p95_wait_ms']:7.1f} ms")
+        for navn in ("interactive", "prefetch", "backfill")
+    ])
+
+    # Fælles 429-pause mod en stub der tillader 20 kald/s
+    stub = OpenMeteoStub(StubConfig(max_rps=20))
+    url, stop = stub.run_in_thread()
+    limiter = RateLimiter(rate=40.0, burst=5)
+    params = {"latitude": 55.6761, "longitude": 12.5683,
+              "start_date": "2024-01-01", "daily": "temperature_2m_max"}
+    t0 = time.perf_counter()
+    fejl = 0
+    try:
+        for _ in range(100):
+            try:
+                get_json(f"{url}/v1/archive", params, BACKFILL, forsøg=5, limiter=limiter)
+            except Exception:
+                fejl += 1
+    finally:
+        stop()
+    stats = limiter.stats()
+    _rapport("100 kald mod stub med 20 req/s (limiter 40/s)", [
+        ("varighed",     f"{time.perf_counter() - t0:8.2f} s"),
+        ("429-svar",     f"{stats['throttled']:8d}"),
+        ("opgivne kald", f"{fejl:8d}"),
+    ])
+
+
+@benchmark("viewing")
+def bench_viewing(antal: int = 200):
+    """
+    Pris for "bedste nætter"-søgningen over 16 nætter.
+
+    Måler beregningen alene (`rank_nights`) og hele søgningen med ét kald
+    til Open-Meteo-stand-in'en.
+
+    Args:
+        antal (int): Antal gentagelser.
+    """
+    import datetime as dt
+    from logik.meteo_stub import OpenMeteoStub, point_client_at
+    from logik.moon_api import MoonAPIClient
+    from logik.viewing import best_viewing_nights, rank_nights
+
+    klient = MoonAPIClient()
+    skydække = [float(i % 101) for i in range(16 * 24)]
+    i_dag = dt.date.today()
+
+    t0 = time.perf_counter()
+    for _ in range(antal):
+        rank_nights(klient, i_dag, skydække)
+    beregning = (time.perf_counter() - t0) / antal
+
+    stub = OpenMeteoStub()
+    url, stop = stub.run_in_thread()
+    try:
+        point_client_at(klient, url)
+        t0 = time.perf_counter()
+        for _ in range(antal // 10 or 1):
+            nætter = best_viewing_nights(klient, fra=i_dag)
+        i_alt = (time.perf_counter() - t0) / (antal // 10 or 1)
+    finally:
+        stop()
+
+    _rapport("Bedste nætter (16 nætter × 13 timer)", [
+        ("beregning",          f"{beregning * 1000:6.2f} ms"),
+        ("inkl. ét stub-kald", f"{i_alt * 1000:6.2f} ms"),
+        ("bedste nat",         f"{nætter[0].date} (score {nætter[0].score:.2f})"),
+    ])
+
+
+@benchmark("hourly")
+def bench_hourly(antal: int = 200_000):
+    """
+    Timevejr som søjler (`HourlyTable`) mod en liste af ordbøger pr. time.
+
+    Måler hukommelse for sliderens vindue (121 dage), pris for opslaget
+    "skydække ved måneopgang" og for et 24-timers udsnit.
+
+    Args:
+        antal (int): Antal opslag.
+    """
+    import datetime as dt
+    from logik.moon_api import TIME_VARIABLE
+    from logik.records import HourlyTable
+
+    start = dt.date(2024, 1, 1)
+    timer = 121 * 24
+
+    def byg_dicts():
+        return [{"time": f"{start + dt.timedelta(days=i // 24)}T{i % 24:02d}:00",
+                 "cloud_cover": float(i % 101), "temperature_2m": 5.0 + i % 10,
+                 "precipitation_probability": float(i % 50)} for i in range(timer)]
+
+    def byg_tabel():
+        tabel = HourlyTable(start, timer, TIME_VARIABLE)
+        tabel.fill("cloud_cover", 0, [float(i % 101) for i in range(timer)])
+        tabel.fill("temperature_2m", 0, [5.0 + i % 10 for i in range(timer)])
+        tabel.fill("precipitation_probability", 0, [float(i % 50) for i in range(timer)])
+        return tabel
+
+    dicts, b_dicts, _ = _mål_hukommelse(byg_dicts)
+    tabel, b_tabel, _ = _mål_hukommelse(byg_tabel)
+
+    datoer = [start + dt.timedelta(days=i % 121) for i in range(antal)]
+    t0 = time.perf_counter()
+    for i, dato in enumerate(datoer):
+        tabel.at("cloud_cover", tabel.hour_index(dato, (i * 37) % 1440, 1))
+    opslag = (time.perf_counter() - t0) / antal * 1e6
+
+    t0 = time.perf_counter()
+    for i in range(antal):
+        tabel.view("cloud_cover", i % 2880, i % 2880 + 24)
+    udsnit_view = (time.perf_counter() - t0) / antal * 1e6
+
+    t0 = time.perf_counter()
+    for i in range(antal):
+        [d["cloud_cover"] for d in dicts[i % 2880:i % 2880 + 24]]
+    udsnit_dicts = (time.perf_counter() - t0) / antal * 1e6
+
+    _rapport(f"Timevejr for 121 dage ({timer} timer × 3 variable)", [
+        ("ordbøger pr. time",        f"{b_dicts / 1024:8.0f} KiB"),
+        ("HourlyTable (array 'd')",  f"{b_tabel / 1024:8.0f} KiB"),
+        ("opslag ved måneopgang",    f"{opslag:8.2f} µs"),
+        ("24 t udsnit, memoryview",  f"{udsnit_view:8.2f} µs"),
+        ("24 t udsnit, ordbøger",    f"{udsnit_dicts:8.2f} µs"),
+    ])
+
+
+@benchmark("async-client")
+def bench_async_client(antal: int = 100, latens: float = 0.02):
+    """
+    Synkron `MoonAPIClient` mod `AsyncWeatherClient` for mange steder.
+
+    Begge henter tre datoer (én arkiv- og to forecastdage) for `antal`
+    steder fra Open-Meteo-stand-in'en med fast latens pr. kald.
+
+    Args:
+        antal (int):    Antal steder.
+        latens (float): Stubbens latens pr. kald i sekunder.
+    """
+    import asyncio
+    import contextlib
+    import datetime as dt
+    import io
+    from logik.async_client import AsyncWeatherClient
+    from logik.meteo_stub import OpenMeteoStub, StubConfig, point_client_at
+    from logik.moon_api import MoonAPIClient
+
+    i_dag = dt.date.today()
+    datoer = [(i_dag + dt.timedelta(days=d)).isoformat() for d in (-10, 2, 5)]
+    steder = [(round(54.6 + (i % 20) * 0.15, 4), round(8.1 + (i // 20) * 0.4, 4), f"Sted {i}")
+              for i in range(antal)]
+
+    stub = OpenMeteoStub(StubConfig(latens=latens))
+    url, stop = stub.run_in_thread()
+    try:
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            synkron = []
+            for sted in steder:
+                klient = MoonAPIClient(*sted)
+                point_client_at(klient, url)
+                synkron.append([klient.fetch_weather_data(d) for d in datoer])
+        t_synkron = time.perf_counter() - t0
+        kald_synkron = stub.stats["requests"]
+
+        klient = AsyncWeatherClient(max_samtidige=8)
+        point_client_at(klient, url)
+        t0 = time.perf_counter()
+        asynkron = asyncio.run(klient.fetch_many(steder, datoer))
+        t_asynkron = time.perf_counter() - t0
+        klient.close()
+    finally:
+        stop()
+
+    celler = antal * len(datoer)
+    _rapport(f"Vejr for {antal} steder × {len(datoer)} datoer, {latens * 1000:.0f} ms latens", [
+        ("synkron",          f"{t_synkron:8.2f} s   ({kald_synkron} kald)"),
+        ("asynkron",         f"{t_asynkron:8.2f} s   ({klient.stats['http_calls']} kald)"),
+        ("speedup",          f"{t_synkron / t_asynkron:8.1f}x"),
+        ("celler/s asynkron", f"{celler / t_asynkron:8.0f}"),
+        ("ens resultater",   f"{'ja' if synkron == asynkron else 'NEJ':>8}"),
+    ])
+
+
+# ──────────────────────────────────────────────
+# KOMMANDOLINJE
+# ──────────────────────────────────────────────
+
+def main(argv=None):
+    """
+    Kører et navngivet benchmark fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="LunarOrbit benchmarks")
+    parser.add_argument("navn", nargs="?", choices=sorted(BENCHMARKS),
+                        help="Benchmark der skal køres")
+    parser.add_argument("--antal", type=int, default=None,
+                        help="Overskriv arbejdsmængden (antal poster/kald)")
+    args = parser.parse_args(argv)
+
+    if args.navn is None:
+        print("Tilgængelige benchmarks:")
+        for navn in sorted(BENCHMARKS):
+            print(f"  {navn}")
+        return
+
+    funktion = BENCHMARKS[args.navn]
+    kwargs = {}
+    if args.antal and "antal" in inspect.signature(funktion).parameters:
+        kwargs["antal"] = args.antal
+    funktion(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,9 @@ Indeholder hjælpefunktioner, konstanter og hjælperklasser.
 Dette modul giver genbrugelig funktionalitet til applikationen.
 """
 
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 
 class DateUtils:
@@ -57,11 +58,25 @@ class DateUtils:
         Returns:
             list: Liste af datostrenge i YYYY-MM-DD-format
         """
-        date_list = []
+        return list(DateUtils.iter_date_range(start_date, days))
+
+    @staticmethod
+    def iter_date_range(start_date: datetime, days: int = 30) -> Iterator[str]:
+        """
+        Som `get_date_range`, men genererer datoerne én ad gangen.
+
+        Til lange intervaller, hvor listen ikke skal ligge i hukommelsen
+        (se også `logik.pipeline.stream_days`).
+
+        Args:
+            start_date (datetime): Startdato
+            days (int): Antal dage at generere
+
+        Yields:
+            str: Datostreng i YYYY-MM-DD-format
+        """
         for i in range(days):
-            date = start_date + timedelta(days=i)
-            date_list.append(date.strftime("%Y-%m-%d"))
-        return date_list
+            yield (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
     
     @staticmethod
     def create_slider_date_range(center_date: str, range_days: int = 60) -> Tuple[str, str]:
@@ -171,6 +186,10 @@ class MoonConstants:
     # Månecykluskonstanter
     SYNODIC_MONTH = 29.53  # Dage i en månecyklus
     
+    # Mappe til lokale datafiler (efemerider pr. år, snapshots, tiles osv.).
+    # LUNARORBIT_DATA flytter den (f.eks. en tom mappe i headless-kørsler).
+    DATA_DIR = os.environ.get("LUNARORBIT_DATA") or os.path.join(os.path.expanduser("~"), ".lunarorbit")
+    
     # Fasenavne på dansk
     PHASE_NAMES = {
         0: "Nymåne",
@@ -261,6 +280,36 @@ class Formatters:
         """
         return f"{latitude:.4f}°N, {longitude:.4f}°E"
 
+    @staticmethod
+    def format_minutes(minutes: int) -> str:
+        """
+        Formatterer minutter efter lokal midnat som "HH:MM".
+
+        Args:
+            minutes (int): Minutter efter midnat, eller negativ for manglende tid
+
+        Returns:
+            str: Formateret tid (f.eks. "06:42") eller "-"
+        """
+        if minutes < 0:
+            return "-"
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    @staticmethod
+    def format_value(value: float) -> str:
+        """
+        Formatterer en vejrværdi til visning.
+
+        Args:
+            value (float): Vejrværdi, eller NaN for manglende data
+
+        Returns:
+            str: Formateret værdi (f.eks. "12.3" eller "80") eller "-"
+        """
+        if value != value:  # NaN er aldrig lig med sig selv
+            return "-"
+        return f"{value:g}"
+
 class MoonEngine:
     """
     Månefaseberegning og transformationsmotor.
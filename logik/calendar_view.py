@@ -0,0 +1,328 @@
+"""
+Måneds- og årskalender med månefaser.
+
+En naiv kalender ville kalde månefaseberegningen pr. celle og tegne ca.
+365 Tk-widgets for et år. Her gøres i stedet sådan:
+
+  - Alle dage i en måned beregnes i én batch (`pipeline.phase_columns`).
+  - Hver måned tegnes som ét PIL-billede (en "tile") med en tegnet
+    måneskive pr. dag. Tilen caches pr. sted, måned og cellestørrelse.
+  - Årsvisningen sætter 12 cachede tiles sammen til ét billede.
+
+Et skift til et allerede vist år er derfor kun en sammensætning af
+billeder. `prefetch_year_async()` bygger nabo-årene i en baggrundstråd;
+år der allerede er cachet eller ved at blive bygget springes over.
+
+Klik på et billede omsættes til en dato med `hit_test_month()` og
+`hit_test_year()`.
+"""
+
+import calendar
+import datetime as dt
+import functools
+import math
+import threading
+from array import array
+from typing import Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from logik.moon_api import MoonAPIClient
+from logik.pipeline import phase_columns
+from logik.timeline import LRUCache
+
+
+# Ét bogstav pr. ugedag (Pillows indbyggede skrift har ikke "ø")
+UGEDAGE    = ("M", "T", "O", "T", "F", "L", "S")
+MÅNEDER    = ("Januar", "Februar", "Marts", "April", "Maj", "Juni", "Juli",
+              "August", "September", "Oktober", "November", "December")
+
+CELLE_MÅNED = 64    # Cellestørrelse i månedsvisning (pixels)
+CELLE_ÅR    = 26    # Cellestørrelse i årsvisning
+ÅR_KOLONNER = 4     # Måneder pr. række i årsvisningen
+MAX_TILES   = 72    # Loft over cachede månedstiles (6 år i to størrelser)
+FASE_TRIN   = 56    # Faser der tegnes som færdige skiver (ca. ½ dag pr. trin)
+
+# Farver i UI'ets lilla tema
+BAGGRUND = (26, 8, 42)
+TEKST    = (220, 200, 240)
+SVAG     = (140, 110, 170)
+MØRK     = (55, 40, 75)
+LYS      = (245, 240, 210)
+I_DAG    = (192, 96, 224)
+
+
+def _skrift(størrelse: int) -> ImageFont.ImageFont:
+    """Pillows indbyggede skrift i en given størrelse (ældre Pillow: fast størrelse)."""
+    try:
+        return ImageFont.load_default(størrelse)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _tegn_måne(draw: ImageDraw.ImageDraw, cx: float, cy: float, r: float, fase: float) -> None:
+    """
+    Tegner en måneskive med den oplyste del for en fase (0 = ny, 0,5 = fuld).
+
+    Den oplyste del afgrænses af randen på den ene side og terminatoren
+    (en halv ellipse med halvakse r·cos(2π·fase)) på den anden.
+    """
+    draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill=MØRK)
+    k = math.cos(2 * math.pi * fase)
+    if k > 0.98:
+        return                          # Nymåne
+    side = 1.0 if fase < 0.5 else -1.0  # Tiltagende: lys til højre
+    trin = 16
+    rand, terminator = [], []
+    for i in range(trin + 1):
+        y = -r + 2 * r * i / trin
+        bredde = math.sqrt(max(0.0, r * r - y * y))
+        rand.append((cx + side * bredde, cy + y))
+        terminator.append((cx + side * bredde * k, cy + y))
+    draw.polygon(rand + terminator[::-1], fill=LYS)
+
+
+@functools.lru_cache(maxsize=8)
+def _sprites(celle: int):
+    """
+    Færdigtegnede småbilleder for én cellestørrelse.
+
+    At tegne tekst og polygoner pr. celle er det dyreste ved en tile;
+    i stedet tegnes hver måneskive (kvantiseret til `FASE_TRIN`) og hvert
+    dagnummer én gang og indsættes med `paste`.
+
+    Returns:
+        tuple: (skiver, tal, ugedage) – lister/billede i baggrundsfarven.
+    """
+    r = celle * 0.3
+    side = int(2 * r) + 3
+    skiver = []
+    for i in range(FASE_TRIN):
+        billede = Image.new("RGB", (side, side), BAGGRUND)
+        _tegn_måne(ImageDraw.Draw(billede), side / 2, side / 2, r, i / FASE_TRIN)
+        skiver.append(billede)
+
+    skrift = _skrift(max(7, celle // 5))
+    højde = max(8, int(celle * 0.28))
+    tal = [None]
+    for dag in range(1, 32):
+        billede = Image.new("RGB", (celle - 4, højde), BAGGRUND)
+        ImageDraw.Draw(billede).text(((celle - 4) / 2, højde / 2), str(dag),
+                                     fill=TEKST, font=skrift, anchor="mm")
+        tal.append(billede)
+
+    ugedage = Image.new("RGB", (7 * celle, celle // 2), BAGGRUND)
+    draw = ImageDraw.Draw(ugedage)
+    for i, navn in enumerate(UGEDAGE):
+        draw.text((celle * (i + 0.5), celle * 0.28), navn, fill=SVAG, font=skrift, anchor="mm")
+    return skiver, tal, ugedage
+
+
+def _gitter(år: int, måned: int) -> Tuple[int, int]:
+    """(ugedag for den 1. med mandag = 0, antal dage i måneden)."""
+    return calendar.monthrange(år, måned)
+
+
+def month_cells(client: MoonAPIClient, år: int, måned: int) -> array:
+    """
+    Beregner månefasen for alle dage i en måned i én batch.
+
+    Args:
+        client (MoonAPIClient): Giver fasemodellen.
+        år (int), måned (int):  Måneden.
+
+    Returns:
+        array('d'): Fase (0-1) pr. dag.
+    """
+    _, antal = _gitter(år, måned)
+    return phase_columns(client, dt.date(år, måned, 1), antal)[0]
+
+
+def render_month(år: int, måned: int, faser: array, celle: int = CELLE_MÅNED,
+                 i_dag: Optional[dt.date] = None) -> Image.Image:
+    """
+    Tegner én måned som et billede.
+
+    Args:
+        år (int), måned (int): Måneden.
+        faser (array):   Fase pr. dag (fra `month_cells`).
+        celle (int):     Cellestørrelse i pixels.
+        i_dag (date, optional): Dag der markeres.
+
+    Returns:
+        PIL.Image: 7 × 6 celler under en titel- og ugedagslinje.
+    """
+    første, _ = _gitter(år, måned)
+    top = celle                                   # Titel + ugedage
+    billede = Image.new("RGB", (7 * celle, top + 6 * celle), BAGGRUND)
+    draw = ImageDraw.Draw(billede)
+
+    skiver, tal, ugedage = _sprites(celle)
+    draw.text((celle * 3.5, top * 0.3), f"{MÅNEDER[måned - 1]} {år}",
+              fill=TEKST, font=_skrift(max(9, celle // 3)), anchor="mm")
+    billede.paste(ugedage, (0, top // 2))
+
+    side = skiver[0].size[0]
+    tal_højde = tal[1].size[1]
+    for i, fase in enumerate(faser):
+        række, kolonne = divmod(første + i, 7)
+        x0, y0 = kolonne * celle, top + række * celle
+        skive = skiver[int(fase * FASE_TRIN + 0.5) % FASE_TRIN]
+        billede.paste(skive, (x0 + (celle - side) // 2, y0 + int(celle * 0.42) - side // 2))
+        billede.paste(tal[i + 1], (x0 + 2, y0 + int(celle * 0.86) - tal_højde // 2))
+        if i_dag is not None and (i_dag.year, i_dag.month, i_dag.day) == (år, måned, i + 1):
+            draw.rectangle([x0 + 1, y0 + 1, x0 + celle - 2, y0 + celle - 2], outline=I_DAG)
+    return billede
+
+
+class CalendarRenderer:
+    """
+    Måneds- og årsvisning med cachede månedstiles for ét sted.
+    """
+
+    def __init__(self, client: MoonAPIClient, max_tiles: int = MAX_TILES):
+        """
+        Args:
+            client (MoonAPIClient): Sted og månemodel.
+            max_tiles (int):        Loft over cachede tiles.
+        """
+        self.client = client
+        self._tiles = LRUCache(max_tiles)
+        self.stats  = {"hits": 0, "rendered": 0, "prefetches": 0}
+
+        # (år, celle) for forhåndstegninger der kører lige nu
+        self._i_gang = set()
+        self._lås    = threading.Lock()
+
+    def _nøgle(self, år: int, måned: int, celle: int, i_dag: dt.date) -> tuple:
+        """Cachenøgle for én månedstile."""
+        return (self.client.latitude, self.client.longitude, år, måned, celle, i_dag)
+
+    def month_tile(self, år: int, måned: int, celle: int = CELLE_MÅNED) -> Image.Image:
+        """
+        Én måned som billede (fra cachen hvis den er tegnet før).
+
+        Args:
+            år (int), måned (int): Måneden.
+            celle (int):           Cellestørrelse i pixels.
+
+        Returns:
+            PIL.Image: Månedens tile. Den må ikke ændres, da den deles.
+        """
+        i_dag = dt.date.today()
+        nøgle = self._nøgle(år, måned, celle, i_dag)
+        tile = self._tiles.get(nøgle)
+        if tile is None:
+            tile = render_month(år, måned, month_cells(self.client, år, måned), celle, i_dag)
+            self._tiles[nøgle] = tile
+            self.stats["rendered"] += 1
+        else:
+            self.stats["hits"] += 1
+        return tile
+
+    def year_image(self, år: int, celle: int = CELLE_ÅR) -> Image.Image:
+        """
+        Sætter årets 12 månedstiles sammen til ét billede.
+
+        Args:
+            år (int):   Året.
+            celle (int): Cellestørrelse i pixels.
+
+        Returns:
+            PIL.Image: 4 × 3 måneder med lidt luft imellem.
+        """
+        tiles = [self.month_tile(år, m, celle) for m in range(1, 13)]
+        bredde, højde = tiles[0].size
+        luft = celle // 2
+        rækker = math.ceil(12 / ÅR_KOLONNER)
+        billede = Image.new("RGB", (ÅR_KOLONNER * (bredde + luft) - luft,
+                                    rækker * (højde + luft) - luft), BAGGRUND)
+        for i, tile in enumerate(tiles):
+            række, kolonne = divmod(i, ÅR_KOLONNER)
+            billede.paste(tile, (kolonne * (bredde + luft), række * (højde + luft)))
+        return billede
+
+    def has_year(self, år: int, celle: int = CELLE_ÅR) -> bool:
+        """True hvis alle årets tiles allerede ligger i cachen."""
+        i_dag = dt.date.today()
+        return all(self._nøgle(år, m, celle, i_dag) in self._tiles for m in range(1, 13))
+
+    def prefetch_year(self, år: int, celle: int = CELLE_ÅR) -> None:
+        """Tegner årets tiles på forhånd (kan køres i en baggrundstråd)."""
+        for m in range(1, 13):
+            self.month_tile(år, m, celle)
+
+    def prefetch_year_async(self, år: int, celle: int = CELLE_ÅR) -> bool:
+        """
+        Tegner årets tiles i en baggrundstråd, hvis det er nødvendigt.
+
+        Et år der allerede er cachet, eller som en anden tråd er i gang
+        med, springes over, så hurtige årsskift ikke starter tråde der
+        tegner de samme tiles to gange.
+
+        Args:
+            år (int):    Året.
+            celle (int): Cellestørrelse i pixels.
+
+        Returns:
+            bool: True hvis en ny tråd blev startet.
+        """
+        with self._lås:
+            if (år, celle) in self._i_gang or self.has_year(år, celle):
+                return False
+            self._i_gang.add((år, celle))
+            self.stats["prefetches"] += 1
+
+        def kør():
+            try:
+                self.prefetch_year(år, celle)
+            finally:
+                with self._lås:
+                    self._i_gang.discard((år, celle))
+
+        threading.Thread(target=kør, daemon=True).start()
+        return True
+
+
+def hit_test_month(år: int, måned: int, x: int, y: int,
+                   celle: int = CELLE_MÅNED) -> Optional[str]:
+    """
+    Omsætter et klik på en månedstile til en dato.
+
+    Args:
+        år (int), måned (int): Måneden.
+        x (int), y (int):      Klikkets position i billedet.
+        celle (int):           Cellestørrelse i pixels.
+
+    Returns:
+        str eller None: Dato i YYYY-MM-DD format, None uden for dagene.
+    """
+    første, antal = _gitter(år, måned)
+    if y < celle or x < 0 or x >= 7 * celle:
+        return None
+    nummer = ((y - celle) // celle) * 7 + x // celle - første
+    if not 0 <= nummer < antal:
+        return None
+    return dt.date(år, måned, nummer + 1).isoformat()
+
+
+def hit_test_year(år: int, x: int, y: int, celle: int = CELLE_ÅR) -> Optional[str]:
+    """
+    Omsætter et klik på årsbilledet til en dato.
+
+    Args:
+        år (int):         Året.
+        x (int), y (int): Klikkets position i billedet.
+        celle (int):      Cellestørrelse i pixels.
+
+    Returns:
+        str eller None: Dato i YYYY-MM-DD format, None mellem månederne.
+    """
+    bredde, højde = 7 * celle, 7 * celle
+    luft = celle // 2
+    kolonne, rest_x = divmod(x, bredde + luft)
+    række, rest_y = divmod(y, højde + luft)
+    måned = række * ÅR_KOLONNER + kolonne + 1
+    if not (0 <= kolonne < ÅR_KOLONNER and 1 <= måned <= 12):
+        return None
+    return hit_test_month(år, måned, rest_x, rest_y, celle)
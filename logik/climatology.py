@@ -0,0 +1,297 @@
+"""
+Klimanormaler pr. sted som reserve for vejr uden prognose.
+
+Open-Meteo har kun prognose 16 dage frem. For datoer længere ude (og når
+netværket ikke svarer) gav `fetch_weather_data` tidligere "-" i alle
+vejrfelter, og brugeren prøvede igen til ingen nytte. I stedet bruges nu
+et estimat fra lokale klimanormaler:
+
+  - Normalerne beregnes fra arkivdata i `ArchiveStore` (se backfill.py):
+    gennemsnit pr. dag i året af maks./min. temperatur og skydække samt
+    andelen af dage med nedbør (≥ 0,1 mm, som i Open-Meteos
+    nedbørssandsynlighed).
+  - Hver dag udglattes over ±7 dage, så få års data giver jævne kurver.
+  - Resultatet gemmes som 366 float32-værdier pr. størrelse i én lille fil
+    pr. sted (ca. 7 KB) og slås op uden netværk.
+
+Poster udfyldt herfra har `source == "climatology"`, så UI og eksport
+kan vise dem tydeligt som estimat.
+
+Kør fra kommandolinjen (efter `python -m logik.backfill`):
+    python -m logik.climatology --lat 55.6761 --lon 12.5683
+"""
+
+import argparse
+import datetime as dt
+import math
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Optional
+
+from logik.boilerplate import MoonConstants
+from logik.records import MANGLER, WeatherRecord
+from logik.tiles import sted_nøgle
+
+
+STANDARD_MAPPE = os.path.join(MoonConstants.DATA_DIR, "climatology")
+
+MAGIC = b"LOCLIM1\0"
+
+DAGE        = 366    # Dag i året, skudår inkl. (29. februar har sin egen plads)
+HALV_VINDUE = 7      # Udglatning: ±dage omkring hver dag
+NEDBØR_MM   = 0.1    # Grænse for en dag med nedbør
+
+# Felter i WeatherRecord → arkivsøjle der midles
+_MIDDEL = {
+    "temperature_max": "temperature_2m_max",
+    "temperature_min": "temperature_2m_min",
+    "cloud_cover":     "cloud_cover_mean",
+}
+_NEDBØR = "precipitation_sum"
+
+# magic | breddegrad | længdegrad | første år | sidste år | halvt vindue
+_HEADER = struct.Struct("<8sddiii")
+
+
+def dag_indeks(dato: dt.date) -> int:
+    """
+    Dagens plads (0-365) i et skudår, så samme kalenderdag altid deler plads.
+
+    Args:
+        dato (date): Datoen.
+
+    Returns:
+        int: Indeks i normalerne.
+    """
+    return (dt.date(2000, dato.month, dato.day) - dt.date(2000, 1, 1)).days
+
+
+def _udglat(summer: array, antal: array, halv: int) -> array:
+    """Cirkulært glidende gennemsnit: Σ summer / Σ antal over ±halv dage."""
+    resultat = array("f", [MANGLER]) * DAGE
+    for k in range(DAGE):
+        s = n = 0.0
+        for d in range(k - halv, k + halv + 1):
+            s += summer[d % DAGE]
+            n += antal[d % DAGE]
+        if n:
+            resultat[k] = s / n
+    return resultat
+
+
+class ClimatologyStore:
+    """
+    Klimanormaler pr. dag i året for ét sted.
+
+    Attributes:
+        normals (dict): Felt i WeatherRecord → array('f') med 366 værdier.
+        samples (array): Antal arkivdage bag hver dag (før udglatning).
+    """
+
+    def __init__(self, lat: float, lon: float, første_år: int, sidste_år: int,
+                 normals: Dict[str, array], samples: array, halv_vindue: int = HALV_VINDUE):
+        self.lat         = lat
+        self.lon         = lon
+        self.første_år   = første_år
+        self.sidste_år   = sidste_år
+        self.normals     = normals
+        self.samples     = samples
+        self.halv_vindue = halv_vindue
+
+    @property
+    def label(self) -> str:
+        """Kort beskrivelse til visning, f.eks. "normal 2000-2024"."""
+        return f"normal {self.første_år}-{self.sidste_år}"
+
+    # ── Opbygning ──
+
+    @classmethod
+    def build(cls, archive, halv_vindue: int = HALV_VINDUE) -> "ClimatologyStore":
+        """
+        Beregner normalerne fra et arkivlager.
+
+        Args:
+            archive (ArchiveStore): Stedets arkiv (se backfill.py).
+            halv_vindue (int):      Udglatning i dage på hver side.
+
+        Returns:
+            ClimatologyStore: Normalerne.
+
+        Raises:
+            ValueError: Hvis arkivet er tomt.
+        """
+        if archive.rows == 0:
+            raise ValueError("Arkivet er tomt – kør backfill først")
+        kolonner = archive.manifest["columns"]
+        indekser = array("H", (dag_indeks(d) for d in archive.dates()))
+        samples = array("H", bytes(2 * DAGE))
+        for k in indekser:
+            samples[k] += 1
+
+        normals = {}
+        for felt, kilde in _MIDDEL.items():
+            summer, antal = array("d", bytes(8 * DAGE)), array("d", bytes(8 * DAGE))
+            if kilde in kolonner:
+                for k, værdi in zip(indekser, archive.column(kilde)):
+                    if not math.isnan(værdi):
+                        summer[k] += værdi
+                        antal[k]  += 1
+            normals[felt] = _udglat(summer, antal, halv_vindue)
+
+        # Nedbørssandsynlighed: andel af dage med mindst NEDBØR_MM, i procent
+        summer, antal = array("d", bytes(8 * DAGE)), array("d", bytes(8 * DAGE))
+        if _NEDBØR in kolonner:
+            for k, værdi in zip(indekser, archive.column(_NEDBØR)):
+                if not math.isnan(værdi):
+                    summer[k] += 100.0 if værdi >= NEDBØR_MM else 0.0
+                    antal[k]  += 1
+        normals["precip_prob"] = _udglat(summer, antal, halv_vindue)
+
+        slut = archive.start + dt.timedelta(days=archive.rows - 1)
+        return cls(archive.manifest["latitude"], archive.manifest["longitude"],
+                   archive.start.year, slut.year, normals, samples, halv_vindue)
+
+    # ── Fil ──
+
+    def save(self, sti: Optional[str] = None) -> str:
+        """
+        Gemmer normalerne atomisk (midlertidig fil + os.replace).
+
+        Args:
+            sti (str, optional): Filen (standard: `path_for(lat, lon)`).
+
+        Returns:
+            str: Stien der blev skrevet.
+        """
+        sti = sti or self.path_for(self.lat, self.lon)
+        os.makedirs(os.path.dirname(sti), exist_ok=True)
+        midlertidig = sti + ".tmp"
+        with open(midlertidig, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, self.lat, self.lon, self.første_år,
+                                 self.sidste_år, self.halv_vindue))
+            for felt in WeatherRecord.VEJR_FELTER:
+                søjle = array("f", self.normals[felt])
+                if sys.byteorder == "big":
+                    søjle.byteswap()
+                søjle.tofile(f)
+            samples = array("H", self.samples)
+            if sys.byteorder == "big":
+                samples.byteswap()
+            samples.tofile(f)
+        os.replace(midlertidig, sti)
+        return sti
+
+    @classmethod
+    def load(cls, sti: str) -> "ClimatologyStore":
+        """
+        Indlæser normaler fra en fil.
+
+        Args:
+            sti (str): Filen.
+
+        Returns:
+            ClimatologyStore: Normalerne.
+
+        Raises:
+            OSError:    Hvis filen ikke kan læses.
+            ValueError: Ved forkert magic eller afkortet fil.
+        """
+        with open(sti, "rb") as f:
+            data = f.read()
+        forventet = _HEADER.size + DAGE * (4 * len(WeatherRecord.VEJR_FELTER) + 2)
+        if len(data) != forventet or data[:8] != MAGIC:
+            raise ValueError(f"{sti} er ikke en gyldig klimanormal-fil")
+        _, lat, lon, første, sidste, halv = _HEADER.unpack_from(data, 0)
+
+        pos = _HEADER.size
+        normals = {}
+        for felt in WeatherRecord.VEJR_FELTER:
+            søjle = array("f", data[pos:pos + 4 * DAGE])
+            if sys.byteorder == "big":
+                søjle.byteswap()
+            normals[felt] = søjle
+            pos += 4 * DAGE
+        samples = array("H", data[pos:])
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return cls(lat, lon, første, sidste, normals, samples, halv)
+
+    @staticmethod
+    def path_for(lat: float, lon: float, mappe: str = STANDARD_MAPPE) -> str:
+        """Standardfilen for et sted."""
+        return os.path.join(mappe, sted_nøgle(lat, lon) + ".clim")
+
+    @classmethod
+    def for_site(cls, lat: float, lon: float,
+                 mappe: str = STANDARD_MAPPE) -> Optional["ClimatologyStore"]:
+        """
+        Stedets normaler, eller None hvis de ikke er bygget (eller er ugyldige).
+
+        Args:
+            lat (float), lon (float): Stedet.
+            mappe (str): Mappen med normalfiler.
+
+        Returns:
+            ClimatologyStore eller None.
+        """
+        try:
+            return cls.load(cls.path_for(lat, lon, mappe))
+        except (OSError, ValueError):
+            return None
+
+    # ── Opslag ──
+
+    def estimate(self, dato: dt.date) -> Dict[str, float]:
+        """
+        Normalværdierne for en kalenderdag.
+
+        Args:
+            dato (date): Datoen (kun måned og dag bruges).
+
+        Returns:
+            dict: Felt i WeatherRecord → værdi (`MANGLER` uden data).
+        """
+        k = dag_indeks(dato)
+        return {felt: søjle[k] for felt, søjle in self.normals.items()}
+
+    def apply(self, post: WeatherRecord, dato: dt.date) -> None:
+        """
+        Udfylder en posts vejrfelter med normalerne og mærker den som estimat.
+
+        Args:
+            post (WeatherRecord): Posten (astronomitiderne røres ikke).
+            dato (date):          Datoen.
+        """
+        for felt, værdi in self.estimate(dato).items():
+            setattr(post, felt, værdi)
+        post.source = "climatology" if post.has_weather else ""
+
+
+def main(argv=None):
+    """
+    Bygger klimanormaler for et sted fra dets arkivlager.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    # Importeres her: backfill henter data over netværket og kræver requests
+    from logik.backfill import STANDARD_MAPPE as ARKIV_MAPPE, ArchiveStore
+
+    parser = argparse.ArgumentParser(description="Byg klimanormaler fra arkivdata")
+    parser.add_argument("--lat", type=float, default=MoonConstants.LATITUDE)
+    parser.add_argument("--lon", type=float, default=MoonConstants.LONGITUDE)
+    parser.add_argument("--window", type=int, default=HALV_VINDUE, help="Udglatning ±dage")
+    parser.add_argument("--archive", default=ARKIV_MAPPE, help="Rodmappe for arkivlagrene")
+    parser.add_argument("--dir", default=STANDARD_MAPPE, help="Mappe for normalfiler")
+    args = parser.parse_args(argv)
+
+    lager = ArchiveStore.open(os.path.join(args.archive, sted_nøgle(args.lat, args.lon)))
+    normaler = ClimatologyStore.build(lager, args.window)
+    sti = normaler.save(ClimatologyStore.path_for(args.lat, args.lon, args.dir))
+    print(f"Klimanormaler ({normaler.label}, {lager.rows} dage) gemt i {sti}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Pakket binært datasætformat for efemeride- og vejrdata pr. sted og dag.
+
+Batch-output (f.eks. hundrede år fra `pipeline.stream_chunks`) har hidtil
+ikke haft et effektivt filformat. CSV med "HH:MM"-strenge fylder ca. 70
+bytes pr. dag og skal parses linje for linje. Her gemmes hver dag i 36
+bytes i faste søjler, som kan læses med mmap uden parsing:
+
+Filformat (little-endian, ".lods"):
+    header:   magic (8 bytes) | breddegrad (float64) | længdegrad (float64)
+              | første dato (int32, ordinal) | antal rækker (uint32)
+              | antal søjler (uint16) | flag (uint16) | stednavn (48 bytes,
+              UTF-8) | vejrets kilde (16 bytes)
+    katalog:  pr. søjle: navn (16 bytes) | typekode (1 byte) | offset (uint64)
+    søjler:   hver søjle er `antal rækker` værdier i træk, startende på en
+              8-byte-grænse
+
+Søjler:
+    date                                 int32    datoens ordinal (indeks)
+    sunrise, sunset, moonrise, moonset   int16    minutter efter lokal midnat
+                                                  (-1 = ingen begivenhed)
+    phase, illumination                  float32
+    temperature_max, temperature_min,
+    cloud_cover, precip_prob             float32  NaN = mangler
+
+Datoerne står sorteret i `date`-søjlen, så en dato findes med binær søgning.
+Er dagene fortløbende (flag 1, altid for `write_dataset`), er opslaget blot
+en subtraktion.
+
+Kør fra kommandolinjen:
+    python -m logik.dataset --start 1950-01-01 --end 2049-12-31 -o kbh.lods
+    python -m logik.dataset --info kbh.lods
+"""
+
+import argparse
+import datetime as dt
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional
+
+from logik.boilerplate import MoonConstants
+from logik.records import WeatherRecord, WeatherTable
+
+
+MAGIC = b"LODSET1\0"
+
+# Søjlernes rækkefølge og typekoder i filen
+KOLONNER = (
+    ("date", "i"),
+    *((navn, "h") for navn in WeatherRecord.TID_FELTER),
+    ("phase", "f"), ("illumination", "f"),
+    *((navn, "f") for navn in WeatherRecord.VEJR_FELTER),
+)
+
+FORTLØBENDE = 1     # Flag: dagene er fortløbende (ingen huller)
+
+_HEADER  = struct.Struct("<8sddiIHH48s16s")
+_KATALOG = struct.Struct("<16sc7xQ")
+
+
+def _justér(n: int) -> int:
+    """Runder op til næste 8-byte-grænse."""
+    return (n + 7) & ~7
+
+
+def _layout(rækker: int) -> Dict[str, int]:
+    """Offset for hver søjle i en fil med `rækker` rækker."""
+    pos = _justér(_HEADER.size + len(KOLONNER) * _KATALOG.size)
+    offsets = {}
+    for navn, kode in KOLONNER:
+        offsets[navn] = pos
+        pos = _justér(pos + rækker * array(kode).itemsize)
+    offsets[""] = pos                   # Filens samlede størrelse
+    return offsets
+
+
+# ──────────────────────────────────────────────
+# SKRIVNING
+# ──────────────────────────────────────────────
+
+class DatasetWriter:
+    """
+    Skriver et datasæt bid for bid med konstant hukommelsesforbrug.
+
+    Filen oprettes i fuld størrelse med det samme, og hver bids søjler
+    skrives direkte på deres plads. Antallet af rækker skal derfor kendes
+    på forhånd. Filen gøres først synlig af `close()` (midlertidig fil +
+    os.replace).
+    """
+
+    def __init__(self, sti: str, rækker: int, lat: float, lon: float,
+                 location: str = "", source: str = ""):
+        """
+        Args:
+            sti (str):      Filen.
+            rækker (int):   Det samlede antal dage.
+            lat (float), lon (float): Stedet.
+            location (str): Stednavn (højst 48 bytes UTF-8).
+            source (str):   Vejrets kilde, f.eks. "archive" ("" uden vejr).
+        """
+        self.sti      = sti
+        self.rækker   = rækker
+        self.lat      = lat
+        self.lon      = lon
+        self.location = location
+        self.source   = source
+        self.skrevet  = 0
+        self._første  = None
+        self._sidste  = None
+        self._huller  = False
+        self._offsets = _layout(rækker)
+
+        mappe = os.path.dirname(sti)
+        if mappe:
+            os.makedirs(mappe, exist_ok=True)
+        self._midlertidig = f"{sti}.{os.getpid()}.tmp"
+        self._f = open(self._midlertidig, "w+b")
+        self._f.truncate(self._offsets[""])
+
+    def write_chunk(self, bid) -> None:
+        """
+        Skriver en `DayChunk` (fra `pipeline.compute_chunk`/`stream_chunks`).
+
+        Args:
+            bid (DayChunk): Fortløbende dage efter de allerede skrevne.
+
+        Raises:
+            ValueError: Hvis datoerne ikke kommer i stigende orden, eller
+                        filen bliver overfyldt.
+        """
+        første = bid.start.toordinal()
+        self.write_columns(range(første, første + len(bid)),
+                           dict(bid.table.columns, phase=bid.phase, illumination=bid.illumination))
+
+    def write_columns(self, ordinals: Iterable[int], søjler: Dict[str, Iterable]) -> None:
+        """
+        Skriver rækker givet som søjler (datoer må have huller, men skal stige).
+
+        Args:
+            ordinals (iterable): Datoernes ordinal (`date.toordinal()`).
+            søjler (dict):       Søjlenavn → værdier; alle søjler i `KOLONNER`
+                                 undtagen "date" skal være med.
+
+        Raises:
+            ValueError: Ved manglende søjler, forkert længde, faldende
+                        datoer eller for mange rækker.
+        """
+        datoer = array("i", ordinals)
+        n = len(datoer)
+        if not n:
+            return
+        if self.skrevet + n > self.rækker:
+            raise ValueError(f"Datasættet har plads til {self.rækker} rækker")
+        forrige = self._sidste
+        for o in datoer:
+            if forrige is not None and o <= forrige:
+                raise ValueError("Datoerne skal komme i stigende orden")
+            if forrige is not None and o != forrige + 1:
+                self._huller = True
+            forrige = o
+        if self._første is None:
+            self._første = datoer[0]
+        self._sidste = forrige
+
+        for navn, kode in KOLONNER:
+            if navn == "date":
+                data = datoer
+            else:
+                if navn not in søjler:
+                    raise ValueError(f"Søjlen {navn} mangler")
+                værdier = søjler[navn]
+                data = værdier if getattr(værdier, "typecode", None) == kode else \
+                    array(kode, map(int, værdier) if kode == "h" else værdier)
+                if len(data) != n:
+                    raise ValueError(f"Søjlen {navn} har {len(data)} værdier, forventede {n}")
+            if sys.byteorder == "big":
+                data = array(kode, data)
+                data.byteswap()
+            self._f.seek(self._offsets[navn] + self.skrevet * data.itemsize)
+            data.tofile(self._f)
+        self.skrevet += n
+
+    def close(self) -> str:
+        """
+        Skriver header og katalog og gør filen synlig.
+
+        Returns:
+            str: Filens sti.
+
+        Raises:
+            ValueError: Hvis der er skrevet færre rækker end angivet.
+        """
+        if self.skrevet != self.rækker:
+            self.abort()
+            raise ValueError(f"Skrev {self.skrevet} rækker, forventede {self.rækker}")
+        flag = 0 if self._huller else FORTLØBENDE
+        self._f.seek(0)
+        self._f.write(_HEADER.pack(MAGIC, self.lat, self.lon, self._første or 0, self.rækker,
+                                   len(KOLONNER), flag,
+                                   self.location.encode("utf-8")[:48],
+                                   self.source.encode("ascii")[:16]))
+        for navn, kode in KOLONNER:
+            self._f.write(_KATALOG.pack(navn.encode("ascii"), kode.encode("ascii"),
+                                        self._offsets[navn]))
+        self._f.close()
+        os.replace(self._midlertidig, self.sti)
+        return self.sti
+
+    def abort(self) -> None:
+        """Opgiver skrivningen og sletter den midlertidige fil."""
+        if not self._f.closed:
+            self._f.close()
+        if os.path.exists(self._midlertidig):
+            os.remove(self._midlertidig)
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_dataset(sti: str, client, start: dt.date, slut: dt.date,
+                  archive=None, bid_dage: int = 366) -> str:
+    """
+    Beregner et datointerval bid for bid og skriver det som datasæt.
+
+    Args:
+        sti (str):              Filen.
+        client (MoonAPIClient): Sted og månemodel.
+        start, slut (date):     Interval (begge inkl.).
+        archive (ArchiveStore, optional): Lokalt arkiv med vejr (se backfill.py).
+        bid_dage (int):         Dage pr. bid.
+
+    Returns:
+        str: Filens sti.
+    """
+    from logik.pipeline import stream_chunks
+
+    rækker = (slut - start).days + 1
+    with DatasetWriter(sti, rækker, client.latitude, client.longitude, client.location_name,
+                       "archive" if archive is not None else "") as skriver:
+        for bid in stream_chunks(client, start, slut, bid_dage, archive):
+            skriver.write_chunk(bid)
+    return sti
+
+
+# ──────────────────────────────────────────────
+# LÆSNING
+# ──────────────────────────────────────────────
+
+class PackedDataset:
+    """
+    Et datasæt åbnet med mmap. Søjler og udsnit er memoryviews direkte på
+    filen (ingen kopiering); kun de sider, der læses, hentes fra disken.
+
+    Er der stadig udsnit i brug ved `close()`, lukkes filen først, når de
+    frigives.
+
+    Attributes:
+        rows (int):            Antal dage.
+        latitude, longitude (float): Stedet.
+        location (str):        Stednavn.
+        source (str):          Vejrets kilde ("" uden vejr).
+        contiguous (bool):     True hvis dagene er fortløbende.
+    """
+
+    def __init__(self, sti: str):
+        """
+        Args:
+            sti (str): Filen.
+
+        Raises:
+            OSError:    Hvis filen ikke kan åbnes.
+            ValueError: Ved forkert magic, ukendte søjler eller afkortet fil.
+        """
+        with open(sti, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, self.latitude, self.longitude, self._første, self.rows,
+             antal, flag, navn, kilde) = _HEADER.unpack_from(self._mm, 0)
+            katalog = [_KATALOG.unpack_from(self._mm, _HEADER.size + i * _KATALOG.size)
+                       for i in range(antal)]
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"{sti} er ikke et datasæt")
+        self._offsets = {n.rstrip(b"\0").decode("ascii"): (k.decode("ascii"), o)
+                         for n, k, o in katalog}
+        if (magic != MAGIC or any(self._offsets.get(n, (None,))[0] != k for n, k in KOLONNER)
+                or len(self._mm) < _layout(self.rows)[""]):
+            self._mm.close()
+            raise ValueError(f"{sti} er ikke et gyldigt datasæt")
+        self.location   = navn.rstrip(b"\0").decode("utf-8", "replace")
+        self.source     = kilde.rstrip(b"\0").decode("ascii")
+        self.contiguous = bool(flag & FORTLØBENDE)
+        self._datoer    = self.column("date")
+
+    @property
+    def start(self) -> Optional[dt.date]:
+        """Første dato (None for et tomt datasæt)."""
+        return dt.date.fromordinal(self._datoer[0]) if self.rows else None
+
+    @property
+    def end(self) -> Optional[dt.date]:
+        """Sidste dato (None for et tomt datasæt)."""
+        return dt.date.fromordinal(self._datoer[-1]) if self.rows else None
+
+    def index(self, dato: dt.date) -> int:
+        """
+        Rækken for en dato.
+
+        Args:
+            dato (date): Datoen.
+
+        Returns:
+            int: Rækkeindeks.
+
+        Raises:
+            KeyError: Hvis datoen ikke findes.
+        """
+        o = dato.toordinal()
+        if self.contiguous:
+            i = o - self._første
+        else:
+            i = bisect_left(self._datoer, o)
+        if not 0 <= i < self.rows or self._datoer[i] != o:
+            raise KeyError(dato)
+        return i
+
+    def column(self, navn: str, fra: int = 0, til: Optional[int] = None):
+        """
+        Et udsnit af en søjle uden kopiering.
+
+        Args:
+            navn (str): Søjlenavn fra `KOLONNER`.
+            fra (int), til (int, optional): Rækkeindekser (til eksklusiv).
+
+        Returns:
+            memoryview eller array: Værdierne (på big-endian-maskiner en
+                                    vendt kopi).
+        """
+        kode, start = self._offsets[navn]
+        størrelse = array(kode).itemsize
+        til = self.rows if til is None else til
+        bytes_ = memoryview(self._mm)[start + størrelse * fra:start + størrelse * til]
+        if sys.byteorder == "big":
+            kopi = array(kode, bytes_.tobytes())
+            kopi.byteswap()
+            return kopi
+        return bytes_.cast(kode)
+
+    def slice(self, start: dt.date, slut: dt.date) -> Dict[str, memoryview]:
+        """
+        Alle søjler for et datointerval uden kopiering.
+
+        Args:
+            start, slut (date): Interval (begge inkl.); datoer uden for
+                                datasættet skæres fra.
+
+        Returns:
+            dict: Søjlenavn → memoryview.
+        """
+        fra = bisect_left(self._datoer, start.toordinal())
+        til = bisect_left(self._datoer, slut.toordinal() + 1)
+        return {navn: self.column(navn, fra, til) for navn, _ in KOLONNER}
+
+    def chunk(self, start: dt.date, antal_dage: int):
+        """
+        Fortløbende dage som `DayChunk`, så `DayRecord` kan bruges som ved
+        `pipeline.stream_days` (søjlerne er stadig memoryviews på filen).
+
+        Args:
+            start (date):     Første dag (skal findes i datasættet).
+            antal_dage (int): Antal dage.
+
+        Returns:
+            DayChunk: Bidden.
+
+        Raises:
+            KeyError:   Hvis start ikke findes.
+            ValueError: Hvis dagene ikke er fortløbende, eller intervallet
+                        går ud over datasættet.
+        """
+        from logik.pipeline import DayChunk
+
+        if not self.contiguous:
+            raise ValueError("Datasættet har huller; brug slice()")
+        fra = self.index(start)
+        if fra + antal_dage > self.rows:
+            raise ValueError("Intervallet går ud over datasættet")
+        søjler = {navn: self.column(navn, fra, fra + antal_dage) for navn, _ in KOLONNER[1:]}
+        tabel = WeatherTable(self.location, self.source)
+        tabel.columns = {navn: søjler[navn]
+                         for navn in WeatherRecord.VEJR_FELTER + WeatherRecord.TID_FELTER}
+        return DayChunk(start, søjler["phase"], søjler["illumination"], tabel)
+
+    @property
+    def nbytes(self) -> int:
+        """Filens størrelse i bytes."""
+        return len(self._mm)
+
+    def close(self) -> None:
+        if isinstance(self._datoer, memoryview):
+            self._datoer.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass                        # Udsnit i brug; mmap lukkes, når de frigives
+
+    def __enter__(self) -> "PackedDataset":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ──────────────────────────────────────────────
+# KOMMANDOLINJE
+# ──────────────────────────────────────────────
+
+def main(argv=None):
+    """
+    Skriver eller beskriver et datasæt fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Pakket binært datasæt med efemeride og vejr")
+    parser.add_argument("--info", metavar="FIL", help="Vis header for et eksisterende datasæt")
+    parser.add_argument("--lat", type=float, default=MoonConstants.LATITUDE)
+    parser.add_argument("--lon", type=float, default=MoonConstants.LONGITUDE)
+    parser.add_argument("--name", default="København")
+    parser.add_argument("--start", type=dt.date.fromisoformat, default=dt.date(2000, 1, 1))
+    parser.add_argument("--end", type=dt.date.fromisoformat, default=dt.date(2049, 12, 31))
+    parser.add_argument("--archive", action="store_true",
+                        help="Medtag vejr fra arkivlageret (se backfill.py)")
+    parser.add_argument("-o", "--output", default="lunarorbit.lods")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        with PackedDataset(args.info) as ds:
+            print(f"{args.info}: {ds.location} ({ds.latitude:.4f}, {ds.longitude:.4f}), "
+                  f"{ds.start} – {ds.end}, {ds.rows} dage, {ds.nbytes / 1024:.0f} KB, "
+                  f"{'fortløbende' if ds.contiguous else 'med huller'}"
+                  f"{', vejr: ' + ds.source if ds.source else ''}")
+        return
+
+    from logik.moon_api import MoonAPIClient
+
+    klient = MoonAPIClient(args.lat, args.lon, args.name)
+    arkiv = None
+    if args.archive:
+        # Importeres her: backfill henter data over netværket og kræver requests
+        from logik.backfill import STANDARD_MAPPE as ARKIV_MAPPE, ArchiveStore
+        from logik.tiles import sted_nøgle
+        arkiv = ArchiveStore.open(os.path.join(ARKIV_MAPPE, sted_nøgle(args.lat, args.lon)))
+    sti = write_dataset(args.output, klient, args.start, args.end, arkiv)
+    print(f"Datasæt skrevet til {sti} ({os.path.getsize(sti) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""
+Chebyshev-efemeride for LunarOrbit.
+
+Månens rektascension og deklination tilnærmes med Chebyshev-polynomier
+over faste tidsintervaller. Koefficienterne beregnes én gang ud fra den
+direkte serie og gemmes i en kompakt binær fil. Derefter er en
+positionsforespørgsel blot en polynomieevaluering (Clenshaw) for det
+interval tidspunktet ligger i.
+
+Det betaler sig kun, når serien bag er dyr. Standardefemeriden dækker
+derfor månen fra den fulde Meeus-serie ("meeus"-trinnet i
+lunar_models.py), hvor én evaluering koster ca. 70 µs mod et par µs for
+et opslag. Solens NOAA-formler er billigere end et opslag og evalueres
+direkte, men kan tages med via `legemer`. Der bygges én fil pr. år
+(`year_ephemeris`) første gang året bruges; `MeeusLunarModel.rise_set`
+og `LiveTracker` bygger videre på `ChebyshevSeries`.
+
+Ved tilpasning måles den største afvigelse mod den direkte serie på et
+tæt net af testpunkter i hvert interval. Overskrides tolerancen, afvises
+efemeriden, så den gemte `max_fejl` er en garanteret øvre grænse for de
+målte punkter. `python -m logik.ephemeris [år]` genmåler en gemt
+efemeride mod serien.
+
+Filformat (little-endian):
+    header:  magic (8 bytes) | antal legemer (uint32)
+    pr. legeme:
+             navn (8 bytes) | jd0 (float64) | intervallængde (float64)
+             | antal intervaller (uint32) | antal koefficienter (uint32)
+             | max fejl RA (float64) | max fejl dekl (float64)
+             | koefficienter (float64), ordnet [interval][RA, dekl][koefficient]
+"""
+
+import datetime as dt
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Callable, Dict, Optional, Tuple
+
+from logik.boilerplate import MoonConstants
+from logik.lunar_models import MeeusLunarModel
+from logik.moon_api import _julian_dag, _sol_ekvatorial
+
+
+MAGIC = b"LOCHEB1\0"
+
+# Største tilladte fejl i grader ved opbygning (0.0036")
+STANDARD_TOLERANCE = 1e-6
+
+# Dage ud over årsskiftet i hver ende af en årsefemeride, så lokale
+# døgn omkring nytår (midnat i UT ligger i det forrige år) er dækket
+ÅRS_MARGEN = 2.0
+
+# Juliansk dag for 1. januar 2000 0h UTC (nulpunkt for solserien)
+_JD_2000 = 2451544.5
+
+_HEADER  = struct.Struct("<8sI")
+_LEGEME  = struct.Struct("<8sddIIdd")
+
+_MEEUS = MeeusLunarModel()
+
+
+def _direkte_måne(JD: float) -> Tuple[float, float]:
+    """
+    Månens position fra den fulde Meeus-serie.
+
+    Args:
+        JD (float): Juliansk dag.
+
+    Returns:
+        tuple: (rektascension i grader, deklination i grader)
+    """
+    ra, dekl, _ = _MEEUS.position(JD)
+    return ra, dekl
+
+
+def _direkte_sol(JD: float) -> Tuple[float, float]:
+    """
+    Solens position fra den direkte serie.
+
+    Args:
+        JD (float): Juliansk dag.
+
+    Returns:
+        tuple: (rektascension i grader, deklination i grader)
+    """
+    ra, dekl = _sol_ekvatorial(JD - _JD_2000)
+    return ra, math.degrees(dekl)
+
+
+# Standardopsætning pr. legeme: (direkte serie, intervallængde i dage, koefficienter).
+# 4 dage med 13 koefficienter giver en målt fejl omkring 1e-8°.
+STANDARD_LEGEMER = {
+    "moon": (_direkte_måne, 4.0, 13),
+}
+
+# Solen kan tilføjes (`{**STANDARD_LEGEMER, **SOL_LEGEME}`), men dens direkte
+# serie er billigere end et Chebyshev-opslag
+SOL_LEGEME = {
+    "sun": (_direkte_sol, 32.0, 10),
+}
+
+
+def _vinkel_forskel(a: float, b: float) -> float:
+    """
+    Mindste forskel mellem to vinkler i grader (håndterer 0/360-overgangen).
+
+    Args:
+        a (float), b (float): Vinkler i grader.
+
+    Returns:
+        float: |a - b| reduceret til intervallet 0-180.
+    """
+    d = abs(a - b) % 360.0
+    return 360.0 - d if d > 180.0 else d
+
+
+class ChebyshevSeries:
+    """
+    Chebyshev-koefficienter for ét legeme over et sammenhængende tidsrum.
+
+    Attributes:
+        jd0 (float):          Starten af første interval.
+        interval (float):     Intervallængde i dage.
+        n_segmenter (int):    Antal intervaller.
+        n_koef (int):         Koefficienter pr. koordinat pr. interval.
+        koef (array):         Alle koefficienter (float64).
+        max_fejl_ra (float):  Største målte RA-fejl i grader.
+        max_fejl_dekl (float): Største målte deklinationsfejl i grader.
+    """
+
+    __slots__ = ("jd0", "interval", "n_segmenter", "n_koef", "koef",
+                 "max_fejl_ra", "max_fejl_dekl")
+
+    def __init__(self, jd0: float, interval: float, n_segmenter: int, n_koef: int,
+                 koef: array, max_fejl_ra: float = 0.0, max_fejl_dekl: float = 0.0):
+        self.jd0           = jd0
+        self.interval      = interval
+        self.n_segmenter   = n_segmenter
+        self.n_koef        = n_koef
+        self.koef          = koef
+        self.max_fejl_ra   = max_fejl_ra
+        self.max_fejl_dekl = max_fejl_dekl
+
+    @property
+    def jd_slut(self) -> float:
+        """Slutningen af sidste interval."""
+        return self.jd0 + self.n_segmenter * self.interval
+
+    @property
+    def max_error(self) -> float:
+        """Største målte fejl (grader) over begge koordinater."""
+        return max(self.max_fejl_ra, self.max_fejl_dekl)
+
+    @classmethod
+    def fit(cls, funktion: Callable[[float], Tuple[float, float]],
+            jd0: float, jd_slut: float, interval: float, n_koef: int,
+            prøver_pr_segment: int = 24) -> "ChebyshevSeries":
+        """
+        Tilpasser Chebyshev-polynomier til en positionsfunktion.
+
+        Koefficienterne findes ved interpolation i Chebyshev-knuderne.
+        RA "foldes ud" inden for hvert interval, så 360→0-springet ikke
+        ødelægger tilpasningen. Bagefter måles fejlen mod funktionen
+        (`measure_error`), og resultatet gemmes i `max_fejl_ra` og
+        `max_fejl_dekl`.
+
+        Args:
+            funktion (callable): JD → (RA grader, dekl grader).
+            jd0 (float):         Start-JD.
+            jd_slut (float):     Slut-JD (rundes op til helt interval).
+            interval (float):    Intervallængde i dage.
+            n_koef (int):        Antal koefficienter pr. koordinat.
+            prøver_pr_segment (int): Testpunkter pr. interval ved fejlmålingen.
+
+        Returns:
+            ChebyshevSeries: Den tilpassede serie med målt fejl.
+        """
+        n_segmenter = int(math.ceil((jd_slut - jd0) / interval))
+        N = n_koef
+        # Knuder i stigende tidsorden: x_k = -cos(θ_k)
+        thetas = [math.pi * (k + 0.5) / N for k in range(N)]
+        xs     = [-math.cos(t) for t in thetas]
+        cos_tabel = [[math.cos(j * (math.pi - t)) for t in thetas] for j in range(N)]
+
+        koef = array("d")
+        halv = interval / 2.0
+        for seg in range(n_segmenter):
+            midt = jd0 + seg * interval + halv
+            ra_værdier, dekl_værdier = [], []
+            forrige = None
+            for x in xs:
+                ra, dekl = funktion(midt + x * halv)
+                if forrige is not None:
+                    # Fold RA ud så værdierne er kontinuerte i intervallet
+                    while ra - forrige > 180.0:
+                        ra -= 360.0
+                    while ra - forrige < -180.0:
+                        ra += 360.0
+                forrige = ra
+                ra_værdier.append(ra)
+                dekl_værdier.append(dekl)
+
+            for værdier in (ra_værdier, dekl_værdier):
+                for j in range(N):
+                    c = 2.0 / N * sum(v * cos_tabel[j][k] for k, v in enumerate(værdier))
+                    koef.append(c / 2.0 if j == 0 else c)
+
+        serie = cls(jd0, interval, n_segmenter, n_koef, koef)
+        serie.max_fejl_ra, serie.max_fejl_dekl = serie.measure_error(funktion, prøver_pr_segment)
+        return serie
+
+    def evaluate(self, JD: float) -> Tuple[float, float]:
+        """
+        Evaluerer RA og deklination ved et tidspunkt (Clenshaw-rekursion).
+
+        Args:
+            JD (float): Juliansk dag inden for seriens dækning.
+
+        Returns:
+            tuple: (RA i grader 0-360, deklination i grader)
+
+        Raises:
+            ValueError: Hvis JD ligger uden for dækningen.
+        """
+        seg, rest = divmod(JD - self.jd0, self.interval)
+        seg = int(seg)
+        if seg == self.n_segmenter and rest == 0.0:
+            seg, rest = seg - 1, self.interval     # Præcis på slutpunktet
+        if not 0 <= seg < self.n_segmenter:
+            raise ValueError(f"JD {JD} ligger uden for efemeridens dækning "
+                             f"({self.jd0} - {self.jd_slut})")
+
+        x  = 2.0 * rest / self.interval - 1.0
+        x2 = 2.0 * x
+        n  = self.n_koef
+        k  = self.koef
+        ra0 = seg * 2 * n
+        de0 = ra0 + n
+
+        # Begge koordinater i samme løkke for at spare Python-overhead
+        ra1 = ra2 = de1 = de2 = 0.0
+        for i in range(n - 1, 0, -1):
+            ra1, ra2 = x2 * ra1 - ra2 + k[ra0 + i], ra1
+            de1, de2 = x2 * de1 - de2 + k[de0 + i], de1
+
+        return (x * ra1 - ra2 + k[ra0]) % 360.0, x * de1 - de2 + k[de0]
+
+    def measure_error(self, funktion: Callable[[float], Tuple[float, float]],
+                      prøver_pr_segment: int = 24) -> Tuple[float, float]:
+        """
+        Måler største afvigelse mod den direkte serie.
+
+        Testpunkterne ligger jævnt fordelt i hvert interval inkl. begge
+        endepunkter, dvs. også mellem Chebyshev-knuderne.
+
+        Args:
+            funktion (callable):     JD → (RA grader, dekl grader).
+            prøver_pr_segment (int): Testpunkter pr. interval.
+
+        Returns:
+            tuple: (max RA-fejl, max dekl-fejl) i grader.
+        """
+        max_ra = max_dekl = 0.0
+        trin = self.interval / (prøver_pr_segment - 1)
+        for seg in range(self.n_segmenter):
+            start = self.jd0 + seg * self.interval
+            for i in range(prøver_pr_segment):
+                JD = start + i * trin
+                if i == prøver_pr_segment - 1:
+                    JD = min(JD, self.jd_slut)
+                ra_c, dekl_c = self.evaluate(JD)
+                ra_d, dekl_d = funktion(JD)
+                max_ra   = max(max_ra, _vinkel_forskel(ra_c, ra_d))
+                max_dekl = max(max_dekl, abs(dekl_c - dekl_d))
+        return max_ra, max_dekl
+
+
+class ChebyshevEphemeris:
+    """
+    Chebyshev-efemeride for et eller flere legemer.
+
+    Bygges med `build()`, gemmes med `save()` og indlæses med `load()`.
+    Forespørgsler (`moon_position`, `sun_position`) er rene
+    polynomieevalueringer.
+    """
+
+    def __init__(self, serier: Dict[str, ChebyshevSeries]):
+        """
+        Args:
+            serier (dict): Legemenavn → ChebyshevSeries.
+        """
+        self.serier = serier
+
+    # ── Opbygning og I/O ──
+
+    @classmethod
+    def build(cls, jd0: float, jd_slut: float, tolerance: float = STANDARD_TOLERANCE,
+              legemer: Optional[Dict] = None) -> "ChebyshevEphemeris":
+        """
+        Bygger efemeriden og verificerer fejlgrænsen.
+
+        Args:
+            jd0 (float):       Start-JD.
+            jd_slut (float):   Slut-JD.
+            tolerance (float): Maksimal tilladt fejl i grader.
+            legemer (dict, optional): Navn → (funktion, interval, koefficienter).
+                Standard: `STANDARD_LEGEMER`.
+
+        Returns:
+            ChebyshevEphemeris: Den færdige efemeride.
+
+        Raises:
+            ValueError: Hvis den målte fejl overskrider tolerancen.
+        """
+        legemer = legemer or STANDARD_LEGEMER
+        serier = {}
+        for navn, (funktion, interval, n_koef) in legemer.items():
+            serie = ChebyshevSeries.fit(funktion, jd0, jd_slut, interval, n_koef)
+            if serie.max_error > tolerance:
+                raise ValueError(f"Chebyshev-fejl for {navn} er {serie.max_error:.2e}° "
+                                 f"(tolerance {tolerance:.2e}°)")
+            serier[navn] = serie
+        return cls(serier)
+
+    def save(self, sti: str) -> None:
+        """
+        Gemmer efemeriden i det binære filformat.
+
+        Filen skrives under et midlertidigt navn pr. proces og flyttes på
+        plads til sidst, så samtidige processer (f.eks. tile-puljen) aldrig
+        ser en halv fil.
+
+        Args:
+            sti (str): Filsti.
+        """
+        os.makedirs(os.path.dirname(sti) or ".", exist_ok=True)
+        midlertidig = f"{sti}.{os.getpid()}.tmp"
+        with open(midlertidig, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(self.serier)))
+            for navn, s in self.serier.items():
+                f.write(_LEGEME.pack(navn.encode("ascii").ljust(8, b"\0"),
+                                     s.jd0, s.interval, s.n_segmenter, s.n_koef,
+                                     s.max_fejl_ra, s.max_fejl_dekl))
+                koef = s.koef
+                if sys.byteorder == "big":
+                    koef = array("d", koef)
+                    koef.byteswap()
+                koef.tofile(f)
+        os.replace(midlertidig, sti)
+
+    @classmethod
+    def load(cls, sti: str) -> "ChebyshevEphemeris":
+        """
+        Indlæser en efemeride fra fil.
+
+        Args:
+            sti (str): Filsti.
+
+        Returns:
+            ChebyshevEphemeris: Den indlæste efemeride.
+
+        Raises:
+            ValueError: Hvis filen ikke er en gyldig efemeridefil, er
+                afkortet eller har overskydende bytes.
+        """
+        with open(sti, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{sti} er afkortet (header)")
+        magic, antal = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{sti} er ikke en LunarOrbit-efemeridefil")
+
+        pos = _HEADER.size
+        serier = {}
+        for _ in range(antal):
+            if pos + _LEGEME.size > len(data):
+                raise ValueError(f"{sti} er afkortet (legemehoved ved byte {pos})")
+            navn, jd0, interval, n_seg, n_koef, fejl_ra, fejl_dekl = \
+                _LEGEME.unpack_from(data, pos)
+            navn = navn.rstrip(b"\0").decode("ascii")
+            pos += _LEGEME.size
+            n_bytes = n_seg * 2 * n_koef * 8
+            if pos + n_bytes > len(data):
+                raise ValueError(f"{sti} er afkortet: {navn} mangler "
+                                 f"{pos + n_bytes - len(data)} bytes koefficienter")
+            koef = array("d")
+            koef.frombytes(data[pos:pos + n_bytes])
+            if sys.byteorder == "big":
+                koef.byteswap()
+            pos += n_bytes
+            serier[navn] = ChebyshevSeries(jd0, interval, n_seg, n_koef, koef,
+                                           fejl_ra, fejl_dekl)
+        if pos != len(data):
+            raise ValueError(f"{sti} har {len(data) - pos} overskydende bytes")
+        return cls(serier)
+
+    # ── Forespørgsler ──
+
+    def moon_position(self, JD: float) -> Tuple[float, float]:
+        """
+        Månens position ved et tidspunkt.
+
+        Args:
+            JD (float): Juliansk dag.
+
+        Returns:
+            tuple: (RA i grader 0-360, deklination i grader)
+        """
+        return self.serier["moon"].evaluate(JD)
+
+    def sun_position(self, JD: float) -> Tuple[float, float]:
+        """
+        Solens position ved et tidspunkt (kun hvis solen er med i efemeriden).
+
+        Args:
+            JD (float): Juliansk dag.
+
+        Returns:
+            tuple: (RA i grader 0-360, deklination i grader)
+        """
+        return self.serier["sun"].evaluate(JD)
+
+    def covers(self, jd0: float, jd_slut: Optional[float] = None) -> bool:
+        """
+        Tjekker om alle legemer dækker et tidspunkt eller et interval.
+
+        Args:
+            jd0 (float):               Juliansk dag (intervallets start).
+            jd_slut (float, optional): Intervallets slutning.
+
+        Returns:
+            bool: True hvis hele intervallet ligger inden for dækningen.
+        """
+        jd_slut = jd0 if jd_slut is None else jd_slut
+        return all(s.jd0 <= jd0 and jd_slut <= s.jd_slut for s in self.serier.values())
+
+    @property
+    def max_error(self) -> float:
+        """Største gemte fejl (grader) over alle legemer og koordinater."""
+        return max(s.max_error for s in self.serier.values())
+
+    def verify(self, prøver_pr_segment: int = 24,
+               legemer: Optional[Dict] = None) -> Dict[str, Tuple[float, float]]:
+        """
+        Genmåler fejlen mod de direkte serier og tjekker den gemte grænse.
+
+        Args:
+            prøver_pr_segment (int): Testpunkter pr. interval.
+            legemer (dict, optional): Som i `build()`.
+
+        Returns:
+            dict: Legemenavn → (max RA-fejl, max dekl-fejl) i grader.
+
+        Raises:
+            ValueError: Hvis en målt fejl overstiger den gemte grænse.
+        """
+        legemer = legemer or {**STANDARD_LEGEMER, **SOL_LEGEME}
+        resultat = {}
+        for navn, serie in self.serier.items():
+            målt = serie.measure_error(legemer[navn][0], prøver_pr_segment)
+            if max(målt) > serie.max_error * (1 + 1e-9) + 1e-12:
+                raise ValueError(f"{navn}: målt fejl {max(målt):.2e}° overstiger "
+                                 f"gemt grænse {serie.max_error:.2e}°")
+            resultat[navn] = målt
+        return resultat
+
+
+# ──────────────────────────────────────────────
+# FILER PR. ÅR
+# ──────────────────────────────────────────────
+
+def år_til_jd(år: int) -> float:
+    """
+    Juliansk dag for 1. januar 0h UTC i et år.
+
+    Args:
+        år (int): Årstal.
+
+    Returns:
+        float: Juliansk dag.
+    """
+    return _julian_dag(år, 1, 1)
+
+
+def ephemeris_path(år: int) -> str:
+    """
+    Stien til standardefemeriden for et år.
+
+    Args:
+        år (int): Årstal.
+
+    Returns:
+        str: Sti til filen i DATA_DIR.
+    """
+    return os.path.join(MoonConstants.DATA_DIR, f"ephemeris_{år}.bin")
+
+
+def load_or_build(sti: str, jd0: float, jd_slut: float,
+                  tolerance: float = STANDARD_TOLERANCE,
+                  legemer: Optional[Dict] = None) -> ChebyshevEphemeris:
+    """
+    Indlæser efemeriden fra fil, eller bygger og gemmer den.
+
+    En gemt fil genbruges kun, hvis den dækker intervallet, har alle
+    legemer og overholder tolerancen; ellers bygges den forfra.
+
+    Args:
+        sti (str):         Filsti.
+        jd0 (float):       Start-JD for dækningen.
+        jd_slut (float):   Slut-JD for dækningen.
+        tolerance (float): Maksimal tilladt fejl i grader.
+        legemer (dict, optional): Som i `ChebyshevEphemeris.build()`.
+
+    Returns:
+        ChebyshevEphemeris: Klar til brug.
+
+    Raises:
+        ValueError: Hvis en ny efemeride ikke kan overholde tolerancen.
+    """
+    legemer = legemer or STANDARD_LEGEMER
+    if os.path.exists(sti):
+        try:
+            efemeride = ChebyshevEphemeris.load(sti)
+            if (set(legemer) <= set(efemeride.serier) and efemeride.covers(jd0, jd_slut)
+                    and efemeride.max_error <= tolerance):
+                return efemeride
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Advarsel: Kunne ikke indlæse efemeride, bygger ny: {e}")
+    efemeride = ChebyshevEphemeris.build(jd0, jd_slut, tolerance, legemer)
+    try:
+        efemeride.save(sti)
+    except OSError as e:
+        print(f"Advarsel: Kunne ikke gemme efemeride: {e}")
+    return efemeride
+
+
+_år_cache: Dict[int, ChebyshevEphemeris] = {}
+_år_lås = threading.Lock()
+
+
+def year_ephemeris(år: int) -> ChebyshevEphemeris:
+    """
+    Standardefemeriden for ét år (plus `ÅRS_MARGEN` dage i hver ende).
+
+    Indlæses fra DATA_DIR eller bygges og gemmes første gang året bruges
+    (ca. 0,3 s), og holdes derefter i hukommelsen.
+
+    Args:
+        år (int): Årstal.
+
+    Returns:
+        ChebyshevEphemeris: Efemeriden for året.
+    """
+    with _år_lås:
+        efemeride = _år_cache.get(år)
+        if efemeride is None:
+            efemeride = load_or_build(ephemeris_path(år), år_til_jd(år) - ÅRS_MARGEN,
+                                      år_til_jd(år + 1) + ÅRS_MARGEN)
+            _år_cache[år] = efemeride
+        return efemeride
+
+
+def main() -> int:
+    """Indlæser (eller bygger) årets efemeride og genmåler fejlen."""
+    år = int(sys.argv[1]) if len(sys.argv) > 1 else dt.date.today().year
+    efemeride = year_ephemeris(år)
+    print(f"Efemeride {år}: {ephemeris_path(år)}")
+    try:
+        for navn, (fejl_ra, fejl_dekl) in efemeride.verify().items():
+            print(f"  {navn:<6} RA {fejl_ra:.2e}°  dekl {fejl_dekl:.2e}°  "
+                  f"(tolerance {STANDARD_TOLERANCE:.0e}°)")
+    except ValueError as e:
+        print(f"FEJL: {e}")
+        return 1
+    ok = efemeride.max_error <= STANDARD_TOLERANCE
+    print("Fejlgrænse OK" if ok else "FEJLGRÆNSE OVERSKREDET")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,535 @@
+"""
+Headless kørsel af LunarOrbit med et scriptet testforløb.
+
+`LunarOrbitApp` kunne hidtil kun afprøves i hånden. Dette modul kører
+appen på en virtuel skærm (Xvfb) og afspiller et fast forløb af
+slider-sweeps, størrelsesændringer og nulstillinger, mens der måles:
+
+  - Latens pr. hændelse: fra handlingen udføres, til den tilhørende
+    visningstilstand er anvendt og tegnet (`update_idletasks`).
+  - Frame-timing: intervallet mellem hovedløkkens frames (en fast
+    `after(FRAME_MS)`-puls). Lange frames betyder, at UI'et hakker.
+
+Kørslen er deterministisk:
+
+  - Netværket erstattes af den lokale stand-in (`logik/meteo_stub.py`)
+    i "synthetic"-tilstand.
+  - "I dag" er en fast dato, og DATA_DIR er en tom midlertidig mappe
+    (ingen snapshot, tiles eller klimanormaler fra tidligere kørsler).
+
+Rapporten (p50/p95/maks. pr. hændelsestype, frames, arbejdstråd og stub)
+printes og kan gemmes som JSON til sammenligning i CI. Med `--max-p95`
+afsluttes med kode 1, hvis en hændelsestype er for langsom.
+
+Kør (kræver Xvfb, f.eks. `apt install xvfb`, eller en eksisterende DISPLAY):
+    python -m logik.headless --report ui_perf.json --max-p95 50
+
+Script-filer er JSON-lister af trin, f.eks.:
+    [["sweep", 50, 100, 0.5], ["release"], ["resize", 1280, 800], ["reset"]]
+"""
+
+import argparse
+import json
+import os
+import platform
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Kun standardbiblioteket på modulniveau (DATA_DIR sættes før logik-modulerne)
+from logik.meteo_stub import _percentil
+
+
+# Fast "i dag" for gentagelige kørsler
+STANDARD_DATO = "2025-06-21"
+
+# Millisekunder mellem slider-tik i sweeps (musebevægelse ved ca. 125 Hz)
+TICK_MS = 8
+
+# Hvor længe en hændelse må vente på sin tilstand
+TIMEOUT_MS = 5000
+
+# Handlinger der venter på deres egen tilstand, før næste trin udføres
+_BLOKERENDE = {"resize", "reset", "step"}
+
+
+# ──────────────────────────────────────────────
+# VIRTUEL SKÆRM
+# ──────────────────────────────────────────────
+
+class VirtualDisplay:
+    """
+    Starter en Xvfb-server og sætter DISPLAY, så Tk kan køre uden skærm.
+
+    Serveren vælger selv et ledigt skærmnummer (`-displayfd`).
+    """
+
+    def __init__(self, bredde: int = 1280, højde: int = 1024, dybde: int = 24):
+        self.størrelse = f"{bredde}x{højde}x{dybde}"
+        self.display: Optional[str] = None
+        self._proces: Optional[subprocess.Popen] = None
+        self._forrige = None
+
+    def start(self, timeout: float = 10.0) -> str:
+        """
+        Starter Xvfb.
+
+        Args:
+            timeout (float): Sekunder der ventes på, at serveren er klar.
+
+        Returns:
+            str: Skærmen, f.eks. ":99".
+
+        Raises:
+            RuntimeError: Hvis Xvfb ikke er installeret eller ikke starter.
+        """
+        xvfb = shutil.which("Xvfb")
+        if xvfb is None:
+            raise RuntimeError("Xvfb blev ikke fundet – installer xvfb "
+                               "(apt install xvfb) eller kør med en DISPLAY")
+        læs, skriv = os.pipe()
+        self._proces = subprocess.Popen(
+            [xvfb, "-displayfd", str(skriv), "-screen", "0", self.størrelse, "-nolisten", "tcp"],
+            pass_fds=(skriv,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.close(skriv)
+
+        # Xvfb skriver skærmnummeret (og et linjeskift), når den er klar
+        svar, frist = b"", time.monotonic() + timeout
+        try:
+            while not svar.endswith(b"\n"):
+                rest = frist - time.monotonic()
+                if rest <= 0 or not select.select([læs], [], [], rest)[0]:
+                    break
+                blok = os.read(læs, 16)
+                if not blok:
+                    break
+                svar += blok
+        finally:
+            os.close(læs)
+        if not svar.strip().isdigit():
+            self.stop()
+            raise RuntimeError("Xvfb startede ikke")
+
+        self.display = f":{svar.strip().decode()}"
+        self._forrige = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = self.display
+        return self.display
+
+    def stop(self) -> None:
+        """Stopper serveren og gendanner DISPLAY."""
+        if self._proces is not None:
+            self._proces.terminate()
+            try:
+                self._proces.wait(5)
+            except subprocess.TimeoutExpired:
+                self._proces.kill()
+            self._proces = None
+        if self.display is not None:
+            if self._forrige is None:
+                os.environ.pop("DISPLAY", None)
+            else:
+                os.environ["DISPLAY"] = self._forrige
+            self.display = None
+
+    def __enter__(self) -> "VirtualDisplay":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# ──────────────────────────────────────────────
+# SCRIPT
+# ──────────────────────────────────────────────
+
+def default_script() -> List[list]:
+    """
+    Standardforløbet: sweeps i begge retninger med recenter ved kanten,
+    piletaster, størrelsesændringer og nulstilling.
+
+    Returns:
+        list: Trin (se `expand_script`).
+    """
+    return [
+        ["wait", 500],
+        ["sweep", 50, 100, 0.5], ["release"],
+        ["sweep", 50, 0, 0.5], ["release"],
+        ["reset"],
+        ["step", 1, 20], ["step", -1, 20],
+        ["resize", 1280, 800], ["resize", 640, 480], ["resize", 1024, 768], ["resize", 900, 700],
+        ["sweep", 50, 75, 0.25], ["sweep", 75, 25, 0.25], ["release"],
+        ["reset"],
+    ]
+
+
+def expand_script(script: List[list]) -> List[tuple]:
+    """
+    Folder scriptets trin ud til enkelte handlinger.
+
+    Trin:
+        ["sweep", fra, til, skridt]  Slider-tik fra → til (0-100).
+        ["release"]                  Slip slideren (recenter ved kanten).
+        ["step", dage, antal]        Piletast `antal` gange.
+        ["resize", bredde, højde]    Ny vinduesstørrelse.
+        ["reset"]                    "Tilbage til i dag".
+        ["wait", ms]                 Pause.
+
+    Args:
+        script (list): Trin som ovenfor.
+
+    Returns:
+        list: Handlinger ("slider", værdi), ("step", dage), ("resize", b, h) osv.
+
+    Raises:
+        ValueError: Ved ukendte trin eller skridt ≤ 0.
+    """
+    handlinger = []
+    for trin in script:
+        navn, args = trin[0], list(trin[1:])
+        if navn == "sweep":
+            fra, til, skridt = args
+            if skridt <= 0:
+                raise ValueError("Skridt skal være positivt")
+            retning = 1 if til >= fra else -1
+            antal = int(round(abs(til - fra) / skridt))
+            handlinger.extend(("slider", fra + retning * skridt * i) for i in range(1, antal + 1))
+        elif navn == "step":
+            dage, antal = args
+            handlinger.extend([("step", dage)] * antal)
+        elif navn in ("release", "reset", "resize", "wait"):
+            handlinger.append((navn, *args))
+        else:
+            raise ValueError(f"Ukendt trin '{navn}'")
+    return handlinger
+
+
+def summarize(målinger: List[float]) -> Dict[str, float]:
+    """
+    Antal, p50, p95 og maks. af en liste målinger i ms.
+
+    Args:
+        målinger (list): Værdier i ms.
+
+    Returns:
+        dict: 'count', 'p50_ms', 'p95_ms', 'max_ms'.
+    """
+    sorteret = sorted(målinger)
+    return {
+        "count":  len(sorteret),
+        "p50_ms": round(_percentil(sorteret, 50), 3),
+        "p95_ms": round(_percentil(sorteret, 95), 3),
+        "max_ms": round(sorteret[-1], 3) if sorteret else 0.0,
+    }
+
+
+# ──────────────────────────────────────────────
+# DRIVER
+# ──────────────────────────────────────────────
+
+class HeadlessDriver:
+    """
+    Afspiller handlinger på en kørende `LunarOrbitApp` via Tk's event-loop.
+
+    Handlingerne kalder de samme metoder som widgets (sliderens command,
+    piletasterne, reset-knappen og `geometry`). Slider-tik udføres i fast
+    takt uden at vente på UI'et, som når musen trækkes; de øvrige venter
+    på deres egen tilstand.
+    """
+
+    def __init__(self, app, handlinger: List[tuple], tick_ms: int = TICK_MS,
+                 timeout_ms: int = TIMEOUT_MS):
+        """
+        Args:
+            app (LunarOrbitApp): Appen (oprettet, men mainloop ikke startet).
+            handlinger (list):   Fra `expand_script`.
+            tick_ms (int):       Takt for slider-tik.
+            timeout_ms (int):    Maks. ventetid pr. hændelse.
+        """
+        from logik.viewstate import FRAME_MS
+
+        self.app        = app
+        self.handlinger = list(handlinger)
+        self.tick_ms    = tick_ms
+        self.timeout_ms = timeout_ms
+        self.frame_ms   = FRAME_MS
+
+        self.latenser: Dict[str, List[float]] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.frames: List[float] = []
+        self._ventende: List[tuple] = []      # (type, start, er færdig?)
+        self._næste = 0
+        self._blokeret = False
+        self._færdig = False
+        self._sidste_frame = None
+        self.start_tid = self.slut_tid = None
+
+    def start(self) -> None:
+        """Starter forløbet, når appen har vist sin første måne."""
+        self._puls()
+        self._vent_på_opstart()
+
+    def _vent_på_opstart(self) -> None:
+        if "moon" not in self.app._timer.names:
+            self.app.after(10, self._vent_på_opstart)
+            return
+        self.start_tid = time.perf_counter()
+        self._kør_næste()
+        self._tjek()
+
+    # ── Frames ──
+
+    def _puls(self) -> None:
+        """Fast puls: intervallet mellem kald er hovedløkkens frame-tid."""
+        nu = time.perf_counter()
+        if self._sidste_frame is not None and self.start_tid is not None:
+            self.frames.append((nu - self._sidste_frame) * 1000)
+        self._sidste_frame = nu
+        if not self._færdig:
+            self.app.after(self.frame_ms, self._puls)
+
+    # ── Handlinger ──
+
+    def _kør_næste(self) -> None:
+        if self._næste >= len(self.handlinger):
+            return
+        handling = self.handlinger[self._næste]
+        self._næste += 1
+        navn, app = handling[0], self.app
+        t0 = time.perf_counter()
+        forrige_seq = app.requested_seq
+
+        if navn == "wait":
+            self._blokeret = True
+            app.after(int(handling[1]), self._efter_pause)
+            return
+        if navn == "slider":
+            app.date_slider.set(handling[1])
+            app._on_slider_change(handling[1])
+        elif navn == "release":
+            app._on_slider_release()
+        elif navn == "step":
+            app._step(handling[1])
+        elif navn == "reset":
+            app._reset_to_today()
+        elif navn == "resize":
+            app.geometry(f"{handling[1]}x{handling[2]}")
+
+        if navn == "resize":
+            størrelse = (handling[1], handling[2])
+            self._ventende.append((navn, t0, lambda: app._bg_size == størrelse))
+        elif app.requested_seq != forrige_seq:
+            seq = app.requested_seq
+            self._ventende.append((navn, t0, lambda: app.applied_seq >= seq))
+        else:
+            # Ingen ny tilstand (f.eks. slider-tik inden for samme dag)
+            self._registrer(navn, t0)
+
+        if navn in _BLOKERENDE and self._ventende:
+            self._blokeret = True
+        else:
+            app.after(self.tick_ms, self._kør_næste)
+
+    def _efter_pause(self) -> None:
+        self._blokeret = False
+        self._kør_næste()
+
+    def _registrer(self, navn: str, t0: float) -> None:
+        self.latenser.setdefault(navn, []).append((time.perf_counter() - t0) * 1000)
+
+    def _tjek(self) -> None:
+        """Afslutter ventende hændelser, hvis tilstand er anvendt (hvert ms)."""
+        if self._ventende:
+            nu = time.perf_counter()
+            færdige = [v for v in self._ventende if v[2]()]
+            if færdige:
+                # Tving optegning, så latensen dækker hele vejen til skærmen
+                self.app.update_idletasks()
+            for v in færdige:
+                self._registrer(v[0], v[1])
+            udløbne = [v for v in self._ventende
+                       if v not in færdige and (nu - v[1]) * 1000 > self.timeout_ms]
+            for v in udløbne:
+                self.timeouts[v[0]] = self.timeouts.get(v[0], 0) + 1
+            self._ventende = [v for v in self._ventende if v not in færdige and v not in udløbne]
+            if self._blokeret and not self._ventende:
+                self._blokeret = False
+                self.app.after(self.tick_ms, self._kør_næste)
+
+        if self._næste >= len(self.handlinger) and not self._ventende and not self._blokeret:
+            self._færdig = True
+            self.slut_tid = time.perf_counter()
+            self.app.after(self.frame_ms * 2, self.app._on_close)
+            return
+        self.app.after(1, self._tjek)
+
+    # ── Rapport ──
+
+    def report(self) -> Dict:
+        """
+        Latens pr. hændelsestype, frames og arbejdstrådens statistik.
+
+        Returns:
+            dict: Klar til JSON.
+        """
+        hændelser = {}
+        for navn in sorted(set(self.latenser) | set(self.timeouts)):
+            hændelser[navn] = dict(summarize(self.latenser.get(navn, [])),
+                                   timeouts=self.timeouts.get(navn, 0))
+        frames = summarize(self.frames)
+        frames["long"] = sum(1 for f in self.frames if f > 2 * self.frame_ms)
+        return {
+            "events":     hændelser,
+            "frames":     frames,
+            "startup":    [{"stage": navn, "ms": round(etape, 3), "total_ms": round(samlet, 3)}
+                           for navn, etape, samlet in self.app._timer.report()],
+            "imports":    [{"module": navn, "ms": round(ms, 3)} for navn, ms in self.app._timer.importer],
+            "worker":     {k: round(v, 3) for k, v in self.app.view_worker.report().items()},
+            "duration_s": round((self.slut_tid or time.perf_counter()) - (self.start_tid or 0), 3),
+        }
+
+
+# ──────────────────────────────────────────────
+# KØRSEL
+# ──────────────────────────────────────────────
+
+def run(script: Optional[List[list]] = None, today: str = STANDARD_DATO,
+        latens: float = 0.02, tick_ms: int = TICK_MS, seed: int = 0) -> Dict:
+    """
+    Kører appen med et script mod stand-in-serveren og returnerer rapporten.
+
+    Kræver en skærm (DISPLAY); se `VirtualDisplay`. DATA_DIR skal være sat
+    (LUNARORBIT_DATA), før logik-modulerne importeres – det gør `main()`.
+
+    Args:
+        script (list, optional): Trin (standard: `default_script()`).
+        today (str):             Fast "i dag".
+        latens (float):          Stubbens svartid i sekunder.
+        tick_ms (int):           Takt for slider-tik.
+        seed (int):              Seed for stubben.
+
+    Returns:
+        dict: Rapporten (se `HeadlessDriver.report`) med meta og stub-statistik.
+    """
+    # Importeres her, så DATA_DIR og DISPLAY er sat først
+    from logik.meteo_stub import OpenMeteoStub, StubConfig, point_client_at
+    from logik.startup import StartupTimer
+    from logik.UI import LunarOrbitApp
+
+    script = script or default_script()
+    stub = OpenMeteoStub(StubConfig("synthetic", latens=latens, seed=seed))
+    url, stop = stub.run_in_thread()
+    try:
+        app = LunarOrbitApp(timer=StartupTimer(), today=today)
+        # Før mainloop: ingen hentning er startet endnu
+        point_client_at(app.api_client, url)
+        driver = HeadlessDriver(app, expand_script(script), tick_ms)
+        tk_version = str(app.tk.call("info", "patchlevel"))
+        driver.start()
+        app.mainloop()
+    finally:
+        stop()
+
+    rapport = driver.report()
+    rapport["stub"] = dict(stub.stats)
+    rapport["meta"] = {"today": today, "latency_s": latens, "tick_ms": tick_ms,
+                       "actions": len(driver.handlinger), "python": platform.python_version(),
+                       "tk": tk_version,
+                       "display": os.environ.get("DISPLAY", "")}
+    return rapport
+
+
+def print_report(rapport: Dict) -> None:
+    """Printer rapporten som tabeller."""
+    print("\nHændelser (ms til tilstanden er tegnet)")
+    print("─" * 64)
+    print(f"  {'type':<10} {'antal':>6} {'p50':>9} {'p95':>9} {'maks':>9} {'timeout':>8}")
+    for navn, r in rapport["events"].items():
+        print(f"  {navn:<10} {r['count']:>6} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['max_ms']:>9.2f} {r['timeouts']:>8}")
+    f = rapport["frames"]
+    print(f"\nFrames: {f['count']}  p50 {f['p50_ms']:.2f} ms  p95 {f['p95_ms']:.2f} ms  "
+          f"maks {f['max_ms']:.2f} ms  lange {f['long']}")
+    w = rapport["worker"]
+    print(f"Arbejdstråd: {w['requests']:.0f} anmodninger, {w['built']:.0f} bygget, "
+          f"{w['skipped']:.0f} sprunget over, {w['fetches']:.0f} hentninger")
+    print(f"Stub: {rapport['stub']['requests']} forespørgsler   Varighed: {rapport['duration_s']} s")
+
+
+def check_budget(rapport: Dict, max_p95: Optional[float]) -> List[str]:
+    """
+    Overtrædelser af budgettet (timeouts og p95 over grænsen).
+
+    Args:
+        rapport (dict):  Fra `run`.
+        max_p95 (float, optional): Grænse i ms for hver hændelsestype.
+
+    Returns:
+        list: Beskrivelser; tom hvis alt er inden for budget.
+    """
+    fejl = []
+    for navn, r in rapport["events"].items():
+        if r["timeouts"]:
+            fejl.append(f"{navn}: {r['timeouts']} timeouts")
+        if max_p95 is not None and r["p95_ms"] > max_p95:
+            fejl.append(f"{navn}: p95 {r['p95_ms']:.1f} ms > {max_p95:.1f} ms")
+    return fejl
+
+
+def main(argv=None):
+    """
+    Kører headless-forløbet fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Headless UI-ydelsestest for LunarOrbit")
+    parser.add_argument("--script", help="JSON-fil med trin (standard: indbygget forløb)")
+    parser.add_argument("--report", help="Gem rapporten som JSON")
+    parser.add_argument("--today", default=STANDARD_DATO, help="Fast 'i dag' (YYYY-MM-DD)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stubbens svartid (s)")
+    parser.add_argument("--tick", type=int, default=TICK_MS, help="Slider-takt (ms)")
+    parser.add_argument("--max-p95", type=float, default=None,
+                        help="Afslut med kode 1 hvis en hændelses p95 overstiger (ms)")
+    parser.add_argument("--use-display", action="store_true",
+                        help="Brug den eksisterende DISPLAY i stedet for Xvfb")
+    args = parser.parse_args(argv)
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix="lunarorbit-headless-") as data_dir:
+        os.environ["LUNARORBIT_DATA"] = data_dir
+        skærm = None if args.use_display else VirtualDisplay()
+        try:
+            if skærm is not None:
+                skærm.start()
+            rapport = run(script, args.today, args.latency, args.tick)
+        except RuntimeError as e:
+            print(f"Fejl: {e}")
+            sys.exit(2)
+        finally:
+            if skærm is not None:
+                skærm.stop()
+
+    print_report(rapport)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, ensure_ascii=False, indent=2)
+        print(f"Rapport gemt i {args.report}")
+
+    fejl = check_budget(rapport, args.max_p95)
+    for linje in fejl:
+        print(f"Over budget: {linje}")
+    if fejl:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Batch-kerner for de astronomiske beregninger.
+
+Kernerne beregner juliansk dag, solens og månens position, månefasen og
+sol- og månetider for mange dage på én gang. Der er to backends, og den
+vælges automatisk ved import:
+
+  - "numba":  Hvis numba (og numpy) er installeret, oversættes kernerne
+              til maskinkode med `numba.njit` første gang de bruges.
+  - "python": Ellers køres præcis de samme funktioner som ren Python.
+
+Formlerne står kun ét sted: kernerne er de skalare funktioner fra
+moon_api.py (`_julian_dag`, `_sol_position`, `_måne_position`,
+`_opgang_nedgang` osv.), som `_kompiler` oversætter. Modulet selv
+indeholder kun løkkerne. `ObserverContext.solar_events_range` og
+`moon_events_range` (og dermed `pipeline.compute_chunk` og
+`tiles.compute_tile`) bruger kernerne.
+
+`verify()` sammenligner den aktive backend med de skalare funktioner og
+med `ObserverContext` dag for dag. `python -m logik.kernels` kører
+kontrollen.
+
+Miljøvariablen LUNARORBIT_KERNELS=python tvinger den rene Python-backend
+(f.eks. for at sammenligne).
+"""
+
+import datetime as dt
+import math
+import os
+import sys
+import types
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from logik import moon_api
+
+try:
+    if os.environ.get("LUNARORBIT_KERNELS", "").lower() == "python":
+        raise ImportError
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+    np = None
+
+BACKEND = "numba" if numba is not None else "python"
+
+
+def _kompiler(funktion, **afhængigheder):
+    """
+    Oversætter en funktion med numba, hvis den er tilgængelig.
+
+    Funktionerne i moon_api.py kalder hinanden ved navn. `afhængigheder`
+    peger de navne på de oversatte udgaver, så numba kan kalde dem.
+
+    Args:
+        funktion (callable): Funktionen der oversættes.
+        **afhængigheder:     Navn → oversat funktion, som funktionen kalder.
+
+    Returns:
+        callable: Den oversatte funktion (eller funktionen selv uden numba).
+    """
+    if numba is None:
+        return funktion
+    if afhængigheder:
+        funktion = types.FunctionType(funktion.__code__,
+                                      {**funktion.__globals__, **afhængigheder},
+                                      funktion.__name__, funktion.__defaults__)
+    return numba.njit(cache=True)(funktion)
+
+
+# ──────────────────────────────────────────────
+# SKALARE KERNER (formlerne fra moon_api.py)
+# ──────────────────────────────────────────────
+
+_jd              = _kompiler(moon_api._julian_dag)
+_sol             = _kompiler(moon_api._sol_position)
+_sol_ekvatorial  = _kompiler(moon_api._sol_ekvatorial)
+_måne            = _kompiler(moon_api._måne_position)
+_lokal_minutter  = _kompiler(moon_api._lokal_minutter)
+_sol_dag         = _kompiler(moon_api._sol_dag, _sol_position=_sol)
+_måne_dag        = _kompiler(moon_api._måne_dag, _måne_position=_måne)
+_opgang_nedgang  = _kompiler(moon_api._opgang_nedgang, _lokal_minutter=_lokal_minutter)
+
+
+# ──────────────────────────────────────────────
+# LØKKER (skriver i forudallokerede udgange)
+# ──────────────────────────────────────────────
+
+@_kompiler
+def _jd_løkke(år, måned, dag, ud):
+    for i in range(len(ud)):
+        ud[i] = _jd(int(år[i]), int(måned[i]), int(dag[i]))
+
+
+@_kompiler
+def _sol_løkke(J, ra, dekl, tidslign):
+    for i in range(len(J)):
+        ra[i], dekl[i] = _sol_ekvatorial(J[i])
+        tidslign[i] = _sol(J[i])[1]
+
+
+@_kompiler
+def _måne_løkke(JD, ra, dekl):
+    for i in range(len(JD)):
+        ra[i], dekl[i] = _måne(JD[i])
+
+
+@_kompiler
+def _fase_løkke(dage, synodisk, fase, belysning):
+    for i in range(len(dage)):
+        p = dage[i] % synodisk / synodisk
+        fase[i] = p
+        belysning[i] = 50 * (1 - math.cos(2 * math.pi * p))
+
+
+@_kompiler
+def _sol_tider_løkke(J, offset, længde_timer, sin_phi, cos_phi, sin_h0, ud):
+    # ud er fladt: felt k for dag i ligger på k * n + i (se SolarEvents.FELTER)
+    n = len(J)
+    for i in range(n):
+        noon_utc, sin_led, nævner = _sol_dag(J[i], længde_timer, sin_phi, cos_phi)
+        ud[i] = _lokal_minutter(noon_utc, offset[i])
+        for k in range(len(sin_h0)):
+            op, ned = _opgang_nedgang(noon_utc, sin_h0[k], sin_led, nævner, offset[i])
+            ud[(2 * k + 1) * n + i] = op
+            ud[(2 * k + 2) * n + i] = ned
+
+
+@_kompiler
+def _måne_tider_løkke(JD, offset, længde_timer, sin_phi, cos_phi, sin_h0, op, ned):
+    for i in range(len(JD)):
+        transit_utc, sin_led, nævner = _måne_dag(JD[i], længde_timer, sin_phi, cos_phi)
+        op[i], ned[i] = _opgang_nedgang(transit_utc, sin_h0, sin_led, nævner, offset[i])
+
+
+def _ind(værdier: Sequence[float]):
+    """Inddata i backendens format (numpy-array eller array('d'))."""
+    if np is not None:
+        return np.asarray(værdier, dtype=np.float64)
+    return værdier if isinstance(værdier, array) else array("d", værdier)
+
+
+def _ud(n: int, typekode: str = "d"):
+    """Forudallokeret udgang i backendens format ("d" = float64, "h" = int16)."""
+    if np is not None:
+        return np.empty(n, dtype=np.float64 if typekode == "d" else np.int16)
+    return array(typekode, bytes(array(typekode).itemsize * n))
+
+
+def _som_array(ud, typekode: str = "d") -> array:
+    """Udgang → array(typekode) uanset backend."""
+    if isinstance(ud, array):
+        return ud
+    resultat = array(typekode)
+    resultat.frombytes(ud.tobytes())
+    return resultat
+
+
+# ──────────────────────────────────────────────
+# OFFENTLIGT API
+# ──────────────────────────────────────────────
+
+def julian_days(år: Sequence[int], måned: Sequence[int], dag: Sequence[int]) -> array:
+    """
+    Juliansk dag (0h UT) for mange datoer.
+
+    Args:
+        år, måned, dag (sequence): Datoernes dele, samme længde.
+
+    Returns:
+        array('d'): JD pr. dato.
+    """
+    ud = _ud(len(år))
+    _jd_løkke(_ind(år), _ind(måned), _ind(dag), ud)
+    return _som_array(ud)
+
+
+def sun_positions(J: Sequence[float]) -> Tuple[array, array, array]:
+    """
+    Solens position og tidsligning for mange tidspunkter.
+
+    Args:
+        J (sequence): Dage siden 1. januar 2000 0h UT.
+
+    Returns:
+        tuple: (RA i grader, deklination i radianer, tidsligning i timer) som array('d').
+    """
+    J = _ind(J)
+    ra, dekl, tidslign = _ud(len(J)), _ud(len(J)), _ud(len(J))
+    _sol_løkke(J, ra, dekl, tidslign)
+    return _som_array(ra), _som_array(dekl), _som_array(tidslign)
+
+
+def moon_positions(JD: Sequence[float]) -> Tuple[array, array]:
+    """
+    Månens position (den simple serie fra moon_api.py) for mange tidspunkter.
+
+    Args:
+        JD (sequence): Julianske dage.
+
+    Returns:
+        tuple: (RA i grader, deklination i radianer) som array('d').
+    """
+    JD = _ind(JD)
+    ra, dekl = _ud(len(JD)), _ud(len(JD))
+    _måne_løkke(JD, ra, dekl)
+    return _som_array(ra), _som_array(dekl)
+
+
+def phases(dage: Sequence[float], synodisk: float) -> Tuple[array, array]:
+    """
+    Månefase og belysning (samme model som `MoonAPIClient.fetch_moon_record`).
+
+    Args:
+        dage (sequence): Dage siden referencenymånen.
+        synodisk (float): Den synodiske måneds længde i dage.
+
+    Returns:
+        tuple: (fase 0-1, belysning 0-100) som array('d').
+    """
+    dage = _ind(dage)
+    fase, belysning = _ud(len(dage)), _ud(len(dage))
+    _fase_løkke(dage, synodisk, fase, belysning)
+    return _som_array(fase), _som_array(belysning)
+
+
+def solar_events(J: Sequence[float], offset: Sequence[float], længde_timer: float,
+                 sin_phi: float, cos_phi: float, sin_h0: Sequence[float]) -> List[array]:
+    """
+    Solens middag og opgang/nedgang for hver horisontdefinition, dag for dag.
+
+    Args:
+        J (sequence):         Dage siden 1. januar 2000 0h UT (hele dage).
+        offset (sequence):    Tidszoneforskydning i timer pr. dag.
+        længde_timer (float): Længdegraden i timer.
+        sin_phi (float), cos_phi (float): sin/cos af breddegraden.
+        sin_h0 (sequence):    sin af horisonthøjderne (se `ObserverContext.SOL_DEFINITIONER`).
+
+    Returns:
+        list: array('h') pr. felt: middag, derefter (opgang, nedgang) pr.
+              definition, i minutter efter lokal midnat eller `INGEN_TID`.
+    """
+    J = _ind(J)
+    n, felter = len(J), 1 + 2 * len(sin_h0)
+    ud = _ud(n * felter, "h")
+    _sol_tider_løkke(J, _ind(offset), længde_timer, sin_phi, cos_phi, _ind(sin_h0), ud)
+    ud = _som_array(ud, "h")
+    return [ud[k * n:(k + 1) * n] for k in range(felter)]
+
+
+def moon_events(JD: Sequence[float], offset: Sequence[float], længde_timer: float,
+                sin_phi: float, cos_phi: float, sin_h0: float) -> Tuple[array, array]:
+    """
+    Måneopgang og månenedgang (den simple model fra moon_api.py) dag for dag.
+
+    Args:
+        JD (sequence):        Juliansk dag ved middag UTC pr. dag.
+        offset (sequence):    Tidszoneforskydning i timer pr. dag.
+        længde_timer (float): Længdegraden i timer.
+        sin_phi (float), cos_phi (float): sin/cos af breddegraden.
+        sin_h0 (float):       sin af horisonthøjden.
+
+    Returns:
+        tuple: (måneopgang, månenedgang) som array('h') i minutter efter
+               lokal midnat eller `INGEN_TID`.
+    """
+    JD = _ind(JD)
+    op, ned = _ud(len(JD), "h"), _ud(len(JD), "h")
+    _måne_tider_løkke(JD, _ind(offset), længde_timer, sin_phi, cos_phi, sin_h0, op, ned)
+    return _som_array(op, "h"), _som_array(ned, "h")
+
+
+# ──────────────────────────────────────────────
+# PARITET
+# ──────────────────────────────────────────────
+
+# Steder i kontrollen: København, Tromsø (midnatssol og mørketid) og Cape Town
+_STEDER = ((55.6761, 12.5683), (69.6492, 18.9553), (-33.9249, 18.4241))
+
+
+def _maks(a, b) -> float:
+    """Største absolutte afvigelse mellem to følger."""
+    return max(abs(x - y) for x, y in zip(a, b))
+
+
+def verify(antal: int = 20_000) -> Dict[str, float]:
+    """
+    Sammenligner kernerne med de skalare funktioner i moon_api.py.
+
+    Positionerne kontrolleres punkt for punkt mod `_julian_dag`,
+    `_sol_ekvatorial`, `_sol_position` og `_måne_position`, og
+    batchvejene `solar_events_range` / `moon_events_range` mod
+    `ObserverContext.solar_events` / `moon_events` dag for dag. Med numba
+    er det den oversatte kode mod den rene Python.
+
+    Args:
+        antal (int): Antal testpunkter (dage fra 1900 og frem, med brøkdele).
+
+    Returns:
+        dict: Største absolutte afvigelse pr. størrelse (0.0 = identisk;
+              tider i minutter).
+    """
+    JD = [2415020.5 + i * 3.7 + (i % 24) / 24.0 for i in range(antal)]
+    J = [jd - 2451544.5 for jd in JD]
+    datoer = [(1900 + i % 300, 1 + i % 12, 1 + i % 28) for i in range(antal)]
+    dage = [i * 0.73 for i in range(antal)]
+    synodisk = 29.530588
+
+    afvigelser = {}
+    afvigelser["julian_day"] = _maks(
+        julian_days(*zip(*datoer)), [moon_api._julian_dag(*d) for d in datoer])
+
+    ra, dekl, tidslign = sun_positions(J)
+    reference = [moon_api._sol_ekvatorial(j) for j in J]
+    afvigelser["sun_ra"]   = _maks(ra, [r[0] for r in reference])
+    afvigelser["sun_dec"]  = _maks(dekl, [r[1] for r in reference])
+    afvigelser["sun_eqt"]  = _maks(tidslign, [moon_api._sol_position(j)[1] for j in J])
+
+    ra, dekl = moon_positions(JD)
+    reference = [moon_api._måne_position(jd) for jd in JD]
+    # RA tæt på 0/360 kan lande på hver sin side af grænsen
+    afvigelser["moon_ra"]  = max(min(abs(a - b), 360 - abs(a - b))
+                                 for a, b in zip(ra, (r[0] for r in reference)))
+    afvigelser["moon_dec"] = _maks(dekl, [r[1] for r in reference])
+
+    fase, belysning = phases(dage, synodisk)
+    afvigelser["phase"] = _maks(fase, [d % synodisk / synodisk for d in dage])
+    afvigelser["illumination"] = _maks(
+        belysning, [50 * (1 - math.cos(2 * math.pi * (d % synodisk / synodisk))) for d in dage])
+
+    # Batchvejene mod ObserverContext, dag for dag
+    start = dt.date(2000, 1, 1)
+    antal_dage = max(1, antal // 20)
+    sol = måne = 0
+    for lat, lon in _STEDER:
+        ctx = moon_api.ObserverContext(lat, lon)
+        søjler = ctx.solar_events_range(start, antal_dage)
+        op, ned = ctx.moon_events_range(start, antal_dage)
+        for i in range(antal_dage):
+            d = start + dt.timedelta(days=i)
+            forventet = ctx.solar_events(d.year, d.month, d.day)
+            sol = max(sol, max(abs(søjler[felt][i] - getattr(forventet, felt))
+                               for felt in søjler))
+            forventet = ctx.moon_events(d.year, d.month, d.day)
+            måne = max(måne, abs(op[i] - forventet[0]), abs(ned[i] - forventet[1]))
+    afvigelser["solar_events"] = float(sol)
+    afvigelser["moon_events"] = float(måne)
+    return afvigelser
+
+
+# Største tilladte afvigelse: numba må afvige i sidste decimal (libm mod LLVM)
+PARITET_TOLERANCE = 1e-9
+
+
+def main() -> int:
+    """Kører paritetskontrollen for den aktive backend."""
+    print(f"Backend: {BACKEND}")
+    afvigelser = verify()
+    for navn, værdi in afvigelser.items():
+        print(f"  {navn:<14} {værdi:.3e}")
+    ok = all(v <= PARITET_TOLERANCE for v in afvigelser.values())
+    print("Paritet OK" if ok else "PARITET FEJLER")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
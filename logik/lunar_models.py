@@ -0,0 +1,650 @@
+"""
+Månemodeller i flere præcisionstrin for LunarOrbit.
+
+To trin deler samme API (`position` og `rise_set`):
+
+  - "fast":  Den oprindelige model fra moon_api.py. Seks
+             longitudeled, ingen breddeled, én evaluering ved middag og
+             ingen stjernetid i opgang/nedgang. Meget billig, men kun
+             vejledende.
+  - "meeus": Meeus' "Astronomical Algorithms" kap. 47 med de fulde
+             tabeller for longitude, afstand og bredde, nutation og
+             parallakse. Opgang/nedgang findes ved at følge månens højde
+             over døgnet med rigtig stjernetid.
+
+`validate_tiers()` måler hastighed og fejl for hvert trin mod en
+medfølgende, uafhængig referencetabel (data/moon_reference.csv,
+beregnet med PyEphem) og mod Meeus' eksempel 47.a, så man kan vælge den
+rette pris for hver arbejdsopgave.
+"""
+
+import csv
+import datetime as dt
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from logik.moon_api import ObserverContext, _DST_TABEL, _julian_dag, _måne_position
+from logik.records import INGEN_TID
+
+
+REFERENCE_STI = os.path.join(os.path.dirname(__file__), "data", "moon_reference.csv")
+
+# Jordens ækvatorradius i km (til parallakse)
+_JORD_RADIUS = 6378.14
+
+
+# ──────────────────────────────────────────────
+# MEEUS-TABELLER (kap. 47)
+# ──────────────────────────────────────────────
+
+# Longitude og afstand: (D, M, M', F, Σl [1e-6 °], Σr [1e-3 km])
+_TABEL_LR = (
+    (0, 0, 1, 0, 6288774, -20905355), (2, 0, -1, 0, 1274027, -3699111),
+    (2, 0, 0, 0, 658314, -2955968),   (0, 0, 2, 0, 213618, -569925),
+    (0, 1, 0, 0, -185116, 48888),     (0, 0, 0, 2, -114332, -3149),
+    (2, 0, -2, 0, 58793, 246158),     (2, -1, -1, 0, 57066, -152138),
+    (2, 0, 1, 0, 53322, -170733),     (2, -1, 0, 0, 45758, -204586),
+    (0, 1, -1, 0, -40923, -129620),   (1, 0, 0, 0, -34720, 108743),
+    (0, 1, 1, 0, -30383, 104755),     (2, 0, 0, -2, 15327, 10321),
+    (0, 0, 1, 2, -12528, 0),          (0, 0, 1, -2, 10980, 79661),
+    (4, 0, -1, 0, 10675, -34782),     (0, 0, 3, 0, 10034, -23210),
+    (4, 0, -2, 0, 8548, -21636),      (2, 1, -1, 0, -7888, 24208),
+    (2, 1, 0, 0, -6766, 30824),       (1, 0, -1, 0, -5163, -8379),
+    (1, 1, 0, 0, 4987, -16675),       (2, -1, 1, 0, 4036, -12831),
+    (2, 0, 2, 0, 3994, -10445),       (4, 0, 0, 0, 3861, -11650),
+    (2, 0, -3, 0, 3665, 14403),       (0, 1, -2, 0, -2689, -7003),
+    (2, 0, -1, 2, -2602, 0),          (2, -1, -2, 0, 2390, 10056),
+    (1, 0, 1, 0, -2348, 6322),        (2, -2, 0, 0, 2236, -9884),
+    (0, 1, 2, 0, -2120, 5751),        (0, 2, 0, 0, -2069, 0),
+    (2, -2, -1, 0, 2048, -4950),      (2, 0, 1, -2, -1773, 4130),
+    (2, 0, 0, 2, -1595, 0),           (4, -1, -1, 0, 1215, -3958),
+    (0, 0, 2, 2, -1110, 0),           (3, 0, -1, 0, -892, 3258),
+    (2, 1, 1, 0, -810, 2616),         (4, -1, -2, 0, 759, -1897),
+    (0, 2, -1, 0, -713, -2117),       (2, 2, -1, 0, -700, 2354),
+    (2, 1, -2, 0, 691, 0),            (2, -1, 0, -2, 596, 0),
+    (4, 0, 1, 0, 549, -1423),         (0, 0, 4, 0, 537, -1117),
+    (4, -1, 0, 0, 520, -1571),        (1, 0, -2, 0, -487, -1739),
+    (2, 1, 0, -2, -399, 0),           (0, 0, 2, -2, -381, -4421),
+    (1, 1, 1, 0, 351, 0),             (3, 0, -2, 0, -340, 0),
+    (4, 0, -3, 0, 330, 0),            (2, -1, 2, 0, 327, 0),
+    (0, 2, 1, 0, -323, 1165),         (1, 1, -1, 0, 299, 0),
+    (2, 0, 3, 0, 294, 0),             (2, 0, -1, -2, 0, 8752),
+)
+
+# Bredde: (D, M, M', F, Σb [1e-6 °])
+_TABEL_B = (
+    (0, 0, 0, 1, 5128122), (0, 0, 1, 1, 280602),  (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237), (2, 0, -1, 1, 55413),  (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573),   (0, 0, 2, 1, 17198),   (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822),   (2, -1, 0, -1, 8216),  (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200),    (2, 1, 0, -1, -3359),  (2, -1, -1, 1, 2463),
+    (2, -1, 0, 1, 2211),   (2, -1, -1, -1, 2065), (0, 1, -1, -1, -1870),
+    (4, 0, -1, -1, 1828),  (0, 1, 0, 1, -1794),   (0, 0, 0, 3, -1749),
+    (0, 1, -1, 1, -1565),  (1, 0, 0, 1, -1491),   (0, 1, 1, 1, -1475),
+    (0, 1, 1, -1, -1410),  (0, 1, 0, -1, -1344),  (1, 0, 0, -1, -1335),
+    (0, 0, 3, 1, 1107),    (4, 0, 0, -1, 1021),   (4, 0, -1, 1, 833),
+    (0, 0, 1, -3, 777),    (4, 0, -2, 1, 671),    (2, 0, 0, -3, 607),
+    (2, 0, 2, -1, 596),    (2, -1, 1, -1, 491),   (2, 0, -2, 1, -451),
+    (0, 0, 3, -1, 439),    (2, 0, 2, 1, 422),     (2, 0, -3, -1, 421),
+    (2, 1, -1, 1, -366),   (2, 1, 0, 1, -351),    (4, 0, 0, 1, 331),
+    (2, -1, 1, 1, 315),    (2, -2, 0, -1, 302),   (0, 0, 1, 3, -283),
+    (2, 1, 1, -1, -229),   (1, 1, 0, -1, 223),    (1, 1, 0, 1, 223),
+    (0, 1, -2, -1, -220),  (2, 1, -1, -1, -220),  (1, 0, 1, 1, -185),
+    (2, -1, -2, -1, 181),  (0, 1, 2, 1, -177),    (4, 0, -2, -1, 176),
+    (4, -1, -1, -1, 166),  (1, 0, 1, -1, -164),   (4, 0, 1, -1, 132),
+    (1, 0, -1, -1, -119),  (4, -1, 0, -1, 115),   (2, -2, 0, 1, 107),
+)
+
+
+def _meeus_argumenter(T: float) -> Tuple[float, float, float, float, float, float]:
+    """
+    Fundamentale argumenter for månen (Meeus 47.1-47.6).
+
+    Args:
+        T (float): Julianske århundreder siden J2000.0.
+
+    Returns:
+        tuple: (L', D, M, M', F) i grader og excentricitetsfaktoren E.
+    """
+    T2 = T * T
+    T3 = T2 * T
+    T4 = T3 * T
+
+    Lm = (218.3164477 + 481267.88123421 * T - 0.0015786 * T2
+          + T3 / 538841.0 - T4 / 65194000.0)
+    D  = (297.8501921 + 445267.1114034 * T - 0.0018819 * T2
+          + T3 / 545868.0 - T4 / 113065000.0)
+    M  = 357.5291092 + 35999.0502909 * T - 0.0001536 * T2 + T3 / 24490000.0
+    Mm = (134.9633964 + 477198.8675055 * T + 0.0087414 * T2
+          + T3 / 69699.0 - T4 / 14712000.0)
+    F  = (93.2720950 + 483202.0175233 * T - 0.0036539 * T2
+          - T3 / 3526000.0 + T4 / 863310000.0)
+    E  = 1.0 - 0.002516 * T - 0.0000074 * T2
+    return Lm, D, M, Mm, F, E
+
+
+def _meeus_afstand(JD: float) -> float:
+    """
+    Månens afstand alene (samme led som `_meeus_ekliptisk`).
+
+    Billigere end hele serien, fordi kun afstandsleddene summeres.
+
+    Args:
+        JD (float): Juliansk dag.
+
+    Returns:
+        float: Afstand i km.
+    """
+    _, D, M, Mm, F, E = _meeus_argumenter((JD - 2451545.0) / 36525.0)
+    E_potens = (1.0, E, E * E)
+    D_r, M_r, Mm_r, F_r = (math.radians(v % 360) for v in (D, M, Mm, F))
+    sum_r = 0.0
+    for d, m, mm, f, _, kr in _TABEL_LR:
+        if kr:
+            sum_r += kr * E_potens[abs(m)] * math.cos(d * D_r + m * M_r + mm * Mm_r + f * F_r)
+    return 385000.56 + sum_r / 1000.0
+
+
+def _meeus_ekliptisk(JD: float) -> Tuple[float, float, float, float, float]:
+    """
+    Månens geocentriske ekliptiske koordinater efter Meeus kap. 47.
+
+    Args:
+        JD (float): Juliansk dag (forskellen mellem TT og UT ignoreres).
+
+    Returns:
+        tuple: (longitude i grader, bredde i grader, afstand i km,
+                nutation i longitude i grader, sand ekliptikhældning i grader)
+    """
+    T  = (JD - 2451545.0) / 36525.0
+    T2 = T * T
+    T3 = T2 * T
+    Lm, D, M, Mm, F, E = _meeus_argumenter(T)
+    A1 = math.radians((119.75 + 131.849 * T) % 360)
+    A2 = math.radians((53.09 + 479264.290 * T) % 360)
+    A3 = math.radians((313.45 + 481266.484 * T) % 360)
+    E_potens = (1.0, E, E * E)
+
+    rad = math.radians
+    Lm_r, D_r, M_r, Mm_r, F_r = (rad(v % 360) for v in (Lm, D, M, Mm, F))
+
+    sum_l = sum_r = 0.0
+    for d, m, mm, f, kl, kr in _TABEL_LR:
+        arg = d * D_r + m * M_r + mm * Mm_r + f * F_r
+        e = E_potens[abs(m)]
+        sum_l += kl * e * math.sin(arg)
+        if kr:
+            sum_r += kr * e * math.cos(arg)
+
+    sum_b = 0.0
+    for d, m, mm, f, kb in _TABEL_B:
+        sum_b += kb * E_potens[abs(m)] * math.sin(d * D_r + m * M_r + mm * Mm_r + f * F_r)
+
+    sum_l += 3958 * math.sin(A1) + 1962 * math.sin(Lm_r - F_r) + 318 * math.sin(A2)
+    sum_b += (-2235 * math.sin(Lm_r) + 382 * math.sin(A3)
+              + 175 * math.sin(A1 - F_r) + 175 * math.sin(A1 + F_r)
+              + 127 * math.sin(Lm_r - Mm_r) - 115 * math.sin(Lm_r + Mm_r))
+
+    lam    = (Lm + sum_l / 1e6) % 360
+    beta   = sum_b / 1e6
+    afstand = 385000.56 + sum_r / 1000.0
+
+    # Nutation (Meeus kap. 22, forkortet form, ~0.5" nøjagtighed)
+    omega = rad((125.04452 - 1934.136261 * T) % 360)
+    Ls    = rad((280.4665 + 36000.7698 * T) % 360)
+    Lmr   = rad(Lm % 360)
+    dpsi  = (-17.20 * math.sin(omega) - 1.32 * math.sin(2 * Ls)
+             - 0.23 * math.sin(2 * Lmr) + 0.21 * math.sin(2 * omega)) / 3600.0
+    deps  = (9.20 * math.cos(omega) + 0.57 * math.cos(2 * Ls)
+             + 0.10 * math.cos(2 * Lmr) - 0.09 * math.cos(2 * omega)) / 3600.0
+    eps0  = 23.4392911 - 0.0130042 * T - 1.64e-7 * T2 + 5.04e-7 * T3
+
+    return lam, beta, afstand, dpsi, eps0 + deps
+
+
+def _ekliptisk_til_ækvatorial(lam: float, beta: float, eps: float) -> Tuple[float, float]:
+    """
+    Omregner ekliptiske koordinater til rektascension og deklination.
+
+    Args:
+        lam (float), beta (float), eps (float): Grader.
+
+    Returns:
+        tuple: (RA i grader 0-360, deklination i grader)
+    """
+    l, b, e = math.radians(lam), math.radians(beta), math.radians(eps)
+    ra   = math.atan2(math.sin(l) * math.cos(e) - math.tan(b) * math.sin(e), math.cos(l))
+    dekl = math.asin(math.sin(b) * math.cos(e) + math.cos(b) * math.sin(e) * math.sin(l))
+    return math.degrees(ra) % 360, math.degrees(dekl)
+
+
+# ──────────────────────────────────────────────
+# MODELLER
+# ──────────────────────────────────────────────
+
+class LunarModel:
+    """
+    Fælles API for månemodeller.
+
+    Underklasser implementerer `position`; `rise_set` og
+    `rise_set_range` kan overskrives.
+    """
+
+    navn = "base"
+
+    def position(self, JD: float) -> Tuple[float, float, float]:
+        """
+        Månens tilsyneladende geocentriske position.
+
+        Args:
+            JD (float): Juliansk dag (UT).
+
+        Returns:
+            tuple: (RA i grader 0-360, deklination i grader, afstand i km)
+        """
+        raise NotImplementedError
+
+    def rise_set(self, ctx: ObserverContext, år: int, måned: int, dag: int) -> Tuple[int, int]:
+        """
+        Måneopgang og månenedgang for en lokal kalenderdag.
+
+        Args:
+            ctx (ObserverContext): Observationssted.
+            år (int), måned (int), dag (int): Dato.
+
+        Returns:
+            tuple: (måneopgang, månenedgang) i minutter efter lokal
+                   midnat; `INGEN_TID` hvis begivenheden ikke sker.
+        """
+        raise NotImplementedError
+
+    def rise_set_range(self, ctx: ObserverContext, start: dt.date,
+                       antal_dage: int) -> Tuple[array, array]:
+        """
+        `rise_set` for fortløbende dage.
+
+        Args:
+            ctx (ObserverContext): Observationssted.
+            start (date):     Første dato.
+            antal_dage (int): Antal dage.
+
+        Returns:
+            tuple: (måneopgang, månenedgang) som `array('h')`;
+                   indeks i er dagen `start + i`.
+        """
+        op, ned = array("h"), array("h")
+        ordinal = start.toordinal()
+        for o in range(ordinal, ordinal + antal_dage):
+            dato = dt.date.fromordinal(o)
+            måneop, månened = self.rise_set(ctx, dato.year, dato.month, dato.day)
+            op.append(måneop)
+            ned.append(månened)
+        return op, ned
+
+
+class FastLunarModel(LunarModel):
+    """Det oprindelige, billige trin (seks longitudeled, ±timer for opgang)."""
+
+    navn = "fast"
+
+    # Middelafstand i km – modellen har ingen afstandsled
+    MIDDEL_AFSTAND = 385000.56
+
+    def position(self, JD: float) -> Tuple[float, float, float]:
+        ra, dekl = _måne_position(JD)
+        return ra, math.degrees(dekl), self.MIDDEL_AFSTAND
+
+    def rise_set(self, ctx: ObserverContext, år: int, måned: int, dag: int) -> Tuple[int, int]:
+        return ctx.moon_events(år, måned, dag)
+
+    def rise_set_range(self, ctx: ObserverContext, start: dt.date,
+                       antal_dage: int) -> Tuple[array, array]:
+        # Batchkernen (kernels.moon_events) i stedet for ét kald pr. dag
+        return ctx.moon_events_range(start, antal_dage)
+
+
+class MeeusLunarModel(LunarModel):
+    """
+    Fuld Meeus-model (kap. 47) med stjernetid og parallakse ved opgang/nedgang.
+
+    Opgang/nedgang: positionen evalueres ved lokal midnat, middag og
+    næste midnat og interpoleres kvadratisk. Højden følges time for
+    time, og hver fortegnsskift forfines med sekantmetoden. RA og
+    deklination slås op i årets Chebyshev-efemeride (ephemeris.py), så
+    kun afstanden ved middag kræver en evaluering af serien.
+    """
+
+    navn = "meeus"
+
+    # False: evaluér serien direkte ved opgang/nedgang (f.eks. til sammenligning)
+    brug_efemeride = True
+
+    def position(self, JD: float) -> Tuple[float, float, float]:
+        lam, beta, afstand, dpsi, eps = _meeus_ekliptisk(JD)
+        ra, dekl = _ekliptisk_til_ækvatorial(lam + dpsi, beta, eps)
+        return ra, dekl, afstand
+
+    def rise_set(self, ctx: ObserverContext, år: int, måned: int, dag: int) -> Tuple[int, int]:
+        try:
+            offset = _DST_TABEL[måned][dag]
+            jd0 = _julian_dag(år, måned, dag) - offset / 24.0   # Lokal midnat i UT
+
+            # Tre positioner; resten interpoleres
+            punkter = self._positioner(år, jd0)
+            ra = [p[0] for p in punkter]
+            for i in (1, 2):                      # Fold RA ud over 360°
+                while ra[i] - ra[i - 1] < -180.0:
+                    ra[i] += 360.0
+                while ra[i] - ra[i - 1] > 180.0:
+                    ra[i] -= 360.0
+            dekl    = [p[1] for p in punkter]
+            afstand = _meeus_afstand(jd0 + 0.5)
+
+            # Horisonthøjde: 0.7275 × parallakse − 0.5667° (refraktion + radius)
+            parallakse = math.degrees(math.asin(_JORD_RADIUS / afstand))
+            h0 = 0.7275 * parallakse - 0.5667
+
+            def kvadratisk(v, n):
+                # Interpolation gennem n = 0, 0.5, 1 (brøkdel af døgnet)
+                a, b = v[1] - v[0], v[2] - v[1]
+                x = 2.0 * n - 1.0
+                return v[1] + 0.5 * x * (a + b + x * (b - a))
+
+            def højde(n):
+                h, _ = ctx.horizontal(kvadratisk(ra, n), kvadratisk(dekl, n), jd0 + n)
+                return h - h0
+
+            return _find_krydsninger(højde)
+        except Exception:
+            return (INGEN_TID, INGEN_TID)
+
+    def _positioner(self, år: int, jd0: float) -> List[Tuple[float, float]]:
+        """
+        (RA, dekl) ved lokal midnat, middag og næste midnat.
+
+        Fra årets efemeride, når den kan indlæses eller bygges; ellers
+        (eller med `brug_efemeride = False`) fra serien.
+        """
+        tider = (jd0, jd0 + 0.5, jd0 + 1.0)
+        if self.brug_efemeride:
+            # Importeres her fordi ephemeris selv bygger på dette modul
+            from logik.ephemeris import year_ephemeris
+            try:
+                efemeride = year_ephemeris(år)
+            except (OSError, ValueError) as e:
+                print(f"Advarsel: Ingen efemeride for {år}, bruger serien: {e}")
+                self.brug_efemeride = False
+            else:
+                return [efemeride.moon_position(jd) for jd in tider]
+        return [self.position(jd)[:2] for jd in tider]
+
+
+def _find_krydsninger(højde, trin: int = 24) -> Tuple[int, int]:
+    """
+    Finder første opgang (− → +) og nedgang (+ → −) i et døgn.
+
+    Args:
+        højde (callable): Brøkdel af døgnet (0-1) → højde over horisonten.
+        trin (int):       Antal lige store trin døgnet gennemsøges i.
+
+    Returns:
+        tuple: (opgang, nedgang) i minutter efter lokal midnat eller `INGEN_TID`.
+    """
+    opgang = nedgang = INGEN_TID
+    n_forrige, h_forrige = 0.0, højde(0.0)
+    for i in range(1, trin + 1):
+        n = i / trin
+        h = højde(n)
+        if (h_forrige < 0) != (h < 0):
+            # Sekantmetode inden for trinnet
+            a, ha, b, hb = n_forrige, h_forrige, n, h
+            for _ in range(4):
+                if hb == ha:
+                    break
+                c = b - hb * (b - a) / (hb - ha)
+                a, ha, b, hb = b, hb, c, højde(c)
+            minut = min(1439, max(0, int(b * 1440)))
+            if h > 0 and opgang == INGEN_TID:
+                opgang = minut
+            elif h < 0 and nedgang == INGEN_TID:
+                nedgang = minut
+        n_forrige, h_forrige = n, h
+    return opgang, nedgang
+
+
+TIERS: Dict[str, LunarModel] = {
+    FastLunarModel.navn:  FastLunarModel(),
+    MeeusLunarModel.navn: MeeusLunarModel(),
+}
+
+
+def get_model(tier: str = "fast") -> LunarModel:
+    """
+    Returnerer månemodellen for et præcisionstrin.
+
+    Args:
+        tier (str): "fast" eller "meeus".
+
+    Returns:
+        LunarModel: Den delte modelinstans.
+
+    Raises:
+        ValueError: Ved ukendt trin.
+    """
+    try:
+        return TIERS[tier]
+    except KeyError:
+        raise ValueError(f"Ukendt præcisionstrin '{tier}' (vælg {', '.join(TIERS)})")
+
+
+# ──────────────────────────────────────────────
+# REFERENCETABEL OG VALIDERING
+# ──────────────────────────────────────────────
+
+# Kontrolpunkt fra Meeus, eksempel 47.a (1992-04-12 0h TD):
+# tilsyneladende RA, deklination (grader) og afstand (km)
+MEEUS_47A = (2448724.5, 134.688470, 13.768368, 368409.7)
+
+# Steder i referencetabellen: (navn, breddegrad, længdegrad)
+REFERENCE_STEDER = (
+    ("København", 55.6761, 12.5683),
+    ("Skagen",    57.7209, 10.5839),
+    ("Rønne",     55.1009, 14.7066),
+)
+
+# PyEphem-datoer tæller dage fra 1899-12-31 12h UT (JD 2415020.0)
+_EPHEM_JD0 = 2415020.0
+
+# Astronomisk enhed i km
+_AU_KM = 149597870.7
+
+
+def generate_reference_table(sti: str = REFERENCE_STI, start_år: int = 2024,
+                             antal_dage: int = 366) -> None:
+    """
+    Genererer referencetabellen med PyEphem.
+
+    PyEphem (libastro fra XEphem) har sin egen måneteori og sin egen
+    søgning efter opgang/nedgang og deler hverken kode eller tabeller med
+    trinnene her, så tabellen er en uafhængig kontrol af begge trin.
+
+    Positionerne er tilsyneladende geocentriske RA/deklination ved
+    middag UT. Opgang/nedgang er månens øvre rand i horisonten med
+    standardrefraktion (samme konvention som almanakkerne), første
+    begivenhed i det lokale døgn, afrundet ned til hele minutter.
+
+    PyEphem bruges kun her og er ikke en afhængighed af appen
+    (`pip install ephem`).
+
+    Args:
+        sti (str):        Filsti til CSV.
+        start_år (int):   Første år.
+        antal_dage (int): Antal dage pr. sted.
+
+    Raises:
+        ImportError: Hvis PyEphem ikke er installeret.
+    """
+    import datetime as dt
+
+    try:
+        import ephem
+    except ImportError as e:
+        raise ImportError("Referencetabellen genereres med PyEphem: pip install ephem") from e
+
+    måne = ephem.Moon()
+
+    def begivenhed(obs, midnat: float, næste) -> int:
+        obs.date = midnat - _EPHEM_JD0
+        try:
+            tidspunkt = næste(måne)
+        except ephem.CircumpolarError:
+            return INGEN_TID
+        minutter = (tidspunkt + _EPHEM_JD0 - midnat) * 1440
+        return int(minutter) if minutter < 1440 else INGEN_TID
+
+    start = dt.date(start_år, 1, 1)
+    os.makedirs(os.path.dirname(sti), exist_ok=True)
+    with open(sti, "w", newline="", encoding="utf-8") as f:
+        skriver = csv.writer(f)
+        skriver.writerow(["site", "latitude", "longitude", "date", "jd_noon",
+                          "ra_deg", "dec_deg", "distance_km", "moonrise_min", "moonset_min"])
+        for navn, lat, lon in REFERENCE_STEDER:
+            obs = ephem.Observer()
+            obs.lat, obs.lon, obs.elevation = str(lat), str(lon), 0.0
+            for i in range(antal_dage):
+                d = start + dt.timedelta(days=i)
+                jd = _julian_dag(d.year, d.month, d.day) + 0.5
+                måne.compute(jd - _EPHEM_JD0)
+                ra, dekl = math.degrees(måne.g_ra), math.degrees(måne.g_dec)
+                afstand = måne.earth_distance * _AU_KM
+
+                midnat = _julian_dag(d.year, d.month, d.day) - _DST_TABEL[d.month][d.day] / 24.0
+                op  = begivenhed(obs, midnat, obs.next_rising)
+                ned = begivenhed(obs, midnat, obs.next_setting)
+                skriver.writerow([navn, lat, lon, d.isoformat(), f"{jd:.1f}",
+                                  f"{ra:.6f}", f"{dekl:.6f}", f"{afstand:.1f}", op, ned])
+
+
+def load_reference_table(sti: str = REFERENCE_STI) -> List[Dict]:
+    """
+    Indlæser referencetabellen.
+
+    Args:
+        sti (str): Filsti til CSV.
+
+    Returns:
+        list: Én ordbog pr. række med talværdier.
+    """
+    with open(sti, newline="", encoding="utf-8") as f:
+        rækker = []
+        for r in csv.DictReader(f):
+            år, måned, dag = (int(x) for x in r["date"].split("-"))
+            rækker.append({
+                "latitude": float(r["latitude"]), "longitude": float(r["longitude"]),
+                "dato": (år, måned, dag), "jd": float(r["jd_noon"]),
+                "ra": float(r["ra_deg"]), "dekl": float(r["dec_deg"]),
+                "moonrise": int(r["moonrise_min"]), "moonset": int(r["moonset_min"]),
+            })
+        return rækker
+
+
+def _vinkelafstand(ra1: float, d1: float, ra2: float, d2: float) -> float:
+    """
+    Vinkelafstand mellem to himmelpositioner i grader.
+
+    Args:
+        ra1, d1, ra2, d2 (float): RA og deklination i grader.
+
+    Returns:
+        float: Afstand i grader.
+    """
+    r1, r2 = math.radians(ra1), math.radians(ra2)
+    a, b = math.radians(d1), math.radians(d2)
+    c = math.sin(a) * math.sin(b) + math.cos(a) * math.cos(b) * math.cos(r1 - r2)
+    return math.degrees(math.acos(max(-1.0, min(1.0, c))))
+
+
+def _minut_fejl(a: int, b: int) -> Optional[int]:
+    """Forskel i minutter over midnat, eller None hvis kun én findes."""
+    if a == INGEN_TID and b == INGEN_TID:
+        return 0
+    if a == INGEN_TID or b == INGEN_TID:
+        return None
+    d = abs(a - b) % 1440
+    return min(d, 1440 - d)
+
+
+def validate_tiers(sti: str = REFERENCE_STI) -> Dict[str, Dict[str, float]]:
+    """
+    Måler hastighed og fejl for hvert præcisionstrin mod referencetabellen.
+
+    Tabellen er uafhængig af trinnene (se `generate_reference_table`);
+    afvigelsen fra Meeus' eksempel 47.a måles som en ekstra kontrol.
+
+    Args:
+        sti (str): Filsti til referencetabellen.
+
+    Returns:
+        dict: Trin → nøgletal:
+            'position_us', 'position_max_arcmin', 'rise_set_us',
+            'rise_set_mean_min', 'rise_set_p95_min', 'rise_set_max_min',
+            'rise_set_missing' (antal begivenheder fundet kun i ét sæt),
+            'meeus_47a_arcsec' (afvigelse fra Meeus' eksempel 47.a).
+    """
+    rækker = load_reference_table(sti)
+    kontekster = {}
+    for r in rækker:
+        nøgle = (r["latitude"], r["longitude"])
+        if nøgle not in kontekster:
+            kontekster[nøgle] = ObserverContext(*nøgle)
+
+    resultat = {}
+    for navn, model in TIERS.items():
+        t0 = time.perf_counter()
+        positioner = [model.position(r["jd"]) for r in rækker]
+        pos_us = (time.perf_counter() - t0) / len(rækker) * 1e6
+        pos_fejl = max(_vinkelafstand(p[0], p[1], r["ra"], r["dekl"])
+                       for p, r in zip(positioner, rækker)) * 60
+
+        # Første kald kan indlæse eller bygge en efemeride; det holdes uden for målingen
+        model.rise_set(kontekster[(rækker[0]["latitude"], rækker[0]["longitude"])],
+                       *rækker[0]["dato"])
+        t0 = time.perf_counter()
+        tider = [model.rise_set(kontekster[(r["latitude"], r["longitude"])], *r["dato"])
+                 for r in rækker]
+        rs_us = (time.perf_counter() - t0) / len(rækker) * 1e6
+
+        fejl, mangler = [], 0
+        for (op, ned), r in zip(tider, rækker):
+            for a, b in ((op, r["moonrise"]), (ned, r["moonset"])):
+                f = _minut_fejl(a, b)
+                if f is None:
+                    mangler += 1
+                else:
+                    fejl.append(f)
+        fejl.sort()
+
+        jd, ra, dekl, _ = MEEUS_47A
+        p = model.position(jd)
+
+        resultat[navn] = {
+            "position_us":         pos_us,
+            "position_max_arcmin": pos_fejl,
+            "rise_set_us":         rs_us,
+            "rise_set_mean_min":   sum(fejl) / len(fejl) if fejl else 0.0,
+            "rise_set_p95_min":    fejl[int(0.95 * (len(fejl) - 1))] if fejl else 0.0,
+            "rise_set_max_min":    fejl[-1] if fejl else 0.0,
+            "rise_set_missing":    mangler,
+            "meeus_47a_arcsec":    _vinkelafstand(p[0], p[1], ra, dekl) * 3600,
+        }
+    return resultat
+
+
+if __name__ == "__main__":
+    for trin, tal in validate_tiers().items():
+        print(f"{trin}:")
+        for nøgle, værdi in tal.items():
+            print(f"  {nøgle:<22} {værdi:10.3f}")
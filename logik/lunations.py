@@ -0,0 +1,570 @@
+"""
+Formørkelser og supermåner over lange tidsrum.
+
+Scanneren arbejder i to trin (Meeus, "Astronomical Algorithms" kap. 49
+og 54):
+
+  1. Filter: For alle lunationer i intervallet beregnes middelværdierne
+     af månens breddeargument F og anomali M' i flade arrays. Kun
+     nymåner/fuldmåner nær en knude (|sin F| < 0,36) kan give en
+     formørkelse, og kun syzygier nær perigæum (cos M' stor) kan være
+     en supermåne. Typisk overlever under en tredjedel.
+  2. Forfining: For de få kandidater beregnes det korrigerede tidspunkt,
+     gamma og u (formørkelser) eller den nøjagtige afstand med
+     Meeus-månemodellen (supermåner).
+
+Tidspunkter er i dynamisk tid (JDE). Forskellen til UT (ΔT) er ca. ét
+minut i dag, men op til timer for fjerne århundreder, og den er ikke
+korrigeret. Datoer før 1582 vises i den proleptisk gregorianske kalender.
+
+Desuden `PhaseEventCache`: de nøjagtige tidspunkter for ny-, kvarter- og
+fuldmåner i et sorteret array, så nedtællinger ("dage til fuldmåne")
+findes med binær søgning i stedet for at blive beregnet for hvert tik.
+
+Eksempel:
+    for f in find_eclipses(2024, 2026):
+        print(f.datetime, f.kind, f.type, round(f.magnitude, 3))
+"""
+
+import datetime as dt
+import math
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from logik.lunar_models import _meeus_ekliptisk
+
+
+# Lunationer pr. år (Meeus 49.2)
+LUNATIONER_PR_ÅR = 12.3685
+
+# Grænse for formørkelseskandidater (Meeus kap. 54)
+KNUDE_GRÆNSE = 0.36
+
+# Supermåne: syzygi nærmere end dette (km, centrum til centrum)
+SUPERMÅNE_GRÆNSE_KM = 360000.0
+
+# Filter for supermåner: cos M' skal være over denne værdi. Afstanden ved
+# syzygi er ca. 382.000 - 24.600·cos M' km, så 360.000 km kræver cos M'
+# omkring 0,9; grænsen her har god margen.
+PERIGÆUM_GRÆNSE = 0.75
+
+# Hovedfaserne i rækkefølge (brøkdel af lunationsnummeret: 0, 0,25, 0,5, 0,75)
+FASER = ("new", "first_quarter", "full", "last_quarter")
+
+# Lunationer der beregnes ad gangen, når fasecachen udvides (ca. et år)
+FASE_BLOK = 13
+
+_JD_2000_12H = 2451545.0
+_DATO_2000   = dt.datetime(2000, 1, 1, 12)
+
+
+def jd_til_datetime(JD: float) -> dt.datetime:
+    """
+    Omregner juliansk dag til datetime (proleptisk gregoriansk, UTC).
+
+    Args:
+        JD (float): Juliansk dag.
+
+    Returns:
+        datetime: Tidspunktet afrundet til hele sekunder.
+    """
+    return _DATO_2000 + dt.timedelta(seconds=round((JD - _JD_2000_12H) * 86400))
+
+
+class Eclipse:
+    """
+    Én sol- eller måneformørkelse.
+
+    Attributes:
+        kind (str):        "solar" eller "lunar".
+        type (str):        "total", "annular", "hybrid", "partial" eller "penumbral".
+        jde (float):       Tidspunkt for største formørkelse (JDE).
+        gamma (float):     Mindste afstand fra skyggeaksen til jordens centrum
+                           i jordradier.
+        magnitude (float): Største formørkelsesgrad (for solformørkelser kun
+                           for partielle; ellers 0). For penumbrale
+                           måneformørkelser er det den penumbrale grad.
+    """
+
+    __slots__ = ("kind", "type", "jde", "gamma", "magnitude")
+
+    def __init__(self, kind: str, type: str, jde: float, gamma: float, magnitude: float):
+        self.kind      = kind
+        self.type      = type
+        self.jde       = jde
+        self.gamma     = gamma
+        self.magnitude = magnitude
+
+    @property
+    def datetime(self) -> dt.datetime:
+        """Tidspunktet som datetime."""
+        return jd_til_datetime(self.jde)
+
+    def to_dict(self) -> Dict:
+        """Ordbogsform med ISO-tidspunkt."""
+        return {
+            "kind":      self.kind,
+            "type":      self.type,
+            "time":      self.datetime.isoformat(),
+            "gamma":     round(self.gamma, 4),
+            "magnitude": round(self.magnitude, 3),
+        }
+
+    def __repr__(self):
+        return f"Eclipse({self.kind} {self.type}, {self.datetime:%Y-%m-%d %H:%M})"
+
+
+class Supermoon:
+    """
+    Én ny- eller fuldmåne nær perigæum.
+
+    Attributes:
+        phase (str):         "new" eller "full".
+        jde (float):         Tidspunkt for syzygien (JDE).
+        distance_km (float): Afstand mellem jordens og månens centrum.
+    """
+
+    __slots__ = ("phase", "jde", "distance_km")
+
+    def __init__(self, phase: str, jde: float, distance_km: float):
+        self.phase       = phase
+        self.jde         = jde
+        self.distance_km = distance_km
+
+    @property
+    def datetime(self) -> dt.datetime:
+        """Tidspunktet som datetime."""
+        return jd_til_datetime(self.jde)
+
+    def to_dict(self) -> Dict:
+        """Ordbogsform med ISO-tidspunkt."""
+        return {
+            "phase":       self.phase,
+            "time":        self.datetime.isoformat(),
+            "distance_km": round(self.distance_km),
+        }
+
+    def __repr__(self):
+        return f"Supermoon({self.phase}, {self.datetime:%Y-%m-%d %H:%M}, {self.distance_km:.0f} km)"
+
+
+# ──────────────────────────────────────────────
+# TRIN 1: MIDDELVÆRDIER OG FILTER
+# ──────────────────────────────────────────────
+
+def lunation_range(start_år: int, slut_år: int) -> Tuple[int, int]:
+    """
+    Lunationsnumre (k, Meeus 49.2) der dækker et interval af år.
+
+    Args:
+        start_år (int): Første år.
+        slut_år (int):  Sidste år (inkl.).
+
+    Returns:
+        tuple: (første k, sidste k) med lidt margen i begge ender.
+    """
+    return (math.floor((start_år - 2000) * LUNATIONER_PR_ÅR) - 1,
+            math.ceil((slut_år + 1 - 2000) * LUNATIONER_PR_ÅR) + 1)
+
+
+def mean_phases(k_fra: int, k_til: int, fuldmåne: bool) -> Dict[str, array]:
+    """
+    Middeltidspunkt og argumenter for en række ny- eller fuldmåner.
+
+    Args:
+        k_fra (int), k_til (int): Interval af lunationsnumre (begge inkl.).
+        fuldmåne (bool):          True for fuldmåner (k + 0,5).
+
+    Returns:
+        dict: 'k', 'jde', 'sin_f' og 'cos_m' (cos af månens anomali) som array('d').
+    """
+    halv = 0.5 if fuldmåne else 0.0
+    ks = array("d", (k + halv for k in range(k_fra, k_til + 1)))
+    jde, sin_f, cos_m = array("d"), array("d"), array("d")
+    for k in ks:
+        T = k / 1236.85
+        T2 = T * T
+        jde.append(2451550.09766 + 29.530588861 * k + 0.00015437 * T2)
+        sin_f.append(math.sin(math.radians(160.7108 + 390.67050284 * k - 0.0016118 * T2)))
+        cos_m.append(math.cos(math.radians(201.5643 + 385.81693528 * k + 0.0107582 * T2)))
+    return {"k": ks, "jde": jde, "sin_f": sin_f, "cos_m": cos_m}
+
+
+# ──────────────────────────────────────────────
+# TRIN 2: FORFINING
+# ──────────────────────────────────────────────
+
+def _argumenter(k: float) -> Tuple[float, ...]:
+    """Meeus kap. 49/54: (JDE, E, M, M', F, Ω) for lunation k, vinkler i radianer."""
+    T = k / 1236.85
+    T2, T3 = T * T, T * T * T
+    jde = (2451550.09766 + 29.530588861 * k + 0.00015437 * T2
+           - 0.000000150 * T3 + 0.00000000073 * T2 * T2)
+    E  = 1 - 0.002516 * T - 0.0000074 * T2
+    M  = math.radians(2.5534 + 29.10535670 * k - 0.0000014 * T2 - 0.00000011 * T3)
+    Mm = math.radians(201.5643 + 385.81693528 * k + 0.0107582 * T2
+                      + 0.00001238 * T3 - 0.000000058 * T2 * T2)
+    F  = math.radians(160.7108 + 390.67050284 * k - 0.0016118 * T2
+                      - 0.00000227 * T3 + 0.000000011 * T2 * T2)
+    Om = math.radians(124.7746 - 1.56375588 * k + 0.0020672 * T2 + 0.00000215 * T3)
+    return jde, E, M, Mm, F, Om
+
+
+def _sand_syzygi(k: float) -> Tuple[float, Tuple[float, ...]]:
+    """
+    Korrigeret tidspunkt for ny-/fuldmåne (Meeus kap. 54, få minutters fejl).
+
+    Returns:
+        tuple: (JDE, (E, M, M', F1, Ω))
+    """
+    jde, E, M, Mm, F, Om = _argumenter(k)
+    F1 = F - math.radians(0.02665) * math.sin(Om)
+    A1 = math.radians(299.77 + 0.107408 * k - 0.009173 * (k / 1236.85) ** 2)
+    fuld = k % 1 != 0
+    jde += ((-0.4065 if fuld else -0.4075) * math.sin(Mm)
+            + (0.1727 if fuld else 0.1721) * E * math.sin(M)
+            + 0.0161 * math.sin(2 * Mm) - 0.0097 * math.sin(2 * F1)
+            + 0.0073 * E * math.sin(Mm - M) - 0.0050 * E * math.sin(Mm + M)
+            - 0.0023 * math.sin(Mm - 2 * F1) + 0.0021 * E * math.sin(2 * M)
+            + 0.0012 * math.sin(Mm + 2 * F1) + 0.0006 * E * math.sin(2 * Mm + M)
+            - 0.0004 * math.sin(3 * Mm) - 0.0003 * E * math.sin(M + 2 * F1)
+            + 0.0003 * math.sin(A1) - 0.0002 * E * math.sin(M - 2 * F1)
+            - 0.0002 * E * math.sin(2 * Mm - M) - 0.0002 * math.sin(Om))
+    return jde, (E, M, Mm, F1, Om)
+
+
+def _sand_fase(k: float) -> float:
+    """
+    Korrigeret tidspunkt for en hovedfase (Meeus kap. 49, uden de små
+    planetled; fejl omkring et minut).
+
+    Formørkelsernes `_sand_syzygi` (kap. 54) giver tidspunktet for største
+    formørkelse, der kan ligge en halv time fra selve ny-/fuldmånen.
+
+    Args:
+        k (float): Lunationsnummer med brøkdel 0, 0,25, 0,5 eller 0,75.
+
+    Returns:
+        float: JDE.
+    """
+    jde, E, M, Mm, F, Om = _argumenter(k)
+    brøk = k % 1
+    if brøk in (0.0, 0.5):
+        ny = brøk == 0.0
+        return jde + ((-0.40720 if ny else -0.40614) * math.sin(Mm)
+                      + (0.17241 if ny else 0.17302) * E * math.sin(M)
+                      + (0.01608 if ny else 0.01614) * math.sin(2 * Mm)
+                      + (0.01039 if ny else 0.01043) * math.sin(2 * F)
+                      + (0.00739 if ny else 0.00734) * E * math.sin(Mm - M)
+                      - (0.00514 if ny else 0.00515) * E * math.sin(Mm + M)
+                      + (0.00208 if ny else 0.00209) * E * E * math.sin(2 * M)
+                      - 0.00111 * math.sin(Mm - 2 * F) - 0.00057 * math.sin(Mm + 2 * F)
+                      + 0.00056 * E * math.sin(2 * Mm + M) - 0.00042 * math.sin(3 * Mm)
+                      + 0.00042 * E * math.sin(M + 2 * F) + 0.00038 * E * math.sin(M - 2 * F)
+                      - 0.00024 * E * math.sin(2 * Mm - M) - 0.00017 * math.sin(Om)
+                      - 0.00007 * math.sin(Mm + 2 * M))
+
+    # Første og sidste kvarter
+    jde += (-0.62801 * math.sin(Mm) + 0.17172 * E * math.sin(M)
+            - 0.01183 * E * math.sin(Mm + M) + 0.00862 * math.sin(2 * Mm)
+            + 0.00804 * math.sin(2 * F) + 0.00454 * E * math.sin(Mm - M)
+            + 0.00204 * E * E * math.sin(2 * M) - 0.00180 * math.sin(Mm - 2 * F)
+            - 0.00070 * math.sin(Mm + 2 * F) - 0.00040 * math.sin(3 * Mm)
+            - 0.00034 * E * math.sin(2 * Mm - M) + 0.00032 * E * math.sin(M + 2 * F)
+            + 0.00032 * E * math.sin(M - 2 * F) - 0.00028 * E * E * math.sin(Mm + 2 * M)
+            + 0.00027 * E * math.sin(2 * Mm + M) - 0.00017 * math.sin(Om))
+    W = (0.00306 - 0.00038 * E * math.cos(M) + 0.00026 * math.cos(Mm)
+         - 0.00002 * math.cos(Mm - M) + 0.00002 * math.cos(Mm + M) + 0.00002 * math.cos(2 * F))
+    return jde + (W if brøk == 0.25 else -W)
+
+
+def _formørkelse(k: float) -> "Eclipse | None":
+    """
+    Forfiner én kandidat (Meeus kap. 54).
+
+    Args:
+        k (float): Lunationsnummer (heltal = nymåne, +0,5 = fuldmåne).
+
+    Returns:
+        Eclipse eller None hvis der ikke er nogen formørkelse.
+    """
+    jde, (E, M, Mm, F1, _) = _sand_syzygi(k)
+    P = (0.2070 * E * math.sin(M) + 0.0024 * E * math.sin(2 * M)
+         - 0.0392 * math.sin(Mm) + 0.0116 * math.sin(2 * Mm)
+         - 0.0073 * E * math.sin(Mm + M) + 0.0067 * E * math.sin(Mm - M)
+         + 0.0118 * math.sin(2 * F1))
+    Q = (5.2207 - 0.0048 * E * math.cos(M) + 0.0020 * E * math.cos(2 * M)
+         - 0.3299 * math.cos(Mm) - 0.0060 * E * math.cos(Mm + M)
+         + 0.0041 * E * math.cos(Mm - M))
+    W = abs(math.cos(F1))
+    gamma = (P * math.cos(F1) + Q * math.sin(F1)) * (1 - 0.0048 * W)
+    u = (0.0059 + 0.0046 * E * math.cos(M) - 0.0182 * math.cos(Mm)
+         + 0.0004 * math.cos(2 * Mm) - 0.0005 * math.cos(M + Mm))
+    g = abs(gamma)
+
+    if k % 1 == 0:
+        # Solformørkelse
+        if g > 1.5433 + u:
+            return None
+        if g < 0.9972:
+            if u < 0:
+                type = "total"
+            elif u > 0.0047:
+                type = "annular"
+            else:
+                type = "annular" if u >= 0.00464 * math.sqrt(1 - gamma * gamma) else "hybrid"
+            return Eclipse("solar", type, jde, gamma, 0.0)
+        return Eclipse("solar", "partial", jde, gamma, (1.5433 + u - g) / (0.5461 + 2 * u))
+
+    # Måneformørkelse
+    umbral    = (1.0128 - u - g) / 0.5450
+    penumbral = (1.5573 + u - g) / 0.5450
+    if umbral >= 1.0:
+        return Eclipse("lunar", "total", jde, gamma, umbral)
+    if umbral > 0.0:
+        return Eclipse("lunar", "partial", jde, gamma, umbral)
+    if penumbral > 0.0:
+        return Eclipse("lunar", "penumbral", jde, gamma, penumbral)
+    return None
+
+
+def _i_interval(jde: float, start_år: int, slut_år: int) -> bool:
+    return start_år <= jd_til_datetime(jde).year <= slut_år
+
+
+# ──────────────────────────────────────────────
+# OFFENTLIGT API
+# ──────────────────────────────────────────────
+
+def find_eclipses(start_år: int, slut_år: int,
+                  kinds: Sequence[str] = ("solar", "lunar")) -> List[Eclipse]:
+    """
+    Finder alle sol- og måneformørkelser i et interval af år.
+
+    Args:
+        start_år (int): Første år.
+        slut_år (int):  Sidste år (inkl.).
+        kinds (sequence): "solar" og/eller "lunar".
+
+    Returns:
+        list: `Eclipse` i tidsrækkefølge.
+    """
+    k_fra, k_til = lunation_range(start_år, slut_år)
+    resultat = []
+    for kind, fuldmåne in (("solar", False), ("lunar", True)):
+        if kind not in kinds:
+            continue
+        middel = mean_phases(k_fra, k_til, fuldmåne)
+        for k, sin_f in zip(middel["k"], middel["sin_f"]):
+            if abs(sin_f) >= KNUDE_GRÆNSE:
+                continue
+            formørkelse = _formørkelse(k)
+            if formørkelse and _i_interval(formørkelse.jde, start_år, slut_år):
+                resultat.append(formørkelse)
+    resultat.sort(key=lambda f: f.jde)
+    return resultat
+
+
+def find_supermoons(start_år: int, slut_år: int,
+                    grænse_km: float = SUPERMÅNE_GRÆNSE_KM,
+                    phases: Sequence[str] = ("full",)) -> List[Supermoon]:
+    """
+    Finder ny- og/eller fuldmåner nærmere end `grænse_km`.
+
+    Afstanden beregnes med Meeus-modellen (kap. 47) på det korrigerede
+    tidspunkt for syzygien.
+
+    Args:
+        start_år (int): Første år.
+        slut_år (int):  Sidste år (inkl.).
+        grænse_km (float): Afstandsgrænse i km.
+        phases (sequence): "full" og/eller "new".
+
+    Returns:
+        list: `Supermoon` i tidsrækkefølge.
+    """
+    k_fra, k_til = lunation_range(start_år, slut_år)
+    resultat = []
+    for phase, fuldmåne in (("new", False), ("full", True)):
+        if phase not in phases:
+            continue
+        middel = mean_phases(k_fra, k_til, fuldmåne)
+        for k, cos_m in zip(middel["k"], middel["cos_m"]):
+            if cos_m <= PERIGÆUM_GRÆNSE:
+                continue
+            jde, _ = _sand_syzygi(k)
+            afstand = _meeus_ekliptisk(jde)[2]
+            if afstand < grænse_km and _i_interval(jde, start_år, slut_år):
+                resultat.append(Supermoon(phase, jde, afstand))
+    resultat.sort(key=lambda s: s.jde)
+    return resultat
+
+
+# ──────────────────────────────────────────────
+# FASETIDSPUNKTER
+# ──────────────────────────────────────────────
+
+def _jd(tidspunkt) -> float:
+    """Juliansk dag for en date (midnat UTC) eller datetime (naiv = UTC)."""
+    if not isinstance(tidspunkt, dt.datetime):
+        return tidspunkt.toordinal() + 1721424.5
+    if tidspunkt.tzinfo is not None:
+        tidspunkt = tidspunkt.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return _JD_2000_12H + (tidspunkt - _DATO_2000).total_seconds() / 86400
+
+
+class PhaseEventCache:
+    """
+    Sorteret array med tidspunkterne (JDE) for alle hovedfaser.
+
+    Faserne kommer altid i rækkefølgen ny → første kvarter → fuld → sidste
+    kvarter, så den næste fase af en given type findes med én binær søgning
+    og højst tre skridt frem. Dækningen udvides dovent i hele blokke af
+    lunationer, når et opslag ligger uden for den (begge retninger).
+
+    Opslag er trådsikre: arrays erstattes samlet ved udvidelse.
+
+    Attributes:
+        stats (dict): 'queries', 'hits' (uden udvidelse), 'extensions' og
+                      'events' (beregnede faser).
+    """
+
+    def __init__(self, blok: int = FASE_BLOK):
+        """
+        Args:
+            blok (int): Lunationer der beregnes pr. udvidelse.
+        """
+        self.blok = blok
+        self._lås = threading.Lock()
+        # (første k, JDE'er, fasetype 0-3); k er heltal, faserne er k + type/4
+        self._data: Tuple[int, array, array] = (0, array("d"), array("b"))
+        self.stats = {"queries": 0, "hits": 0, "extensions": 0, "events": 0}
+
+    @property
+    def hit_rate(self) -> float:
+        """Andel af opslag der blev besvaret uden at udvide (0-1)."""
+        return self.stats["hits"] / self.stats["queries"] if self.stats["queries"] else 0.0
+
+    @property
+    def coverage(self) -> Optional[Tuple[dt.datetime, dt.datetime]]:
+        """Første og sidste beregnede fase, eller None før første opslag."""
+        _, jde, _ = self._data
+        return (jd_til_datetime(jde[0]), jd_til_datetime(jde[-1])) if jde else None
+
+    # ── Opslag ──
+
+    def next_event(self, phase: str, tidspunkt) -> float:
+        """
+        Den første fase af en type efter et tidspunkt.
+
+        Args:
+            phase (str): En af `FASER` ("new", "first_quarter", "full", "last_quarter").
+            tidspunkt (date eller datetime): date tæller fra midnat UTC.
+
+        Returns:
+            float: JDE for fasen.
+
+        Raises:
+            ValueError: Ved ukendt fase.
+        """
+        return self._næste(phase, _jd(tidspunkt))
+
+    def days_until(self, phase: str, tidspunkt) -> float:
+        """
+        Dage fra et tidspunkt til næste fase af en type.
+
+        Args:
+            phase (str): En af `FASER`.
+            tidspunkt (date eller datetime): date tæller fra midnat UTC.
+
+        Returns:
+            float: Dage (> 0).
+        """
+        jd = _jd(tidspunkt)
+        return self._næste(phase, jd) - jd
+
+    def events(self, start, slut) -> List[Tuple[str, dt.datetime]]:
+        """
+        Alle hovedfaser i et interval.
+
+        Args:
+            start, slut (date eller datetime): Intervallet [start, slut).
+
+        Returns:
+            list: (fase, tidspunkt) i tidsrækkefølge.
+        """
+        fra, til = _jd(start), _jd(slut)
+        self._opslag(til)
+        _, jde, typer = self._opslag(fra)
+        i = bisect_right(jde, fra)
+        resultat = []
+        while i < len(jde) and jde[i] < til:
+            resultat.append((FASER[typer[i]], jd_til_datetime(jde[i])))
+            i += 1
+        return resultat
+
+    def report(self) -> Dict[str, float]:
+        """Statistik inkl. træfrate og dækning i år."""
+        _, jde, _ = self._data
+        dækning = (jde[-1] - jde[0]) / 365.25 if jde else 0.0
+        return dict(self.stats, hit_rate=self.hit_rate, years=dækning)
+
+    def _næste(self, phase: str, jd: float) -> float:
+        if phase not in FASER:
+            raise ValueError(f"Ukendt fase '{phase}'")
+        _, jde, typer = self._opslag(jd)
+        i = bisect_right(jde, jd)
+        return jde[i + (FASER.index(phase) - typer[i]) % 4]
+
+    # ── Udvidelse ──
+
+    def _opslag(self, jd: float) -> Tuple[int, array, array]:
+        """Data der dækker `jd` med mindst fire faser efter (udvider om nødvendigt)."""
+        data = self._data
+        self.stats["queries"] += 1
+        if self._dækker(data, jd):
+            self.stats["hits"] += 1
+            return data
+        with self._lås:
+            data = self._data
+            if not self._dækker(data, jd):
+                data = self._udvid(data, jd)
+                self._data = data
+                self.stats["extensions"] += 1
+        return data
+
+    @staticmethod
+    def _dækker(data, jd: float) -> bool:
+        _, jde, _ = data
+        return bool(jde) and jde[0] <= jd and bisect_right(jde, jd) + 4 <= len(jde)
+
+    def _udvid(self, data, jd: float) -> Tuple[int, array, array]:
+        """Beregner de manglende lunationer i hele blokke og samler arrays."""
+        k0, jde, typer = data
+        k_mål = math.floor((jd - 2451550.09766) / 29.530588861)
+        if not jde:
+            fra = k_mål - self.blok // 2
+            return self._blok(fra, fra + self.blok)
+
+        k_slut = k0 + len(jde) // 4
+        if jd < jde[0]:
+            # Bagud: fra (mindst) en lunation før målet op til den nuværende start
+            fra = min(k_mål - 1, k0 - self.blok)
+            _, ny_jde, ny_typer = self._blok(fra, k0)
+            return fra, ny_jde + jde, ny_typer + typer
+        # Frem: til (mindst) to lunationer efter målet
+        til = max(k_mål + 2, k_slut + self.blok)
+        _, ny_jde, ny_typer = self._blok(k_slut, til)
+        return k0, jde + ny_jde, typer + ny_typer
+
+    def _blok(self, fra: int, til: int) -> Tuple[int, array, array]:
+        """Faserne for lunation fra .. til-1."""
+        jde, typer = array("d"), array("b")
+        for k in range(fra, til):
+            for t in range(4):
+                jde.append(_sand_fase(k + t / 4))
+                typer.append(t)
+        self.stats["events"] += len(jde)
+        return fra, jde, typer
@@ -0,0 +1,507 @@
+"""
+Lokal stand-in for Open-Meteo til belastningstest af LunarOrbit.
+
+Efterligner de to endpoints `MoonAPIClient` bruger:
+    /v1/forecast   (api.open-meteo.com)
+    /v1/archive    (archive-api.open-meteo.com)
+
+med samme `daily`/`hourly`-svarform. Tre tilstande:
+
+  - "synthetic": Deterministiske værdier beregnet ud fra sted, dato og
+                 variabel. Samme forespørgsel giver altid samme svar.
+  - "record":    Videresender til de rigtige endpoints og gemmer hvert
+                 svar i en "tape"-fil (JSON).
+  - "replay":    Besvarer fra tape-filen uden netværk.
+
+Latens, jitter, fejlrate og throttling (429 over et max antal
+forespørgsler pr. sekund) kan konfigureres, så klientens
+gennemstrømning og halelatens kan måles uden netværk (`run_load`).
+
+Start fra kommandolinjen:
+    python -m logik.meteo_stub --port 8081 --latency 0.05 --max-rps 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime as dt
+import io
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+# De rigtige endpoints (bruges i "record"-tilstand)
+UPSTREAM = {
+    "/v1/forecast": "https://api.open-meteo.com/v1/forecast",
+    "/v1/archive":  "https://archive-api.open-meteo.com/v1/archive",
+}
+
+# Enheder for de variable LunarOrbit beder om
+_ENHEDER = {
+    "temperature_2m": "°C", "cloud_cover": "%", "precipitation_probability": "%",
+    "precipitation": "mm", "relative_humidity_2m": "%", "wind_speed_10m": "km/h",
+    "visibility": "m",
+}
+
+_STATUS_TEKST = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                 429: "Too Many Requests", 500: "Internal Server Error",
+                 502: "Bad Gateway"}
+
+
+class StubConfig:
+    """
+    Indstillinger for stand-in-serveren.
+
+    Attributes:
+        tilstand (str):   "synthetic", "record" eller "replay".
+        tape (str):       Sti til tape-filen (record/replay).
+        latens (float):   Fast svartid i sekunder.
+        jitter (float):   Ekstra tilfældig svartid (0 - jitter sekunder).
+        fejlrate (float): Andel af forespørgsler der besvares med 500.
+        max_rps (float):  Forespørgsler pr. sekund før 429 (None = ubegrænset).
+        seed (int):       Seed for latens- og fejltrækninger.
+    """
+
+    __slots__ = ("tilstand", "tape", "latens", "jitter", "fejlrate", "max_rps", "seed")
+
+    def __init__(self, tilstand: str = "synthetic", tape: Optional[str] = None,
+                 latens: float = 0.0, jitter: float = 0.0, fejlrate: float = 0.0,
+                 max_rps: Optional[float] = None, seed: int = 0):
+        if tilstand not in ("synthetic", "record", "replay"):
+            raise ValueError(f"Ukendt tilstand '{tilstand}'")
+        if tilstand != "synthetic" and not tape:
+            raise ValueError(f"Tilstanden '{tilstand}' kræver en tape-fil")
+        self.tilstand = tilstand
+        self.tape     = tape
+        self.latens   = latens
+        self.jitter   = jitter
+        self.fejlrate = fejlrate
+        self.max_rps  = max_rps
+        self.seed     = seed
+
+
+def _syntetisk_værdi(variabel: str, lat: float, lon: float, tidspunkt: str) -> float:
+    """
+    Deterministisk vejrværdi for en variabel, et sted og et tidspunkt.
+
+    Temperaturer følger en årstidskurve; procentvariable er heltal 0-100.
+
+    Args:
+        variabel (str):  Open-Meteo variabelnavn (f.eks. "temperature_2m_max").
+        lat, lon (float): Koordinater.
+        tidspunkt (str): "YYYY-MM-DD" eller "YYYY-MM-DDTHH:MM".
+
+    Returns:
+        float: Værdien.
+    """
+    rng = random.Random(f"{variabel}|{lat:.4f}|{lon:.4f}|{tidspunkt}")
+    dag_i_år = dt.date.fromisoformat(tidspunkt[:10]).timetuple().tm_yday
+    sæson = -math.cos(2 * math.pi * (dag_i_år - 15) / 365.25)
+
+    if variabel.startswith("temperature"):
+        basis = 8.0 + 9.0 * sæson - 0.3 * (abs(lat) - 50)
+        if variabel.endswith("_min"):
+            basis -= 5.0
+        elif variabel.endswith("_max"):
+            basis += 3.0
+        return round(basis + rng.gauss(0, 2.5), 1)
+    if variabel.startswith(("cloud_cover", "precipitation_probability",
+                            "relative_humidity")):
+        return float(rng.randint(0, 100))
+    if variabel.startswith("precipitation"):
+        return round(max(0.0, rng.gauss(0.5, 2.0)), 1)
+    return round(rng.uniform(0, 10), 1)
+
+
+def synthetic_response(sti: str, query: Dict[str, str]) -> object:
+    """
+    Bygger et Open-Meteo-lignende svar for en forespørgsel.
+
+    Flere koordinater (kommasepareret) giver en liste af svar, som hos
+    Open-Meteo.
+
+    Args:
+        sti (str):    "/v1/forecast" eller "/v1/archive".
+        query (dict): Querystreng-parametre.
+
+    Returns:
+        dict eller list: JSON-serialiserbart svar.
+
+    Raises:
+        ValueError: Ved manglende eller ugyldige parametre.
+    """
+    lats = [float(x) for x in query["latitude"].split(",")]
+    lons = [float(x) for x in query["longitude"].split(",")]
+    if len(lats) != len(lons):
+        raise ValueError("latitude og longitude skal have samme antal værdier")
+
+    start = dt.date.fromisoformat(query["start_date"])
+    slut  = dt.date.fromisoformat(query.get("end_date", query["start_date"]))
+    if slut < start:
+        raise ValueError("end_date ligger før start_date")
+    dage = [(start + dt.timedelta(days=i)).isoformat()
+            for i in range((slut - start).days + 1)]
+    timer = [f"{d}T{h:02d}:00" for d in dage for h in range(24)]
+
+    svar = []
+    for lat, lon in zip(lats, lons):
+        post = {"latitude": lat, "longitude": lon, "generationtime_ms": 0.1,
+                "utc_offset_seconds": 0, "timezone": "GMT",
+                "timezone_abbreviation": "GMT", "elevation": 10.0}
+        for felt, tider in (("daily", dage), ("hourly", timer)):
+            if not query.get(felt):
+                continue
+            variable = query[felt].split(",")
+            post[f"{felt}_units"] = {"time": "iso8601", **{
+                v: next((e for k, e in _ENHEDER.items() if v.startswith(k)), "")
+                for v in variable}}
+            post[felt] = {"time": tider, **{
+                v: [_syntetisk_værdi(v, lat, lon, t) for t in tider] for v in variable}}
+        svar.append(post)
+    return svar[0] if len(svar) == 1 else svar
+
+
+def _tape_nøgle(sti: str, query: Dict[str, str]) -> str:
+    """Stabil nøgle for en forespørgsel: sti + sorteret querystreng."""
+    return f"{sti}?{urlencode(sorted(query.items()))}"
+
+
+class OpenMeteoStub:
+    """
+    asyncio-baseret stand-in-server for Open-Meteo.
+
+    Brug `start()` inden for en kørende event-loop, eller
+    `run_in_thread()` fra synkron kode.
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        """
+        Args:
+            config (StubConfig, optional): Indstillinger (standard: synthetic).
+        """
+        self.config = config or StubConfig()
+        self._rng   = random.Random(self.config.seed)
+        self._tape: Dict[str, Tuple[int, object]] = {}
+        if self.config.tilstand == "replay":
+            with open(self.config.tape, encoding="utf-8") as f:
+                self._tape = {k: tuple(v) for k, v in json.load(f).items()}
+
+        # Tokenspand til throttling
+        self._tokens = self.config.max_rps or 0.0
+        self._sidst  = time.monotonic()
+
+        self.stats  = {"requests": 0, "throttled": 0, "errors": 0, "replay_misses": 0}
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.port   = 0
+        self._forbindelser: set = set()
+
+    # ── Livscyklus ──
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starter serveren i den kørende event-loop.
+
+        Args:
+            host (str): Adresse.
+            port (int): Port (0 vælger en ledig).
+
+        Returns:
+            str: Basis-URL, f.eks. "http://127.0.0.1:54321".
+        """
+        self.server = await asyncio.start_server(self._forbindelse, host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return f"http://{host}:{self.port}"
+
+    async def stop(self) -> None:
+        """Stopper serveren og gemmer tapen i "record"-tilstand."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        # Afbryd åbne keep-alive-forbindelser, før løkken stoppes
+        for opgave in list(self._forbindelser):
+            opgave.cancel()
+        await asyncio.gather(*self._forbindelser, return_exceptions=True)
+        self.save_tape()
+
+    def save_tape(self) -> None:
+        """Skriver optagede svar til tape-filen ("record"-tilstand)."""
+        if self.config.tilstand != "record":
+            return
+        os.makedirs(os.path.dirname(self.config.tape) or ".", exist_ok=True)
+        with open(self.config.tape, "w", encoding="utf-8") as f:
+            json.dump(self._tape, f, ensure_ascii=False)
+
+    def run_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, Callable[[], None]]:
+        """
+        Starter serveren i en baggrundstråd med egen event-loop.
+
+        Args:
+            host (str): Adresse.
+            port (int): Port (0 vælger en ledig).
+
+        Returns:
+            tuple: (basis-URL, stop-funktion)
+        """
+        loop  = asyncio.new_event_loop()
+        klar  = threading.Event()
+        resultat = {}
+
+        def kør():
+            asyncio.set_event_loop(loop)
+            resultat["url"] = loop.run_until_complete(self.start(host, port))
+            klar.set()
+            loop.run_forever()
+
+        tråd = threading.Thread(target=kør, daemon=True)
+        tråd.start()
+        klar.wait()
+
+        def stop():
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            tråd.join()
+            loop.close()
+
+        return resultat["url"], stop
+
+    # ── Forespørgsler ──
+
+    def _throttled(self) -> bool:
+        """Tokenspand: True hvis forespørgslen skal afvises med 429."""
+        if not self.config.max_rps:
+            return False
+        nu = time.monotonic()
+        self._tokens = min(self.config.max_rps,
+                           self._tokens + (nu - self._sidst) * self.config.max_rps)
+        self._sidst = nu
+        if self._tokens < 1.0:
+            return True
+        self._tokens -= 1.0
+        return False
+
+    async def _svar(self, sti: str, query: Dict[str, str]) -> Tuple[int, object, Dict[str, str]]:
+        """
+        Beregner (status, JSON-krop, ekstra headers) for én forespørgsel.
+        """
+        self.stats["requests"] += 1
+        if sti not in UPSTREAM:
+            return 404, {"error": True, "reason": f"Unknown endpoint {sti}"}, {}
+
+        if self._throttled():
+            self.stats["throttled"] += 1
+            return 429, {"error": True, "reason": "Too many requests"}, {"Retry-After": "1"}
+
+        forsinkelse = self.config.latens + self._rng.random() * self.config.jitter
+        if forsinkelse > 0:
+            await asyncio.sleep(forsinkelse)
+
+        if self.config.fejlrate and self._rng.random() < self.config.fejlrate:
+            self.stats["errors"] += 1
+            return 500, {"error": True, "reason": "Simulated upstream error"}, {}
+
+        nøgle = _tape_nøgle(sti, query)
+        if self.config.tilstand == "replay":
+            if nøgle not in self._tape:
+                self.stats["replay_misses"] += 1
+                return 404, {"error": True, "reason": "Not recorded"}, {}
+            status, krop = self._tape[nøgle]
+            return status, krop, {}
+
+        if self.config.tilstand == "record":
+            import requests
+            try:
+                r = await asyncio.get_running_loop().run_in_executor(
+                    None, lambda: requests.get(UPSTREAM[sti], params=query, timeout=15))
+                status, krop = r.status_code, r.json()
+            except Exception as e:
+                return 502, {"error": True, "reason": f"Upstream error: {e}"}, {}
+            self._tape[nøgle] = (status, krop)
+            return status, krop, {}
+
+        try:
+            return 200, synthetic_response(sti, query), {}
+        except (KeyError, ValueError) as e:
+            return 400, {"error": True, "reason": f"Invalid request: {e}"}, {}
+
+    async def _forbindelse(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        """Håndterer én keep-alive-forbindelse (kun GET)."""
+        opgave = asyncio.current_task()
+        self._forbindelser.add(opgave)
+        try:
+            while True:
+                linje = await reader.readline()
+                if not linje:
+                    break
+                try:
+                    _, mål, version = linje.decode("latin-1").split()
+                except ValueError:
+                    break
+                luk = version != "HTTP/1.1"
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    if h.lower().startswith(b"connection:") and b"close" in h.lower():
+                        luk = True
+
+                dele  = urlsplit(mål)
+                query = {k: v[-1] for k, v in parse_qs(dele.query).items()}
+                status, krop, ekstra = await self._svar(dele.path, query)
+
+                data = json.dumps(krop).encode("utf-8")
+                headers = "".join(f"{k}: {v}\r\n" for k, v in ekstra.items())
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS_TEKST.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n{headers}"
+                    f"Connection: {'close' if luk else 'keep-alive'}\r\n\r\n"
+                    .encode("latin-1") + data)
+                await writer.drain()
+                if luk:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._forbindelser.discard(opgave)
+            writer.close()
+
+
+def point_client_at(client, basis_url: str, limiter=None) -> None:
+    """
+    Peger en klient (`MoonAPIClient`, `AsyncWeatherClient`) mod en stand-in-server.
+
+    Klienten får sin egen ratebegrænsning, så målinger mod stubben ikke
+    deler (eller tømmer) processens fælles spand.
+
+    Args:
+        client:          Klienten.
+        basis_url (str): F.eks. "http://127.0.0.1:54321".
+        limiter (RateLimiter, optional): Standard: ubegrænset.
+    """
+    from logik.rate_limiter import RateLimiter
+    client.WEATHER_API_URL = f"{basis_url}/v1/forecast"
+    client.ARCHIVE_API_URL = f"{basis_url}/v1/archive"
+    client.limiter = limiter or RateLimiter(rate=None)
+
+
+# ──────────────────────────────────────────────
+# BELASTNINGSTEST
+# ──────────────────────────────────────────────
+
+def _percentil(sorteret: List[float], p: float) -> float:
+    """Percentil (0-100) af en sorteret liste."""
+    if not sorteret:
+        return 0.0
+    return sorteret[min(len(sorteret) - 1, int(len(sorteret) * p / 100))]
+
+
+def run_load(config: StubConfig, antal: int = 2000, samtidighed: int = 32,
+             client_factory: Optional[Callable] = None,
+             datoer: Optional[List[str]] = None, stille: bool = True) -> Dict[str, float]:
+    """
+    Måler gennemstrømning og halelatens for `fetch_weather_record` mod stubben.
+
+    Kaldene fordeles over `samtidighed` tråde, der hver har sin egen klient.
+    Datoer vælges omkring i dag, så både forecast- og arkiv-endpointet bruges.
+
+    Args:
+        config (StubConfig):      Stubbens indstillinger.
+        antal (int):              Samlet antal kald.
+        samtidighed (int):        Antal samtidige tråde.
+        client_factory (callable, optional): Bygger en klient (standard: MoonAPIClient).
+        datoer (list, optional):  Datoer der trækkes fra.
+        stille (bool):            Undertryk klientens advarsler under kørslen.
+
+    Returns:
+        dict: 'throughput' (kald/s), 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+              'weather_ok' (andel med vejrdata), 'throttled', 'errors'.
+    """
+    if client_factory is None:
+        from logik.moon_api import MoonAPIClient
+        client_factory = MoonAPIClient
+    if datoer is None:
+        i_dag = dt.date.today()
+        datoer = [(i_dag + dt.timedelta(days=d)).isoformat() for d in range(-30, 15)]
+
+    stub = OpenMeteoStub(config)
+    url, stop = stub.run_in_thread()
+    lokal = threading.local()
+
+    def kald(i: int):
+        klient = getattr(lokal, "klient", None)
+        if klient is None:
+            klient = lokal.klient = client_factory()
+            point_client_at(klient, url)
+        t = time.perf_counter()
+        post = klient.fetch_weather_record(datoer[i % len(datoer)])
+        return time.perf_counter() - t, bool(post and post.has_weather)
+
+    try:
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO() if stille else sys.stdout), \
+                ThreadPoolExecutor(max_workers=samtidighed) as pulje:
+            resultater = list(pulje.map(kald, range(antal)))
+        varighed = time.perf_counter() - t0
+    finally:
+        stop()
+
+    latenser = sorted(r[0] for r in resultater)
+    return {
+        "throughput": antal / varighed,
+        "p50_ms":     _percentil(latenser, 50) * 1000,
+        "p95_ms":     _percentil(latenser, 95) * 1000,
+        "p99_ms":     _percentil(latenser, 99) * 1000,
+        "max_ms":     latenser[-1] * 1000,
+        "weather_ok": sum(r[1] for r in resultater) / antal,
+        "throttled":  stub.stats["throttled"],
+        "errors":     stub.stats["errors"],
+    }
+
+
+def main(argv=None):
+    """
+    Kører stand-in-serveren fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Open-Meteo stand-in for LunarOrbit")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--mode", default="synthetic",
+                        choices=("synthetic", "record", "replay"))
+    parser.add_argument("--tape", help="Tape-fil til record/replay")
+    parser.add_argument("--latency", type=float, default=0.0, help="Sekunder")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Sekunder")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    stub = OpenMeteoStub(StubConfig(args.mode, args.tape, args.latency, args.jitter,
+                                    args.error_rate, args.max_rps))
+
+    async def kør():
+        url = await stub.start(args.host, args.port)
+        print(f"Open-Meteo stand-in ({args.mode}) på {url}")
+        try:
+            await stub.server.serve_forever()
+        finally:
+            await stub.stop()
+
+    try:
+        asyncio.run(kør())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,147 @@ Alle astronomiske tider beregnes lokalt, så de altid virker uanset
 internetforbindelse og dato — der er ingen API-grænser eller 400-fejl.
 """
 
+import calendar
 import math
 import datetime as dt
-import requests
-from typing import Dict, Optional
+from array import array
+from typing import Dict, Optional, Tuple
+
+from logik.boilerplate import Formatters
+from logik.rate_limiter import INTERACTIVE, get_json, get_limiter
+from logik.records import (INGEN_TID, MANGLER, HourlyTable, MoonRecord,
+                           SolarEvents, WeatherRecord, til_tal)
+
+
+# ──────────────────────────────────────────────
+# TIDSHJÆLPERE
+# ──────────────────────────────────────────────
+
+def _lokal_minutter(t_utc, offset):
+    """
+    Konverterer UTC-timer (float) til hele minutter efter lokal midnat.
+
+    Afrunder på samme måde som den tidligere "HH:MM"-formatering
+    (timer og minutter trunkeres hver for sig).
+
+    Args:
+        t_utc (float): Tidspunkt i UTC-timer.
+        offset (int):  Tidszoneforskydning i timer.
+
+    Returns:
+        int: Minutter efter lokal midnat (0-1439).
+    """
+    lokal = (t_utc + offset) % 24
+    return int(lokal) * 60 + int((lokal % 1) * 60)
+
+
+def _dst_offset(måned, dag):
+    """
+    Returnerer dansk tidszoneforskydning i timer for en dato.
+
+    Dansk sommertid: UTC+2 fra sidst i marts til sidst i oktober,
+    ellers UTC+1.
+
+    Args:
+        måned (int), dag (int): Dato.
+
+    Returns:
+        int: 2 ved sommertid, ellers 1.
+    """
+    er_sommer = (3 < måned < 10) or \
+                (måned == 3 and dag >= 25) or \
+                (måned == 10 and dag < 25)
+    return 2 if er_sommer else 1
+
+
+# Opslagstabel [måned][dag] → offset, bygget én gang ved import
+_DST_TABEL = [[_dst_offset(m, d) for d in range(32)] for m in range(13)]
+
+# Ordinal for 1. januar 2000 (dt.date.toordinal) og sin af ekliptikkens hældning
+_J2000_ORDINAL = dt.date(2000, 1, 1).toordinal()
+_SIN_EPSILON   = math.sin(math.radians(23.4393))
+_COS_EPSILON   = math.cos(math.radians(23.4393))
+
+# Juliansk dag (0h UT) minus dt.date.toordinal for samme dato
+_JD_ORDINAL = 1721424.5
+
+
+def _offsets(start, antal_dage):
+    """
+    Tidszoneforskydningen for fortløbende dage.
+
+    Args:
+        start (date):     Første dato.
+        antal_dage (int): Antal dage.
+
+    Returns:
+        array('d'): Forskydning i timer pr. dag.
+    """
+    ud = array("d")
+    år, måned, dag = start.year, start.month, start.day
+    while len(ud) < antal_dage:
+        # Resten af måneden i ét udsnit af tabellen
+        sidste = calendar.monthrange(år, måned)[1]
+        n = min(sidste - dag + 1, antal_dage - len(ud))
+        ud.extend(_DST_TABEL[måned][dag:dag + n])
+        år, måned, dag = (år + 1, 1, 1) if måned == 12 else (år, måned + 1, 1)
+    return ud
 
 
 # ──────────────────────────────────────────────
 # SOLOPGANG / SOLNEDGANG  (NOAA-algoritme)
 # ──────────────────────────────────────────────
 
+def _sol_position(J):
+    """
+    Beregner solens deklination og tidsligningen.
+
+    Args:
+        J (float): Dage siden 1. januar 2000 (0h UTC).
+
+    Returns:
+        tuple: (deklination i radianer, tidsligning i timer)
+    """
+    # Solens middelanomalig og ekliptikale longitude
+    M   = math.radians((357.5291 + 0.98560028 * J) % 360)
+    L   = (280.4665 + 0.98564736 * J) % 360
+    C   = 1.9148 * math.sin(M) + 0.0200 * math.sin(2*M) + 0.0003 * math.sin(3*M)
+    lam = math.radians((L + C + 180 + 102.9372) % 360)
+
+    # Solens deklination
+    dekl = math.asin(_SIN_EPSILON * math.cos(lam))
+
+    # Tidsligning (minutter → timer): kompenserer for Jordens elliptiske bane
+    tidslign = (-2.468 * math.sin(2 * math.radians(L))
+                + 0.053 * math.sin(4 * math.radians(L))
+                - 1.915 * math.sin(M)
+                - 0.020 * math.sin(2 * M)) / 60.0
+
+    return dekl, tidslign
+
+
+def _sol_ekvatorial(J):
+    """
+    Beregner solens rektascension og deklination med samme serie som `_sol_position`.
+
+    Args:
+        J (float): Dage siden 1. januar 2000 (0h UTC).
+
+    Returns:
+        tuple: (rektascension i grader 0-360, deklination i radianer)
+    """
+    M   = math.radians((357.5291 + 0.98560028 * J) % 360)
+    L   = (280.4665 + 0.98564736 * J) % 360
+    C   = 1.9148 * math.sin(M) + 0.0200 * math.sin(2*M) + 0.0003 * math.sin(3*M)
+    lam = math.radians((L + C + 180 + 102.9372) % 360)
+
+    # Serien måler `lam` 90° bagud i forhold til den ekliptiske longitude
+    # (deklinationen bruger cos i stedet for sin), så sin/cos byttes også her
+    dekl = math.asin(_SIN_EPSILON * math.cos(lam))
+    ra   = math.degrees(math.atan2(_COS_EPSILON * math.cos(lam), -math.sin(lam))) % 360
+    return ra, dekl
+
+
 def _sol_tider(år, måned, dag, breddegrad, længdegrad):
     """
     Beregner solopgang og solnedgang med NOAA's algoritme.
@@ -37,54 +168,27 @@ def _sol_tider(år, måned, dag, breddegrad, længdegrad):
         tuple: (solopgang, solnedgang) som "HH:MM" strenge i lokal tid,
                eller ("-", "-") ved polar dag/nat.
     """
-    try:
-        # Dage siden J2000.0
-        J = (dt.date(år, måned, dag) - dt.date(2000, 1, 1)).days
-
-        # Solens middelanomalig og ekliptikale longitude
-        M   = math.radians((357.5291 + 0.98560028 * J) % 360)
-        L   = (280.4665 + 0.98564736 * J) % 360
-        C   = 1.9148 * math.sin(M) + 0.0200 * math.sin(2*M) + 0.0003 * math.sin(3*M)
-        lam = math.radians((L + C + 180 + 102.9372) % 360)
-
-        # Solens deklination
-        dekl = math.asin(math.sin(math.radians(23.4393)) * math.cos(lam))
-
-        # Tidsligning (minutter → timer): kompenserer for Jordens elliptiske bane
-        tidslign = (-2.468 * math.sin(2 * math.radians(L))
-                    + 0.053 * math.sin(4 * math.radians(L))
-                    - 1.915 * math.sin(M)
-                    - 0.020 * math.sin(2 * M)) / 60.0
-
-        # Solar noon i UTC-timer
-        noon_utc = 12.0 - (længdegrad / 15.0) - tidslign
+    op, ned = _sol_minutter(år, måned, dag, breddegrad, længdegrad)
+    return (Formatters.format_minutes(op), Formatters.format_minutes(ned))
 
-        # Timevinklen H: vinklen fra solar noon til solopgang/nedgang
-        # Sol regnes op når den er 0.8333 grader under horisonten (refraktion)
-        phi   = math.radians(breddegrad)
-        cos_H = (math.sin(math.radians(-0.8333)) - math.sin(phi) * math.sin(dekl)) / \
-                (math.cos(phi) * math.cos(dekl))
 
-        if abs(cos_H) > 1:
-            return ("-", "-")   # Polar dag eller polarnat
-
-        H = math.degrees(math.acos(cos_H)) / 15.0  # Grader → timer
-
-        # Dansk sommertid: UTC+2 fra sidst i marts til sidst i oktober
-        er_sommer = (3 < måned < 10) or \
-                    (måned == 3 and dag >= 25) or \
-                    (måned == 10 and dag < 25)
-        offset = 2 if er_sommer else 1
+def _sol_minutter(år, måned, dag, breddegrad, længdegrad) -> Tuple[int, int]:
+    """
+    Beregner solopgang og solnedgang som minutter efter lokal midnat.
 
-        def fmt(t_utc):
-            """Konverterer UTC-timer (float) til lokal "HH:MM" streng."""
-            lokal = (t_utc + offset) % 24
-            return f"{int(lokal):02d}:{int((lokal % 1) * 60):02d}"
+    Engangsvariant af `ObserverContext.sun_events`. Ved mange kald for
+    samme sted bør en `ObserverContext` genbruges i stedet.
 
-        return (fmt(noon_utc - H), fmt(noon_utc + H))
+    Args:
+        år (int), måned (int), dag (int): Dato.
+        breddegrad (float): Observatørens breddegrad i grader.
+        længdegrad (float): Observatørens længdegrad i grader.
 
-    except Exception:
-        return ("-", "-")
+    Returns:
+        tuple: (solopgang, solnedgang) i minutter, eller
+               (INGEN_TID, INGEN_TID) ved polar dag/nat.
+    """
+    return ObserverContext(breddegrad, længdegrad).sun_events(år, måned, dag)
 
 
 # ──────────────────────────────────────────────
@@ -112,6 +216,127 @@ def _julian_dag(år, måned, dag):
     return int(365.25 * (år + 4716)) + int(30.6001 * (måned + 1)) + dag + B - 1524.5
 
 
+def _måne_position(JD):
+    """
+    Beregner månens rektascension og deklination.
+
+    Månens position beregnes ud fra dens gennemsnitlige bane med
+    perturbationer (korrektioner for sol og jord).
+
+    Args:
+        JD (float): Juliansk dag (UTC).
+
+    Returns:
+        tuple: (rektascension i grader 0-360, deklination i radianer)
+    """
+    T  = (JD - 2451545.0) / 36525.0            # Julianiske århundreder
+
+    # Månens banepa parametre i grader
+    L0 = (218.3165 + 481267.8813 * T) % 360   # Gennemsnitlig longitude
+    M  = math.radians((134.9634 + 477198.8676 * T) % 360)  # Månens anomali
+    Ms = math.radians((357.5291 + 35999.0503  * T) % 360)  # Solens anomali
+    D  = math.radians((297.8502 + 445267.1115 * T) % 360)  # Elongation
+    F  = math.radians((93.2720  + 483202.0175 * T) % 360)  # Baneknude
+
+    # Korrektioner til ekliptisk longitude (grader)
+    delta_L = (6.289 * math.sin(M)
+               - 1.274 * math.sin(2*D - M)
+               + 0.658 * math.sin(2*D)
+               - 0.214 * math.sin(2*M)
+               - 0.186 * math.sin(Ms)
+               - 0.114 * math.sin(2*F))
+
+    lam     = math.radians((L0 + delta_L) % 360)
+    epsilon = math.radians(23.4393 - 0.013 * T)  # Ekliptikkens hældning
+
+    # Månens deklination og rektascension
+    dekl = math.asin(math.sin(epsilon) * math.sin(lam))
+    ra   = math.degrees(math.atan2(math.cos(epsilon) * math.sin(lam),
+                                   math.cos(lam))) % 360
+    return ra, dekl
+
+
+def _gmst_grader(JD):
+    """
+    Beregner Greenwich middel-stjernetid (Meeus kap. 12).
+
+    Args:
+        JD (float): Juliansk dag (UT).
+
+    Returns:
+        float: Stjernetid i grader (0-360).
+    """
+    T = (JD - 2451545.0) / 36525.0
+    return (280.46061837 + 360.98564736629 * (JD - 2451545.0)
+            + 0.000387933 * T * T - T * T * T / 38710000.0) % 360
+
+
+# ──────────────────────────────────────────────
+# DAGSFORMLER (bruges af ObserverContext og kernels.py)
+# ──────────────────────────────────────────────
+# Funktionerne er selvstændige (kun math og hinanden), så kernels.py kan
+# oversætte præcis de samme formler med numba.
+
+def _sol_dag(J, længde_timer, sin_phi, cos_phi):
+    """
+    Solens middag og leddene til timevinklen for én dag.
+
+    Args:
+        J (float):            Dage siden 1. januar 2000 (0h UTC).
+        længde_timer (float): Længdegraden i timer.
+        sin_phi (float), cos_phi (float): sin/cos af breddegraden.
+
+    Returns:
+        tuple: (solar noon i UTC-timer, sin φ·sin δ, cos φ·cos δ)
+    """
+    dekl, tidslign = _sol_position(J)
+    return (12.0 - længde_timer - tidslign,
+            sin_phi * math.sin(dekl), cos_phi * math.cos(dekl))
+
+
+def _måne_dag(JD, længde_timer, sin_phi, cos_phi):
+    """
+    Månens transit og leddene til timevinklen for én dag.
+
+    Args:
+        JD (float):           Juliansk dag for positionen (middag UTC).
+        længde_timer (float): Længdegraden i timer.
+        sin_phi (float), cos_phi (float): sin/cos af breddegraden.
+
+    Returns:
+        tuple: (transit i UTC-timer, sin φ·sin δ, cos φ·cos δ)
+    """
+    ra, dekl = _måne_position(JD)
+    return ((ra / 15.0 - længde_timer) % 24,
+            sin_phi * math.sin(dekl), cos_phi * math.cos(dekl))
+
+
+def _opgang_nedgang(midt_utc, sin_h0, sin_led, nævner, offset):
+    """
+    Opgang og nedgang symmetrisk om middag/transit.
+
+    Args:
+        midt_utc (float): Middag eller transit i UTC-timer.
+        sin_h0 (float):   sin af horisonthøjden.
+        sin_led (float), nævner (float): Fra `_sol_dag` / `_måne_dag`.
+        offset (int):     Tidszoneforskydning i timer.
+
+    Returns:
+        tuple: (opgang, nedgang) i minutter efter lokal midnat, eller
+               (INGEN_TID, INGEN_TID) ved polar dag/nat.
+    """
+    if nævner == 0.0:
+        return (INGEN_TID, INGEN_TID)    # Observatøren står på en pol
+
+    # Timevinklen H: vinklen fra middag/transit til opgang/nedgang
+    cos_H = (sin_h0 - sin_led) / nævner
+    if abs(cos_H) > 1:
+        return (INGEN_TID, INGEN_TID)
+    H = math.degrees(math.acos(cos_H)) / 15.0  # Grader → timer
+    return (_lokal_minutter(midt_utc - H, offset),
+            _lokal_minutter(midt_utc + H, offset))
+
+
 def _måne_tider(år, måned, dag, breddegrad, længdegrad):
     """
     Beregner måneopgang og månenedgang for en given dato og placering.
@@ -128,67 +353,273 @@ def _måne_tider(år, måned, dag, breddegrad, længdegrad):
         tuple: (måneopgang, månenedgang) som "HH:MM" strenge i lokal tid,
                eller ("-", "-") ved polar dag/nat.
     """
-    try:
-        JD = _julian_dag(år, måned, dag) + 0.5    # Middag UTC
-        T  = (JD - 2451545.0) / 36525.0            # Julianiske århundreder
+    op, ned = _måne_minutter(år, måned, dag, breddegrad, længdegrad)
+    return (Formatters.format_minutes(op), Formatters.format_minutes(ned))
+
+
+def _måne_minutter(år, måned, dag, breddegrad, længdegrad) -> Tuple[int, int]:
+    """
+    Beregner måneopgang og månenedgang som minutter efter lokal midnat.
+
+    Engangsvariant af `ObserverContext.moon_events`. Ved mange kald for
+    samme sted bør en `ObserverContext` genbruges i stedet.
+
+    Args:
+        år (int), måned (int), dag (int): Dato.
+        breddegrad (float): Observatørens breddegrad i grader.
+        længdegrad (float): Observatørens længdegrad i grader.
+
+    Returns:
+        tuple: (måneopgang, månenedgang) i minutter, eller
+               (INGEN_TID, INGEN_TID) ved polar dag/nat.
+    """
+    return ObserverContext(breddegrad, længdegrad).moon_events(år, måned, dag)
 
-        # Månens banepa parametre i grader
-        L0 = (218.3165 + 481267.8813 * T) % 360   # Gennemsnitlig longitude
-        M  = math.radians((134.9634 + 477198.8676 * T) % 360)  # Månens anomali
-        Ms = math.radians((357.5291 + 35999.0503  * T) % 360)  # Solens anomali
-        D  = math.radians((297.8502 + 445267.1115 * T) % 360)  # Elongation
-        F  = math.radians((93.2720  + 483202.0175 * T) % 360)  # Baneknude
 
-        # Korrektioner til ekliptisk longitude (grader)
-        delta_L = (6.289 * math.sin(M)
-                   - 1.274 * math.sin(2*D - M)
-                   + 0.658 * math.sin(2*D)
-                   - 0.214 * math.sin(2*M)
-                   - 0.186 * math.sin(Ms)
-                   - 0.114 * math.sin(2*F))
+# ──────────────────────────────────────────────
+# OBSERVATIONSSTED
+# ──────────────────────────────────────────────
 
-        lam     = math.radians((L0 + delta_L) % 360)
-        epsilon = math.radians(23.4393 - 0.013 * T)  # Ekliptikkens hældning
+class ObserverContext:
+    """
+    Forudberegnet kontekst for ét observationssted.
 
-        # Månens deklination og rektascension
-        dekl     = math.asin(math.sin(epsilon) * math.sin(lam))
-        ra       = math.degrees(math.atan2(math.cos(epsilon) * math.sin(lam),
-                                           math.cos(lam))) % 360
-        ra_timer = ra / 15.0   # Grader → timer
+    Bygges én gang pr. sted og genbruges på tværs af datoer. Cacher de
+    størrelser der ikke afhænger af datoen: sin/cos af breddegraden,
+    længdegraden i timer, horisontkonstanterne for refraktion og
+    sommertidstabellen.
+    """
 
-        # Månens transit i UTC (passage af meridian)
-        transit_utc = (ra_timer - (længdegrad / 15.0)) % 24
+    # Horisonthøjde ved opgang/nedgang i grader (refraktion + skivens radius)
+    SOL_HORISONT  = -0.8333
+    MÅNE_HORISONT = -0.583
 
-        # Timevinklen H ved opgang/nedgang (0.583° under horisonten)
-        phi   = math.radians(breddegrad)
-        cos_H = (math.sin(math.radians(-0.583)) - math.sin(phi) * math.sin(dekl)) / \
-                (math.cos(phi) * math.cos(dekl))
+    # Solhøjder for opgang/nedgang og de tre tusmørkedefinitioner (grader)
+    SOL_DEFINITIONER = (SOL_HORISONT, -6.0, -12.0, -18.0)
 
-        if abs(cos_H) > 1:
-            return ("-", "-")
+    __slots__ = ("breddegrad", "længdegrad", "sin_phi", "cos_phi",
+                 "længde_timer", "sin_h0_sol", "sin_h0_måne", "sin_h0_definitioner")
 
-        H = math.degrees(math.acos(cos_H)) / 15.0  # Grader → timer
+    def __init__(self, breddegrad: float, længdegrad: float):
+        """
+        Initialiserer konteksten for et sted.
 
-        er_sommer = (3 < måned < 10) or \
-                    (måned == 3 and dag >= 25) or \
-                    (måned == 10 and dag < 25)
-        offset = 2 if er_sommer else 1
+        Args:
+            breddegrad (float): Observatørens breddegrad i grader.
+            længdegrad (float): Observatørens længdegrad i grader.
+        """
+        phi = math.radians(breddegrad)
+        self.breddegrad   = breddegrad
+        self.længdegrad   = længdegrad
+        self.sin_phi      = math.sin(phi)
+        self.cos_phi      = math.cos(phi)
+        self.længde_timer = længdegrad / 15.0
+        self.sin_h0_sol   = math.sin(math.radians(self.SOL_HORISONT))
+        self.sin_h0_måne  = math.sin(math.radians(self.MÅNE_HORISONT))
+        self.sin_h0_definitioner = tuple(math.sin(math.radians(h))
+                                         for h in self.SOL_DEFINITIONER)
+
+    def offset(self, måned: int, dag: int) -> int:
+        """
+        Slår tidszoneforskydningen op i den forudberegnede tabel.
 
-        def fmt(t_utc):
-            """Konverterer UTC-timer (float) til lokal "HH:MM" streng."""
-            lokal = (t_utc + offset) % 24
-            return f"{int(lokal):02d}:{int((lokal % 1) * 60):02d}"
+        Args:
+            måned (int), dag (int): Dato.
+
+        Returns:
+            int: Forskydning i timer (1 eller 2).
+        """
+        return _DST_TABEL[måned][dag]
 
-        return (fmt(transit_utc - H), fmt(transit_utc + H))
+    def horizontal(self, ra: float, dekl: float, JD: float) -> Tuple[float, float]:
+        """
+        Omregner ækvatoriale koordinater til højde og azimut for stedet.
 
-    except Exception:
-        return ("-", "-")
+        Args:
+            ra (float):   Rektascension i grader.
+            dekl (float): Deklination i grader.
+            JD (float):   Juliansk dag (UT).
+
+        Returns:
+            tuple: (højde over horisonten i grader,
+                    azimut i grader målt fra nord mod øst)
+        """
+        H = math.radians(_gmst_grader(JD) + self.længdegrad - ra)   # Timevinkel
+        d = math.radians(dekl)
+        sin_d, cos_d, cos_H = math.sin(d), math.cos(d), math.cos(H)
+
+        sin_h = self.sin_phi * sin_d + self.cos_phi * cos_d * cos_H
+        h = math.asin(max(-1.0, min(1.0, sin_h)))
+        az = math.atan2(-cos_d * math.sin(H),
+                        sin_d * self.cos_phi - cos_d * cos_H * self.sin_phi)
+        return math.degrees(h), math.degrees(az) % 360
+
+    def sun_events(self, år: int, måned: int, dag: int) -> Tuple[int, int]:
+        """
+        Beregner solopgang og solnedgang (NOAA-algoritme).
+
+        Args:
+            år (int), måned (int), dag (int): Dato.
+
+        Returns:
+            tuple: (solopgang, solnedgang) i minutter efter lokal midnat,
+                   eller (INGEN_TID, INGEN_TID) ved polar dag/nat.
+        """
+        try:
+            # Dage siden J2000.0
+            J = dt.date(år, måned, dag).toordinal() - _J2000_ORDINAL
+            noon_utc, sin_led, nævner = _sol_dag(J, self.længde_timer,
+                                                 self.sin_phi, self.cos_phi)
+            return _opgang_nedgang(noon_utc, self.sin_h0_sol, sin_led, nævner,
+                                   _DST_TABEL[måned][dag])
+        except Exception:
+            return (INGEN_TID, INGEN_TID)
+
+    def _sol_begivenheder(self, J: int, måned: int, dag: int) -> Tuple[int, ...]:
+        """
+        Sol og tusmørke for én dag (bruges af `solar_events`).
+
+        Deklination og tidsligning beregnes én gang; derefter koster hver
+        horisontdefinition kun én acos. `solar_events_range` gør det samme
+        i `kernels.solar_events`.
+
+        Returns:
+            tuple: Værdierne i rækkefølgen `SolarEvents.FELTER`.
+        """
+        noon_utc, sin_led, nævner = _sol_dag(J, self.længde_timer, self.sin_phi, self.cos_phi)
+        offset   = _DST_TABEL[måned][dag]
+        resultat = [_lokal_minutter(noon_utc, offset)]
+        for sin_h0 in self.sin_h0_definitioner:
+            resultat += _opgang_nedgang(noon_utc, sin_h0, sin_led, nævner, offset)
+        return tuple(resultat)
+
+    def solar_events(self, år: int, måned: int, dag: int) -> SolarEvents:
+        """
+        Beregner solopgang/-nedgang og civilt, nautisk og astronomisk tusmørke.
+
+        Alle definitioner deler én evaluering af solens position.
+        `sunrise`/`sunset` er identiske med `sun_events`.
+
+        Args:
+            år (int), måned (int), dag (int): Dato.
+
+        Returns:
+            SolarEvents: Alle begivenheder i minutter efter lokal midnat.
+        """
+        J = dt.date(år, måned, dag).toordinal() - _J2000_ORDINAL
+        return SolarEvents(*self._sol_begivenheder(J, måned, dag))
+
+    def solar_events_range(self, start: dt.date, antal_dage: int) -> Dict[str, array]:
+        """
+        Batchberegning af `solar_events` for fortløbende dage.
+
+        Beregnes med `kernels.solar_events` (numba, hvis installeret).
+
+        Args:
+            start (date):     Første dato.
+            antal_dage (int): Antal dage.
+
+        Returns:
+            dict: Én `array('h')` pr. felt i `SolarEvents.FELTER`;
+                  indeks i er dagen `start + i`.
+        """
+        # Importeres her fordi kernels selv bygger på dette modul
+        from logik import kernels
+        if antal_dage <= 0:
+            return {felt: array("h") for felt in SolarEvents.FELTER}
+        ordinal = start.toordinal()
+        J = array("d", range(ordinal - _J2000_ORDINAL, ordinal - _J2000_ORDINAL + antal_dage))
+        søjler = kernels.solar_events(J, _offsets(start, antal_dage), self.længde_timer,
+                                      self.sin_phi, self.cos_phi, self.sin_h0_definitioner)
+        return dict(zip(SolarEvents.FELTER, søjler))
+
+    def moon_events(self, år: int, måned: int, dag: int) -> Tuple[int, int]:
+        """
+        Beregner måneopgang og månenedgang. Nøjagtighed ±5-10 min.
+
+        Args:
+            år (int), måned (int), dag (int): Dato.
+
+        Returns:
+            tuple: (måneopgang, månenedgang) i minutter efter lokal midnat,
+                   eller (INGEN_TID, INGEN_TID) ved polar dag/nat.
+        """
+        try:
+            JD = _julian_dag(år, måned, dag) + 0.5    # Middag UTC
+            # Månens transit i UTC (passage af meridian)
+            transit_utc, sin_led, nævner = _måne_dag(JD, self.længde_timer,
+                                                     self.sin_phi, self.cos_phi)
+            return _opgang_nedgang(transit_utc, self.sin_h0_måne, sin_led, nævner,
+                                   _DST_TABEL[måned][dag])
+        except Exception:
+            return (INGEN_TID, INGEN_TID)
+
+    def moon_events_range(self, start: dt.date, antal_dage: int) -> Tuple[array, array]:
+        """
+        Batchberegning af `moon_events` for fortløbende dage.
+
+        Beregnes med `kernels.moon_events` (numba, hvis installeret).
+
+        Args:
+            start (date):     Første dato.
+            antal_dage (int): Antal dage.
+
+        Returns:
+            tuple: (måneopgang, månenedgang) som `array('h')`;
+                   indeks i er dagen `start + i`.
+        """
+        # Importeres her fordi kernels selv bygger på dette modul
+        from logik import kernels
+        if antal_dage <= 0:
+            return array("h"), array("h")
+        # JD ved middag UTC: ordinal + 1721424.5 er JD ved 0h
+        middag = start.toordinal() + _JD_ORDINAL + 0.5
+        JD = array("d", (middag + i for i in range(antal_dage)))
+        return kernels.moon_events(JD, _offsets(start, antal_dage), self.længde_timer,
+                                   self.sin_phi, self.cos_phi, self.sin_h0_måne)
 
 
 # ──────────────────────────────────────────────
 # API-KLIENT
 # ──────────────────────────────────────────────
 
+# Daglige variable pr. endpoint (arkivet har ingen nedbørssandsynlighed)
+ARKIV_VARIABLE    = "temperature_2m_max,temperature_2m_min,cloud_cover_mean"
+FORECAST_VARIABLE = "temperature_2m_max,temperature_2m_min,cloud_cover_max,precipitation_probability_max"
+
+# Timebaserede variable (arkivet har ingen nedbørssandsynlighed)
+TIME_VARIABLE          = ("cloud_cover", "temperature_2m", "precipitation_probability")
+ARKIV_TIME_VARIABLE    = "cloud_cover,temperature_2m"
+FORECAST_TIME_VARIABLE = "cloud_cover,temperature_2m,precipitation_probability"
+
+
+def anvend_dagligt(post: WeatherRecord, daglig: Dict, i: int = 0,
+                   kilde: str = "forecast") -> None:
+    """
+    Overfører én dag fra et Open-Meteo `daily`-svar til en post.
+
+    Args:
+        post (WeatherRecord): Posten der udfyldes.
+        daglig (dict):        Svarets `daily`-ordbog.
+        i (int):              Dagens indeks i svarets tidsakse.
+        kilde (str):          "forecast" eller "archive" (sættes som `source`,
+                              hvis svaret indeholdt vejrdata).
+    """
+    def værdi(navn):
+        liste = daglig.get(navn) or ()
+        return liste[i] if i < len(liste) else None
+
+    sky = værdi("cloud_cover_max")
+    if sky is None:
+        sky = værdi("cloud_cover_mean")
+
+    post.temperature_max = til_tal(værdi("temperature_2m_max"))
+    post.temperature_min = til_tal(værdi("temperature_2m_min"))
+    post.cloud_cover     = til_tal(sky)
+    post.precip_prob     = til_tal(værdi("precipitation_probability_max"))
+    post.source          = kilde if post.has_weather else ""
+
+
 class MoonAPIClient:
     """
     Månefaseberegner og vejr-API-klient for LunarOrbit.
@@ -204,7 +635,9 @@ class MoonAPIClient:
     ARCHIVE_API_URL = "https://archive-api.open-meteo.com/v1/archive"
 
     def __init__(self, latitude: float = 55.6761, longitude: float = 12.5683,
-                 location_name: str = "København"):
+                 location_name: str = "København", lunar_tier: str = "fast",
+                 priority: int = INTERACTIVE, tiles: bool = True,
+                 offline: bool = False):
         """
         Initialiserer klienten med observationssted.
 
@@ -212,34 +645,151 @@ class MoonAPIClient:
             latitude (float):    Breddegrad. Standard: København.
             longitude (float):   Længdegrad. Standard: København.
             location_name (str): Stednavnet til visning.
+            lunar_tier (str):    Præcisionstrin for måneopgang/-nedgang,
+                                 "fast" eller "meeus" (se lunar_models.py).
+            priority (int):      Prioritet i den fælles ratebegrænsning
+                                 (se rate_limiter.py).
+            tiles (bool):        Slå astronomidata op i forudberegnede
+                                 årstiles, når de findes (se tiles.py).
+            offline (bool):      Hent aldrig vejr over netværket; brug
+                                 klimanormaler (se climatology.py).
         """
+        # Importeres her fordi lunar_models selv bygger på dette modul
+        from logik.lunar_models import get_model
+        from logik.tiles import TileStore
+
         self.latitude      = latitude
         self.longitude     = longitude
         self.location_name = location_name
 
-    def fetch_moon_data(self, date_string: str) -> Optional[Dict]:
+        # Stedets astronomiske invarianter beregnes én gang og genbruges
+        self.observer      = ObserverContext(latitude, longitude)
+        self.lunar_model   = get_model(lunar_tier)
+        self.tiles         = TileStore(latitude, longitude, lunar_tier) if tiles else None
+
+        # Alle Open-Meteo-kald går gennem processens fælles ratebegrænsning
+        self.priority      = priority
+        self.limiter       = get_limiter()
+
+        # Klimanormaler (reserve uden prognose) indlæses ved første behov
+        self.offline       = offline
+        self._normaler     = None
+        self._normaler_indlæst = False
+
+    def fetch_moon_record(self, date_string: str) -> Optional[MoonRecord]:
         """
-        Beregner månefase og belysning for en dato (lokal beregning).
+        Beregner månefase og belysning for en dato som typet post.
 
         Args:
             date_string (str): Dato i YYYY-MM-DD format.
 
         Returns:
-            dict med 'phase' (0-1) og 'illumination' (0-100), eller None.
+            MoonRecord eller None ved fejl.
         """
         try:
             date_obj  = dt.datetime.strptime(date_string, "%Y-%m-%d")
+            if self.tiles is not None:
+                fra_tile = self.tiles.moon(date_obj.date())
+                if fra_tile is not None:
+                    return MoonRecord(fra_tile[1], fra_tile[0])
             days      = (date_obj - self.KNOWN_NEW_MOON).days
             phase     = (days % self.SYNODIC_MONTH) / self.SYNODIC_MONTH
             illumination = 50 * (1 - math.cos(2 * math.pi * phase))
-            return {"illumination": float(illumination), "phase": float(phase)}
+            return MoonRecord(float(illumination), float(phase))
         except Exception as e:
             print(f"Fejl ved månefaseberegning: {e}")
             return None
 
-    def fetch_weather_data(self, date_string: str) -> Optional[Dict]:
+    def fetch_moon_data(self, date_string: str) -> Optional[Dict]:
         """
-        Henter vejrdata og beregner astronomiske tider for en dato.
+        Beregner månefase og belysning for en dato (lokal beregning).
+
+        Args:
+            date_string (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            dict med 'phase' (0-1) og 'illumination' (0-100), eller None.
+        """
+        record = self.fetch_moon_record(date_string)
+        return record.to_dict() if record else None
+
+    def _astro_record(self, dato: dt.datetime) -> WeatherRecord:
+        """
+        Bygger en post med lokalt beregnede astronomitider og uden vejrdata.
+
+        Args:
+            dato (datetime): Datoen.
+
+        Tiderne læses fra en årstile, hvis den findes, og beregnes ellers.
+
+        Returns:
+            WeatherRecord: Post hvor alle vejrfelter er `MANGLER`.
+        """
+        tider = self.tiles.events(dato.date()) if self.tiles is not None else None
+        if tider is not None:
+            solopgang, solnedgang, måneopgang, månenedgang = tider
+        else:
+            solopgang,  solnedgang  = self.observer.sun_events(dato.year, dato.month, dato.day)
+            måneopgang, månenedgang = self.lunar_model.rise_set(
+                self.observer, dato.year, dato.month, dato.day)
+        return WeatherRecord(location=self.location_name,
+                             sunrise=solopgang,   sunset=solnedgang,
+                             moonrise=måneopgang, moonset=månenedgang)
+
+    @property
+    def climatology(self):
+        """
+        Stedets klimanormaler (se climatology.py), eller None hvis de ikke er bygget.
+        """
+        if not self._normaler_indlæst:
+            from logik.climatology import ClimatologyStore
+            self._normaler = ClimatologyStore.for_site(self.latitude, self.longitude)
+            self._normaler_indlæst = True
+        return self._normaler
+
+    def apply_climatology(self, post: WeatherRecord, dato: dt.date) -> bool:
+        """
+        Udfylder en post uden vejr med et klimanormal-estimat (intet netværk).
+
+        Args:
+            post (WeatherRecord): Posten (får `source == "climatology"`).
+            dato (date):          Datoen.
+
+        Returns:
+            bool: True hvis der fandtes normaler for stedet.
+        """
+        if self.climatology is None:
+            return False
+        self.climatology.apply(post, dato)
+        return True
+
+    def _kilde(self, url: str) -> str:
+        """Vejrets kilde ("archive" eller "forecast") for et endpoint."""
+        return "archive" if url == self.ARCHIVE_API_URL else "forecast"
+
+    def _vejr_endpoint(self, dato: dt.datetime,
+                       i_dag: dt.datetime) -> Optional[Tuple[str, str]]:
+        """
+        Vælger Open-Meteo endpoint og daglige variable for en dato.
+
+        Args:
+            dato (datetime):  Datoen der skal hentes vejr for.
+            i_dag (datetime): Nuværende tidspunkt.
+
+        Returns:
+            tuple: (url, kommasepareret liste af daglige variable), eller
+                   None hvis datoen ligger uden for forecast-horisonten.
+        """
+        dage_fra_i_dag = (dato - i_dag).days
+        if dage_fra_i_dag < -1:
+            return self.ARCHIVE_API_URL, ARKIV_VARIABLE
+        if dage_fra_i_dag <= 16:
+            return self.WEATHER_API_URL, FORECAST_VARIABLE
+        return None
+
+    def fetch_weather_record(self, date_string: str) -> Optional[WeatherRecord]:
+        """
+        Henter vejrdata og beregner astronomiske tider for en dato som typet post.
 
         Astronomiske tider beregnes altid lokalt og returneres selv
         hvis vejr-API'et fejler. Vejrdata hentes fra Open-Meteo med
@@ -249,42 +799,24 @@ class MoonAPIClient:
             date_string (str): Dato i YYYY-MM-DD format.
 
         Returns:
-            dict med vejr- og astronomidata, eller None ved fejl.
+            WeatherRecord med vejr- og astronomidata, eller None ved fejl.
         """
+        import requests
+
         try:
             dato  = dt.datetime.strptime(date_string, "%Y-%m-%d")
             i_dag = dt.datetime.now()
 
-            # Beregn astronomiske tider lokalt (virker altid, uanset API)
-            solopgang,  solnedgang  = _sol_tider(
-                dato.year, dato.month, dato.day, self.latitude, self.longitude)
-            måneopgang, månenedgang = _måne_tider(
-                dato.year, dato.month, dato.day, self.latitude, self.longitude)
-
-            # Grundresultat med astronomitider (bruges også hvis API fejler)
-            resultat = {
-                "temperature_max": "-",
-                "temperature_min": "-",
-                "cloud_cover":     "-",
-                "precip_prob":     "-",
-                "location":        self.location_name,
-                "sunrise":         solopgang,
-                "sunset":          solnedgang,
-                "moonrise":        måneopgang,
-                "moonset":         månenedgang,
-            }
+            # Grundpost med astronomitider (bruges også hvis API fejler)
+            resultat = self._astro_record(dato)
 
             # Vælg API-endpoint baseret på datoen
-            dage_fra_i_dag = (dato - i_dag).days
-            if dage_fra_i_dag < -1:
-                url    = self.ARCHIVE_API_URL
-                daglig = "temperature_2m_max,temperature_2m_min,cloud_cover_mean"
-            elif dage_fra_i_dag <= 16:
-                url    = self.WEATHER_API_URL
-                daglig = "temperature_2m_max,temperature_2m_min,cloud_cover_max,precipitation_probability_max"
-            else:
-                # For langt ude i fremtiden — ingen vejrdata
+            endpoint = self._vejr_endpoint(dato, i_dag)
+            if endpoint is None or self.offline:
+                # For langt ude i fremtiden (eller offline) — estimat fra klimanormaler
+                self.apply_climatology(resultat, dato.date())
                 return resultat
+            url, daglig = endpoint
 
             params = {
                 "latitude":   self.latitude,
@@ -295,43 +827,118 @@ class MoonAPIClient:
                 "timezone":   "auto"
             }
 
-            response = requests.get(url, params=params, timeout=8)
-            response.raise_for_status()
-            d = response.json().get("daily", {})
-
-            sky = (d.get("cloud_cover_max") or d.get("cloud_cover_mean") or ["-"])[0]
+            try:
+                svar = get_json(url, params, self.priority, timeout=8, forsøg=2,
+                                limiter=self.limiter)
+                d = svar.get("daily", {})
+            except requests.exceptions.RequestException as e:
+                print(f"Advarsel: Kunne ikke hente vejrdata: {e}")
+                # Returnér astronomitider (og evt. klimanormal) selv om vejr-API fejler
+                self.apply_climatology(resultat, dato.date())
+                return resultat
 
-            resultat.update({
-                "temperature_max": d.get("temperature_2m_max", ["-"])[0],
-                "temperature_min": d.get("temperature_2m_min", ["-"])[0],
-                "cloud_cover":     sky,
-                "precip_prob":     d.get("precipitation_probability_max", ["-"])[0],
-            })
+            anvend_dagligt(resultat, d, kilde=self._kilde(url))
             return resultat
 
-        except requests.exceptions.RequestException as e:
-            print(f"Advarsel: Kunne ikke hente vejrdata: {e}")
-            # Returnér astronomitider selv om vejr-API fejler
-            try:
-                dato = dt.datetime.strptime(date_string, "%Y-%m-%d")
-                op, ned   = _sol_tider(
-                    dato.year, dato.month, dato.day, self.latitude, self.longitude)
-                mop, mned = _måne_tider(
-                    dato.year, dato.month, dato.day, self.latitude, self.longitude)
-                return {
-                    "temperature_max": "-", "temperature_min": "-",
-                    "cloud_cover": "-",     "precip_prob": "-",
-                    "location": self.location_name,
-                    "sunrise": op, "sunset": ned,
-                    "moonrise": mop, "moonset": mned,
-                }
-            except Exception:
-                return None
-
         except Exception as e:
             print(f"Uventet fejl: {e}")
             return None
 
+    def fetch_weather_data(self, date_string: str) -> Optional[Dict]:
+        """
+        Henter vejrdata og beregner astronomiske tider for en dato.
+
+        Omsætter `fetch_weather_record` til ordbogsform med "HH:MM"
+        tider, vejrværdier som float og None for manglende værdier.
+
+        Args:
+            date_string (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            dict med vejr- og astronomidata, eller None ved fejl.
+        """
+        record = self.fetch_weather_record(date_string)
+        return record.to_dict() if record else None
+
+    def fetch_hourly(self, start_date: str, end_date: str,
+                     priority: Optional[int] = None) -> HourlyTable:
+        """
+        Henter timebaseret vejr for et datointerval (f.eks. sliderens vindue).
+
+        Intervallet deles i sammenhængende stykker pr. endpoint (arkiv og
+        forecast), så der sendes højst ét kald pr. endpoint. Dage uden for
+        forecast-horisonten og stykker hvor kaldet fejler, forbliver `MANGLER`
+        (ligesom hele tabellen i offline-tilstand).
+
+        Args:
+            start_date (str): Første dato (YYYY-MM-DD).
+            end_date (str):   Sidste dato inkl. (YYYY-MM-DD).
+            priority (int, optional): Prioritet (standard: klientens).
+
+        Returns:
+            HourlyTable: Søjler for `TIME_VARIABLE`, indeks 0 = start 00:00 UTC.
+        """
+        import requests
+
+        start = dt.date.fromisoformat(start_date)
+        slut  = dt.date.fromisoformat(end_date)
+        tabel = HourlyTable(start, ((slut - start).days + 1) * 24, TIME_VARIABLE)
+        i_dag = dt.datetime.now()
+
+        # Sammenhængende stykker: [url, variable, fra, til]
+        stykker = []
+        dato = start
+        while dato <= slut:
+            endpoint = self._vejr_endpoint(dt.datetime(dato.year, dato.month, dato.day), i_dag)
+            if endpoint is not None and not self.offline:
+                url = endpoint[0]
+                if stykker and stykker[-1][0] == url and stykker[-1][3] == dato - dt.timedelta(days=1):
+                    stykker[-1][3] = dato
+                else:
+                    variable = ARKIV_TIME_VARIABLE if url == self.ARCHIVE_API_URL else FORECAST_TIME_VARIABLE
+                    stykker.append([url, variable, dato, dato])
+            dato += dt.timedelta(days=1)
+
+        for url, variable, fra, til in stykker:
+            params = {
+                "latitude":   self.latitude,
+                "longitude":  self.longitude,
+                "start_date": fra.isoformat(),
+                "end_date":   til.isoformat(),
+                "hourly":     variable,
+                "timezone":   "GMT",
+            }
+            try:
+                svar = get_json(url, params, self.priority if priority is None else priority,
+                                timeout=15, forsøg=2, limiter=self.limiter)
+            except requests.exceptions.RequestException as e:
+                print(f"Advarsel: Kunne ikke hente timevejr: {e}")
+                continue
+            timer = svar.get("hourly", {})
+            for variabel in variable.split(","):
+                tabel.fill(variabel, (fra - start).days * 24, timer.get(variabel, []))
+        return tabel
+
+    def hourly_at(self, tabel: HourlyTable, variabel: str,
+                  date_string: str, minutter: int) -> float:
+        """
+        Slår en timeværdi op for et lokalt tidspunkt, f.eks. skydække ved måneopgang.
+
+        Args:
+            tabel (HourlyTable): Fra `fetch_hourly`.
+            variabel (str):      F.eks. "cloud_cover".
+            date_string (str):   Lokal dato (YYYY-MM-DD).
+            minutter (int):      Minutter efter lokal midnat (`INGEN_TID` giver `MANGLER`).
+
+        Returns:
+            float: Værdien for nærmeste hele time, eller `MANGLER`.
+        """
+        if minutter < 0:
+            return MANGLER
+        dato = dt.date.fromisoformat(date_string)
+        return tabel.at(variabel, tabel.hour_index(
+            dato, minutter, self.observer.offset(dato.month, dato.day)))
+
     def fetch_complete_data(self, date_string: str) -> Dict:
         """
         Henter komplet måne- og vejrdata for en dato.
@@ -0,0 +1,225 @@
+"""
+Strømmende dag-for-dag data for lange datointervaller.
+
+`DateUtils.get_date_range` + `fetch_complete_data` pr. dato holder hele
+intervallet i hukommelsen og beregner én dag ad gangen. `stream_days()`
+gør i stedet sådan:
+
+  - Intervallet beregnes i bidder (standard 366 dage) med søjlebaserede
+    batchkald: `ObserverContext.solar_events_range`, månefase for hele
+    bidden og eventuelt vejr fra et lokalt arkiv (`ArchiveStore`).
+  - Hver dag udleveres som en let `DayRecord`, der først bygger
+    `MoonRecord`/`WeatherRecord` når de læses.
+  - Kun én bid ligger i hukommelsen ad gangen, så forbruget er konstant
+    selv for hundrede år.
+
+Eksempel:
+    for dag in stream_days(MoonAPIClient(), dt.date(1950, 1, 1), dt.date(2049, 12, 31)):
+        if dag.moon.illumination > 99 and dag.weather.moonrise >= 0:
+            ...
+"""
+
+import datetime as dt
+import math
+from array import array
+from typing import Dict, Iterator
+
+from logik import kernels
+from logik.moon_api import MoonAPIClient
+from logik.records import MANGLER, MoonRecord, WeatherRecord, WeatherTable
+
+
+# Dage pr. bid (ét år dækker alle sæsoner og holder bidden lille)
+STANDARD_BID = 366
+
+# Arkivsøjler → felter i WeatherRecord (arkivet har ingen nedbørssandsynlighed)
+_ARKIV_FELTER = {
+    "temperature_max": "temperature_2m_max",
+    "temperature_min": "temperature_2m_min",
+    "cloud_cover":     "cloud_cover_mean",
+}
+
+
+class DayChunk:
+    """
+    Én bid af fortløbende dage i søjleform.
+
+    Attributes:
+        start (date):          Første dag i bidden.
+        phase (array):         Månefase (0-1) pr. dag.
+        illumination (array):  Belysning (0-100) pr. dag.
+        table (WeatherTable):  Astronomitider og vejr pr. dag.
+    """
+
+    __slots__ = ("start", "phase", "illumination", "table")
+
+    def __init__(self, start: dt.date, phase: array, illumination: array, table: WeatherTable):
+        self.start        = start
+        self.phase        = phase
+        self.illumination = illumination
+        self.table        = table
+
+    def __len__(self) -> int:
+        return len(self.phase)
+
+    def __iter__(self) -> Iterator["DayRecord"]:
+        for i in range(len(self)):
+            yield DayRecord(self, i)
+
+
+class DayRecord:
+    """
+    Doven visning af én dag i en `DayChunk`.
+
+    Posterne bygges først, når `moon` eller `weather` læses.
+    """
+
+    __slots__ = ("_bid", "_i")
+
+    def __init__(self, bid: DayChunk, i: int):
+        self._bid = bid
+        self._i   = i
+
+    @property
+    def date(self) -> dt.date:
+        """Dagens dato."""
+        return self._bid.start + dt.timedelta(days=self._i)
+
+    @property
+    def moon(self) -> MoonRecord:
+        """Månefase og belysning."""
+        return MoonRecord(self._bid.illumination[self._i], self._bid.phase[self._i])
+
+    @property
+    def weather(self) -> WeatherRecord:
+        """Astronomitider og (hvis et arkiv blev givet) vejr."""
+        return self._bid.table[self._i]
+
+    def to_dict(self) -> Dict:
+        """
+        Samme form som `MoonAPIClient.fetch_complete_data`.
+
+        Returns:
+            dict med nøglerne 'moon', 'weather' og 'date'.
+        """
+        return {"moon": self.moon.to_dict(), "weather": self.weather.to_dict(),
+                "date": self.date.isoformat()}
+
+    def __repr__(self) -> str:
+        return f"DayRecord({self.date})"
+
+
+def phase_columns(client: MoonAPIClient, start: dt.date, antal_dage: int):
+    """
+    Månefase og belysning for fortløbende dage (samme formel som `fetch_moon_record`).
+
+    Args:
+        client (MoonAPIClient): Giver referencenymåne og synodisk måned.
+        start (date):      Første dag.
+        antal_dage (int):  Antal dage.
+
+    Returns:
+        tuple: (phase, illumination) som array('d').
+    """
+    synodisk = client.SYNODIC_MONTH
+    første = (start - client.KNOWN_NEW_MOON.date()).days
+    if kernels.BACKEND == "python":
+        # Generatorudtrykket er hurtigere end kernens indekserede løkke i ren Python
+        phase = array("d", ((første + i) % synodisk / synodisk for i in range(antal_dage)))
+        illumination = array("d", (50 * (1 - math.cos(2 * math.pi * p)) for p in phase))
+        return phase, illumination
+    return kernels.phases(array("d", range(første, første + antal_dage)), synodisk)
+
+
+def compute_chunk(client: MoonAPIClient, start: dt.date, antal_dage: int,
+                  archive=None) -> DayChunk:
+    """
+    Beregner én bid af fortløbende dage i søjleform.
+
+    Args:
+        client (MoonAPIClient): Sted og månemodel.
+        start (date):      Første dag.
+        antal_dage (int):  Antal dage.
+        archive (ArchiveStore, optional): Lokalt arkiv med vejr (se backfill.py).
+
+    Returns:
+        DayChunk: Bidden.
+    """
+    tabel = WeatherTable(client.location_name, "archive" if archive is not None else "")
+    fra_tiles = client.tiles.columns(start, antal_dage) if client.tiles is not None else None
+    if fra_tiles is not None:
+        # Forudberegnede årstiles (se tiles.py)
+        phase, illumination = fra_tiles.pop("phase"), fra_tiles.pop("illumination")
+        tabel.columns.update(fra_tiles)
+    else:
+        ctx   = client.observer
+        model = client.lunar_model
+        phase, illumination = phase_columns(client, start, antal_dage)
+
+        # Sol og måne i hver sin batch (kernels.py for solen og det hurtige trin)
+        sol = ctx.solar_events_range(start, antal_dage)
+        tabel.columns["sunrise"] = sol["sunrise"]
+        tabel.columns["sunset"]  = sol["sunset"]
+        tabel.columns["moonrise"], tabel.columns["moonset"] = \
+            model.rise_set_range(ctx, start, antal_dage)
+
+    # Vejr: ét udsnit pr. søjle fra arkivet, ellers MANGLER
+    for felt in WeatherRecord.VEJR_FELTER:
+        søjle = array("f", [MANGLER]) * antal_dage
+        kilde = _ARKIV_FELTER.get(felt)
+        if archive is not None and kilde in archive.manifest["columns"]:
+            slut = start + dt.timedelta(days=antal_dage - 1)
+            værdier = archive.column(kilde, start, slut)
+            fra = max(0, (archive.start - start).days)
+            søjle[fra:fra + len(værdier)] = værdier
+        tabel.columns[felt] = søjle
+
+    return DayChunk(start, phase, illumination, tabel)
+
+
+def stream_chunks(client: MoonAPIClient, start: dt.date, slut: dt.date,
+                  bid_dage: int = STANDARD_BID, archive=None) -> Iterator[DayChunk]:
+    """
+    Gennemløber et datointerval bid for bid (til forbrugere der arbejder på søjler).
+
+    Args:
+        client (MoonAPIClient): Sted og månemodel.
+        start, slut (date):     Interval (begge inkl.).
+        bid_dage (int):         Dage pr. bid.
+        archive (ArchiveStore, optional): Lokalt arkiv med vejr.
+
+    Yields:
+        DayChunk: Én bid ad gangen.
+    """
+    if bid_dage < 1:
+        raise ValueError("bid_dage skal være mindst 1")
+    dag = start
+    while dag <= slut:
+        antal = min(bid_dage, (slut - dag).days + 1)
+        yield compute_chunk(client, dag, antal, archive)
+        dag += dt.timedelta(days=antal)
+
+
+def stream_days(client: MoonAPIClient, start: dt.date, slut: dt.date,
+                bid_dage: int = STANDARD_BID, archive=None) -> Iterator[DayRecord]:
+    """
+    Gennemløber et datointerval dag for dag med konstant hukommelsesforbrug.
+
+    Dagene beregnes i bidder af `bid_dage`; kun den aktuelle bid holdes i
+    hukommelsen. Vejr kommer kun fra `archive` (intet netværk), så dage
+    uden arkivdata har MANGLER i vejrfelterne.
+
+    Args:
+        client (MoonAPIClient): Sted og månemodel.
+        start, slut (date):     Interval (begge inkl.).
+        bid_dage (int):         Dage pr. bid.
+        archive (ArchiveStore, optional): Lokalt arkiv med vejr.
+
+    Yields:
+        DayRecord: Én dag ad gangen.
+
+    Raises:
+        ValueError: Hvis `bid_dage` er mindre end 1.
+    """
+    for bid in stream_chunks(client, start, slut, bid_dage, archive):
+        yield from bid
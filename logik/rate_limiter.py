@@ -0,0 +1,227 @@
+"""
+Fælles ratebegrænsning for alle kald til Open-Meteo.
+
+Alle klienter i processen (UI, async-klienten, arkivhentning) deler én
+`RateLimiter`, så det samlede antal kald holder sig under Open-Meteo's
+fair-use-grænser. Begrænsningen er et tokenspand med prioritetskø:
+
+  - INTERACTIVE: brugeren venter på svaret (slider, dato-skift)
+  - PREFETCH:    forudhentning og samlede kald for mange steder
+  - BACKFILL:    arkivhentning i baggrunden
+
+Et ledigt token gives altid til den ventende med højest prioritet.
+Svarer Open-Meteo med 429, pauses alle kald i processen i den tid
+`Retry-After` angiver (eller med eksponentiel backoff).
+
+Ventetider måles pr. prioritet og kan hentes med `stats()`.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+
+# Prioritetsklasser (lavere tal går først)
+INTERACTIVE = 0
+PREFETCH    = 1
+BACKFILL    = 2
+
+PRIORITET_NAVNE = {INTERACTIVE: "interactive", PREFETCH: "prefetch", BACKFILL: "backfill"}
+
+# Open-Meteo's gratis grænse er 600 kald/minut; vi holder os et godt stykke under
+STANDARD_RATE  = 5.0     # tokens pr. sekund
+STANDARD_BURST = 10      # største antal kald i en byge
+
+# Længste pause et interaktivt kald accepterer ved 429, før det opgiver
+MAX_INTERAKTIV_PAUSE = 5.0
+
+
+class RateLimiter:
+    """
+    Trådsikkert tokenspand med prioritetskø og fælles 429-pause.
+    """
+
+    def __init__(self, rate: Optional[float] = STANDARD_RATE, burst: int = STANDARD_BURST):
+        """
+        Args:
+            rate (float, optional): Tokens pr. sekund (None = ubegrænset,
+                                    f.eks. mod en lokal stub).
+            burst (int):            Spandens størrelse.
+        """
+        self.rate  = rate
+        self.burst = burst
+
+        self._tokens   = float(burst)
+        self._sidst    = time.monotonic()
+        self._pause_til = 0.0
+        self._kø: list = []                 # heap af (prioritet, løbenummer)
+        self._løbenr   = itertools.count()
+        self._betingelse = threading.Condition()
+
+        # Målinger pr. prioritet
+        self._ventetider = {p: deque(maxlen=1000) for p in PRIORITET_NAVNE}
+        self._antal      = {p: 0 for p in PRIORITET_NAVNE}
+        self._samlet_ventetid = {p: 0.0 for p in PRIORITET_NAVNE}
+        self._throttled  = 0
+
+    def _fyld(self, nu: float) -> None:
+        """Fylder spanden op efter den forløbne tid."""
+        if self.rate is None:
+            self._tokens = float(self.burst)
+            return
+        self._tokens = min(self.burst, self._tokens + (nu - self._sidst) * self.rate)
+        self._sidst = nu
+
+    def acquire(self, prioritet: int = INTERACTIVE,
+                timeout: Optional[float] = None) -> float:
+        """
+        Venter på et token.
+
+        Args:
+            prioritet (int):  INTERACTIVE, PREFETCH eller BACKFILL.
+            timeout (float, optional): Maks. ventetid i sekunder.
+
+        Returns:
+            float: Ventetiden i sekunder.
+
+        Raises:
+            TimeoutError: Hvis der ikke blev et token ledigt i tide.
+        """
+        start = time.monotonic()
+        with self._betingelse:
+            billet = (prioritet, next(self._løbenr))
+            heapq.heappush(self._kø, billet)
+            try:
+                while True:
+                    nu = time.monotonic()
+                    self._fyld(nu)
+                    if (self._kø[0] == billet and nu >= self._pause_til
+                            and self._tokens >= 1.0):
+                        self._tokens -= 1.0
+                        break
+
+                    # Beregn hvor længe der mindst skal ventes
+                    if nu < self._pause_til:
+                        vent = self._pause_til - nu
+                    elif self._kø[0] != billet:
+                        vent = None         # vækkes når køen rykker
+                    else:
+                        vent = (1.0 - self._tokens) / self.rate
+                    if timeout is not None:
+                        rest = start + timeout - nu
+                        if rest <= 0:
+                            raise TimeoutError("Ingen ledig kapacitet hos Open-Meteo")
+                        vent = rest if vent is None else min(vent, rest)
+                    self._betingelse.wait(vent)
+            finally:
+                self._kø.remove(billet)
+                heapq.heapify(self._kø)
+                self._betingelse.notify_all()
+
+            ventetid = time.monotonic() - start
+            self._antal[prioritet] += 1
+            self._samlet_ventetid[prioritet] += ventetid
+            self._ventetider[prioritet].append(ventetid)
+        return ventetid
+
+    def backoff(self, sekunder: float) -> None:
+        """
+        Pauser alle kald i processen efter et 429-svar.
+
+        Args:
+            sekunder (float): Pausens længde.
+        """
+        with self._betingelse:
+            self._throttled += 1
+            self._pause_til = max(self._pause_til, time.monotonic() + sekunder)
+            self._betingelse.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Ventetidsmålinger pr. prioritet.
+
+        Returns:
+            dict: For hver prioritet 'calls', 'mean_wait_ms', 'p95_wait_ms'
+                  og 'max_wait_ms', samt 'throttled' (antal 429) og
+                  'queued' (ventende lige nu).
+        """
+        with self._betingelse:
+            resultat = {}
+            for p, navn in PRIORITET_NAVNE.items():
+                seneste = sorted(self._ventetider[p])
+                antal = self._antal[p]
+                resultat[navn] = {
+                    "calls":        antal,
+                    "mean_wait_ms": self._samlet_ventetid[p] / antal * 1000 if antal else 0.0,
+                    "p95_wait_ms":  seneste[int(len(seneste) * 0.95)] * 1000 if seneste else 0.0,
+                    "max_wait_ms":  seneste[-1] * 1000 if seneste else 0.0,
+                }
+            resultat["throttled"] = self._throttled
+            resultat["queued"]    = len(self._kø)
+            return resultat
+
+
+_LIMITER = RateLimiter()
+
+
+def get_limiter() -> RateLimiter:
+    """Returnerer processens fælles `RateLimiter`."""
+    return _LIMITER
+
+
+def _retry_after(response: "requests.Response", forsøg: int) -> float:
+    """Pause i sekunder ud fra `Retry-After` eller eksponentiel backoff."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return float(2 ** forsøg)
+
+
+def get_json(url: str, params: Dict, prioritet: int = INTERACTIVE,
+             timeout: float = 8.0, forsøg: int = 3,
+             session: Optional["requests.Session"] = None,
+             limiter: Optional[RateLimiter] = None) -> object:
+    """
+    GET mod Open-Meteo gennem den fælles ratebegrænsning.
+
+    Ved 429 pauses hele processen, og kaldet prøves igen. Interaktive kald
+    opgiver i stedet for at vente længere end `MAX_INTERAKTIV_PAUSE`.
+
+    Args:
+        url (str):       Endpoint.
+        params (dict):   Querystreng-parametre.
+        prioritet (int): INTERACTIVE, PREFETCH eller BACKFILL.
+        timeout (float): Timeout pr. HTTP-kald i sekunder.
+        forsøg (int):    Maks. antal forsøg ved 429.
+        session (requests.Session, optional): Genbrugt session.
+        limiter (RateLimiter, optional): Standard: processens fælles.
+
+    Returns:
+        Det afkodede JSON-svar.
+
+    Raises:
+        requests.exceptions.RequestException: Ved netværks- og HTTP-fejl,
+            herunder 429 når forsøgene er brugt.
+    """
+    import requests     # Først her: holder opstarten fri for requests
+
+    limiter = limiter or _LIMITER
+    hent = session.get if session is not None else requests.get
+    for i in range(forsøg):
+        limiter.acquire(prioritet)
+        response = hent(url, params=params, timeout=timeout)
+        if response.status_code == 429:
+            pause = _retry_after(response, i)
+            limiter.backoff(pause)
+            if i < forsøg - 1 and not (prioritet == INTERACTIVE
+                                       and pause > MAX_INTERAKTIV_PAUSE):
+                continue
+        response.raise_for_status()
+        return response.json()
+    raise requests.exceptions.RetryError("Alle forsøg brugt")
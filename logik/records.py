@@ -0,0 +1,366 @@
+"""
+Kompakte resultatposter for LunarOrbit.
+
+Måne- og vejrdata gemmes som typede poster i stedet for ordbøger med
+forudformaterede strenge:
+
+  - Tidspunkter (sol/måne op og ned) gemmes som heltal: minutter efter
+    lokal midnat. `INGEN_TID` markerer polar dag/nat.
+  - Vejrværdier gemmes som float. `MANGLER` (NaN) markerer manglende data.
+
+Formatering til "HH:MM" og "-" sker først i UI'et (se `Formatters` i
+boilerplate.py). `to_dict()` herunder giver tal (None for manglende) og
+tider som "HH:MM".
+"""
+
+import datetime as dt
+import math
+from array import array
+from typing import Dict, Iterable, Iterator
+
+from logik.boilerplate import Formatters
+
+
+# Sentinel for manglende vejrværdi (NaN sammenlignes aldrig lig med sig selv)
+MANGLER = float("nan")
+
+# Sentinel for manglende tidspunkt (polar dag/nat eller beregningsfejl)
+INGEN_TID = -1
+
+
+def er_mangler(værdi: float) -> bool:
+    """
+    Tjekker om en vejrværdi er den manglende sentinel.
+
+    Args:
+        værdi (float): Vejrværdi.
+
+    Returns:
+        bool: True hvis værdien mangler.
+    """
+    return math.isnan(værdi)
+
+
+def til_tal(værdi) -> float:
+    """
+    Konverterer en rå API-værdi (tal, None eller "-") til float.
+
+    Args:
+        værdi: Værdi fra Open-Meteo JSON.
+
+    Returns:
+        float: Værdien som float, eller `MANGLER`.
+    """
+    if værdi is None or værdi == "-":
+        return MANGLER
+    try:
+        return float(værdi)
+    except (TypeError, ValueError):
+        return MANGLER
+
+
+class MoonRecord:
+    """
+    Månefase og belysning for én dato.
+
+    Attributes:
+        illumination (float): Belysning i procent (0-100).
+        phase (float): Faseværdi (0-1).
+    """
+
+    __slots__ = ("illumination", "phase")
+
+    def __init__(self, illumination: float, phase: float):
+        self.illumination = illumination
+        self.phase        = phase
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Konverterer posten til den klassiske ordbogsform.
+
+        Returns:
+            dict med 'illumination' og 'phase'.
+        """
+        return {"illumination": self.illumination, "phase": self.phase}
+
+    def __repr__(self) -> str:
+        return f"MoonRecord(illumination={self.illumination:.1f}, phase={self.phase:.4f})"
+
+
+class WeatherRecord:
+    """
+    Vejr- og astronomidata for én dato og ét observationssted.
+
+    Attributes:
+        temperature_max (float): Maks. temperatur i °C eller `MANGLER`.
+        temperature_min (float): Min. temperatur i °C eller `MANGLER`.
+        cloud_cover (float):     Skydække i procent eller `MANGLER`.
+        precip_prob (float):     Nedbørssandsynlighed i procent eller `MANGLER`.
+        location (str):          Stednavn.
+        sunrise, sunset, moonrise, moonset (int):
+            Minutter efter lokal midnat eller `INGEN_TID`.
+        source (str):            Vejrets kilde: "forecast", "archive",
+                                 "climatology" (estimat fra klimanormaler)
+                                 eller "" uden vejrdata.
+    """
+
+    __slots__ = ("temperature_max", "temperature_min", "cloud_cover", "precip_prob",
+                 "location", "sunrise", "sunset", "moonrise", "moonset", "source")
+
+    VEJR_FELTER = ("temperature_max", "temperature_min", "cloud_cover", "precip_prob")
+    TID_FELTER  = ("sunrise", "sunset", "moonrise", "moonset")
+
+    def __init__(self, location: str = "",
+                 sunrise: int = INGEN_TID, sunset: int = INGEN_TID,
+                 moonrise: int = INGEN_TID, moonset: int = INGEN_TID,
+                 temperature_max: float = MANGLER, temperature_min: float = MANGLER,
+                 cloud_cover: float = MANGLER, precip_prob: float = MANGLER,
+                 source: str = ""):
+        self.location        = location
+        self.sunrise         = sunrise
+        self.sunset          = sunset
+        self.moonrise        = moonrise
+        self.moonset         = moonset
+        self.temperature_max = temperature_max
+        self.temperature_min = temperature_min
+        self.cloud_cover     = cloud_cover
+        self.precip_prob     = precip_prob
+        self.source          = source
+
+    @property
+    def is_estimate(self) -> bool:
+        """True hvis vejret er et klimanormal-estimat og ikke en prognose/måling."""
+        return self.source == "climatology"
+
+    @property
+    def has_weather(self) -> bool:
+        """True hvis mindst én vejrværdi er tilgængelig."""
+        return not all(er_mangler(getattr(self, f)) for f in self.VEJR_FELTER)
+
+    def to_dict(self) -> Dict:
+        """
+        Konverterer posten til den klassiske ordbogsform fra `fetch_weather_data`.
+
+        Vejrværdier returneres som float (None hvis de mangler), tider som
+        "HH:MM". Tallene rundes til 6 betydende cifre, så float32-søjler
+        ikke giver støj som 12.300000190734863.
+
+        Returns:
+            dict med vejr- og astronomidata.
+        """
+        resultat = {}
+        for f in self.VEJR_FELTER:
+            værdi = getattr(self, f)
+            resultat[f] = None if er_mangler(værdi) else float(f"{værdi:.6g}")
+        resultat["location"] = self.location
+        resultat["source"]   = self.source
+        for f in self.TID_FELTER:
+            resultat[f] = Formatters.format_minutes(getattr(self, f))
+        return resultat
+
+    def __repr__(self) -> str:
+        return (f"WeatherRecord(location={self.location!r}, "
+                f"sunrise={self.sunrise}, sunset={self.sunset}, "
+                f"moonrise={self.moonrise}, moonset={self.moonset}, "
+                f"temperature_max={self.temperature_max}, "
+                f"temperature_min={self.temperature_min}, "
+                f"cloud_cover={self.cloud_cover}, precip_prob={self.precip_prob}, "
+                f"source={self.source!r})")
+
+
+class SolarEvents:
+    """
+    Solens begivenheder for én dato ved alle horisontdefinitioner.
+
+    Alle felter er minutter efter lokal midnat eller `INGEN_TID`, når
+    solen ikke krydser den pågældende højde (f.eks. lyse sommernætter,
+    hvor astronomisk tusmørke aldrig slutter).
+
+    Attributes:
+        solar_noon (int):                          Solens højeste punkt.
+        sunrise, sunset (int):                     -0.8333° (refraktion + skivens radius).
+        civil_dawn, civil_dusk (int):              -6°.
+        nautical_dawn, nautical_dusk (int):        -12°.
+        astronomical_dawn, astronomical_dusk (int): -18°.
+    """
+
+    FELTER = ("solar_noon", "sunrise", "sunset", "civil_dawn", "civil_dusk",
+              "nautical_dawn", "nautical_dusk", "astronomical_dawn", "astronomical_dusk")
+
+    __slots__ = FELTER
+
+    def __init__(self, solar_noon: int, sunrise: int, sunset: int,
+                 civil_dawn: int, civil_dusk: int,
+                 nautical_dawn: int, nautical_dusk: int,
+                 astronomical_dawn: int, astronomical_dusk: int):
+        self.solar_noon        = solar_noon
+        self.sunrise           = sunrise
+        self.sunset            = sunset
+        self.civil_dawn        = civil_dawn
+        self.civil_dusk        = civil_dusk
+        self.nautical_dawn     = nautical_dawn
+        self.nautical_dusk     = nautical_dusk
+        self.astronomical_dawn = astronomical_dawn
+        self.astronomical_dusk = astronomical_dusk
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Konverterer posten til ordbogsform med "HH:MM" og "-".
+
+        Returns:
+            dict med ét felt pr. begivenhed.
+        """
+        return {f: Formatters.format_minutes(getattr(self, f)) for f in self.FELTER}
+
+    def __repr__(self) -> str:
+        return (f"SolarEvents(sunrise={self.sunrise}, sunset={self.sunset}, "
+                f"astronomical_dusk={self.astronomical_dusk})")
+
+
+class WeatherTable:
+    """
+    Søjlebaseret (array-backed) samling af vejrposter til batch-brug.
+
+    Hver kolonne er et sammenhængende `array.array`: vejrværdier som
+    float32 ('f') og tider som int16 ('h'). Det fylder ca. 24 bytes pr.
+    række mod flere hundrede bytes for en ordbog med strenge.
+    Stednavnet og vejrets kilde deles af hele tabellen.
+    """
+
+    def __init__(self, location: str = "", source: str = ""):
+        """
+        Opretter en tom tabel.
+
+        Args:
+            location (str): Stednavn for alle rækker.
+            source (str):   Vejrets kilde for rækker med vejrdata.
+        """
+        self.location = location
+        self.source   = source
+        self.columns = {f: array("f") for f in WeatherRecord.VEJR_FELTER}
+        self.columns.update({f: array("h") for f in WeatherRecord.TID_FELTER})
+
+    def __len__(self) -> int:
+        return len(self.columns["sunrise"])
+
+    def append(self, record: WeatherRecord) -> None:
+        """
+        Tilføjer en post som ny række.
+
+        Args:
+            record (WeatherRecord): Posten der skal tilføjes.
+        """
+        for navn, kolonne in self.columns.items():
+            kolonne.append(getattr(record, navn))
+
+    def __getitem__(self, index: int) -> WeatherRecord:
+        """
+        Bygger en `WeatherRecord` for rækken `index`.
+
+        Args:
+            index (int): Rækkeindeks.
+
+        Returns:
+            WeatherRecord: Posten for rækken.
+        """
+        værdier = {navn: kolonne[index] for navn, kolonne in self.columns.items()}
+        post = WeatherRecord(location=self.location, **værdier)
+        if post.has_weather:
+            post.source = self.source
+        return post
+
+    def __iter__(self) -> Iterator[WeatherRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def nbytes(self) -> int:
+        """Antal bytes brugt af kolonnedata."""
+        return sum(k.itemsize * len(k) for k in self.columns.values())
+
+
+class HourlyTable:
+    """
+    Timebaserede vejrdata som sammenhængende float64-søjler.
+
+    Hver variabel er ét `array('d')` med én værdi pr. time, hvor indeks 0
+    er `start` kl. 00:00 UTC. Søjlerne har fast længde (forudfyldt med
+    `MANGLER`), så opslag er O(1), og `view()` returnerer et
+    `memoryview`-udsnit uden kopiering.
+
+    Fordi søjlerne aldrig ændrer størrelse, kan udsnit holdes mens
+    tabellen fyldes (array kan ikke ændre størrelse med aktive views).
+    """
+
+    def __init__(self, start: dt.date, antal_timer: int, variable: Iterable[str]):
+        """
+        Args:
+            start (date):      Dato for indeks 0 (00:00 UTC).
+            antal_timer (int): Antal timer tabellen dækker.
+            variable (list):   Open-Meteo variabelnavne (f.eks. "cloud_cover").
+        """
+        self.start   = start
+        self.columns = {v: array("d", [MANGLER]) * antal_timer for v in variable}
+        self._længde = antal_timer
+
+    def __len__(self) -> int:
+        return self._længde
+
+    def hour_index(self, dato: dt.date, minutter: int, utc_offset: int) -> int:
+        """
+        Indeks for nærmeste hele time til et lokalt tidspunkt.
+
+        Args:
+            dato (date):      Lokal dato.
+            minutter (int):   Minutter efter lokal midnat.
+            utc_offset (int): Lokal tidszoneforskydning i timer.
+
+        Returns:
+            int: Timeindeks (kan ligge uden for tabellen).
+        """
+        return (dato - self.start).days * 24 + (minutter + 30) // 60 - utc_offset
+
+    def fill(self, variabel: str, fra: int, værdier: Iterable) -> None:
+        """
+        Skriver værdier ind fra indeks `fra`. Værdier uden for tabellen ignoreres.
+
+        Args:
+            variabel (str): Variabelnavn.
+            fra (int):      Indeks for første værdi.
+            værdier (list): Tal eller None.
+        """
+        kolonne = self.columns[variabel]
+        værdier = array("d", (til_tal(v) for v in værdier))
+        a, b = max(0, fra), min(self._længde, fra + len(værdier))
+        if a < b:
+            kolonne[a:b] = værdier[a - fra:b - fra]
+
+    def at(self, variabel: str, indeks: int) -> float:
+        """
+        Værdien ved et timeindeks.
+
+        Returns:
+            float: Værdien, eller `MANGLER` uden for tabellen/ukendt variabel.
+        """
+        kolonne = self.columns.get(variabel)
+        if kolonne is None or not 0 <= indeks < self._længde:
+            return MANGLER
+        return kolonne[indeks]
+
+    def view(self, variabel: str, fra: int, til: int) -> memoryview:
+        """
+        Udsnit [fra, til) af en søjle uden kopiering.
+
+        Args:
+            variabel (str): Variabelnavn.
+            fra (int), til (int): Timeindeks (afkortes til tabellen).
+
+        Returns:
+            memoryview: Formatet 'd'; kan bruges som sekvens af float.
+        """
+        return memoryview(self.columns[variabel])[max(0, fra):min(self._længde, til)]
+
+    @property
+    def nbytes(self) -> int:
+        """Antal bytes brugt af søjledata."""
+        return sum(k.itemsize * len(k) for k in self.columns.values())
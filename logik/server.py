@@ -0,0 +1,363 @@
+"""
+Lokal JSON-tjeneste for LunarOrbit.
+
+Gør måne-, astronomi- og vejrdata tilgængelige for andre programmer
+(f.eks. interne dashboards) uden Tk-appen. Serveren er bygget på
+asyncio og standardbiblioteket:
+
+  - Delt cache på tværs af alle forbindelser.
+  - Samtidige identiske forespørgsler slås sammen til ét upstream-kald.
+  - Antallet af samtidige upstream-kald er begrænset.
+
+Endpoints (GET, svar i JSON):
+    /day?date=YYYY-MM-DD[&lat=..&lon=..&name=..]
+    /range?start=YYYY-MM-DD&end=YYYY-MM-DD[&lat=..&lon=..&name=..]
+    /stats
+    /health
+
+Start serveren:
+    python -m logik.server --port 8765
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from logik.boilerplate import MoonConstants
+from logik.moon_api import MoonAPIClient
+
+
+# Største antal dage i én /range-forespørgsel
+MAX_RANGE_DAGE = 366
+
+# Sekunder en dag uden vejrdata caches (f.eks. efter et midlertidigt API-udfald)
+KORT_TTL = 30.0
+
+_STATUS_TEKST = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ServiceError(Exception):
+    """Fejl der sendes til klienten med en HTTP-statuskode."""
+
+    def __init__(self, status: int, besked: str):
+        super().__init__(besked)
+        self.status = status
+
+
+class LunarOrbitService:
+    """
+    Forespørgselslag med delt cache, sammenlægning og upstream-loft.
+
+    Hvert sted får sin egen `MoonAPIClient` (og dermed sin egen
+    `ObserverContext`), som genbruges på tværs af forespørgsler.
+    Upstream-kaldene er synkrone og køres i asyncio's trådpulje.
+    """
+
+    def __init__(self, client_factory: Callable[..., MoonAPIClient] = MoonAPIClient,
+                 max_upstream: int = 4, cache_størrelse: int = 10_000,
+                 cache_ttl: float = 900.0, fejl_ttl: float = KORT_TTL):
+        """
+        Args:
+            client_factory (callable): Bygger en klient ud fra
+                (latitude, longitude, location_name).
+            max_upstream (int):     Maks. samtidige upstream-kald.
+            cache_størrelse (int):  Maks. antal cachede dage (LRU).
+            cache_ttl (float):      Sekunder en cachet dag er gyldig.
+            fejl_ttl (float):       Sekunder en dag uden vejrdata er gyldig.
+        """
+        self.client_factory  = client_factory
+        self.max_upstream    = max_upstream
+        self.cache_størrelse = cache_størrelse
+        self.cache_ttl       = cache_ttl
+        self.fejl_ttl        = fejl_ttl
+
+        self._klienter: Dict[Tuple[float, float], MoonAPIClient] = {}
+        self._cache: "OrderedDict[tuple, Tuple[float, Dict]]" = OrderedDict()
+        self._i_gang: Dict[tuple, asyncio.Future] = {}
+        self._semafor: Optional[asyncio.Semaphore] = None
+
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0,
+                      "upstream_calls": 0, "errors": 0}
+
+    def _klient(self, lat: float, lon: float, navn: str) -> MoonAPIClient:
+        """Returnerer (og opretter ved behov) klienten for et sted."""
+        nøgle = (lat, lon)
+        klient = self._klienter.get(nøgle)
+        if klient is None:
+            klient = self.client_factory(latitude=lat, longitude=lon, location_name=navn)
+            self._klienter[nøgle] = klient
+        return klient
+
+    @staticmethod
+    def _med_navn(resultat: Dict, navn: str) -> Dict:
+        """
+        Sætter stednavnet i et svar.
+
+        Klienter og cache deles på tværs af navne for samme koordinater,
+        så navnet fra den første forespørgsel må ikke følge med i svaret.
+        """
+        vejr = resultat.get("weather")
+        if vejr is None or vejr.get("location") == navn:
+            return resultat
+        return {**resultat, "weather": {**vejr, "location": navn}}
+
+    async def get_day(self, lat: float, lon: float, navn: str, dato: str) -> Dict:
+        """
+        Henter komplet data for én dag (som `fetch_complete_data`).
+
+        Args:
+            lat (float), lon (float): Koordinater.
+            navn (str):  Stednavn.
+            dato (str):  Dato i YYYY-MM-DD format.
+
+        Returns:
+            dict med nøglerne 'moon', 'weather' og 'date'.
+        """
+        nøgle = (lat, lon, dato)
+
+        # 1) Delt cache
+        post = self._cache.get(nøgle)
+        if post is not None and time.monotonic() < post[0]:
+            self._cache.move_to_end(nøgle)
+            self.stats["cache_hits"] += 1
+            return self._med_navn(post[1], navn)
+
+        # 2) Sammenlægning: en identisk forespørgsel er allerede i gang
+        fremtid = self._i_gang.get(nøgle)
+        if fremtid is not None:
+            self.stats["coalesced"] += 1
+            return self._med_navn(await asyncio.shield(fremtid), navn)
+
+        fremtid = asyncio.get_running_loop().create_future()
+        self._i_gang[nøgle] = fremtid
+        try:
+            if self._semafor is None:
+                self._semafor = asyncio.Semaphore(self.max_upstream)
+            async with self._semafor:
+                self.stats["upstream_calls"] += 1
+                klient = self._klient(lat, lon, navn)
+                resultat = await asyncio.get_running_loop().run_in_executor(
+                    None, klient.fetch_complete_data, dato)
+
+            # Uden vejrdata er svaret sandsynligvis et midlertidigt udfald
+            vejr = resultat.get("weather")
+            ttl = self.cache_ttl if vejr and vejr.get("source") else self.fejl_ttl
+            self._cache[nøgle] = (time.monotonic() + ttl, resultat)
+            self._cache.move_to_end(nøgle)
+            while len(self._cache) > self.cache_størrelse:
+                self._cache.popitem(last=False)
+
+            fremtid.set_result(resultat)
+            return self._med_navn(resultat, navn)
+        except asyncio.CancelledError:
+            # Ventende forespørgsler må ikke hænge på en aflyst leder
+            fremtid.cancel()
+            raise
+        except BaseException as e:
+            if not fremtid.done():
+                fremtid.set_exception(e)
+                # Marker undtagelsen som hentet, hvis ingen andre venter
+                fremtid.exception()
+            raise
+        finally:
+            del self._i_gang[nøgle]
+
+    async def get_range(self, lat: float, lon: float, navn: str,
+                        start: dt.date, slut: dt.date) -> list:
+        """
+        Henter komplet data for et datointerval (begge endepunkter inkl.).
+
+        Args:
+            lat (float), lon (float): Koordinater.
+            navn (str):   Stednavn.
+            start, slut (date): Intervallets endepunkter.
+
+        Returns:
+            list: Én `fetch_complete_data`-ordbog pr. dag.
+        """
+        antal = (slut - start).days + 1
+        datoer = [(start + dt.timedelta(days=i)).isoformat() for i in range(antal)]
+        return await asyncio.gather(*(self.get_day(lat, lon, navn, d) for d in datoer))
+
+    # ── HTTP-routing ──
+
+    async def dispatch(self, sti: str) -> Tuple[int, object]:
+        """
+        Behandler én GET-forespørgsel.
+
+        Args:
+            sti (str): Sti inkl. querystreng.
+
+        Returns:
+            tuple: (HTTP-status, JSON-serialiserbart svar)
+        """
+        self.stats["requests"] += 1
+        dele = urlsplit(sti)
+        query = {k: v[-1] for k, v in parse_qs(dele.query).items()}
+
+        try:
+            if dele.path == "/health":
+                return 200, {"status": "ok"}
+            if dele.path == "/stats":
+                return 200, dict(self.stats, cache_size=len(self._cache),
+                                 in_flight=len(self._i_gang))
+
+            lat, lon, navn = _læs_sted(query)
+            if dele.path == "/day":
+                dato = _læs_dato(query, "date")
+                return 200, await self.get_day(lat, lon, navn, dato.isoformat())
+            if dele.path == "/range":
+                start = _læs_dato(query, "start")
+                slut  = _læs_dato(query, "end")
+                if slut < start:
+                    raise ServiceError(400, "'end' ligger før 'start'")
+                if (slut - start).days + 1 > MAX_RANGE_DAGE:
+                    raise ServiceError(400, f"Højst {MAX_RANGE_DAGE} dage pr. forespørgsel")
+                return 200, await self.get_range(lat, lon, navn, start, slut)
+
+            raise ServiceError(404, f"Ukendt endpoint: {dele.path}")
+
+        except ServiceError as e:
+            self.stats["errors"] += 1
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Uventet fejl i tjenesten: {e}")
+            return 500, {"error": "Intern fejl"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """
+        Håndterer én TCP-forbindelse (HTTP/1.1 med keep-alive).
+
+        Args:
+            reader, writer: asyncio-strømme for forbindelsen.
+        """
+        try:
+            while True:
+                linje = await reader.readline()
+                if not linje:
+                    break
+                try:
+                    metode, sti, version = linje.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    navn, _, værdi = h.decode("latin-1").partition(":")
+                    headers[navn.strip().lower()] = værdi.strip()
+
+                if metode != "GET":
+                    status, svar = 405, {"error": "Kun GET understøttes"}
+                else:
+                    status, svar = await self.dispatch(sti)
+
+                behold = (version == "HTTP/1.1"
+                          and headers.get("connection", "").lower() != "close")
+                krop = json.dumps(svar, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS_TEKST.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(krop)}\r\n"
+                    f"Connection: {'keep-alive' if behold else 'close'}\r\n\r\n"
+                    .encode("latin-1") + krop)
+                await writer.drain()
+                if not behold:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _læs_sted(query: Dict[str, str]) -> Tuple[float, float, str]:
+    """
+    Læser sted fra querystrengen (standard: København).
+
+    Koordinater afrundes til 4 decimaler (~10 m), så næsten ens
+    forespørgsler deler cache.
+
+    Raises:
+        ServiceError: Ved ugyldige koordinater.
+    """
+    try:
+        lat = round(float(query.get("lat", MoonConstants.LATITUDE)), 4)
+        lon = round(float(query.get("lon", MoonConstants.LONGITUDE)), 4)
+    except ValueError:
+        raise ServiceError(400, "'lat' og 'lon' skal være tal")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ServiceError(400, "Koordinater uden for gyldigt område")
+    navn = query.get("name", "København" if "lat" not in query else f"{lat},{lon}")
+    return lat, lon, navn
+
+
+def _læs_dato(query: Dict[str, str], felt: str) -> dt.date:
+    """
+    Læser en påkrævet dato i YYYY-MM-DD format fra querystrengen.
+
+    Raises:
+        ServiceError: Hvis feltet mangler eller er ugyldigt.
+    """
+    if felt not in query:
+        raise ServiceError(400, f"Mangler parameteren '{felt}'")
+    try:
+        return dt.datetime.strptime(query[felt], "%Y-%m-%d").date()
+    except ValueError:
+        raise ServiceError(400, f"'{felt}' skal have formatet YYYY-MM-DD")
+
+
+async def start_server(service: LunarOrbitService, host: str = "127.0.0.1",
+                       port: int = 8765) -> asyncio.AbstractServer:
+    """
+    Starter HTTP-serveren for en tjeneste.
+
+    Args:
+        service (LunarOrbitService): Tjenesten der besvarer forespørgsler.
+        host (str): Adresse der lyttes på.
+        port (int): Port (0 vælger en ledig port).
+
+    Returns:
+        asyncio.AbstractServer: Den kørende server.
+    """
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def main(argv=None):
+    """
+    Kører tjenesten fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="LunarOrbit JSON-tjeneste")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-upstream", type=int, default=4,
+                        help="Maks. samtidige kald til Open-Meteo")
+    args = parser.parse_args(argv)
+
+    async def kør():
+        service = LunarOrbitService(max_upstream=args.max_upstream)
+        server = await start_server(service, args.host, args.port)
+        print(f"LunarOrbit-tjeneste lytter på http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(kør())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
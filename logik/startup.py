@@ -0,0 +1,183 @@
+"""
+Opstart i etaper: tidsmåling og snapshot af sidste session.
+
+Opstarten af LunarOrbit er delt op, så vinduet er brugbart hurtigst
+muligt:
+
+  1. Kun de nødvendige moduler importeres (requests, kalender og
+     live-tracker importeres først når de bruges).
+  2. Vinduet tegnes første gang ud fra et snapshot af sidste session:
+     dato, sted, tekster i panelerne og den skalerede baggrund (PNG).
+  3. Efter første optegning beregnes månen for datoen, og vejret hentes
+     i baggrunden.
+
+`StartupTimer` måler hver etape til første optegning og videre til
+vejret er vist. Tunge moduler importeres gennem `import_module()`, så
+importtiden også vises for sig selv. Rapporten printes med
+`python main.py --startup-report`.
+
+Dette modul bruger kun standardbiblioteket, så det kan importeres, før
+de tunge moduler indlæses.
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from logik.boilerplate import MoonConstants
+
+
+SNAPSHOT_STI = os.path.join(MoonConstants.DATA_DIR, "session.json")
+_FORMAT = 1
+
+
+def background_path(bredde: int, højde: int) -> str:
+    """
+    Stien til den cachede baggrund for en vinduesstørrelse.
+
+    Args:
+        bredde (int), højde (int): Vinduets størrelse i pixels.
+
+    Returns:
+        str: Sti til PNG-filen i DATA_DIR.
+    """
+    return os.path.join(MoonConstants.DATA_DIR, f"background_{bredde}x{højde}.png")
+
+
+def prune_backgrounds(behold: str) -> None:
+    """
+    Sletter cachede baggrunde for andre vinduesstørrelser.
+
+    Kun den seneste størrelse bruges ved næste opstart, så de øvrige
+    PNG-filer ville ellers hobe sig op i DATA_DIR.
+
+    Args:
+        behold (str): Sti til den baggrund der skal beholdes.
+    """
+    mappe = os.path.dirname(behold)
+    try:
+        navne = os.listdir(mappe)
+    except OSError:
+        return
+    for navn in navne:
+        sti = os.path.join(mappe, navn)
+        if navn.startswith("background_") and navn.endswith(".png") and sti != behold:
+            try:
+                os.remove(sti)
+            except OSError:
+                pass
+
+
+class StartupTimer:
+    """
+    Tidsstempler for opstartens etaper.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start (float, optional): `time.perf_counter()` ved processens
+                                     start (standard: nu).
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.etaper: List[Tuple[str, float]] = []
+        self.importer: List[Tuple[str, float]] = []
+
+    def mark(self, navn: str) -> None:
+        """
+        Afslutter en etape. Kun første markering med et navn tæller.
+
+        Args:
+            navn (str): Etapens navn.
+        """
+        if navn not in self.names:
+            self.etaper.append((navn, time.perf_counter()))
+
+    @property
+    def names(self) -> List[str]:
+        return [navn for navn, _ in self.etaper]
+
+    def import_module(self, navn: str):
+        """
+        Importerer et modul og registrerer importtiden.
+
+        Er modulet allerede importeret (f.eks. af et andet modul),
+        registreres intet.
+
+        Args:
+            navn (str): Modulnavn, f.eks. "PIL.ImageTk".
+
+        Returns:
+            module: Det importerede modul.
+        """
+        if navn in sys.modules:
+            return sys.modules[navn]
+        t0 = time.perf_counter()
+        modul = importlib.import_module(navn)
+        self.importer.append((navn, (time.perf_counter() - t0) * 1000))
+        return modul
+
+    def report(self) -> List[Tuple[str, float, float]]:
+        """
+        Etaperne med varighed og samlet tid.
+
+        Returns:
+            list: (navn, ms for etapen, ms siden start) i rækkefølge.
+        """
+        rækker, forrige = [], self.start
+        for navn, tid in self.etaper:
+            rækker.append((navn, (tid - forrige) * 1000, (tid - self.start) * 1000))
+            forrige = tid
+        return rækker
+
+    def print_report(self) -> None:
+        """Printer rapporten som en tabel."""
+        print("\nOpstart")
+        print("─" * 48)
+        for navn, etape, samlet in self.report():
+            print(f"  {navn:<14} {etape:8.1f} ms   (i alt {samlet:8.1f} ms)")
+        if self.importer:
+            print("\nImporter (indeholdt i etaperne ovenfor)")
+            print("─" * 48)
+            for navn, ms in self.importer:
+                print(f"  {navn:<22} {ms:8.1f} ms")
+
+
+def load_snapshot(sti: str = SNAPSHOT_STI) -> Optional[Dict]:
+    """
+    Indlæser snapshot af sidste session.
+
+    Args:
+        sti (str): Snapshotfilen.
+
+    Returns:
+        dict eller None: Snapshot, eller None hvis filen mangler, er
+                         ødelagt eller har et andet format.
+    """
+    try:
+        with open(sti, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != _FORMAT:
+        return None
+    return snapshot
+
+
+def save_snapshot(snapshot: Dict, sti: str = SNAPSHOT_STI) -> None:
+    """
+    Gemmer snapshot atomisk (midlertidig fil + os.replace).
+
+    Args:
+        snapshot (dict): Dato, sted, vinduesstørrelse og tekster.
+        sti (str):       Snapshotfilen.
+    """
+    os.makedirs(os.path.dirname(sti), exist_ok=True)
+    data = dict(snapshot, format=_FORMAT, saved_at=time.time())
+    midlertidig = sti + ".tmp"
+    with open(midlertidig, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(midlertidig, sti)
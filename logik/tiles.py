@@ -0,0 +1,400 @@
+"""
+Forudberegnede årstiles med astronomidata pr. sted.
+
+Et skift af sted betyder normalt, at alle sol- og månetider beregnes
+forfra. Med tiles beregnes hvert (sted, år) én gang af et baggrundsjob,
+der fordeler arbejdet på alle kerner (`ProcessPoolExecutor`), og gemmes
+som én binær fil:
+
+    ~/.lunarorbit/tiles/<lat>_<lon>/<år>-<trin>.tile
+
+Filformat (little-endian):
+    header:  magic (8 bytes) | år (int32) | breddegrad (float64)
+             | længdegrad (float64) | måne-trin (8 bytes) | antal dage (uint32)
+    søjler:  sunrise, sunset, moonrise, moonset, phase, illumination
+             som float32, `antal dage` værdier pr. søjle
+
+Tider er minutter efter lokal midnat (-1 = ingen begivenhed), præcis
+som i `WeatherRecord`. Fase og belysning er gemt som float32 (ca. 7
+betydende cifre).
+
+`TileStore` åbner filerne med mmap, så et opslag kun læser de bytes, der
+bruges. `MoonAPIClient` og `pipeline.compute_chunk` bruger tiles, når de
+findes, og beregner ellers som før.
+
+Kør fra kommandolinjen:
+    python -m logik.tiles --start 2020 --end 2030
+    python -m logik.tiles --sites steder.json --start 2000 --end 2050 --workers 8
+"""
+
+import argparse
+import datetime as dt
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from logik.boilerplate import MoonConstants
+
+
+STANDARD_MAPPE = os.path.join(MoonConstants.DATA_DIR, "tiles")
+
+MAGIC = b"LOTILE1\0"
+
+# Søjlernes rækkefølge i filen
+KOLONNER = ("sunrise", "sunset", "moonrise", "moonset", "phase", "illumination")
+TID_KOLONNER = KOLONNER[:4]
+
+_HEADER = struct.Struct("<8sidd8sI")
+_FLOAT  = struct.Struct("<f")
+
+Sted = Tuple[float, float, str]
+
+
+def sted_nøgle(lat: float, lon: float) -> str:
+    """Mappenavn for et sted, f.eks. "55.6761_12.5683"."""
+    return f"{lat:.4f}_{lon:.4f}"
+
+
+def tile_path(lat: float, lon: float, år: int, trin: str = "fast",
+              mappe: str = STANDARD_MAPPE) -> str:
+    """
+    Stien til tilen for et sted og år.
+
+    Args:
+        lat (float), lon (float): Stedet.
+        år (int):    Året.
+        trin (str):  Månemodellens præcisionstrin (se lunar_models.py).
+        mappe (str): Rodmappen for tiles.
+
+    Returns:
+        str: Filens sti.
+    """
+    return os.path.join(mappe, sted_nøgle(lat, lon), f"{år}-{trin}.tile")
+
+
+# ──────────────────────────────────────────────
+# SKRIVNING
+# ──────────────────────────────────────────────
+
+def compute_tile(lat: float, lon: float, år: int, trin: str = "fast") -> Dict[str, array]:
+    """
+    Beregner et års søjler for et sted.
+
+    Args:
+        lat (float), lon (float): Stedet.
+        år (int):   Året.
+        trin (str): Månemodellens præcisionstrin.
+
+    Returns:
+        dict: Søjlenavn → array('f') med én værdi pr. dag.
+    """
+    # Importeres her: pipeline bygger selv på MoonAPIClient, som bruger dette modul
+    from logik.moon_api import MoonAPIClient
+    from logik.pipeline import compute_chunk
+
+    klient = MoonAPIClient(lat, lon, lunar_tier=trin, tiles=False)
+    start = dt.date(år, 1, 1)
+    bid = compute_chunk(klient, start, (dt.date(år + 1, 1, 1) - start).days)
+    søjler = {navn: array("f", bid.table.columns[navn]) for navn in TID_KOLONNER}
+    søjler["phase"] = array("f", bid.phase)
+    søjler["illumination"] = array("f", bid.illumination)
+    return søjler
+
+
+def write_tile(sti: str, lat: float, lon: float, år: int, trin: str,
+               søjler: Dict[str, array]) -> None:
+    """
+    Skriver en tile atomisk (midlertidig fil + os.replace).
+
+    Args:
+        sti (str):     Filens sti.
+        lat (float), lon (float): Stedet.
+        år (int):      Året.
+        trin (str):    Månemodellens præcisionstrin.
+        søjler (dict): Fra `compute_tile`.
+    """
+    os.makedirs(os.path.dirname(sti), exist_ok=True)
+    dage = len(søjler["phase"])
+    midlertidig = f"{sti}.{os.getpid()}.tmp"
+    with open(midlertidig, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, år, lat, lon, trin.encode("ascii"), dage))
+        for navn in KOLONNER:
+            søjle = søjler[navn]
+            if len(søjle) != dage:
+                raise ValueError(f"Søjlen {navn} har {len(søjle)} værdier, forventede {dage}")
+            if sys.byteorder == "big":
+                søjle = array("f", søjle)
+                søjle.byteswap()
+            søjle.tofile(f)
+    os.replace(midlertidig, sti)
+
+
+def _byg(job: Tuple[float, float, int, str, str]) -> Tuple[str, int]:
+    """Arbejderfunktion: beregner og skriver én tile (kører i en anden proces)."""
+    lat, lon, år, trin, mappe = job
+    sti = tile_path(lat, lon, år, trin, mappe)
+    write_tile(sti, lat, lon, år, trin, compute_tile(lat, lon, år, trin))
+    return sti, os.path.getsize(sti)
+
+
+def build_tiles(steder: Sequence[Sted], start_år: int, slut_år: int, trin: str = "fast",
+                mappe: str = STANDARD_MAPPE, arbejdere: Optional[int] = None,
+                overwrite: bool = False) -> Dict[str, float]:
+    """
+    Forudberegner tiles for alle steder og år på alle kerner.
+
+    Hvert (sted, år) er et selvstændigt job, så puljen holdes travl, også
+    med få steder. Eksisterende tiles springes over, medmindre `overwrite`.
+
+    Args:
+        steder (list):   Steder som (breddegrad, længdegrad, stednavn).
+        start_år (int), slut_år (int): Årene (begge inkl.).
+        trin (str):      Månemodellens præcisionstrin.
+        mappe (str):     Rodmappen for tiles.
+        arbejdere (int, optional): Antal processer (standard: alle kerner).
+        overwrite (bool): Beregn også tiles der allerede findes.
+
+    Returns:
+        dict: built, skipped, bytes, seconds og workers.
+    """
+    arbejdere = arbejdere or os.cpu_count() or 1
+    jobs = [(lat, lon, år, trin, mappe)
+            for lat, lon, _ in steder for år in range(start_år, slut_år + 1)
+            if overwrite or not os.path.exists(tile_path(lat, lon, år, trin, mappe))]
+    resultat = {"built": 0, "skipped": len(steder) * (slut_år - start_år + 1) - len(jobs),
+                "bytes": 0, "seconds": 0.0, "workers": arbejdere}
+
+    t0 = time.perf_counter()
+    if arbejdere == 1:
+        færdige = [_byg(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=arbejdere) as pulje:
+            færdige = [f.result() for f in as_completed([pulje.submit(_byg, j) for j in jobs])]
+    for _, størrelse in færdige:
+        resultat["built"] += 1
+        resultat["bytes"] += størrelse
+    resultat["seconds"] = time.perf_counter() - t0
+    return resultat
+
+
+# ──────────────────────────────────────────────
+# LÆSNING
+# ──────────────────────────────────────────────
+
+class YearTile:
+    """
+    Én tile åbnet med mmap (kun de læste sider hentes fra disken).
+    """
+
+    def __init__(self, sti: str):
+        """
+        Args:
+            sti (str): Filens sti.
+
+        Raises:
+            OSError:    Hvis filen ikke kan åbnes.
+            ValueError: Ved forkert magic eller afkortet fil.
+        """
+        with open(sti, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.year, self.latitude, self.longitude, trin, self.days = \
+                _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"{sti} er ikke en tile")
+        if magic != MAGIC or len(self._mm) != _HEADER.size + len(KOLONNER) * self.days * 4:
+            self._mm.close()
+            raise ValueError(f"{sti} er ikke en gyldig tile")
+        self.tier = trin.rstrip(b"\0").decode("ascii")
+        self._forskydning = {navn: _HEADER.size + k * self.days * 4
+                             for k, navn in enumerate(KOLONNER)}
+
+    def value(self, kolonne: str, i: int) -> float:
+        """
+        Én værdi (dag `i` fra 1. januar).
+
+        Args:
+            kolonne (str): Søjlenavn fra `KOLONNER`.
+            i (int):       Dagens indeks i året.
+
+        Returns:
+            float: Værdien.
+        """
+        return _FLOAT.unpack_from(self._mm, self._forskydning[kolonne] + 4 * i)[0]
+
+    def column(self, kolonne: str, fra: int = 0, til: Optional[int] = None):
+        """
+        Et udsnit af en søjle uden kopiering.
+
+        Args:
+            kolonne (str): Søjlenavn fra `KOLONNER`.
+            fra (int), til (int, optional): Dagindekser (til eksklusiv).
+
+        Returns:
+            memoryview eller array: float32-værdier (på big-endian-maskiner
+                                    en vendt kopi).
+        """
+        til = self.days if til is None else til
+        start = self._forskydning[kolonne]
+        bytes_ = memoryview(self._mm)[start + 4 * fra:start + 4 * til]
+        if sys.byteorder == "big":
+            kopi = array("f", bytes_.tobytes())
+            kopi.byteswap()
+            return kopi
+        return bytes_.cast("f")
+
+
+class TileStore:
+    """
+    Tiles for ét sted og ét måne-trin; årene åbnes ved første opslag.
+    """
+
+    def __init__(self, lat: float, lon: float, trin: str = "fast",
+                 mappe: str = STANDARD_MAPPE):
+        """
+        Args:
+            lat (float), lon (float): Stedet.
+            trin (str):  Månemodellens præcisionstrin.
+            mappe (str): Rodmappen for tiles.
+        """
+        self.lat   = lat
+        self.lon   = lon
+        self.trin  = trin
+        self.mappe = mappe
+        self._tiles: Dict[int, Optional[YearTile]] = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def tile(self, år: int) -> Optional[YearTile]:
+        """
+        Årets tile, eller None hvis den ikke findes (eller er ugyldig).
+
+        Args:
+            år (int): Året.
+
+        Returns:
+            YearTile eller None.
+        """
+        if år not in self._tiles:
+            try:
+                tile = YearTile(tile_path(self.lat, self.lon, år, self.trin, self.mappe))
+            except (OSError, ValueError):
+                tile = None
+            self._tiles[år] = tile
+        return self._tiles[år]
+
+    def refresh(self) -> None:
+        """Glemmer manglende år, så tiles bygget siden da bliver fundet."""
+        self._tiles = {år: t for år, t in self._tiles.items() if t is not None}
+
+    def _opslag(self, dato: dt.date) -> Tuple[Optional[YearTile], int]:
+        tile = self.tile(dato.year)
+        self.stats["hits" if tile is not None else "misses"] += 1
+        return tile, dato.timetuple().tm_yday - 1
+
+    def moon(self, dato: dt.date) -> Optional[Tuple[float, float]]:
+        """
+        Månefase og belysning for en dag.
+
+        Args:
+            dato (date): Dagen.
+
+        Returns:
+            tuple eller None: (fase 0-1, belysning 0-100), None uden tile.
+        """
+        tile, i = self._opslag(dato)
+        if tile is None:
+            return None
+        return tile.value("phase", i), tile.value("illumination", i)
+
+    def events(self, dato: dt.date) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Sol- og måneopgang/-nedgang for en dag.
+
+        Args:
+            dato (date): Dagen.
+
+        Returns:
+            tuple eller None: (sunrise, sunset, moonrise, moonset) i minutter.
+        """
+        tile, i = self._opslag(dato)
+        if tile is None:
+            return None
+        return tuple(int(tile.value(navn, i)) for navn in TID_KOLONNER)
+
+    def columns(self, start: dt.date, antal_dage: int) -> Optional[Dict[str, array]]:
+        """
+        Søjler for fortløbende dage, hvis tiles dækker hele intervallet.
+
+        Args:
+            start (date):     Første dag.
+            antal_dage (int): Antal dage.
+
+        Returns:
+            dict eller None: Søjlenavn → array ('h' for tider, 'd' for fase
+                             og belysning), None hvis et år mangler.
+        """
+        slut = start + dt.timedelta(days=antal_dage - 1)
+        if any(self.tile(år) is None for år in range(start.year, slut.year + 1)):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        søjler = {navn: array("h") for navn in TID_KOLONNER}
+        søjler.update(phase=array("d"), illumination=array("d"))
+        dag = start
+        while dag <= slut:
+            tile = self._tiles[dag.year]
+            fra = dag.timetuple().tm_yday - 1
+            til = min(tile.days, fra + (slut - dag).days + 1)
+            for navn, søjle in søjler.items():
+                udsnit = tile.column(navn, fra, til)
+                søjle.extend(map(int, udsnit) if søjle.typecode == "h" else udsnit)
+            dag += dt.timedelta(days=til - fra)
+        return søjler
+
+
+# ──────────────────────────────────────────────
+# KOMMANDOLINJE
+# ──────────────────────────────────────────────
+
+def _læs_steder(sti: str) -> List[Sted]:
+    """Steder fra en JSON-fil: [[lat, lon, "navn"], ...]."""
+    with open(sti, encoding="utf-8") as f:
+        return [(float(lat), float(lon), str(navn)) for lat, lon, navn in json.load(f)]
+
+
+def main(argv=None):
+    """
+    Bygger tiles fra kommandolinjen.
+
+    Args:
+        argv (list, optional): Argumenter (standard: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Forudberegn årstiles med astronomidata")
+    parser.add_argument("--sites", help="JSON-fil med [[lat, lon, navn], ...]")
+    parser.add_argument("--lat", type=float, default=MoonConstants.LATITUDE)
+    parser.add_argument("--lon", type=float, default=MoonConstants.LONGITUDE)
+    parser.add_argument("--name", default="København")
+    parser.add_argument("--start", type=int, default=dt.date.today().year - 5)
+    parser.add_argument("--end", type=int, default=dt.date.today().year + 5)
+    parser.add_argument("--tier", default="fast", help="Månemodel: fast eller meeus")
+    parser.add_argument("--workers", type=int, default=None, help="Processer (standard: alle kerner)")
+    parser.add_argument("--overwrite", action="store_true")
+    parser.add_argument("--dir", default=STANDARD_MAPPE, help="Rodmappe for tiles")
+    args = parser.parse_args(argv)
+
+    steder = _læs_steder(args.sites) if args.sites else [(args.lat, args.lon, args.name)]
+    r = build_tiles(steder, args.start, args.end, args.tier, args.dir,
+                    args.workers, args.overwrite)
+    print(f"{r['built']} tiles bygget, {r['skipped']} fandtes i forvejen "
+          f"({r['bytes'] / 1024:.0f} KB, {r['seconds']:.1f} s på {r['workers']} processer)")
+
+
+if __name__ == "__main__":
+    main()
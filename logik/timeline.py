@@ -0,0 +1,258 @@
+"""
+Uendelig tidslinje til slideren.
+
+Slideren viser altid et vindue på ±60 dage omkring et centrum. Når
+brugeren når kanten, flyttes centrum til den valgte dato, og slideren
+sættes tilbage til midten. Dermed kan man bevæge sig vilkårligt langt
+frem og tilbage i tid.
+
+Data for tidslinjen beregnes kun for de dage, der faktisk vises:
+
+  - Dagene beregnes i blokke på 32 dage med `pipeline.compute_chunk`
+    (søjler, ét batchkald pr. blok).
+  - Blokkene ligger i en LRU-cache med fast loft. Blokke uden for
+    vinduet og margenen smides ud, når centrum flyttes.
+
+Hukommelse og svartid er derfor de samme, uanset om brugeren ser på
+1950 eller 2150.
+"""
+
+import datetime as dt
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from logik.moon_api import MoonAPIClient
+from logik.pipeline import DayChunk, DayRecord, compute_chunk
+
+
+HALV_VIDDE = 60     # Dage på hver side af centrum (slider 0-100)
+KANT       = 3.0    # Slider-værdi fra kanten, hvor centrum flyttes
+BLOK_DAGE  = 32     # Dage pr. beregnet blok
+MARGEN     = 32     # Dage uden for vinduet der beholdes ved flytning
+MAX_BLOKKE = 8      # Loft over cachede blokke
+
+
+class LRUCache:
+    """
+    Trådsikker LRU-ordbog med fast loft over antal poster.
+    """
+
+    def __init__(self, størrelse: int):
+        """
+        Args:
+            størrelse (int): Maks. antal poster.
+        """
+        self.størrelse = størrelse
+        self._data: "OrderedDict" = OrderedDict()
+        self._lås = threading.Lock()
+
+    def get(self, nøgle, standard=None):
+        """Slår en post op og markerer den som senest brugt."""
+        with self._lås:
+            if nøgle not in self._data:
+                return standard
+            self._data.move_to_end(nøgle)
+            return self._data[nøgle]
+
+    def __contains__(self, nøgle) -> bool:
+        with self._lås:
+            return nøgle in self._data
+
+    def __getitem__(self, nøgle):
+        with self._lås:
+            self._data.move_to_end(nøgle)
+            return self._data[nøgle]
+
+    def __setitem__(self, nøgle, værdi) -> None:
+        with self._lås:
+            self._data[nøgle] = værdi
+            self._data.move_to_end(nøgle)
+            while len(self._data) > self.størrelse:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def discard_if(self, betingelse) -> int:
+        """
+        Fjerner alle poster hvis nøgle opfylder en betingelse.
+
+        Args:
+            betingelse (callable): nøgle → bool.
+
+        Returns:
+            int: Antal fjernede poster.
+        """
+        with self._lås:
+            gamle = [n for n in self._data if betingelse(n)]
+            for n in gamle:
+                del self._data[n]
+            return len(gamle)
+
+    def values(self) -> List:
+        with self._lås:
+            return list(self._data.values())
+
+
+class Timeline:
+    """
+    Slider-vindue med flytbart centrum og blokvis cache af dagsdata.
+    """
+
+    def __init__(self, client: MoonAPIClient, center: str, halv_vidde: int = HALV_VIDDE,
+                 blok_dage: int = BLOK_DAGE, max_blokke: int = MAX_BLOKKE):
+        """
+        Args:
+            client (MoonAPIClient): Sted og månemodel.
+            center (str):     Startcentrum (YYYY-MM-DD).
+            halv_vidde (int): Dage på hver side af centrum.
+            blok_dage (int):  Dage pr. beregnet blok.
+            max_blokke (int): Loft over cachede blokke.
+        """
+        self.client     = client
+        self.halv_vidde = halv_vidde
+        self.blok_dage  = blok_dage
+        self._center    = dt.date.fromisoformat(center)
+        self._blokke    = LRUCache(max_blokke)
+        self.stats = {"hits": 0, "misses": 0, "recenters": 0, "evicted": 0}
+
+    # ── Vinduet ──
+
+    @property
+    def center(self) -> str:
+        return self._center.isoformat()
+
+    @property
+    def start(self) -> str:
+        """Første dag i vinduet (slider 0)."""
+        return (self._center - dt.timedelta(days=self.halv_vidde)).isoformat()
+
+    @property
+    def end(self) -> str:
+        """Sidste dag i vinduet (slider 100)."""
+        return (self._center + dt.timedelta(days=self.halv_vidde)).isoformat()
+
+    def value_to_date(self, værdi: float) -> str:
+        """
+        Omregner slider-værdi (0-100) til en dato i vinduet.
+
+        Args:
+            værdi (float): Sliderens position.
+
+        Returns:
+            str: Dato i YYYY-MM-DD format.
+        """
+        forskydning = round((værdi / 100.0 - 0.5) * 2 * self.halv_vidde)
+        return (self._center + dt.timedelta(days=forskydning)).isoformat()
+
+    def date_to_value(self, dato: str) -> float:
+        """
+        Omregner en dato til slider-værdi (kan ligge uden for 0-100).
+
+        Args:
+            dato (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            float: Slider-værdi.
+        """
+        dage = (dt.date.fromisoformat(dato) - self._center).days
+        return 50.0 + 50.0 * dage / self.halv_vidde
+
+    def needs_recenter(self, værdi: float) -> bool:
+        """True hvis slideren er så tæt på en kant, at centrum skal flyttes."""
+        return værdi <= KANT or værdi >= 100.0 - KANT
+
+    def recenter(self, dato: str) -> None:
+        """
+        Flytter centrum til en dato og smider blokke langt fra vinduet ud.
+
+        Args:
+            dato (str): Nyt centrum (YYYY-MM-DD).
+        """
+        self._center = dt.date.fromisoformat(dato)
+        self.stats["recenters"] += 1
+        fra = (self._center.toordinal() - self.halv_vidde - MARGEN) // self.blok_dage
+        til = (self._center.toordinal() + self.halv_vidde + MARGEN) // self.blok_dage
+        self.stats["evicted"] += self._blokke.discard_if(lambda b: not fra <= b <= til)
+
+    def goto(self, dato: str) -> float:
+        """
+        Går til en dato; flytter centrum hvis datoen ligger ved eller uden
+        for kanten.
+
+        Args:
+            dato (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            float: Den slider-værdi datoen nu har.
+        """
+        værdi = self.date_to_value(dato)
+        if self.needs_recenter(værdi):
+            self.recenter(dato)
+            værdi = 50.0
+        return værdi
+
+    # ── Dagsdata ──
+
+    def _blok(self, nummer: int) -> DayChunk:
+        """Returnerer (og beregner ved behov) én blok."""
+        blok = self._blokke.get(nummer)
+        if blok is None:
+            self.stats["misses"] += 1
+            start = dt.date.fromordinal(nummer * self.blok_dage)
+            blok = compute_chunk(self.client, start, self.blok_dage)
+            self._blokke[nummer] = blok
+        else:
+            self.stats["hits"] += 1
+        return blok
+
+    def day(self, dato: str) -> DayRecord:
+        """
+        Måne- og astronomidata for én dag.
+
+        Args:
+            dato (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            DayRecord: Doven dagspost (se pipeline.py).
+        """
+        ordinal = dt.date.fromisoformat(dato).toordinal()
+        nummer, i = divmod(ordinal, self.blok_dage)
+        return DayRecord(self._blok(nummer), i)
+
+    def days(self, fra: str, antal: int) -> List[DayRecord]:
+        """
+        Fortløbende dage fra en dato (f.eks. de synlige celler).
+
+        Args:
+            fra (str):   Første dag.
+            antal (int): Antal dage.
+
+        Returns:
+            list: `DayRecord` pr. dag.
+        """
+        start = dt.date.fromisoformat(fra)
+        return [self.day((start + dt.timedelta(days=i)).isoformat()) for i in range(antal)]
+
+    @property
+    def cached_blocks(self) -> int:
+        return len(self._blokke)
+
+    @property
+    def nbytes(self) -> int:
+        """Omtrentlig hukommelse for de cachede blokke (søjledata)."""
+        total = 0
+        for blok in self._blokke.values():
+            total += blok.table.nbytes
+            total += blok.phase.itemsize * len(blok.phase) * 2
+        return total
+
+    def report(self) -> Dict[str, float]:
+        """
+        Cache-statistik.
+
+        Returns:
+            dict: hits, misses, recenters, evicted, blocks og nbytes.
+        """
+        return dict(self.stats, blocks=self.cached_blocks, nbytes=self.nbytes)
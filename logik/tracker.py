@@ -0,0 +1,177 @@
+"""
+Live position af måne og sol.
+
+`LiveTracker.sample()` giver højde, azimut og belysning for "nu" og er
+beregnet til at blive kaldt hvert sekund fra UI'ets ur. Med den fulde
+Meeus-serie ("meeus") er månens position dyr, så i stedet for at
+evaluere den ved hvert tik tilpasses et kort Chebyshev-polynomium
+(`ChebyshevSeries`) til RA/deklination over et vindue på 6 timer. Hvert
+tik er derefter:
+
+  - én Clenshaw-evaluering for månen (få multiplikationer)
+  - én omregning til højde/azimut (`ObserverContext.horizontal`)
+
+Når tidspunktet forlader vinduet, tilpasses et nyt. Det koster nogle
+få evalueringer af den fulde serie én gang hver 6. time. Hvert nyt
+vindue måles mod serien; overstiger fejlen `VINDUE_TOLERANCE`, bruges
+serien direkte, indtil næste vindue tilpasses.
+
+Solens NOAA-formler og månens "fast"-trin er billigere end et
+Chebyshev-opslag og evalueres derfor direkte ved hvert tik.
+
+Tidsforbrug pr. tik måles løbende og kan læses i `stats`.
+"""
+
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from logik.ephemeris import ChebyshevSeries
+from logik.moon_api import MoonAPIClient, _sol_ekvatorial
+
+
+# Vinduets længde i dage og antal koefficienter for månen.
+# 6 timer med 6 koefficienter giver fejl langt under 1".
+VINDUE_DAGE = 0.25
+KOEFFICIENTER = 6
+
+# Største tilladte målte fejl for et vindue i grader (1")
+VINDUE_TOLERANCE = 1.0 / 3600
+
+# Testpunkter pr. vindue ved fejlmålingen
+VINDUE_PRØVER = 12
+
+# Månetrin hvor den fulde serie er dyrere end et Chebyshev-opslag
+VINDUE_TRIN = ("meeus",)
+
+_JD_UNIX_0    = 2440587.5    # 1. januar 1970, 0h UT
+_JD_J2000_0H  = 2451544.5    # 1. januar 2000, 0h UT
+_JD_NYMÅNE    = 2451549.5    # MoonAPIClient.KNOWN_NEW_MOON (6. januar 2000)
+
+
+def unix_til_jd(tidspunkt: float) -> float:
+    """
+    Omregner Unix-tid til juliansk dag.
+
+    Args:
+        tidspunkt (float): Sekunder siden 1970-01-01 UTC.
+
+    Returns:
+        float: Juliansk dag (UT).
+    """
+    return tidspunkt / 86400.0 + _JD_UNIX_0
+
+
+class SkySample:
+    """
+    Måne og sol på ét tidspunkt.
+    """
+
+    __slots__ = ("timestamp", "moon_altitude", "moon_azimuth",
+                 "sun_altitude", "sun_azimuth", "illumination")
+
+    def __init__(self, timestamp: float, moon_altitude: float, moon_azimuth: float,
+                 sun_altitude: float, sun_azimuth: float, illumination: float):
+        self.timestamp     = timestamp       # Unix-tid
+        self.moon_altitude = moon_altitude   # Grader over horisonten
+        self.moon_azimuth  = moon_azimuth    # Grader fra nord mod øst
+        self.sun_altitude  = sun_altitude
+        self.sun_azimuth   = sun_azimuth
+        self.illumination  = illumination    # 0-100
+
+    def to_dict(self) -> Dict:
+        """Ordbogsform med vinkler afrundet til 0,1°."""
+        return {
+            "moon_altitude": round(self.moon_altitude, 1),
+            "moon_azimuth":  round(self.moon_azimuth, 1),
+            "sun_altitude":  round(self.sun_altitude, 1),
+            "sun_azimuth":   round(self.sun_azimuth, 1),
+            "illumination":  round(self.illumination, 1),
+        }
+
+    def __repr__(self):
+        return (f"SkySample(måne {self.moon_altitude:.1f}°/{self.moon_azimuth:.1f}°, "
+                f"sol {self.sun_altitude:.1f}°/{self.sun_azimuth:.1f}°)")
+
+
+class LiveTracker:
+    """
+    Inkrementel live-position af måne og sol for klientens sted.
+    """
+
+    def __init__(self, client: MoonAPIClient, vindue: float = VINDUE_DAGE):
+        """
+        Args:
+            client (MoonAPIClient): Sted (`observer`) og månemodel.
+            vindue (float):         Tilpasningsvinduets længde i dage.
+        """
+        self.ctx      = client.observer
+        self.vindue   = vindue
+        self.synodisk = client.SYNODIC_MONTH
+
+        model = client.lunar_model
+        self._måne = lambda JD: model.position(JD)[:2]
+        self.bruger_vindue = model.navn in VINDUE_TRIN
+        self._serie: Optional[ChebyshevSeries] = None
+        self._serie_ok = False
+        self.stats = {"ticks": 0, "refits": 0, "rejected": 0, "total_s": 0.0, "max_s": 0.0}
+
+    @staticmethod
+    def _sol(JD: float) -> Tuple[float, float]:
+        """Solens (RA, dekl) i grader fra den fulde serie."""
+        ra, dekl = _sol_ekvatorial(JD - _JD_J2000_0H)
+        return ra, math.degrees(dekl)
+
+    def _måne_position(self, JD: float) -> Tuple[float, float]:
+        """
+        Månens RA og deklination. Med et dyrt trin kommer de fra det
+        cachede polynomium, og et nyt vindue tilpasses når JD ligger
+        uden for det nuværende; ellers evalueres modellen direkte. Et
+        vindue over `VINDUE_TOLERANCE` afvises, og modellen evalueres
+        direkte i vinduets tidsrum.
+        """
+        if not self.bruger_vindue:
+            return self._måne(JD)
+        serie = self._serie
+        if serie is None or not serie.jd0 <= JD < serie.jd_slut:
+            serie = ChebyshevSeries.fit(self._måne, JD, JD + self.vindue,
+                                        self.vindue, KOEFFICIENTER, VINDUE_PRØVER)
+            self._serie = serie
+            self._serie_ok = serie.max_error <= VINDUE_TOLERANCE
+            self.stats["refits"] += 1
+            if not self._serie_ok:
+                self.stats["rejected"] += 1
+        return serie.evaluate(JD) if self._serie_ok else self._måne(JD)
+
+    def sample(self, tidspunkt: Optional[float] = None) -> SkySample:
+        """
+        Måne og sol på et tidspunkt.
+
+        Args:
+            tidspunkt (float, optional): Unix-tid (standard: nu).
+
+        Returns:
+            SkySample: Højde, azimut og belysning.
+        """
+        start = time.perf_counter()
+        if tidspunkt is None:
+            tidspunkt = time.time()
+        JD = unix_til_jd(tidspunkt)
+
+        måne_højde, måne_azimut = self.ctx.horizontal(*self._måne_position(JD), JD)
+        sol_højde, sol_azimut   = self.ctx.horizontal(*self._sol(JD), JD)
+
+        # Samme fasemodel som MoonAPIClient, men med brøkdele af døgnet
+        fase = (JD - _JD_NYMÅNE) % self.synodisk / self.synodisk
+        belysning = 50 * (1 - math.cos(2 * math.pi * fase))
+
+        forbrug = time.perf_counter() - start
+        self.stats["ticks"]   += 1
+        self.stats["total_s"] += forbrug
+        self.stats["max_s"]    = max(self.stats["max_s"], forbrug)
+        return SkySample(tidspunkt, måne_højde, måne_azimut, sol_højde, sol_azimut, belysning)
+
+    def mean_tick_ms(self) -> float:
+        """Gennemsnitlig tid pr. tik i millisekunder."""
+        antal = self.stats["ticks"]
+        return self.stats["total_s"] / antal * 1000 if antal else 0.0
@@ -0,0 +1,197 @@
+"""
+Søgning efter de bedste nætter til måneobservation.
+
+`best_viewing_nights()` henter hele forecast-vinduet (16 dage) i ét kald
+til Open-Meteo og vurderer hver nat ud fra:
+
+  - Mørke:     solen under -12° (nautisk tusmørke er slut)
+  - Månehøjde: månen mindst 10° over horisonten
+  - Skydække:  timeværdien fra forecastet
+  - Belysning: månens belysningsgrad ved midnat
+
+Natten dækker lokal tid 18:00-06:00. Alle prøvetidspunkter for alle
+nætter beregnes samlet i flade lister, så beregningen tager få
+millisekunder oven i det ene netværkskald.
+
+Vurdering pr. nat:
+    klare_timer = Σ (1 - skydække/100) over mørke timer med månen oppe
+    score       = klare_timer × (0,5 + 0,5 × belysning/100)
+"""
+
+import datetime as dt
+import math
+from typing import Dict, List, Optional
+
+from logik.boilerplate import Formatters
+from logik.moon_api import MoonAPIClient, _DST_TABEL, _julian_dag, _sol_ekvatorial
+from logik.rate_limiter import get_json
+from logik.records import INGEN_TID, MANGLER, er_mangler, til_tal
+
+
+# Forecast-horisont hos Open-Meteo (dage)
+FORECAST_DAGE = 16
+
+# Nattens lokale timer: 18:00 til og med 06:00 næste morgen
+NAT_TIMER = tuple(range(18, 31))
+
+SOL_MØRKE_GRÆNSE = -12.0    # grader
+MÅNE_MIN_HØJDE   = 10.0     # grader
+
+_JD_J2000_0H = 2451544.5    # 1. januar 2000, 0h UT
+
+
+class ViewingNight:
+    """
+    Vurdering af én nat (aftenens dato).
+    """
+
+    __slots__ = ("date", "score", "clear_hours", "mean_cloud", "max_altitude",
+                 "illumination", "best_time", "complete")
+
+    def __init__(self, date: str, score: float, clear_hours: float, mean_cloud: float,
+                 max_altitude: float, illumination: float, best_time: int, complete: bool):
+        self.date         = date           # Aftenens dato (YYYY-MM-DD)
+        self.score        = score
+        self.clear_hours  = clear_hours    # Vægtede klare timer med månen oppe i mørke
+        self.mean_cloud   = mean_cloud     # Middel-skydække i de timer (MANGLER hvis ingen)
+        self.max_altitude = max_altitude   # Største månehøjde i mørke (grader)
+        self.illumination = illumination   # Belysning ved midnat (0-100)
+        self.best_time    = best_time      # Bedste time, minutter efter lokal midnat
+        self.complete     = complete       # False hvis forecastet ikke dækker hele natten
+
+    def to_dict(self) -> Dict:
+        """Ordbogsform med afrundede tal og "HH:MM" for bedste tid."""
+        return {
+            "date":         self.date,
+            "score":        round(self.score, 2),
+            "clear_hours":  round(self.clear_hours, 1),
+            "mean_cloud":   ("-" if er_mangler(self.mean_cloud)
+                             else Formatters.format_value(round(self.mean_cloud))),
+            "max_altitude": round(self.max_altitude, 1),
+            "illumination": round(self.illumination, 1),
+            "best_time":    Formatters.format_minutes(self.best_time),
+            "complete":     self.complete,
+        }
+
+    def __repr__(self):
+        return f"ViewingNight({self.date}, score={self.score:.2f})"
+
+
+def rank_nights(client: MoonAPIClient, fra: dt.date, skydække: List[float],
+                nætter: int = FORECAST_DAGE) -> List[ViewingNight]:
+    """
+    Vurderer og rangerer nætter ud fra et timebaseret skydække.
+
+    Args:
+        client (MoonAPIClient): Giver sted (`observer`) og månemodel.
+        fra (date):        Første aften; også tidspunktet 00:00 UTC for `skydække[0]`.
+        skydække (list):   Skydække i % pr. UTC-time fra `fra` 00:00.
+        nætter (int):      Antal nætter.
+
+    Returns:
+        list: `ViewingNight` sorteret efter faldende score.
+    """
+    ctx   = client.observer
+    model = client.lunar_model
+
+    # ── Alle prøvetidspunkter for alle nætter i flade lister ──
+    jd_liste, indeks, lokale = [], [], []
+    for n in range(nætter):
+        aften = fra + dt.timedelta(days=n)
+        for nat_time in NAT_TIMER:
+            dag = aften + dt.timedelta(days=nat_time // 24)
+            lokal_time = nat_time % 24
+            utc_time = lokal_time - _DST_TABEL[dag.month][dag.day]
+            jd_liste.append(_julian_dag(dag.year, dag.month, dag.day) + utc_time / 24.0)
+            indeks.append((dag - fra).days * 24 + utc_time)
+            lokale.append(lokal_time * 60)
+
+    sol_højde, måne_højde = [], []
+    for JD in jd_liste:
+        ra, dekl = _sol_ekvatorial(JD - _JD_J2000_0H)
+        sol_højde.append(ctx.horizontal(ra, math.degrees(dekl), JD)[0])
+        ra, dekl, _ = model.position(JD)
+        måne_højde.append(ctx.horizontal(ra, dekl, JD)[0])
+    skyer = [til_tal(skydække[i]) if 0 <= i < len(skydække) else MANGLER for i in indeks]
+
+    # ── Vurdering pr. nat ──
+    pr_nat = len(NAT_TIMER)
+    resultat = []
+    for n in range(nætter):
+        aften = fra + dt.timedelta(days=n)
+        klare, sky_sum, sky_antal = 0.0, 0.0, 0
+        max_højde, bedst, bedst_værdi = -90.0, INGEN_TID, 0.0
+        komplet = True
+        for k in range(n * pr_nat, (n + 1) * pr_nat):
+            if sol_højde[k] >= SOL_MØRKE_GRÆNSE:
+                continue
+            max_højde = max(max_højde, måne_højde[k])
+            if måne_højde[k] < MÅNE_MIN_HØJDE:
+                continue
+            sky = skyer[k]
+            if er_mangler(sky):
+                komplet = False
+                continue
+            klar = 1.0 - sky / 100.0
+            klare += klar
+            sky_sum += sky
+            sky_antal += 1
+            værdi = klar * math.sin(math.radians(måne_højde[k]))
+            if værdi > bedst_værdi:
+                bedst, bedst_værdi = lokale[k], værdi
+
+        midnat = (aften + dt.timedelta(days=1)).isoformat()
+        måne = client.fetch_moon_record(midnat)
+        belysning = måne.illumination if måne else 0.0
+        resultat.append(ViewingNight(
+            date=aften.isoformat(),
+            score=klare * (0.5 + 0.5 * belysning / 100.0),
+            clear_hours=klare,
+            mean_cloud=sky_sum / sky_antal if sky_antal else MANGLER,
+            max_altitude=max_højde,
+            illumination=belysning,
+            best_time=bedst,
+            complete=komplet,
+        ))
+
+    resultat.sort(key=lambda nat: nat.score, reverse=True)
+    return resultat
+
+
+def best_viewing_nights(client: MoonAPIClient, nætter: int = FORECAST_DAGE,
+                        fra: Optional[dt.date] = None) -> List[ViewingNight]:
+    """
+    Finder de bedste nætter til måneobservation i forecast-vinduet.
+
+    Henter timebaseret skydække for hele vinduet i ét kald. Kan vejret
+    ikke hentes, får alle nætter score 0 og markeres ufuldstændige
+    (månehøjde og belysning er stadig udfyldt).
+
+    Args:
+        client (MoonAPIClient): Sted, månemodel og endpoint.
+        nætter (int):        Antal nætter (højst 16).
+        fra (date, optional): Første aften (standard: i dag).
+
+    Returns:
+        list: `ViewingNight` sorteret efter faldende score.
+    """
+    import requests
+
+    fra = fra or dt.date.today()
+    nætter = min(nætter, FORECAST_DAGE)
+    params = {
+        "latitude":   client.latitude,
+        "longitude":  client.longitude,
+        "start_date": fra.isoformat(),
+        "end_date":   (fra + dt.timedelta(days=nætter - 1)).isoformat(),
+        "hourly":     "cloud_cover",
+        "timezone":   "GMT",
+    }
+    try:
+        svar = get_json(client.WEATHER_API_URL, params, client.priority,
+                        timeout=8, forsøg=2, limiter=client.limiter)
+        skydække = svar.get("hourly", {}).get("cloud_cover", [])
+    except requests.exceptions.RequestException as e:
+        print(f"Advarsel: Kunne ikke hente skydække: {e}")
+        skydække = []
+    return rank_nights(client, fra, skydække, nætter)
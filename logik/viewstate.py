@@ -0,0 +1,306 @@
+"""
+Visningstilstande beregnet uden for Tk's hovedtråd.
+
+Tidligere kørte `_fetch_and_display_moon` i hovedtråden for hvert
+slider-tik: datoparsing, fase, formatering og cache-opslag. Kun
+netværkskaldet lå i en tråd. Nu gøres sådan:
+
+  - Hovedtråden kalder kun `ViewStateWorker.request(dato)`. Det er en
+    tildeling under en lås og returnerer med det samme.
+  - En arbejdstråd bygger en færdig, uforanderlig `ViewState` med alle
+    tekster for datoen. Kommer der nye anmodninger, før den er færdig,
+    bygges kun den nyeste (ældre springes over).
+  - Hovedtråden henter færdige tilstande fra en kø én gang pr. frame
+    (`poll()`) og skriver blot teksterne i widgets.
+
+Vejret hentes af arbejderen i en separat tråd, og kun for den dato der
+stadig er ønsket. Når det ankommer, bygges en ny tilstand for datoen.
+
+Modulet importerer ikke tkinter og kan derfor bruges uden skærm (se
+benchmark og headless-tilstanden).
+"""
+
+import datetime as dt
+import queue
+import threading
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from logik.boilerplate import Formatters, MoonEngine, MoonVisuals
+from logik.lunations import PhaseEventCache
+from logik.moon_api import MoonAPIClient
+from logik.records import WeatherRecord
+from logik.timeline import LRUCache, Timeline
+
+
+# Antal celler i dagsstrimlen (den midterste er den valgte dato)
+STRIMMEL_CELLER = 15
+
+# Hovedtrådens poll-interval (ca. én frame ved 60 Hz)
+FRAME_MS = 16
+
+# Status-tekst og farve
+_HENTER = ("Henter vejr...", "orange")
+_KLAR   = ("Klar", "lightgreen")
+
+
+class ViewState(NamedTuple):
+    """
+    Alt hovedvinduet viser for én dato. Uforanderlig, så den kan gives
+    mellem tråde uden låse.
+
+    Attributes:
+        seq (int):        Anmodningens løbenummer (stiger monotont).
+        date (str):       Datoen (YYYY-MM-DD).
+        labels (tuple):   (widget-navn, tekst) for hovedvinduets labels.
+        strip (tuple):    Tekst pr. celle i dagsstrimlen.
+        status (tuple):   (tekst, farve) for statuslinjen.
+        weather_ready (bool): True når vejret er hentet (eller fejlet).
+        compute_ms (float):   Tid brugt på at bygge tilstanden.
+    """
+    seq: int
+    date: str
+    labels: Tuple[Tuple[str, str], ...]
+    strip: Tuple[str, ...]
+    status: Tuple[str, str]
+    weather_ready: bool
+    compute_ms: float
+
+
+def weather_labels(client: MoonAPIClient, dato: str, weather: Optional[WeatherRecord],
+                   astro: WeatherRecord, hourly=None,
+                   henter: bool = False) -> Tuple[Tuple[str, str], ...]:
+    """
+    Teksterne i vejr- og astronomipanelet.
+
+    Posten indeholder rå tal; formatering til "HH:MM" og "-" sker her.
+
+    Args:
+        client (MoonAPIClient): Til timevejr-opslag og klimanormalens mærkat.
+        dato (str):             Datoen.
+        weather (WeatherRecord eller None): Hentet post, None hvis den
+                                mangler eller hentningen fejlede.
+        astro (WeatherRecord):  Lokalt beregnede tider (vises mens vejret hentes).
+        hourly (HourlyTable, optional): Timevejr for slider-vinduet.
+        henter (bool):          True mens vejret stadig hentes.
+
+    Returns:
+        tuple: (widget-navn, tekst) par.
+    """
+    fmt_tid   = Formatters.format_minutes
+    fmt_værdi = Formatters.format_value
+    post = weather or astro
+
+    if weather:
+        tekst = (
+            f"🌡 {fmt_værdi(weather.temperature_min)}° – "
+            f"{fmt_værdi(weather.temperature_max)}°C\n"
+            f"☁ Skydækket: {fmt_værdi(weather.cloud_cover)}%"
+        )
+        if hourly is not None and weather.moonrise >= 0:
+            sky = client.hourly_at(hourly, "cloud_cover", dato, weather.moonrise)
+            tekst += f"\n☁ Ved måneopgang: {fmt_værdi(sky)}%"
+        overskrift = "Vejr"
+        if weather.is_estimate:
+            # Klimanormal, ikke prognose (dato uden for horisonten eller offline)
+            overskrift = f"Vejr (estimat, {client.climatology.label})"
+        vejr = f"{overskrift}: {tekst}"
+    else:
+        vejr = "Vejr: henter..." if henter else "Vejr: ikke tilgængeligt"
+
+    return (
+        ("weather_label",  vejr),
+        ("sunrise_label",  f"🌅 Solopgang:   {fmt_tid(post.sunrise)}"),
+        ("sunset_label",   f"🌇 Solnedgang:  {fmt_tid(post.sunset)}"),
+        ("moonrise_label", f"🌕 Måneopgang:  {fmt_tid(post.moonrise)}"),
+        ("moonset_label",  f"🌑 Månenedgang: {fmt_tid(post.moonset)}"),
+        # UV-indeks hentes ikke endnu
+        ("uv_label",       "☀️ UV-indeks:   -"),
+        ("precip_label",   f"🌧 Nedbør:      {fmt_værdi(post.precip_prob)}%"),
+    )
+
+
+class ViewStateWorker:
+    """
+    Arbejdstråd der bygger `ViewState` for den senest ønskede dato.
+    """
+
+    def __init__(self, client: MoonAPIClient, timeline: Timeline,
+                 weather_cache: LRUCache, fetch_weather: bool = True):
+        """
+        Args:
+            client (MoonAPIClient): Sted, vejr og månemodel.
+            timeline (Timeline):    Dagsdata (blokcache, trådsikker).
+            weather_cache (LRUCache): Hentet vejr pr. dato (None = fejlet).
+            fetch_weather (bool):   Hent manglende vejr i baggrundstråde.
+        """
+        self.client        = client
+        self.timeline      = timeline
+        self.weather_cache = weather_cache
+        self.fetch_weather = fetch_weather
+        self.engine        = MoonEngine()
+        self.visuals       = MoonVisuals()
+        # Nøjagtige fasetidspunkter til nedtællinger (binær søgning pr. tik)
+        self.phase_events  = PhaseEventCache()
+
+        self._ud       = queue.Queue()
+        self._lås      = threading.Condition()
+        self._ønsket: Optional[Tuple[int, str]] = None
+        self._aktuel   = None
+        self._seq      = 0
+        self._hourly   = None
+        self._henter   = set()
+        self._stop     = False
+        self._tråd     = threading.Thread(target=self._løkke, name="viewstate", daemon=True)
+        self.stats = {"requests": 0, "built": 0, "skipped": 0, "fetches": 0,
+                      "total_ms": 0.0, "max_ms": 0.0}
+
+    # ── Hovedtråden ──
+
+    def start(self) -> "ViewStateWorker":
+        self._tråd.start()
+        return self
+
+    def stop(self) -> None:
+        with self._lås:
+            self._stop = True
+            self._lås.notify()
+
+    def request(self, dato: str) -> int:
+        """
+        Beder om en tilstand for en dato (returnerer med det samme).
+
+        Args:
+            dato (str): Dato i YYYY-MM-DD format.
+
+        Returns:
+            int: Anmodningens løbenummer.
+        """
+        with self._lås:
+            self._seq += 1
+            if self._ønsket is not None:
+                self.stats["skipped"] += 1
+            self._ønsket = (self._seq, dato)
+            self._aktuel = dato
+            self.stats["requests"] += 1
+            self._lås.notify()
+            return self._seq
+
+    def poll(self) -> Optional[ViewState]:
+        """
+        Den nyeste færdige tilstand siden sidste kald (ældre kasseres).
+
+        Returns:
+            ViewState eller None.
+        """
+        nyeste = None
+        while True:
+            try:
+                nyeste = self._ud.get_nowait()
+            except queue.Empty:
+                return nyeste
+
+    def set_hourly(self, tabel) -> None:
+        """Nyt timevejr (kan kaldes fra enhver tråd); den aktuelle dato bygges om."""
+        with self._lås:
+            self._hourly = tabel
+            aktuel = self._aktuel
+        if aktuel is not None:
+            self.request(aktuel)
+
+    # ── Arbejdstråden ──
+
+    def _løkke(self) -> None:
+        while True:
+            with self._lås:
+                while self._ønsket is None and not self._stop:
+                    self._lås.wait()
+                if self._stop:
+                    return
+                seq, dato = self._ønsket
+                self._ønsket = None
+            try:
+                self._ud.put(self.build(dato, seq))
+            except Exception as e:
+                print(f"Fejl ved opbygning af visning for {dato}: {e}")
+
+    def build(self, dato: str, seq: int = 0) -> ViewState:
+        """
+        Bygger tilstanden for en dato (kaldes normalt af arbejdstråden).
+
+        Args:
+            dato (str): Dato i YYYY-MM-DD format.
+            seq (int):  Løbenummer der gives videre.
+
+        Returns:
+            ViewState: Færdig tilstand.
+        """
+        t0 = time.perf_counter()
+        dag = self.timeline.day(dato)
+        moon = dag.moon
+        phase = moon.phase
+
+        labels = [
+            ("date_label",         dato),
+            ("moon_display",       self.visuals.get_large_moon_display(phase, size=1)),
+            ("phase_label",        f"Fase: {self.engine.get_phase_name(phase)}"),
+            ("illumination_label", f"Belysning: {Formatters.format_illumination(moon.illumination)}"),
+            ("days_label",         "Dage til fuldmåne: "
+                                   f"{int(round(self.phase_events.days_until('full', dag.date)))}"),
+        ]
+
+        klar = dato in self.weather_cache
+        weather = self.weather_cache.get(dato)
+        henter = not klar and self._hent(dato)
+        labels.extend(weather_labels(self.client, dato, weather, dag.weather,
+                                     self._hourly, henter))
+
+        start = dag.date - dt.timedelta(days=STRIMMEL_CELLER // 2)
+        strimmel = tuple(f"{self.visuals.get_moon_emoji(d.moon.phase)}\n{d.date.day}"
+                         for d in self.timeline.days(start.isoformat(), STRIMMEL_CELLER))
+
+        ms = (time.perf_counter() - t0) * 1000
+        self.stats["built"] += 1
+        self.stats["total_ms"] += ms
+        self.stats["max_ms"] = max(self.stats["max_ms"], ms)
+        return ViewState(seq, dato, tuple(labels), strimmel,
+                         _HENTER if henter else _KLAR, klar, ms)
+
+    def _hent(self, dato: str) -> bool:
+        """
+        Starter hentning af vejr for en dato, hvis den stadig er ønsket.
+
+        Returns:
+            bool: True hvis vejret er (eller allerede var) på vej.
+        """
+        if not self.fetch_weather:
+            return False
+        with self._lås:
+            if dato in self._henter:
+                return True
+            if self._ønsket is not None:
+                # En nyere dato venter allerede; spring netværket over (slider-sweep)
+                return True
+            self._henter.add(dato)
+        self.stats["fetches"] += 1
+        threading.Thread(target=self._hent_vejr, args=(dato,), daemon=True).start()
+        return True
+
+    def _hent_vejr(self, dato: str) -> None:
+        """Henter vejret (i sin egen tråd) og bygger visningen om, hvis datoen stadig vises."""
+        weather = self.client.fetch_weather_record(dato)
+        self.weather_cache[dato] = weather
+        with self._lås:
+            self._henter.discard(dato)
+            aktuel = self._aktuel
+        if aktuel == dato:
+            self.request(dato)
+
+    def report(self):
+        """
+        Statistik: anmodninger, byggede og oversprungne tilstande, hentninger,
+        gennemsnitlig/maks. byggetid og fasecachens træfrate.
+        """
+        bygget = self.stats["built"] or 1
+        return dict(self.stats, mean_ms=self.stats["total_ms"] / bygget,
+                    phase_hit_rate=self.phase_events.hit_rate)
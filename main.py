@@ -3,11 +3,23 @@ LunarOrbit - Entry point for applikationen.
 
 Denne fil holdes bevidst minimal og bruges kun til at starte
 brugergrænsefladen fra `UI.py`.
+
+    python main.py                   # Start appen
+    python main.py --startup-report  # Print opstartens etaper og importtider
 """
 
-from logik.UI import LunarOrbitApp
+import sys
+import time
+
+_START = time.perf_counter()
+
+from logik.startup import StartupTimer
 
 
 if __name__ == "__main__":
-    app = LunarOrbitApp()
+    timer = StartupTimer(_START)
+    timer.import_module("customtkinter")
+    ui = timer.import_module("logik.UI")
+    timer.mark("imports")
+    app = ui.LunarOrbitApp(timer=timer, startup_report="--startup-report" in sys.argv)
     app.mainloop()